@@ -1,19 +1,20 @@
 import zoom_meeting_sdk as zoom
 import jwt
-from deepgram_transcriber import DeepgramTranscriber
 from datetime import datetime, timedelta
 import os
 import requests
 import urllib.parse
 import json
+from concurrent.futures import ThreadPoolExecutor
 
-import cv2
-import numpy as np
+# cv2 and numpy are imported where they are used, so they only load when video is handled
 import gi
 gi.require_version('GLib', '2.0')
 from gi.repository import GLib
 
 def save_yuv420_frame_as_png(frame_bytes, width, height, output_path):
+    import cv2
+    import numpy as np
     try:
         # Convert bytes to numpy array
         yuv_data = np.frombuffer(frame_bytes, dtype=np.uint8)
@@ -117,6 +118,8 @@ def normalized_rms_audio(pcm_data: bytes, sample_width: int = 2) -> bool:
     return normalized_rms
 
 def create_red_yuv420_frame(width=640, height=360):
+    import cv2
+    import numpy as np
     bgr_frame = np.zeros((height, width, 3), dtype=np.uint8)
     bgr_frame[:, :] = [0, 0, 255]  # Pure red in BGR
     yuv_frame = cv2.cvtColor(bgr_frame, cv2.COLOR_BGR2YUV_I420)
@@ -149,6 +152,7 @@ class APIMeetingBot:
         self.meeting_id = None
         self.meeting_password = None
         self.meeting_link = None
+        self.meeting_info_future = None
 
     def cleanup(self):
         print("CleanUPSDK() called")
@@ -224,9 +228,11 @@ class APIMeetingBot:
             return None
 
     def init(self):
-        # Fetch meeting info from API first
-        self.fetch_meeting_info()
-        
+        # The API request does not need the SDK, so it runs while InitSDK, auth and join start up
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="startup")
+        self.meeting_info_future = executor.submit(self.fetch_meeting_info)
+        executor.shutdown(wait=False)
+
         # Check for Zoom credentials
         if os.environ.get('ZOOM_APP_CLIENT_ID') is None:
             raise Exception('No ZOOM_APP_CLIENT_ID found in environment')
@@ -248,6 +254,8 @@ class APIMeetingBot:
 
     def join_meeting(self):
         """Join meeting using data fetched from API"""
+        # Raises here if fetching the meeting info failed
+        self.meeting_info_future.result()
         if not self.meeting_id or not self.meeting_password:
             raise Exception('Meeting ID or password not available')
         
@@ -0,0 +1,128 @@
+import argparse
+import mmap
+import os
+import struct
+import time
+from collections import namedtuple
+
+# Must match src/audio_raw_data_shared_memory_sink.h
+AUDIO_RING_MAGIC = 0x4252415A
+AUDIO_RING_VERSION = 1
+RING_HEADER = struct.Struct("<IIQQI")
+RECORD_HEADER = struct.Struct("<IIQIHH")
+POSITION = struct.Struct("<Q")
+WRITE_POSITION_OFFSET = 64
+WRITTEN_CHUNKS_OFFSET = 72
+DROPPED_CHUNKS_OFFSET = 80
+DROPPED_BYTES_OFFSET = 88
+READ_POSITION_OFFSET = 128
+
+AUDIO_SOURCE_ONE_WAY = 0
+AUDIO_SOURCE_MIXED = 1
+AUDIO_SOURCE_SHARE = 2
+
+AudioRingChunk = namedtuple("AudioRingChunk", ["node_id", "timestamp", "sample_rate", "channels", "source", "data"])
+
+class AudioRingReader:
+    """Reads audio chunks written by an AudioRawDataSharedMemorySink, from any process on the same machine"""
+    def __init__(self, name, attach_timeout_seconds=10):
+        # Opened through /dev/shm rather than multiprocessing.shared_memory, whose resource
+        # tracker would unlink the segment when this process exits
+        self.path = "/dev/shm/" + name.lstrip("/")
+        deadline = time.monotonic() + attach_timeout_seconds
+        while True:
+            try:
+                fd = os.open(self.path, os.O_RDWR)
+                break
+            except FileNotFoundError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.1)
+        try:
+            self.memory = mmap.mmap(fd, 0)
+        finally:
+            os.close(fd)
+
+        while True:
+            magic, version, self.capacity, self.data_offset, record_header_size = RING_HEADER.unpack_from(self.memory, 0)
+            if magic == AUDIO_RING_MAGIC or time.monotonic() > deadline:
+                break
+            time.sleep(0.01)
+        if magic != AUDIO_RING_MAGIC or version != AUDIO_RING_VERSION or record_header_size != RECORD_HEADER.size:
+            self.memory.close()
+            raise ValueError(f"{self.path} is not a version {AUDIO_RING_VERSION} audio ring")
+
+        self.read_position = POSITION.unpack_from(self.memory, READ_POSITION_OFFSET)[0]
+
+    def copy_out(self, position, length):
+        offset = position & (self.capacity - 1)
+        start = self.data_offset + offset
+        first = min(length, self.capacity - offset)
+        if first == length:
+            return self.memory[start:start + length]
+        return self.memory[start:start + first] + self.memory[self.data_offset:self.data_offset + length - first]
+
+    def read(self, max_chunks=None):
+        """Returns the chunks written since the last read, oldest first, and frees their space in the ring"""
+        write_position = POSITION.unpack_from(self.memory, WRITE_POSITION_OFFSET)[0]
+        chunks = []
+        position = self.read_position
+        while position < write_position and (max_chunks is None or len(chunks) < max_chunks):
+            length, node_id, timestamp, sample_rate, channels, source = RECORD_HEADER.unpack(self.copy_out(position, RECORD_HEADER.size))
+            data = self.copy_out(position + RECORD_HEADER.size, length)
+            chunks.append(AudioRingChunk(node_id, timestamp, sample_rate, channels, source, data))
+            position += (RECORD_HEADER.size + length + 7) & ~7
+
+        if position != self.read_position:
+            self.read_position = position
+            # A single aligned 8 byte store, so the producer never sees a torn position
+            POSITION.pack_into(self.memory, READ_POSITION_OFFSET, position)
+        return chunks
+
+    def stats(self):
+        write_position = POSITION.unpack_from(self.memory, WRITE_POSITION_OFFSET)[0]
+        return {
+            "written_chunks": POSITION.unpack_from(self.memory, WRITTEN_CHUNKS_OFFSET)[0],
+            "dropped_chunks": POSITION.unpack_from(self.memory, DROPPED_CHUNKS_OFFSET)[0],
+            "dropped_bytes": POSITION.unpack_from(self.memory, DROPPED_BYTES_OFFSET)[0],
+            "pending_bytes": write_position - self.read_position,
+            "capacity": self.capacity,
+        }
+
+    def close(self):
+        self.memory.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Write each participant's audio from a bot's shared memory audio ring to a PCM file")
+    parser.add_argument("name", help="Name of the ring, AUDIO_SHARED_MEMORY_RING in the bot")
+    parser.add_argument("--out", default="sample_program/out/ring_audio")
+    parser.add_argument("--poll-ms", type=int, default=20)
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    reader = AudioRingReader(args.name)
+    files = {}
+    last_dropped = 0
+    try:
+        while True:
+            chunks = reader.read()
+            for chunk in chunks:
+                if chunk.node_id not in files:
+                    files[chunk.node_id] = open(os.path.join(args.out, f"node_{chunk.node_id}.pcm"), "ab")
+                files[chunk.node_id].write(chunk.data)
+
+            dropped = reader.stats()["dropped_chunks"]
+            if dropped != last_dropped:
+                print(f"Audio ring overrun: {dropped - last_dropped} chunks dropped")
+                last_dropped = dropped
+            if not chunks:
+                time.sleep(args.poll_ms / 1000)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for file in files.values():
+            file.close()
+        reader.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import mmap
+import time
+
+from gi.repository import GLib
+
+def pcm_file_chunks(path, chunk_bytes):
+    """Reads a PCM file chunk by chunk into one reused buffer; each chunk is only valid until the next one is read"""
+    buffer = bytearray(chunk_bytes)
+    view = memoryview(buffer)
+    with open(path, "rb") as file:
+        while True:
+            length = file.readinto(buffer)
+            if not length:
+                return
+            yield view[:length]
+
+def pcm_mmap_chunks(path, chunk_bytes):
+    """Yields zero-copy slices of a memory mapped PCM file"""
+    with open(path, "rb") as file:
+        memory = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    # Not closed explicitly: the consumer may still hold the last slice, and the mapping
+    # is unmapped once no slice references it
+    view = memoryview(memory)
+    for offset in range(0, len(view), chunk_bytes):
+        yield view[offset:offset + chunk_bytes]
+
+def rechunk(chunks, chunk_bytes):
+    """Turns an iterable of bytes-like objects of any size, such as a TTS stream, into chunks of chunk_bytes"""
+    pending = bytearray()
+    for chunk in chunks:
+        pending += chunk
+        while len(pending) >= chunk_bytes:
+            yield bytes(pending[:chunk_bytes])
+            del pending[:chunk_bytes]
+    if pending:
+        yield bytes(pending)
+
+class PacedAudioSource:
+    """
+    Streams 16 bit PCM to a virtual mic or share audio sender in real time sized chunks
+    from the GLib main loop, the thread the SDK calls back on, so the sender is never used
+    from another thread and clips of any length use one chunk of memory. Each chunk is
+    sent from a one-shot timeout scheduled against an absolute time.monotonic() deadline
+    derived from the bytes sent so far and the sample rate, after an initial prebuffer that
+    lets the SDK absorb jitter. A send that fails is retried with backoff, which is how the
+    SDK pushes back, and the stream gives up after max_retries consecutive failures.
+    cancel() stops it between chunks.
+    """
+    def __init__(self, chunks, send, sample_rate=32000, channels=1, prebuffer_ms=100, max_retries=50, on_finished=None):
+        self.chunks = iter(chunks)
+        self.send = send
+        self.bytes_per_second = sample_rate * channels * 2
+        self.prebuffer_seconds = prebuffer_ms / 1000
+        self.max_retries = max_retries
+        self.on_finished = on_finished
+        self.timeout_id = None
+        self.start_time = None
+        # The chunk waiting for its deadline or a retry, and when it is due
+        self.chunk = None
+        self.deadline = None
+        self.attempts = 0
+        self.cancelled = False
+        self.finished = False
+        self.bytes_sent = 0
+        self.chunks_sent = 0
+        self.retries = 0
+        self.max_lateness = 0
+        self.error = None
+
+    @staticmethod
+    def chunk_bytes(sample_rate, channels=1, chunk_ms=20):
+        return sample_rate * channels * 2 * chunk_ms // 1000
+
+    def start(self):
+        if self.timeout_id is None and not self.finished:
+            self.start_time = time.monotonic()
+            self.timeout_id = GLib.idle_add(self.tick)
+
+    def cancel(self):
+        if self.finished:
+            return
+        self.cancelled = True
+        if self.timeout_id is not None:
+            GLib.source_remove(self.timeout_id)
+            self.timeout_id = None
+        self.finish()
+
+    def schedule(self, delay):
+        self.timeout_id = GLib.timeout_add(max(0, round(delay * 1000)), self.tick)
+
+    def tick(self):
+        self.timeout_id = None
+        try:
+            while True:
+                if self.chunk is None:
+                    self.chunk = next(self.chunks, None)
+                    if self.chunk is None:
+                        self.finish()
+                        return False
+                    # The deadline is when the audio sent so far finishes playing, less the prebuffer
+                    self.deadline = self.start_time + self.bytes_sent / self.bytes_per_second - self.prebuffer_seconds
+                delay = self.deadline - time.monotonic()
+                if delay > 0 and self.attempts == 0:
+                    self.schedule(delay)
+                    return False
+                if self.attempts == 0 and self.deadline >= self.start_time:
+                    self.max_lateness = max(self.max_lateness, -delay)
+                if not self.send(self.chunk):
+                    self.attempts += 1
+                    self.retries += 1
+                    if self.attempts > self.max_retries:
+                        self.error = f"sender rejected a chunk {self.attempts} times"
+                        self.finish()
+                    else:
+                        self.schedule(min(0.005 * 2 ** (self.attempts - 1), 0.1))
+                    return False
+                self.bytes_sent += len(self.chunk)
+                self.chunks_sent += 1
+                self.chunk = None
+                self.attempts = 0
+        except Exception as e:
+            self.error = str(e)
+            self.finish()
+        # The next chunk is sent from a new one-shot timeout
+        return False
+
+    def finish(self):
+        if self.finished:
+            return
+        self.finished = True
+        self.chunk = None
+        close = getattr(self.chunks, "close", None)
+        if close:
+            close()
+        if self.error:
+            print(f"Error streaming audio: {self.error}")
+        if self.on_finished:
+            self.on_finished(self)
+
+    def stats(self):
+        return {
+            "seconds_sent": self.bytes_sent / self.bytes_per_second,
+            "chunks_sent": self.chunks_sent,
+            "retries": self.retries,
+            "max_lateness_ms": self.max_lateness * 1000,
+            "cancelled": self.cancelled,
+            "error": self.error,
+        }
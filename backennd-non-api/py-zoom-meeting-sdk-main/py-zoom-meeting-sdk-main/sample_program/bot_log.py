@@ -0,0 +1,165 @@
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+
+class StructuredLogger:
+    """
+    JSON lines logging that is safe to call from SDK callback threads. log() only decides
+    whether to keep the record and appends a dict to an in-memory queue; a writer thread
+    serializes and writes it, so a slow reader on the other end of a pipe stalls the
+    writer, never a callback. Past max_queue records, new ones are dropped and counted,
+    and the writer reports the count as a log_records_dropped record.
+
+    Each call site, named by its event, can be rate limited (a token bucket of
+    rate_per_second with a burst of burst) and sampled (keep a fraction of calls). Records
+    emitted after some were suppressed carry the count in "suppressed".
+    """
+    def __init__(self, stream=None, max_queue=10000, drop_report_interval_seconds=10):
+        # None follows sys.stdout at write time, as print does
+        self.stream = stream
+        self.max_queue = max_queue
+        self.drop_report_interval_seconds = drop_report_interval_seconds
+        self.queue = queue.SimpleQueue()
+        self.lock = threading.Lock()
+        self.queued = 0
+        self.dropped = 0
+        self.reported_drops = 0
+        self.written = 0
+        # event: [tokens, last refill time, suppressed count]
+        self.sites = {}
+        self.thread = None
+        self.closed = False
+
+    def allow(self, event, rate_per_second=None, burst=None, sample=None):
+        """Whether a record for this call site should be kept; for callers whose fields are costly to build"""
+        if sample is None and rate_per_second is None:
+            return True
+        now = time.monotonic()
+        with self.lock:
+            site = self.sites.get(event)
+            if site is None:
+                site = self.sites[event] = [burst or 1, now, 0]
+            if sample is not None and random.random() >= sample:
+                site[2] += 1
+                return False
+            if rate_per_second is not None:
+                site[0] = min(burst or 1, site[0] + (now - site[1]) * rate_per_second)
+                site[1] = now
+                if site[0] < 1:
+                    site[2] += 1
+                    return False
+                site[0] -= 1
+        return True
+
+    def emit(self, event, level="info", **fields):
+        """Queues a record without rate limiting or sampling. Never blocks; returns False if it was dropped."""
+        record = {"ts": time.time(), "level": level, "event": event, "thread": threading.current_thread().name}
+        record.update(fields)
+        with self.lock:
+            if self.closed or self.queued >= self.max_queue:
+                self.dropped += 1
+                return False
+            self.queued += 1
+            site = self.sites.get(event)
+            if site and site[2]:
+                record["suppressed"] = site[2]
+                site[2] = 0
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.writer_loop, name="bot-log", daemon=True)
+                self.thread.start()
+            # Under the lock, so nothing is queued after close() queues the writer's stop marker
+            self.queue.put(record)
+        return True
+
+    def log(self, event, level="info", rate_per_second=None, burst=None, sample=None, **fields):
+        if not self.allow(event, rate_per_second, burst, sample):
+            return False
+        return self.emit(event, level, **fields)
+
+    def info(self, event, **kwargs):
+        return self.log(event, "info", **kwargs)
+
+    def warning(self, event, **kwargs):
+        return self.log(event, "warning", **kwargs)
+
+    def error(self, event, **kwargs):
+        return self.log(event, "error", **kwargs)
+
+    def drop_report(self, now):
+        with self.lock:
+            new_drops = self.dropped - self.reported_drops
+            if not new_drops:
+                return None
+            self.reported_drops = self.dropped
+        return {"ts": now, "level": "warning", "event": "log_records_dropped", "thread": "bot-log", "count": new_drops}
+
+    def writer_loop(self):
+        last_drop_report = 0
+        while True:
+            records = [self.queue.get()]
+            # Whatever else is already queued goes out in the same write
+            while len(records) < 256:
+                try:
+                    records.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = records[-1] is None
+            if stop:
+                records.pop()
+            taken = len(records)
+            now = time.time()
+            if now - last_drop_report >= self.drop_report_interval_seconds or stop:
+                report = self.drop_report(now)
+                if report:
+                    records.append(report)
+                    last_drop_report = now
+            lines = "".join(json.dumps(record, default=str) + "\n" for record in records)
+            stream = self.stream or sys.stdout
+            try:
+                stream.write(lines)
+                stream.flush()
+            except (IOError, ValueError):
+                # The reader went away; keep draining so callbacks keep their queue space
+                pass
+            with self.lock:
+                self.queued -= taken
+                self.written += len(records)
+            if stop:
+                return
+
+    def stats(self):
+        with self.lock:
+            return {"queued": self.queued, "written": self.written, "dropped": self.dropped}
+
+    def close(self, timeout=2):
+        """Writes what is queued, waiting at most timeout seconds for a stalled reader"""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            thread = self.thread
+        if thread:
+            self.queue.put(None)
+            thread.join(timeout)
+
+_logger = None
+_logger_lock = threading.Lock()
+
+def get_logger():
+    """The process wide logger. Writes to stdout, or to BOT_LOG_PATH when it is set."""
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            path = os.environ.get('BOT_LOG_PATH')
+            stream = None
+            if path:
+                try:
+                    stream = open(path, "a", buffering=1024 * 1024)
+                except IOError as e:
+                    print(f"Error: failed to open {path}, logging to stdout. Error: {e}")
+            _logger = StructuredLogger(stream, max_queue=int(os.environ.get('BOT_LOG_QUEUE_SIZE', '10000')))
+        return _logger
@@ -0,0 +1,96 @@
+import zoom_meeting_sdk as zoom
+import json
+import math
+import os
+import time
+
+import gi
+gi.require_version('GLib', '2.0')
+from gi.repository import GLib
+
+def summarize_performance_data(data):
+    """Summary of a CallbackPerformanceData. The sparse bins use the fixed native layout, so summaries can be merged by adding bins."""
+    if data.numCalls == 0:
+        return {"calls": 0}
+    return {
+        "calls": data.numCalls,
+        "mean_us": data.totalProcessingTimeMicroseconds / data.numCalls,
+        "min_us": data.minProcessingTimeMicroseconds,
+        "p50_us": data.p50,
+        "p90_us": data.p90,
+        "p99_us": data.p99,
+        "p999_us": data.p999,
+        "max_us": data.maxProcessingTimeMicroseconds,
+        "bins": {str(index): count for index, count in enumerate(data.processingTimeBinCounts) if count},
+    }
+
+def merge_summaries(summaries):
+    """Merges summaries from several collectors or exports into one, recomputing the percentiles from the merged bins"""
+    summaries = [summary for summary in summaries if summary["calls"]]
+    if not summaries:
+        return {"calls": 0}
+    calls = sum(summary["calls"] for summary in summaries)
+    min_us = min(summary["min_us"] for summary in summaries)
+    max_us = max(summary["max_us"] for summary in summaries)
+    bins = {}
+    for summary in summaries:
+        for index, count in summary["bins"].items():
+            bins[int(index)] = bins.get(int(index), 0) + count
+
+    def percentile(fraction):
+        target = max(1, math.ceil(fraction * calls))
+        seen = 0
+        for index in sorted(bins):
+            seen += bins[index]
+            if seen >= target:
+                return min(max(zoom.CallbackPerformanceData.getBinUpperBound(index), min_us), max_us)
+        return max_us
+
+    return {
+        "calls": calls,
+        "mean_us": sum(summary["mean_us"] * summary["calls"] for summary in summaries) / calls,
+        "min_us": min_us,
+        "p50_us": percentile(0.5),
+        "p90_us": percentile(0.9),
+        "p99_us": percentile(0.99),
+        "p999_us": percentile(0.999),
+        "max_us": max_us,
+        "bins": {str(index): bins[index] for index in sorted(bins)},
+    }
+
+class CallbackPerformanceExporter:
+    """Periodically logs every live callback performance collector and appends a JSON line per export to a metrics file"""
+    def __init__(self, path="sample_program/out/callback_performance.jsonl", interval_seconds=60, reset_after_export=False):
+        self.path = path
+        self.interval_seconds = interval_seconds
+        self.reset_after_export = reset_after_export
+        self.timeout_id = None
+
+    def start(self):
+        if self.timeout_id is None and self.interval_seconds > 0:
+            self.timeout_id = GLib.timeout_add_seconds(self.interval_seconds, self.export)
+
+    def stop(self):
+        if self.timeout_id is not None:
+            GLib.source_remove(self.timeout_id)
+            self.timeout_id = None
+
+    def export(self):
+        snapshot = zoom.GetCallbackPerformanceDataSnapshot()
+        if self.reset_after_export:
+            zoom.ResetCallbackPerformanceData()
+
+        collectors = {name: summarize_performance_data(data) for name, data in snapshot.items()}
+        for name, summary in collectors.items():
+            if summary["calls"]:
+                print(f"Callback performance {name}: calls={summary['calls']} mean={summary['mean_us']:.0f}us p50={summary['p50_us']}us p90={summary['p90_us']}us p99={summary['p99_us']}us p999={summary['p999_us']}us max={summary['max_us']}us")
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a") as file:
+                file.write(json.dumps({"time": time.time(), "collectors": collectors, "all": merge_summaries(collectors.values())}) + "\n")
+        except IOError as e:
+            print(f"Error: failed to write callback performance data to {self.path}. Error: {e}")
+
+        # Keep the GLib timeout running
+        return True
@@ -1,5 +1,11 @@
 from deepgram.utils import verboselogs
 import os
+import collections
+import random
+import threading
+import time
+
+import numpy as np
 
 from deepgram import (
     DeepgramClient,
@@ -11,51 +17,293 @@ from deepgram import (
 
 import asyncio
 
+# Deepgram closes a stream that has seen no data for ~10 seconds, so send a
+# KeepAlive whenever we haven't sent audio for this long.
+KEEPALIVE_INTERVAL_SECONDS = 4
+RECONNECT_INITIAL_DELAY_SECONDS = 0.5
+RECONNECT_MAX_DELAY_SECONDS = 30
+# How much audio that Deepgram has not yet finalized we hold on to so it can
+# be replayed after a reconnect
+REPLAY_BUFFER_SECONDS = 30
+
 class DeepgramTranscriber:
-    def __init__(self):
-        # Configure the DeepgramClientOptions to enable KeepAlive for maintaining the WebSocket connection (only if necessary to your scenario)
-        config = DeepgramClientOptions(
-            options={"keepalive": "true"}
-        )
+    def __init__(self, sample_rate=32000, replay_buffer_seconds=REPLAY_BUFFER_SECONDS, latency_tracer=None, on_transcript=None):
+        self.sample_rate = sample_rate
+        self.latency_tracer = latency_tracer
+        # Called with (text, start_seconds, end_seconds, node_id) for each final transcript, timed from the start of the
+        # audio stream; node_id is the participant whose audio was loudest in it, or None if unknown
+        self.on_transcript = on_transcript
+        # linear16 mono
+        self.bytes_per_second = sample_rate * 2
+
+        # KeepAlive is sent by sender_loop so it only goes out while audio is silent
+        config = DeepgramClientOptions()
 
         # Create a websocket connection using the DEEPGRAM_API_KEY from environment variables
         self.deepgram = DeepgramClient(os.environ.get('DEEPGRAM_API_KEY'), config)
 
+        self.options = LiveOptions(
+            model="nova-2-conversationalai",
+            punctuate=True,
+            interim_results=True,
+            language='en-GB',
+            encoding= "linear16",
+            sample_rate=sample_rate
+            )
+
+        self.lock = threading.RLock()
+        # Notified when there is something to send; only the sender thread talks to the websocket
+        self.send_condition = threading.Condition(self.lock)
+        self.dg_connection = None
+        self.connected = False
+        self.finished = False
+        self.reconnect_thread = None
+        self.reconnect_count = 0
+        self.last_send_time = time.monotonic()
+
+        # Ring buffer of (stream_offset, chunk, tag) that Deepgram has not yet returned a final result for.
+        # Offsets are byte positions in the logical audio stream, which spans reconnects.
+        self.replay_buffer = collections.deque()
+        self.replay_buffer_bytes = 0
+        self.replay_buffer_max_bytes = int(replay_buffer_seconds * self.bytes_per_second)
+        self.stream_offset = 0
+        # Stream offset that the current connection's t=0 corresponds to
+        self.connection_base_offset = 0
+        self.dropped_bytes = 0
+        # (chunk, tag) waiting for the sender thread on the current connection; replayed chunks have no tag
+        self.pending = collections.deque()
+        self.pending_bytes = 0
+
+        self.sender_thread = threading.Thread(target=self.sender_loop, name="deepgram-sender", daemon=True)
+        self.sender_thread.start()
+
+        if not self.connect():
+            self.schedule_reconnect()
+
+    def connect(self):
+        """Open a new websocket and replay any audio Deepgram has not finalized yet"""
         # Use the listen.live class to create the websocket connection
-        self.dg_connection = self.deepgram.listen.websocket.v("1") 
+        dg_connection = self.deepgram.listen.websocket.v("1")
 
-        def on_message(self, result, **kwargs):
+        def on_message(client, result, **kwargs):
             #print("got")
             #print(result)
             #print(result.channel.alternatives[0])
+            if result.is_final:
+                base_seconds = self.connection_base_offset / self.bytes_per_second
+                node_id = self.acknowledge(dg_connection, result.start, result.start + result.duration)
+            else:
+                self.trace_interim(dg_connection, result.start + result.duration)
             sentence = result.channel.alternatives[0].transcript
             if len(sentence) == 0:
                 return
             print(f"Transcription: {sentence}")
+            if result.is_final and self.on_transcript:
+                self.on_transcript(sentence, base_seconds + result.start, base_seconds + result.start + result.duration, node_id)
 
-        self.dg_connection.on(LiveTranscriptionEvents.Transcript, on_message)
+        dg_connection.on(LiveTranscriptionEvents.Transcript, on_message)
 
-        def on_error(self, error, **kwargs):
+        def on_error(client, error, **kwargs):
             print(f"Error: {error}")
 
-        self.dg_connection.on(LiveTranscriptionEvents.Error, on_error)
+        dg_connection.on(LiveTranscriptionEvents.Error, on_error)
 
-        options = LiveOptions(
-            model="nova-2-conversationalai",
-            punctuate=True,
-            interim_results=True,
-            language='en-GB',
-            encoding= "linear16",
-            sample_rate=32000
-            )
+        def on_close(client, close, **kwargs):
+            self.on_disconnect(dg_connection, "connection closed")
 
-        self.dg_connection.start(options)
+        dg_connection.on(LiveTranscriptionEvents.Close, on_close)
+
+        try:
+            started = dg_connection.start(self.options)
+        except Exception as e:
+            print(f"Failed to connect to Deepgram: {e}")
+            return False
+        if started is False:
+            print("Failed to connect to Deepgram")
+            return False
+
+        with self.lock:
+            if self.finished:
+                dg_connection.finish()
+                return True
+            self.dg_connection = dg_connection
+            self.connection_base_offset = self.replay_buffer[0][0] if self.replay_buffer else self.stream_offset
+            # The sender thread replays these before any newer chunk, without holding the lock
+            self.pending = collections.deque((chunk, None) for offset, chunk, tag in self.replay_buffer)
+            self.pending_bytes = replay_bytes = self.replay_buffer_bytes
+            self.connected = True
+            self.last_send_time = time.monotonic()
+            self.send_condition.notify()
+
+        if self.reconnect_count > 0:
+            print(f"Reconnected to Deepgram, replaying {replay_bytes / self.bytes_per_second:.1f}s of audio")
+        return True
+
+    def acknowledge(self, dg_connection, start_seconds, end_seconds):
+        """
+        Drop buffered audio that Deepgram has returned a final transcript for. Returns the
+        node id whose chunks within the transcript carried the most energy, since every
+        participant's audio goes into the one stream, or None if no chunk is tagged.
+        """
+        now = time.monotonic()
+        acked = []
+        with self.lock:
+            if dg_connection is not self.dg_connection:
+                return None
+            start_offset = self.connection_base_offset + int(start_seconds * self.bytes_per_second)
+            acked_offset = self.connection_base_offset + int(end_seconds * self.bytes_per_second)
+            while self.replay_buffer:
+                offset, chunk, tag = self.replay_buffer[0]
+                if offset + len(chunk) > acked_offset:
+                    break
+                self.replay_buffer.popleft()
+                self.replay_buffer_bytes -= len(chunk)
+                if tag and tag.node_id is not None and offset + len(chunk) > start_offset:
+                    acked.append((tag.node_id, chunk))
+                if self.latency_tracer and tag:
+                    if tag.first_result_at is None:
+                        self.latency_tracer.record("first_interim", tag, now)
+                    self.latency_tracer.record("final", tag, now)
+        # Summed outside the lock, on Deepgram's thread rather than an audio callback
+        energy = collections.Counter()
+        for node_id, chunk in acked:
+            samples = np.frombuffer(chunk, dtype=np.int16, count=len(chunk) // 2).astype(np.float32)
+            energy[node_id] += float(np.dot(samples, samples))
+        return energy.most_common(1)[0][0] if energy else None
+
+    def trace_interim(self, dg_connection, end_seconds):
+        """Record first-result latency for buffered chunks covered by an interim transcript"""
+        if not self.latency_tracer:
+            return
+        now = time.monotonic()
+        with self.lock:
+            if dg_connection is not self.dg_connection:
+                return
+            end_offset = self.connection_base_offset + int(end_seconds * self.bytes_per_second)
+            for offset, chunk, tag in self.replay_buffer:
+                if offset + len(chunk) > end_offset:
+                    break
+                if tag and tag.first_result_at is None:
+                    tag.first_result_at = now
+                    self.latency_tracer.record("first_interim", tag, now)
+
+    def buffer_chunk(self, data, tag):
+        self.replay_buffer.append((self.stream_offset, data, tag))
+        self.replay_buffer_bytes += len(data)
+        self.stream_offset += len(data)
+        while self.replay_buffer_bytes > self.replay_buffer_max_bytes:
+            offset, chunk, tag = self.replay_buffer.popleft()
+            self.replay_buffer_bytes -= len(chunk)
+            if not self.connected:
+                self.dropped_bytes += len(chunk)
+
+    def on_disconnect(self, dg_connection, reason):
+        with self.lock:
+            if self.finished or dg_connection is not self.dg_connection or not self.connected:
+                return
+            self.connected = False
+            # Still in the replay buffer, so they go out again after reconnecting
+            self.pending.clear()
+            self.pending_bytes = 0
+        print(f"Deepgram disconnected ({reason}), reconnecting")
+        self.schedule_reconnect()
+
+    def schedule_reconnect(self):
+        with self.lock:
+            if self.finished or (self.reconnect_thread and self.reconnect_thread.is_alive()):
+                return
+            self.reconnect_thread = threading.Thread(target=self.reconnect_loop, daemon=True)
+            self.reconnect_thread.start()
+
+    def reconnect_loop(self):
+        delay = RECONNECT_INITIAL_DELAY_SECONDS
+        while not self.finished:
+            # Full jitter so many bots don't reconnect in lockstep after an outage
+            time.sleep(random.uniform(0, delay))
+            old_connection = self.dg_connection
+            if old_connection is not None:
+                try:
+                    old_connection.finish()
+                except Exception:
+                    pass
+            self.reconnect_count += 1
+            if self.connect():
+                return
+            delay = min(delay * 2, RECONNECT_MAX_DELAY_SECONDS)
+
+    def take_pending(self):
+        """Waits for a chunk to send, or a keepalive to be due. Returns (connection, chunk, tag), chunk None for a keepalive, or None once finished."""
+        with self.send_condition:
+            while True:
+                if self.pending and self.connected:
+                    chunk, tag = self.pending.popleft()
+                    self.pending_bytes -= len(chunk)
+                    return self.dg_connection, chunk, tag
+                if self.finished:
+                    return None
+                idle = time.monotonic() - self.last_send_time
+                if self.connected and idle >= KEEPALIVE_INTERVAL_SECONDS:
+                    self.last_send_time = time.monotonic()
+                    return self.dg_connection, None, None
+                self.send_condition.wait(KEEPALIVE_INTERVAL_SECONDS - idle if self.connected else 1)
+
+    def sender_loop(self):
+        """Does all websocket I/O, so audio callbacks never wait on the network or on a reconnect's replay"""
+        while True:
+            item = self.take_pending()
+            if item is None:
+                return
+            dg_connection, chunk, tag = item
+            if chunk is None:
+                try:
+                    dg_connection.keep_alive()
+                except Exception as e:
+                    print(f"Failed to send keepalive to Deepgram: {e}")
+                continue
+            if self.latency_tracer:
+                self.latency_tracer.record("queue", tag)
+            try:
+                sent = dg_connection.send(chunk)
+            except Exception as e:
+                print(f"Failed to send audio to Deepgram: {e}")
+                sent = False
+            now = time.monotonic()
+            with self.lock:
+                self.last_send_time = now
+            if sent is False:
+                self.on_disconnect(dg_connection, "send failed")
+            elif self.latency_tracer:
+                self.latency_tracer.record("send", tag, now)
+
+    def send(self, data, tag=None):
+        """Called on the SDK audio thread. Only buffers the chunk for the sender thread, so it never blocks on the network."""
+        with self.lock:
+            self.buffer_chunk(data, tag)
+            if not self.connected:
+                return
+            self.pending.append((data, tag))
+            self.pending_bytes += len(data)
+            # A stalled connection keeps at most as much unsent audio as the replay buffer would
+            while self.pending_bytes > self.replay_buffer_max_bytes:
+                chunk, _ = self.pending.popleft()
+                self.pending_bytes -= len(chunk)
+                self.dropped_bytes += len(chunk)
+            self.send_condition.notify()
 
-    def send(self, data):
-        self.dg_connection.send(data)
+    def finish(self, timeout=2):
+        """Sends what is pending, waiting at most timeout seconds, then closes the stream"""
+        with self.lock:
+            self.finished = True
+            self.send_condition.notify()
+        self.sender_thread.join(timeout)
+        with self.lock:
+            self.connected = False
+            dg_connection = self.dg_connection
+        if self.dropped_bytes:
+            print(f"Deepgram transcriber dropped {self.dropped_bytes / self.bytes_per_second:.1f}s of audio it could not send")
+        if dg_connection is not None:
+            dg_connection.finish()
 
-    def finish(self):
-        self.dg_connection.finish()
 
 PCM_FILE_PATH = 'sample_program/out/test_audio_16778240.pcm'
 CHUNK_SIZE = 64000*10
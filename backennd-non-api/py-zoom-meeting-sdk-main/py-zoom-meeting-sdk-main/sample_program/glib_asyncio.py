@@ -0,0 +1,157 @@
+import asyncio
+import math
+import selectors
+from collections.abc import Mapping
+
+import gi
+gi.require_version('GLib', '2.0')
+from gi.repository import GLib
+
+def fileobj_to_fd(fileobj):
+    """The file descriptor of an int or an object with fileno(), as selectors expects"""
+    if isinstance(fileobj, int):
+        fd = fileobj
+    else:
+        try:
+            fd = int(fileobj.fileno())
+        except (AttributeError, TypeError, ValueError):
+            raise ValueError(f"Invalid file object: {fileobj!r}") from None
+    if fd < 0:
+        raise ValueError(f"Invalid file descriptor: {fd}")
+    return fd
+
+class SelectorKeyMapping(Mapping):
+    """Read only file object to SelectorKey view of a GLibSelector, returned by get_map()"""
+    def __init__(self, selector):
+        self.selector = selector
+
+    def __len__(self):
+        return len(self.selector.keys)
+
+    def __getitem__(self, fileobj):
+        fd = self.selector.lookup_fd(fileobj)
+        try:
+            return self.selector.keys[fd]
+        except KeyError:
+            raise KeyError(f"{fileobj!r} is not registered") from None
+
+    def __iter__(self):
+        return iter(self.selector.keys)
+
+class GLibSelector(selectors.BaseSelector):
+    """
+    Selector that waits by iterating the default GLib main context, so while an asyncio loop
+    waits for I/O or timers, GLib sources (SDK callbacks, GLib.timeout_add, signals) are
+    dispatched on the same thread. Every registered file descriptor is watched with a GLib
+    unix fd source. select() returns after any GLib source has been dispatched, because that
+    source may have scheduled asyncio callbacks.
+    """
+    def __init__(self, context):
+        self.context = context
+        # fd to SelectorKey and to the GLib source watching it
+        self.keys = {}
+        self.watches = {}
+        self.ready = {}
+        self.map = SelectorKeyMapping(self)
+
+    def lookup_fd(self, fileobj):
+        try:
+            return fileobj_to_fd(fileobj)
+        except ValueError:
+            # A file object closed since it was registered no longer has a fileno()
+            for key in self.keys.values():
+                if key.fileobj is fileobj:
+                    return key.fd
+            raise
+
+    def register(self, fileobj, events, data=None):
+        if not events or events & ~(selectors.EVENT_READ | selectors.EVENT_WRITE):
+            raise ValueError(f"Invalid events: {events!r}")
+        key = selectors.SelectorKey(fileobj, self.lookup_fd(fileobj), events, data)
+        if key.fd in self.keys:
+            raise KeyError(f"{fileobj!r} (FD {key.fd}) is already registered")
+        condition = GLib.IOCondition(0)
+        if events & selectors.EVENT_READ:
+            condition |= GLib.IOCondition.IN | GLib.IOCondition.HUP | GLib.IOCondition.ERR
+        if events & selectors.EVENT_WRITE:
+            condition |= GLib.IOCondition.OUT | GLib.IOCondition.ERR
+        self.keys[key.fd] = key
+        self.watches[key.fd] = GLib.unix_fd_add_full(GLib.PRIORITY_DEFAULT, key.fd, condition, self.on_fd_ready)
+        return key
+
+    def unregister(self, fileobj):
+        try:
+            key = self.keys.pop(self.lookup_fd(fileobj))
+        except KeyError:
+            raise KeyError(f"{fileobj!r} is not registered") from None
+        GLib.source_remove(self.watches.pop(key.fd))
+        self.ready.pop(key.fd, None)
+        return key
+
+    def modify(self, fileobj, events, data=None):
+        key = self.get_key(fileobj)
+        if events == key.events:
+            # Only the data changed, so the GLib source can stay
+            key = key._replace(data=data)
+            self.keys[key.fd] = key
+            return key
+        self.unregister(fileobj)
+        return self.register(fileobj, events, data)
+
+    def get_map(self):
+        return self.map
+
+    def on_fd_ready(self, fd, condition):
+        events = 0
+        if condition & (GLib.IOCondition.IN | GLib.IOCondition.HUP | GLib.IOCondition.ERR):
+            events |= selectors.EVENT_READ
+        if condition & (GLib.IOCondition.OUT | GLib.IOCondition.ERR):
+            events |= selectors.EVENT_WRITE
+        self.ready[fd] = self.ready.get(fd, 0) | events
+        # Level triggered, like select(); asyncio unregisters what it no longer wants
+        return True
+
+    def select(self, timeout=None):
+        self.ready = {}
+        if timeout is not None and timeout <= 0:
+            # A single pass: ready fds stay ready until asyncio has read them, so looping would spin
+            self.context.iteration(False)
+        else:
+            timer = None
+            if timeout is not None:
+                fired = []
+                def on_timer():
+                    fired.append(True)
+                    return False
+                timer = GLib.timeout_add(math.ceil(timeout * 1000), on_timer)
+            # Blocks until at least one source, possibly the timer, has been dispatched
+            self.context.iteration(True)
+            if timer is not None and not fired:
+                GLib.source_remove(timer)
+
+        ready = []
+        for fd, events in self.ready.items():
+            key = self.keys.get(fd)
+            if key and events & key.events:
+                ready.append((key, events & key.events))
+        return ready
+
+    def close(self):
+        for source_id in self.watches.values():
+            GLib.source_remove(source_id)
+        self.watches.clear()
+        self.keys.clear()
+        self.ready.clear()
+
+class GLibEventLoop(asyncio.SelectorEventLoop):
+    """An asyncio event loop that also runs the default GLib main context, replacing GLib.MainLoop"""
+    def __init__(self):
+        super().__init__(GLibSelector(GLib.MainContext.default()))
+
+    def post(self, callback, *args):
+        """Runs callback on the loop thread; safe to call from SDK callback and worker threads"""
+        return self.call_soon_threadsafe(callback, *args)
+
+    def post_coroutine(self, coroutine):
+        """Schedules a coroutine on the loop from any thread and returns a concurrent.futures.Future for its result"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self)
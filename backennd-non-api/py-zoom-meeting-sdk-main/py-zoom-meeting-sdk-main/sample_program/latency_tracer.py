@@ -0,0 +1,70 @@
+import zoom_meeting_sdk as zoom
+from callback_performance import summarize_performance_data
+import json
+import threading
+import time
+
+# queue: waited to be picked up by the sender thread; send: handed to the websocket;
+# first_interim / final: covered by Deepgram's first interim and final transcript
+AUDIO_STAGES = ("queue", "send", "first_interim", "final")
+
+class ChunkTag:
+    """Identifies one audio chunk as it moves through the pipeline"""
+    __slots__ = ("sdk_timestamp", "received_at", "node_id", "first_result_at")
+
+    def __init__(self, sdk_timestamp, received_at, node_id):
+        self.sdk_timestamp = sdk_timestamp
+        self.received_at = received_at
+        self.node_id = node_id
+        self.first_result_at = None
+
+class LatencyTracer:
+    """
+    Collects per-stage latency histograms for audio chunks, measured from when the SDK delivered them.
+    Each stage is a CallbackPerformanceData, so stage summaries use the same bins as the callback
+    performance exports and can be merged with them.
+    """
+    def __init__(self, stages=AUDIO_STAGES):
+        self.lock = threading.Lock()
+        self.histograms = {stage: zoom.CallbackPerformanceData() for stage in stages}
+        self.started_at = time.monotonic()
+
+    def tag(self, sdk_timestamp, node_id=None, received_at=None):
+        """received_at is a time.monotonic() time, now if omitted"""
+        return ChunkTag(sdk_timestamp, time.monotonic() if received_at is None else received_at, node_id)
+
+    def record(self, stage, tag, now=None):
+        if tag is None:
+            return
+        if now is None:
+            now = time.monotonic()
+        microseconds = max(0, int((now - tag.received_at) * 1_000_000))
+        with self.lock:
+            self.histograms[stage].record(microseconds)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "uptime_seconds": time.monotonic() - self.started_at,
+                "stages": {stage: summarize_performance_data(histogram) for stage, histogram in self.histograms.items()},
+            }
+
+    def format(self):
+        snapshot = self.snapshot()
+        lines = [f"Audio latency after {snapshot['uptime_seconds']:.0f}s (ms)"]
+        for stage, stats in snapshot["stages"].items():
+            if not stats["calls"]:
+                lines.append(f"  {stage:<14} n=0")
+                continue
+            lines.append(
+                f"  {stage:<14} n={stats['calls']:<8} p50={stats['p50_us'] / 1000:<9.1f} p90={stats['p90_us'] / 1000:<9.1f} "
+                f"p99={stats['p99_us'] / 1000:<9.1f} max={stats['max_us'] / 1000:.1f}"
+            )
+        return "\n".join(lines)
+
+    def dump(self, path):
+        try:
+            with open(path, "w") as file:
+                json.dump(self.snapshot(), file, indent=2)
+        except IOError as e:
+            print(f"Error: failed to write latency histograms to {path}. Error: {e}")
@@ -0,0 +1,353 @@
+import json
+import mmap
+import queue
+import struct
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+
+# A capture is the magic, a length prefixed JSON header, then records back to back. Each
+# record is a fixed header followed by its payload:
+#   audio          PCM as delivered, node_id is the participant
+#   video / share  "<HH" width and height, then the I420 frame
+#   user join      node_id is the user, the payload is the UTF-8 name
+#   speakers       the active speakers' user ids as little endian uint32s
+#   share status   "<II" status and sharing user, node_id is the share source
+# arrival_us is microseconds since the capture started, from time.monotonic_ns().
+CAPTURE_MAGIC = b"ZMCAP001"
+HEADER_LENGTH = struct.Struct("<I")
+RECORD_HEADER = struct.Struct("<BIQQI")
+FRAME_HEADER = struct.Struct("<HH")
+SHARE_STATUS = struct.Struct("<II")
+
+AUDIO = 1
+VIDEO_FRAME = 2
+SHARE_FRAME = 3
+USER_JOIN = 4
+ACTIVE_SPEAKERS = 5
+SHARE_STATUS_CHANGE = 6
+KIND_NAMES = {AUDIO: "audio", VIDEO_FRAME: "video", SHARE_FRAME: "share", USER_JOIN: "user_join", ACTIVE_SPEAKERS: "active_speakers", SHARE_STATUS_CHANGE: "share_status"}
+
+CaptureRecord = namedtuple("CaptureRecord", "kind node_id sdk_timestamp arrival_us payload")
+
+class MediaCaptureWriter:
+    """
+    Streams a bot's callback traffic to a capture file. The record_* methods run on SDK
+    callback threads and only copy the payload out of the SDK buffer and enqueue it, so
+    no SDK frame is held past its callback; a writer thread does the file I/O. The queue is bounded in bytes, and what arrives while it is full is
+    dropped and counted rather than blocking the callback. Frames are recorded only when
+    video_fps is set, at most video_fps per stream.
+    """
+    def __init__(self, path, sample_rate=32000, channels=1, video_fps=0, max_queue_bytes=64 * 1024 * 1024):
+        self.path = path
+        self.frame_interval_ns = int(1e9 / video_fps) if video_fps else None
+        self.max_queue_bytes = max_queue_bytes
+        self.start_ns = time.monotonic_ns()
+        self.queue = queue.SimpleQueue()
+        self.lock = threading.Lock()
+        self.queued_bytes = 0
+        self.next_frame_ns = {}
+        self.counts = {name: 0 for name in KIND_NAMES.values()}
+        self.dropped = 0
+        self.bytes_written = 0
+        self.closed = False
+
+        header = json.dumps({"version": 1, "created": datetime.now().isoformat(), "sample_rate": sample_rate, "channels": channels}).encode()
+        self.file = open(path, "wb", buffering=1024 * 1024)
+        self.file.write(CAPTURE_MAGIC + HEADER_LENGTH.pack(len(header)) + header)
+        self.thread = threading.Thread(target=self.writer_loop, name="media-capture", daemon=True)
+        self.thread.start()
+
+    def arrival_us(self):
+        return (time.monotonic_ns() - self.start_ns) // 1000
+
+    def enqueue(self, kind, node_id, sdk_timestamp, payload, arrival_us=None, prefix=b""):
+        size = len(prefix) + memoryview(payload).nbytes
+        # Stamped and queued under the lock, so records from different SDK threads are written in arrival order
+        with self.lock:
+            if self.closed or self.queued_bytes + size > self.max_queue_bytes:
+                self.dropped += 1
+                return False
+            self.queued_bytes += size
+            self.counts[KIND_NAMES[kind]] += 1
+            if arrival_us is None:
+                arrival_us = self.arrival_us()
+            self.queue.put((RECORD_HEADER.pack(kind, node_id, sdk_timestamp, arrival_us, size) + prefix, payload, size))
+        return True
+
+    def record_audio(self, data, node_id):
+        """Called with an AudioRawData on the SDK audio thread"""
+        return self.enqueue(AUDIO, node_id, data.GetTimeStamp(), data.GetBuffer())
+
+    def record_audio_batch(self, batch):
+        """Records each chunk of an AudioRawDataBatch with the time the SDK delivered that chunk, not when the batch was flushed"""
+        buffer = memoryview(batch)
+        for node_id, timestamp, arrival_ns, offset, length in zip(batch.GetNodeIds().tolist(), batch.GetTimeStamps().tolist(), batch.GetArrivalTimes().tolist(), batch.GetOffsets().tolist(), batch.GetLengths().tolist()):
+            self.enqueue(AUDIO, node_id, timestamp, bytes(buffer[offset:offset + length]), max(0, arrival_ns - self.start_ns) // 1000)
+
+    def record_frame(self, data, user_id, share=False):
+        """Called with a YUVRawDataI420 on the SDK renderer thread"""
+        if not self.frame_interval_ns:
+            return False
+        kind = SHARE_FRAME if share else VIDEO_FRAME
+        now = time.monotonic_ns()
+        with self.lock:
+            if now < self.next_frame_ns.get((kind, user_id), 0):
+                return False
+            self.next_frame_ns[(kind, user_id)] = now + self.frame_interval_ns
+        # Copied rather than queued as a view, which would keep the SDK frame alive until it is written
+        return self.enqueue(kind, user_id or 0, data.GetTimeStamp(), data.GetBuffer(), prefix=FRAME_HEADER.pack(data.GetStreamWidth(), data.GetStreamHeight()))
+
+    def record_user_join(self, user_ids, user_name):
+        for user_id in user_ids:
+            self.enqueue(USER_JOIN, user_id, 0, (user_name or "").encode())
+
+    def record_active_speakers(self, user_ids):
+        self.enqueue(ACTIVE_SPEAKERS, 0, 0, struct.pack(f"<{len(user_ids)}I", *user_ids))
+
+    def record_share_status(self, status, user_id, share_source_id):
+        self.enqueue(SHARE_STATUS_CHANGE, share_source_id, 0, SHARE_STATUS.pack(status, user_id))
+
+    def writer_loop(self):
+        last_flush = time.monotonic()
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            header, payload, size = item
+            try:
+                self.file.write(header)
+                self.file.write(payload)
+            except IOError as e:
+                print(f"Error: failed to write media capture {self.path}. Error: {e}")
+            del item, payload
+            with self.lock:
+                self.queued_bytes -= size
+                self.bytes_written += RECORD_HEADER.size + size
+            # Flushed about once a second, so a bot that is killed loses at most that much
+            if self.queue.empty() or time.monotonic() - last_flush > 1:
+                self.file.flush()
+                last_flush = time.monotonic()
+        self.file.close()
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counts, dropped=self.dropped, queued_bytes=self.queued_bytes, bytes_written=self.bytes_written)
+
+    def close(self, timeout=10):
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+        self.queue.put(None)
+        self.thread.join(timeout)
+        print(f"Media capture {self.path}: {self.stats()}")
+
+class MediaCaptureReader:
+    """Reads a capture through a memory map; payloads are zero-copy views into it"""
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self.memory = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.memory)
+        if bytes(self.view[:len(CAPTURE_MAGIC)]) != CAPTURE_MAGIC:
+            raise ValueError(f"{path} is not a media capture")
+        header_length, = HEADER_LENGTH.unpack_from(self.view, len(CAPTURE_MAGIC))
+        header_start = len(CAPTURE_MAGIC) + HEADER_LENGTH.size
+        self.header = json.loads(bytes(self.view[header_start:header_start + header_length]))
+        self.records_start = header_start + header_length
+
+    def records(self):
+        offset = self.records_start
+        end = len(self.view)
+        while offset + RECORD_HEADER.size <= end:
+            kind, node_id, sdk_timestamp, arrival_us, size = RECORD_HEADER.unpack_from(self.view, offset)
+            offset += RECORD_HEADER.size
+            # A capture cut short by a killed bot ends in a partial record
+            if offset + size > end:
+                return
+            yield CaptureRecord(kind, node_id, sdk_timestamp, arrival_us, self.view[offset:offset + size])
+            offset += size
+
+    def summary(self):
+        counts = {name: 0 for name in KIND_NAMES.values()}
+        users = {}
+        duration_us = 0
+        for record in self.records():
+            name = KIND_NAMES.get(record.kind, "unknown")
+            counts[name] = counts.get(name, 0) + 1
+            if record.kind == USER_JOIN:
+                users[record.node_id] = bytes(record.payload).decode()
+            duration_us = record.arrival_us
+        return {"header": self.header, "seconds": duration_us / 1e6, "records": counts, "users": users}
+
+class ReplayedAudioRawData(bytes):
+    """A captured chunk with the AudioRawData methods the bot's callbacks use"""
+    def __new__(cls, payload, timestamp, sample_rate, channels):
+        data = super().__new__(cls, payload)
+        data.timestamp = timestamp
+        data.sample_rate = sample_rate
+        data.channels = channels
+        return data
+
+    def GetBuffer(self):
+        return bytes(self)
+
+    def GetBufferView(self):
+        return memoryview(self)
+
+    def GetBufferLen(self):
+        return len(self)
+
+    def GetTimeStamp(self):
+        return self.timestamp
+
+    def GetSampleRate(self):
+        return self.sample_rate
+
+    def GetChannelNum(self):
+        return self.channels
+
+class ReplayedFrame:
+    """A captured frame with the YUVRawDataI420 methods the bot's video pipelines use"""
+    def __init__(self, payload, timestamp, source_id):
+        import numpy as np
+        self.width, self.height = FRAME_HEADER.unpack_from(payload)
+        self.frame = np.frombuffer(payload[FRAME_HEADER.size:], dtype=np.uint8).reshape(self.height * 3 // 2, self.width)
+        self.timestamp = timestamp
+        self.source_id = source_id
+
+    def GetBufferView(self):
+        return self.frame
+
+    def GetYPlaneView(self):
+        return self.frame[:self.height]
+
+    def GetUPlaneView(self):
+        return self.frame[self.height:self.height * 5 // 4].reshape(self.height // 2, self.width // 2)
+
+    def GetVPlaneView(self):
+        return self.frame[self.height * 5 // 4:].reshape(self.height // 2, self.width // 2)
+
+    def GetBuffer(self):
+        return self.frame.tobytes()
+
+    def GetBufferLen(self):
+        return self.frame.size
+
+    def GetStreamWidth(self):
+        return self.width
+
+    def GetStreamHeight(self):
+        return self.height
+
+    def GetTimeStamp(self):
+        return self.timestamp
+
+    def GetSourceID(self):
+        return self.source_id
+
+    def IsLimitedI420(self):
+        return False
+
+    def GetRotation(self):
+        return 0
+
+class CaptureReplayer:
+    """
+    Feeds a capture to callbacks with the SDK's signatures, on a worker thread or the
+    caller's. At speed 1 records are delivered at their captured arrival times, at speed N
+    N times as fast, and at speed 0 as fast as the callbacks return. Deadlines are
+    absolute, so slow callbacks make the replay late rather than slower overall.
+    """
+    def __init__(self, path, speed=1.0, on_audio=None, on_frame=None, on_share_frame=None, on_user_join=None, on_active_speakers=None, on_share_status=None, on_finished=None):
+        self.reader = MediaCaptureReader(path)
+        self.speed = speed
+        self.on_audio = on_audio
+        self.on_frame = on_frame
+        self.on_share_frame = on_share_frame
+        self.on_user_join = on_user_join
+        self.on_active_speakers = on_active_speakers
+        self.on_share_status = on_share_status
+        self.on_finished = on_finished
+        self.cancelled = threading.Event()
+        self.thread = None
+        self.counts = {name: 0 for name in KIND_NAMES.values()}
+        self.max_lateness = 0
+        self.elapsed = 0
+        self.captured_seconds = 0
+
+    @classmethod
+    def for_bot(cls, path, bot, speed=1.0, **kwargs):
+        """Replays into a MeetingBot's callbacks, as the SDK would deliver them"""
+        return cls(
+            path,
+            speed=speed,
+            on_audio=bot.on_one_way_audio_raw_data_received_callback,
+            on_frame=bot.on_raw_data_frame_received_callback,
+            on_share_frame=lambda data: bot.on_share_raw_data_frame_received_callback(data) if bot.share_capture else None,
+            on_user_join=bot.on_user_join_callback,
+            on_active_speakers=bot.on_user_active_audio_change_callback,
+            **kwargs,
+        )
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name="capture-replayer", daemon=True)
+        self.thread.start()
+
+    def cancel(self, timeout=1):
+        self.cancelled.set()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout)
+
+    def deliver(self, record):
+        kind = record.kind
+        if kind == AUDIO:
+            if self.on_audio:
+                self.on_audio(ReplayedAudioRawData(record.payload, record.sdk_timestamp, self.sample_rate, self.channels), record.node_id)
+        elif kind == VIDEO_FRAME:
+            if self.on_frame:
+                self.on_frame(ReplayedFrame(record.payload, record.sdk_timestamp, record.node_id), record.node_id)
+        elif kind == SHARE_FRAME:
+            if self.on_share_frame:
+                self.on_share_frame(ReplayedFrame(record.payload, record.sdk_timestamp, record.node_id))
+        elif kind == USER_JOIN:
+            if self.on_user_join:
+                self.on_user_join([record.node_id], bytes(record.payload).decode())
+        elif kind == ACTIVE_SPEAKERS:
+            if self.on_active_speakers:
+                self.on_active_speakers(list(struct.unpack(f"<{len(record.payload) // 4}I", record.payload)))
+        elif kind == SHARE_STATUS_CHANGE:
+            if self.on_share_status:
+                status, user_id = SHARE_STATUS.unpack(record.payload)
+                self.on_share_status(status, user_id, record.node_id)
+        else:
+            return
+        self.counts[KIND_NAMES[kind]] += 1
+
+    def run(self):
+        self.sample_rate = self.reader.header.get("sample_rate", 32000)
+        self.channels = self.reader.header.get("channels", 1)
+        start = time.monotonic()
+        try:
+            for record in self.reader.records():
+                if self.speed > 0:
+                    deadline = start + record.arrival_us / 1e6 / self.speed
+                    delay = deadline - time.monotonic()
+                    if delay > 0:
+                        if self.cancelled.wait(delay):
+                            break
+                    else:
+                        self.max_lateness = max(self.max_lateness, -delay)
+                if self.cancelled.is_set():
+                    break
+                self.deliver(record)
+                self.captured_seconds = record.arrival_us / 1e6
+        finally:
+            self.elapsed = time.monotonic() - start
+            if self.on_finished:
+                self.on_finished(self)
+
+    def stats(self):
+        return dict(self.counts, captured_seconds=self.captured_seconds, elapsed_seconds=self.elapsed, max_lateness_ms=self.max_lateness * 1000, cancelled=self.cancelled.is_set())
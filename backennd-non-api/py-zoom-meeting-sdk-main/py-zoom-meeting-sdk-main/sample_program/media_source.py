@@ -0,0 +1,146 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import time
+
+import numpy as np
+from gi.repository import GLib
+
+# Cache file layout: this header, then frame_count I420 frames of width * height * 3 / 2 bytes
+I420_CACHE_MAGIC = b"ZI420CA1"
+I420_CACHE_HEADER = struct.Struct("<8sIII")
+I420_CACHE_DATA_OFFSET = 64
+
+def source_fingerprint(sources, width, height):
+    digest = hashlib.sha1(f"{width}x{height}".encode())
+    for source in sources:
+        if isinstance(source, str):
+            stat = os.stat(source)
+            digest.update(f"{os.path.abspath(source)}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        else:
+            digest.update(np.ascontiguousarray(source).data)
+    return digest.hexdigest()[:16]
+
+def convert_to_i420(source, width, height):
+    """Returns an image path, BGR image or I420 frame as an I420 frame of the given size"""
+    # Only needed to build a cache, so bots that open an existing one never load OpenCV
+    import cv2
+    if isinstance(source, str):
+        path = source
+        source = cv2.imread(path)
+        if source is None:
+            raise IOError(f"Could not read image {path}")
+    if source.ndim == 2:
+        if source.shape != (height * 3 // 2, width):
+            raise ValueError(f"I420 frame has shape {source.shape}, expected {(height * 3 // 2, width)}")
+        return source
+    if source.shape[:2] != (height, width):
+        source = cv2.resize(source, (width, height), interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(source, cv2.COLOR_BGR2YUV_I420)
+
+class I420FrameCache:
+    """
+    Frames converted to I420 once and stored in a file that is memory mapped read only.
+    Every bot process on the machine that opens the same cache shares the same page cache
+    pages, so adding bots does not add frame memory, and only the first one pays for decoding
+    and converting the images.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self.memory = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.width, self.height, self.frame_count = I420_CACHE_HEADER.unpack_from(self.memory, 0)
+        if magic != I420_CACHE_MAGIC:
+            self.memory.close()
+            raise ValueError(f"{path} is not an I420 frame cache")
+        self.frame_size = self.width * self.height * 3 // 2
+        # One read only array over the whole mapping; frames are views into it, never copies
+        self.frames = np.frombuffer(self.memory, dtype=np.uint8, count=self.frame_count * self.frame_size, offset=I420_CACHE_DATA_OFFSET).reshape(self.frame_count, self.height * 3 // 2, self.width)
+
+    @classmethod
+    def open(cls, name, sources, width, height, cache_dir="sample_program/out/media_cache"):
+        """Opens the cache for these sources at this size, building it first if no process has yet"""
+        path = os.path.join(cache_dir, f"{name}_{width}x{height}_{source_fingerprint(sources, width, height)}.i420")
+        if not os.path.exists(path):
+            os.makedirs(cache_dir, exist_ok=True)
+            # Written to a temporary file and renamed, so concurrent bots never map a partial cache
+            fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    header = I420_CACHE_HEADER.pack(I420_CACHE_MAGIC, width, height, len(sources))
+                    file.write(header.ljust(I420_CACHE_DATA_OFFSET, b"\0"))
+                    for source in sources:
+                        file.write(convert_to_i420(source, width, height))
+                os.replace(temp_path, path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        return cls(path)
+
+    def __len__(self):
+        return self.frame_count
+
+    def __getitem__(self, index):
+        return self.frames[index]
+
+    def close(self):
+        self.frames = None
+        self.memory.close()
+
+class PacedFrameSender:
+    """
+    Sends cached frames in a loop at a fixed rate from the GLib main loop. Each send is
+    scheduled against an absolute time.monotonic() deadline rather than a repeating
+    timeout, so timer and send latency do not accumulate as drift. When the loop falls
+    more than one frame behind, the missed slots are skipped and counted instead of being
+    sent in a burst.
+    """
+    def __init__(self, frames, send_frame, fps):
+        self.frames = frames
+        self.send_frame = send_frame
+        self.interval = 1 / fps
+        self.index = 0
+        self.next_send_at = None
+        self.timeout_id = None
+        self.sent = 0
+        self.skipped = 0
+        self.max_lateness = 0
+
+    def start(self):
+        if self.timeout_id is None:
+            self.next_send_at = time.monotonic()
+            self.timeout_id = GLib.idle_add(self.tick)
+
+    def stop(self):
+        if self.timeout_id is not None:
+            GLib.source_remove(self.timeout_id)
+            self.timeout_id = None
+
+    def schedule(self):
+        delay_ms = max(0, round((self.next_send_at - time.monotonic()) * 1000))
+        self.timeout_id = GLib.timeout_add(delay_ms, self.tick)
+
+    def tick(self):
+        now = time.monotonic()
+        lateness = now - self.next_send_at
+        self.max_lateness = max(self.max_lateness, lateness)
+        if lateness >= self.interval:
+            missed = int(lateness / self.interval)
+            self.skipped += missed
+            self.index = (self.index + missed) % len(self.frames)
+            self.next_send_at += missed * self.interval
+
+        if not self.send_frame(self.frames[self.index]):
+            self.timeout_id = None
+            return False
+        self.sent += 1
+        self.index = (self.index + 1) % len(self.frames)
+        self.next_send_at += self.interval
+        self.schedule()
+        # The next tick runs from the new one-shot timeout
+        return False
+
+    def stats(self):
+        return {"sent": self.sent, "skipped": self.skipped, "max_lateness_ms": self.max_lateness * 1000}
@@ -1,17 +1,30 @@
 import zoom_meeting_sdk as zoom
 import jwt
-from deepgram_transcriber import DeepgramTranscriber
+from latency_tracer import LatencyTracer
+from callback_performance import CallbackPerformanceExporter
+from audio_source import PacedAudioSource, pcm_file_chunks
+from video_subscriptions import ActiveSpeakerRendererPool
+from startup_timeline import StartupTimeline
+from bot_log import get_logger
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+import importlib
 import os
 
-import cv2
-import numpy as np
+# cv2, numpy, the Deepgram SDK and the video modules that need them are imported where they
+# are used, so a bot without video or transcription never loads them
 import gi
 gi.require_version('GLib', '2.0')
 from gi.repository import GLib
+
+# Callbacks log through this rather than print, so a slow reader of stdout never blocks an SDK thread
+log = get_logger()
+
 def save_yuv420_frame_as_png(frame_bytes, width, height, output_path):
+    import cv2
+    import numpy as np
     try:
-        # Convert bytes to numpy array
+        # View the frame as a numpy array (no copy for bytes or YUVRawDataI420 views)
         yuv_data = np.frombuffer(frame_bytes, dtype=np.uint8)
 
         # Reshape into I420 format with U/V planes
@@ -44,7 +57,7 @@ def normalized_rms_audio(pcm_data: bytes, sample_width: int = 2) -> bool:
     Determine if PCM audio data contains significant audio or is essentially silence.
 
     Args:
-        pcm_data: Bytes object containing PCM audio data in linear16 format
+        pcm_data: Bytes-like object (e.g. AudioRawData) containing PCM audio data in linear16 format
         threshold: RMS amplitude threshold below which audio is considered silent (0.0 to 1.0)
         sample_width: Number of bytes per sample (2 for linear16)
 
@@ -54,10 +67,8 @@ def normalized_rms_audio(pcm_data: bytes, sample_width: int = 2) -> bool:
     if len(pcm_data) == 0:
         return True
 
-    # Convert bytes to 16-bit integers
-    import array
-    samples = array.array('h')  # signed short integer array
-    samples.frombytes(pcm_data)
+    # View the bytes as 16-bit integers without copying them
+    samples = memoryview(pcm_data).cast('h')
 
     # Calculate RMS amplitude
     sum_squares = sum(sample * sample for sample in samples)
@@ -70,18 +81,26 @@ def normalized_rms_audio(pcm_data: bytes, sample_width: int = 2) -> bool:
     return normalized_rms
 
 def create_red_yuv420_frame(width=640, height=360):
-    # Create BGR frame (red is [0,0,255] in BGR)
-    bgr_frame = np.zeros((height, width, 3), dtype=np.uint8)
-    bgr_frame[:, :] = [0, 0, 255]  # Pure red in BGR
+    import numpy as np
 
-    # Convert BGR to YUV420 (I420)
-    yuv_frame = cv2.cvtColor(bgr_frame, cv2.COLOR_BGR2YUV_I420)
+    # Pure red as I420, the values cv2.cvtColor(..., cv2.COLOR_BGR2YUV_I420) gives, filled
+    # in plane by plane so the virtual camera never has to load OpenCV
+    yuv_frame = np.empty((height * 3 // 2, width), dtype=np.uint8)
+    yuv_frame[:height] = 82
+    yuv_frame[height:height * 5 // 4] = 90
+    yuv_frame[height * 5 // 4:] = 240
 
-    # Return as bytes
-    return yuv_frame.tobytes()
+    # The senders accept any contiguous buffer, so the array is sent without converting it to bytes
+    return yuv_frame
 
 class MeetingBot:
-    def __init__(self):
+    def __init__(self, startup_timeline=None):
+        self.startup_timeline = startup_timeline or StartupTimeline()
+        self.startup_executor = None
+        self.jwt_future = None
+        self.deepgram_future = None
+        # Set by the runner to the GLibEventLoop that runs both the SDK's GLib sources and asyncio tasks
+        self.event_loop = None
 
         self.meeting_service = None
         self.setting_service = None
@@ -93,35 +112,55 @@ class MeetingBot:
 
         self.audio_source = None
         self.audio_helper = None
+        # When set, one-way audio is coalesced natively and delivered to Python once per interval
+        self.audio_batch_interval_ms = int(os.environ.get('AUDIO_BATCH_INTERVAL_MS', '0'))
+        # When set, audio is also written to this shared memory ring for sample_program/audio_ring_reader.py
+        self.audio_shared_memory_ring = os.environ.get('AUDIO_SHARED_MEMORY_RING')
+        self.audio_shared_memory_sink = None
 
         self.audio_settings = None
 
         self.use_audio_recording = True
         self.use_video_recording = os.environ.get('RECORD_VIDEO') == 'true'
 
+        self.collect_performance_data = os.environ.get('COLLECT_PERFORMANCE_DATA', 'true') == 'true'
+        self.performance_exporter = CallbackPerformanceExporter(interval_seconds=int(os.environ.get('PERFORMANCE_EXPORT_INTERVAL_SECONDS', '60')))
+
         self.reminder_controller = None
 
         self.recording_ctrl = None
         self.audio_ctrl = None
         self.audio_ctrl_event = None
         self.audio_raw_data_sender = None
+        self.mic_audio_source = None
         self.virtual_audio_mic_event_passthrough = None
 
-        self.deepgram_transcriber = DeepgramTranscriber()
+        self.latency_tracer = LatencyTracer()
+        self.deepgram_transcriber = None
+        self.meeting_records = None
+        self.meeting_notes = None
+        self.transcript_index = None
+        # When MEDIA_CAPTURE_PATH is set, the callback stream is recorded for sample_program/media_capture.py to replay
+        self.media_capture = None
 
         self.my_participant_id = None
         self.other_participant_id = None
         self.participants_ctrl = None
         self.meeting_reminder_event = None
-        self.audio_print_counter = 0
 
-        self.video_helper = None
-        self.renderer_delegate = None
-        self.video_frame_counter = 0
+        self.video_renderer_pool = None
+        self.video_capture = None
+        self.video_recorder = None
+
+        self.share_renderer_delegate = None
+        self.share_renderer = None
+        self.share_capture = None
+        self.other_share_source_id = None
 
         self.meeting_video_controller = None
         self.video_sender = None
         self.virtual_camera_video_source = None
+        self.virtual_camera_pacer = None
         self.video_source_helper = None
 
         self.meeting_sharing_controller = None
@@ -132,6 +171,7 @@ class MeetingBot:
         self.share_audio_renderer_delegate = None
         self.share_video_sender = None
         self.share_audio_sender = None
+        self.share_video_pacer = None
 
         self.chat_ctrl = None
         self.chat_ctrl_event = None
@@ -140,6 +180,13 @@ class MeetingBot:
         self.bo_ctrl_event = None
 
     def cleanup(self):
+        # Emits what was reached if the bot never got as far as receiving audio
+        self.startup_timeline.emit()
+
+        if self.collect_performance_data:
+            self.performance_exporter.stop()
+            self.performance_exporter.export()
+
         if self.meeting_service:
             zoom.DestroyMeetingService(self.meeting_service)
             print("Destroyed Meeting service")
@@ -150,18 +197,85 @@ class MeetingBot:
             zoom.DestroyAuthService(self.auth_service)
             print("Destroyed Auth service")
 
+        if self.audio_source and self.audio_batch_interval_ms > 0:
+            self.audio_source.flushAudioBatch()
+
+        if self.audio_shared_memory_sink:
+            print(f"Audio ring {self.audio_shared_memory_sink.getName()}: {self.audio_shared_memory_sink.getWrittenChunks()} chunks written, {self.audio_shared_memory_sink.getDroppedChunks()} dropped as overruns")
+            # The process ends with os._exit, so the sink's destructor would never remove the segment
+            self.audio_shared_memory_sink.unlink()
+
         if self.audio_helper:
             audio_helper_unsubscribe_result = self.audio_helper.unSubscribe()
             print("audio_helper.unSubscribe() returned", audio_helper_unsubscribe_result)
 
-        if self.video_helper:
-            video_helper_unsubscribe_result = self.video_helper.unSubscribe()
-            print("video_helper.unSubscribe() returned", video_helper_unsubscribe_result)
+        if self.video_renderer_pool:
+            self.video_renderer_pool.stop()
+
+        if self.mic_audio_source:
+            self.mic_audio_source.cancel()
+
+        if self.share_video_pacer:
+            self.share_video_pacer.stop()
+
+        if self.virtual_camera_pacer:
+            self.virtual_camera_pacer.stop()
+
+        if self.share_renderer:
+            share_renderer_unsubscribe_result = self.share_renderer.unSubscribe()
+            print("share_renderer.unSubscribe() returned", share_renderer_unsubscribe_result)
+
+        if self.video_capture:
+            self.video_capture.stop()
+
+        if self.share_capture:
+            self.share_capture.stop()
+
+        if self.video_recorder:
+            self.video_recorder.stop()
+
+        if self.meeting_notes:
+            # Scores are kept current during the meeting, so this is only a final rescore and a file write
+            # Named after the meeting, so bots running side by side do not overwrite each other's notes
+            self.meeting_notes.write(f"sample_program/out/meeting_notes_{os.environ.get('MEETING_ID')}.md")
+            if self.meeting_records:
+                self.meeting_records.add("notes", **self.meeting_notes.notes())
+
+        if self.transcript_index:
+            self.transcript_index.close()
+
+        if self.media_capture:
+            self.media_capture.close()
+
+        if self.meeting_records:
+            self.meeting_records.stop()
+            print(f"Meeting records: {self.meeting_records.stats()}")
 
         print("CleanUPSDK() called")
         zoom.CleanUPSDK()
         print("CleanUPSDK() finished")
 
+        self.dump_latency_histograms()
+        # The runner exits with os._exit, so queued records are written now
+        log.close()
+
+    def run_async(self, coroutine):
+        """
+        Schedules a coroutine, such as an async transcription, upload or IPC sink, on the bot's
+        event loop. Safe to call from SDK callback threads; returns a concurrent.futures.Future,
+        or None when no event loop is running.
+        """
+        if self.event_loop is None or self.event_loop.is_closed():
+            coroutine.close()
+            print("Error: no event loop to run coroutine on")
+            return None
+        return self.event_loop.post_coroutine(coroutine)
+
+    def dump_latency_histograms(self, path="sample_program/out/latency_histograms.json"):
+        print(self.latency_tracer.format())
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.latency_tracer.dump(path)
+
     def init(self):
         if os.environ.get('MEETING_ID') is None:
             raise Exception('No MEETING_ID found in environment. Please define this in a .env file located in the repository root')
@@ -172,6 +286,8 @@ class MeetingBot:
         if os.environ.get('ZOOM_APP_CLIENT_SECRET') is None:
             raise Exception('No ZOOM_APP_CLIENT_SECRET found in environment. Please define this in a .env file located in the repository root')
 
+        self.start_background_startup()
+
         init_param = zoom.InitParam()
 
         init_param.strWebDomain = "https://zoom.us"
@@ -183,83 +299,187 @@ class MeetingBot:
         init_sdk_result = zoom.InitSDK(init_param)
         if init_sdk_result != zoom.SDKERR_SUCCESS:
             raise Exception('InitSDK failed')
+        self.startup_timeline.mark("init_sdk")
 
         self.create_services()
 
+    def start_background_startup(self):
+        """Starts start-up work that does not need the SDK, so it overlaps with InitSDK, auth and join"""
+        self.startup_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="startup")
+
+        def make_jwt():
+            token = generate_jwt(os.environ.get('ZOOM_APP_CLIENT_ID'), os.environ.get('ZOOM_APP_CLIENT_SECRET'))
+            self.startup_timeline.mark("jwt_ready")
+            return token
+        self.jwt_future = self.startup_executor.submit(make_jwt)
+
+        if os.environ.get('MEETING_RECORDS_URL'):
+            self.meeting_records = self.create_meeting_records()
+
+        if os.environ.get('DEEPGRAM_API_KEY'):
+            def connect_transcriber():
+                if os.environ.get('TRANSCRIPT_INDEX_DIR'):
+                    self.transcript_index = self.create_transcript_index(os.environ.get('TRANSCRIPT_INDEX_DIR'))
+                if os.environ.get('MEETING_NOTES', 'true') == 'true':
+                    from meeting_notes import MeetingNotesEngine
+                    self.meeting_notes = MeetingNotesEngine(top_k=int(os.environ.get('MEETING_NOTES_TOP_K', '8')))
+                from deepgram_transcriber import DeepgramTranscriber
+                transcriber = DeepgramTranscriber(latency_tracer=self.latency_tracer, on_transcript=self.on_transcript)
+                self.startup_timeline.mark("transcriber_ready")
+                return transcriber
+            self.deepgram_future = self.startup_executor.submit(connect_transcriber)
+            # Attached from the GLib thread once ready, so joining never waits on Deepgram
+            self.deepgram_future.add_done_callback(lambda future: GLib.idle_add(self.attach_transcriber, future))
+
+        # Warm the imports of the enabled video subsystems, which are otherwise first imported after joining
+        modules = ["media_source"]
+        if os.environ.get('VIDEO_CAPTURE_FORMAT') != 'none':
+            modules += ["video_capture", "scene_change"]
+        if self.use_video_recording:
+            modules.append("video_recorder")
+        self.startup_executor.submit(lambda: [importlib.import_module(module) for module in modules])
+        self.startup_executor.shutdown(wait=False)
+
+    def attach_transcriber(self, future):
+        """GLib idle callback; a transcriber that failed to start leaves the bot running without one"""
+        try:
+            self.deepgram_transcriber = future.result()
+        except Exception as e:
+            log.error("transcriber_disabled", error=str(e))
+        return False
+
+    def create_meeting_records(self):
+        from meeting_records import HttpBatchSender, MeetingRecordClient
+        sender = HttpBatchSender(os.environ.get('MEETING_RECORDS_URL'), api_key=os.environ.get('MEETING_RECORDS_API_KEY'))
+        meeting_records = MeetingRecordClient(
+            sender,
+            spool_path=os.environ.get('MEETING_RECORDS_SPOOL_PATH'),
+            meeting_id=os.environ.get('MEETING_ID'),
+            batch_size=int(os.environ.get('MEETING_RECORDS_BATCH_SIZE', '100')),
+            flush_interval_seconds=float(os.environ.get('MEETING_RECORDS_FLUSH_INTERVAL_SECONDS', '2')),
+        )
+        GLib.timeout_add_seconds(60, meeting_records.report)
+        return meeting_records
+
+    def create_transcript_index(self, root):
+        """
+        Concurrent bots share TRANSCRIPT_INDEX_DIR, and an index has a single writer, so each
+        bot writes its own directory named after the meeting; TranscriptIndexReader searches them all
+        """
+        from transcript_index import TranscriptIndex
+        name = os.environ.get('MEETING_ID') or str(os.getpid())
+        for directory in (os.path.join(root, name), os.path.join(root, f"{name}-{os.getpid()}")):
+            try:
+                return TranscriptIndex(directory)
+            except IOError as e:
+                # Another bot in the same meeting has the directory; fall back to one of our own
+                print(f"Error: {e}")
+        print("Error: transcript indexing disabled")
+        return None
+
+    def speaker_name(self, node_id):
+        if node_id is None or self.participants_ctrl is None:
+            return None
+        user = self.participants_ctrl.GetUserByUserID(node_id)
+        return user.GetUserName() if user else str(node_id)
+
+    def on_transcript(self, text, start, end, node_id=None):
+        speaker = self.speaker_name(node_id)
+        if self.meeting_notes:
+            for item in self.meeting_notes.add_segment(text, start=start, end=end, speaker=speaker):
+                print(f"Action item: {item['text']}")
+        if self.transcript_index:
+            self.transcript_index.add(os.environ.get('MEETING_ID'), text, start=start, end=end, speaker=speaker)
+        if self.meeting_records:
+            self.meeting_records.add_transcript(text, start=start, end=end, speaker=speaker)
+
     def on_user_join_callback(self, joined_user_ids, user_name):
-        print("on_user_join_callback called. joined_user_ids =", joined_user_ids, "user_name =", user_name)
+        log.info("user_join", user_ids=joined_user_ids, user_name=user_name)
+        if self.media_capture:
+            self.media_capture.record_user_join(joined_user_ids, user_name)
 
     def on_sharing_status_callback(self, share_info):
-        print(
-            f"on_sharing_status_callback called. ",
-            f"userid = {share_info.userid} ",
-            f"shareSourceID = {share_info.shareSourceID} ",
-            f"status = {share_info.status} ",
-            f"contentType = {share_info.contentType} ",
-            f"isShowingInFirstView = {share_info.isShowingInFirstView} ",
-            f"isShowingInSecondView = {share_info.isShowingInSecondView} ",
+        if self.media_capture:
+            self.media_capture.record_share_status(share_info.status, share_info.userid, share_info.shareSourceID)
+        self.log_share_info("sharing_status", share_info)
+        if share_info.status == zoom.Sharing_Other_Share_Begin:
+            self.other_share_source_id = share_info.shareSourceID
+            self.subscribe_share_renderer()
+        elif share_info.status == zoom.Sharing_Other_Share_End and share_info.shareSourceID == self.other_share_source_id:
+            self.other_share_source_id = None
+            if self.share_renderer:
+                log.info("share_renderer_unsubscribe", rate_per_second=1, burst=5, result=self.share_renderer.unSubscribe())
+
+    @staticmethod
+    def log_share_info(event, share_info):
+        log.info(
+            event,
+            rate_per_second=5,
+            burst=10,
+            userid=share_info.userid,
+            share_source_id=share_info.shareSourceID,
+            status=share_info.status,
+            content_type=share_info.contentType,
+            showing_in_first_view=share_info.isShowingInFirstView,
+            showing_in_second_view=share_info.isShowingInSecondView,
         )
 
+    def subscribe_share_renderer(self):
+        if self.share_renderer is None or self.other_share_source_id is None:
+            return
+        subscribe_result = self.share_renderer.subscribe(self.other_share_source_id, zoom.ZoomSDKRawDataType.RAW_DATA_TYPE_SHARE)
+        log.info("share_renderer_subscribe", rate_per_second=1, burst=5, share_source_id=self.other_share_source_id, result=subscribe_result)
+
     def on_failed_to_start_share_callback(self):
-        print("on_failed_to_start_share_callback called")
+        log.error("share_start_failed", rate_per_second=1, burst=5)
 
     def on_share_content_notification_callback(self, share_info):
-        print(
-            f"on_share_content_notification_callback called. ",
-            f"userid = {share_info.userid} ",
-            f"shareSourceID = {share_info.shareSourceID} ",
-            f"status = {share_info.status} ",
-            f"contentType = {share_info.contentType} ",
-            f"isShowingInFirstView = {share_info.isShowingInFirstView} ",
-            f"isShowingInSecondView = {share_info.isShowingInSecondView} ",
-        )
+        self.log_share_info("share_content_notification", share_info)
 
     def on_share_setting_type_changed_notification_callback(self, share_setting_type):
-        print("on_share_setting_type_changed_notification_callback called. share_setting_type =", share_setting_type)
+        log.info("share_setting_type_changed", rate_per_second=1, burst=5, share_setting_type=share_setting_type)
 
     def on_shared_video_ended_callback(self):
-        print("on_shared_video_ended_callback called")
+        log.info("shared_video_ended", rate_per_second=1, burst=5)
 
     def on_video_file_share_play_error_callback(self, error):
-        print("on_video_file_share_play_error_callback called. error =", error)
+        log.error("video_file_share_play_error", rate_per_second=1, burst=5, error=error)
 
     def on_optimizing_share_for_video_clip_status_changed_callback(self, share_info):
-        print(
-            f"on_optimizing_share_for_video_clip_status_changed_callback called. ",
-            f"userid = {share_info.userid} ",
-            f"shareSourceID = {share_info.shareSourceID} ",
-            f"status = {share_info.status} ",
-            f"contentType = {share_info.contentType} ",
-            f"isShowingInFirstView = {share_info.isShowingInFirstView} ",
-            f"isShowingInSecondView = {share_info.isShowingInSecondView} ",
-        )
+        self.log_share_info("optimizing_share_for_video_clip_status", share_info)
 
     # NOTE: content will always be None use chat_msg_info.GetContent() instead
     def on_chat_msg_notification_callback(self, chat_msg_info, content):
-        print("\n=== on_chat_msg_notification called ===")
-        print(f"Message ID: {chat_msg_info.GetMessageID()}")
-        print(f"Sender ID: {chat_msg_info.GetSenderUserId()}")
-        print(f"Sender Name: {chat_msg_info.GetSenderDisplayName()}")
-        print(f"Receiver ID: {chat_msg_info.GetReceiverUserId()}")
-        print(f"Receiver Name: {chat_msg_info.GetReceiverDisplayName()}")
-        print(f"Content: {chat_msg_info.GetContent()}")
-        print(f"Timestamp: {chat_msg_info.GetTimeStamp()}")
-        print(f"Message Type: {chat_msg_info.GetChatMessageType()}")
-        print(f"Is Chat To All: {chat_msg_info.IsChatToAll()}")
-        print(f"Is Chat To All Panelist: {chat_msg_info.IsChatToAllPanelist()}")
-        print(f"Is Chat To Waitingroom: {chat_msg_info.IsChatToWaitingroom()}")
-        print(f"Is Comment: {chat_msg_info.IsComment()}")
-        print(f"Is Thread: {chat_msg_info.IsThread()}")
-        print(f"Thread ID: {chat_msg_info.GetThreadID()}")
-        print("=====================\n")
+        # Each getter is a separate binding call, so only the fields that are kept are read, once each
+        sender_name = chat_msg_info.GetSenderDisplayName()
+        message = chat_msg_info.GetContent()
+        log.info("chat_message", rate_per_second=5, burst=20, sender_name=sender_name, content=message)
+        if self.meeting_records:
+            self.meeting_records.add_chat(
+                message_id=chat_msg_info.GetMessageID(),
+                sender_id=chat_msg_info.GetSenderUserId(),
+                sender_name=sender_name,
+                content=message,
+                timestamp=chat_msg_info.GetTimeStamp(),
+                to_all=chat_msg_info.IsChatToAll(),
+            )
 
     def on_has_attendee_rights_notification(self, attendee):
-        print("on_has_attendee_rights_notification called. attendee =", attendee)
         join_bo_result = attendee.JoinBo()
-        print("called JoinBo(). join_bo_result =", join_bo_result)
+        log.info("breakout_room_join", rate_per_second=1, burst=5, result=join_bo_result)
 
     def on_join(self):
-        self.meeting_reminder_event = zoom.MeetingReminderEventCallbacks(onReminderNotifyCallback=self.on_reminder_notify)
+        if self.collect_performance_data:
+            self.performance_exporter.start()
+
+        if os.environ.get('MEDIA_CAPTURE_PATH'):
+            from media_capture import MediaCaptureWriter
+            try:
+                self.media_capture = MediaCaptureWriter(os.environ.get('MEDIA_CAPTURE_PATH'), video_fps=float(os.environ.get('MEDIA_CAPTURE_VIDEO_FPS', '0')))
+            except IOError as e:
+                log.error("media_capture_disabled", error=str(e))
+
+        self.meeting_reminder_event = zoom.MeetingReminderEventCallbacks(onReminderNotifyCallback=self.on_reminder_notify, collectPerformanceData=self.collect_performance_data)
         self.reminder_controller = self.meeting_service.GetMeetingReminderController()
         self.reminder_controller.SetEvent(self.meeting_reminder_event)
 
@@ -267,29 +487,33 @@ class MeetingBot:
             self.recording_ctrl = self.meeting_service.GetMeetingRecordingController()
 
             def on_recording_privilege_changed(can_rec):
-                print("on_recording_privilege_changed called. can_record =", can_rec)
+                log.info("recording_privilege_changed", rate_per_second=1, burst=5, can_record=can_rec)
                 if can_rec:
                     GLib.timeout_add_seconds(1, self.start_raw_recording)
                 else:
                     self.stop_raw_recording()
 
-            self.recording_event = zoom.MeetingRecordingCtrlEventCallbacks(onRecordPrivilegeChangedCallback=on_recording_privilege_changed)
+            self.recording_event = zoom.MeetingRecordingCtrlEventCallbacks(onRecordPrivilegeChangedCallback=on_recording_privilege_changed, collectPerformanceData=self.collect_performance_data)
             self.recording_ctrl.SetEvent(self.recording_event)
 
             GLib.timeout_add_seconds(1, self.start_raw_recording)
 
         self.participants_ctrl = self.meeting_service.GetMeetingParticipantsController()
-        self.participants_ctrl_event = zoom.MeetingParticipantsCtrlEventCallbacks(onUserJoinCallback=self.on_user_join_callback)
+        self.participants_ctrl_event = zoom.MeetingParticipantsCtrlEventCallbacks(onUserJoinCallback=self.on_user_join_callback, collectPerformanceData=self.collect_performance_data)
         self.participants_ctrl.SetEvent(self.participants_ctrl_event)
         self.my_participant_id = self.participants_ctrl.GetMySelfUser().GetUserID()
 
         participant_ids_list = self.participants_ctrl.GetParticipantsList()
-        print("participant_ids_list", participant_ids_list)
         for participant_id in participant_ids_list:
             if participant_id != self.my_participant_id:
                 self.other_participant_id = participant_id
                 break
-        print("other_participant_id", self.other_participant_id)
+        log.info("participants", participant_ids=participant_ids_list, other_participant_id=self.other_participant_id)
+        # Participants already in the meeting, so a replay knows every node id's name
+        if self.media_capture:
+            for participant_id in participant_ids_list:
+                user = self.participants_ctrl.GetUserByUserID(participant_id)
+                self.media_capture.record_user_join([participant_id], user.GetUserName() if user else None)
 
         self.meeting_sharing_controller = self.meeting_service.GetMeetingShareController()
         self.meeting_share_ctrl_event = zoom.MeetingShareCtrlEventCallbacks(
@@ -299,17 +523,17 @@ class MeetingBot:
             onShareSettingTypeChangedNotificationCallback=self.on_share_setting_type_changed_notification_callback,
             onSharedVideoEndedCallback=self.on_shared_video_ended_callback,
             onVideoFileSharePlayErrorCallback=self.on_video_file_share_play_error_callback,
-            onOptimizingShareForVideoClipStatusChangedCallback=self.on_optimizing_share_for_video_clip_status_changed_callback
+            onOptimizingShareForVideoClipStatusChangedCallback=self.on_optimizing_share_for_video_clip_status_changed_callback,
+            collectPerformanceData=self.collect_performance_data
         )
         self.meeting_sharing_controller.SetEvent(self.meeting_share_ctrl_event)
         viewable_sharing_user_list = self.meeting_sharing_controller.GetViewableSharingUserList()
-        print("viewable_sharing_user_list", viewable_sharing_user_list)
         for user_id in viewable_sharing_user_list:
             sharing_info_list_for_user = self.meeting_sharing_controller.GetSharingSourceInfoList(user_id)
-            print("sharing_info_list_for_user", user_id, " = ", sharing_info_list_for_user)
+            log.info("viewable_sharing_user", user_id=user_id, sharing_info=sharing_info_list_for_user)
 
         self.audio_ctrl = self.meeting_service.GetMeetingAudioController()
-        self.audio_ctrl_event = zoom.MeetingAudioCtrlEventCallbacks(onUserAudioStatusChangeCallback=self.on_user_audio_status_change_callback, onUserActiveAudioChangeCallback=self.on_user_active_audio_change_callback)
+        self.audio_ctrl_event = zoom.MeetingAudioCtrlEventCallbacks(onUserAudioStatusChangeCallback=self.on_user_audio_status_change_callback, onUserActiveAudioChangeCallback=self.on_user_active_audio_change_callback, collectPerformanceData=self.collect_performance_data)
         self.audio_ctrl.SetEvent(self.audio_ctrl_event)
         # Raw audio input got borked in the Zoom SDK after 6.3.5.
         # This is work-around to get it to work again.
@@ -317,12 +541,13 @@ class MeetingBot:
         self.audio_ctrl.JoinVoip()
 
         self.chat_ctrl = self.meeting_service.GetMeetingChatController()
-        self.chat_ctrl_event = zoom.MeetingChatEventCallbacks(onChatMsgNotificationCallback=self.on_chat_msg_notification_callback)
+        self.chat_ctrl_event = zoom.MeetingChatEventCallbacks(onChatMsgNotificationCallback=self.on_chat_msg_notification_callback, collectPerformanceData=self.collect_performance_data)
         self.chat_ctrl.SetEvent(self.chat_ctrl_event)
 
         self.bo_ctrl = self.meeting_service.GetMeetingBOController()
         self.bo_ctrl_event = zoom.MeetingBOEventCallbacks(
-            onHasAttendeeRightsNotificationCallback=self.on_has_attendee_rights_notification
+            onHasAttendeeRightsNotificationCallback=self.on_has_attendee_rights_notification,
+            collectPerformanceData=self.collect_performance_data
         )
         self.bo_ctrl.SetEvent(self.bo_ctrl_event)
 
@@ -333,88 +558,150 @@ class MeetingBot:
         builder.SetMessageType(zoom.SDKChatMessageType.To_All)
         msg = builder.Build()
         send_result = self.chat_ctrl.SendChatMsgTo(msg)
-        print("send_result =", send_result)
+        log.info("welcome_chat_sent", result=send_result)
         builder.Clear()
 
     def on_user_active_audio_change_callback(self, user_ids):
-        print("on_user_active_audio_change_callback called. user_ids =", user_ids)
+        log.info("active_audio_change", rate_per_second=2, burst=5, user_ids=user_ids)
+        if self.media_capture:
+            self.media_capture.record_active_speakers(user_ids)
+        if self.video_renderer_pool:
+            self.video_renderer_pool.on_active_speakers(user_ids)
 
     def on_user_audio_status_change_callback(self, user_audio_statuses, otherstuff):
-        print("on_user_audio_status_change_callback called. user_audio_statuses =", user_audio_statuses, "otherstuff =", otherstuff)
+        log.info("user_audio_status_change", rate_per_second=2, burst=5, user_audio_statuses=user_audio_statuses, other=otherstuff)
 
     def on_mic_initialize_callback(self, sender):
-        print("on_mic_initialize_callback called")
+        log.info("mic_initialized", rate_per_second=1, burst=5)
         self.audio_raw_data_sender = sender
 
     def on_mic_start_send_callback(self):
-        print("on_mic_start_send_callback called")
-        audio_path = 'sample_program/input_audio/test_audio_16778240.pcm'
+        log.info("mic_start_send", rate_per_second=1, burst=5)
+        audio_path = os.environ.get('MIC_AUDIO_PATH', 'sample_program/input_audio/test_audio_16778240.pcm')
         if not os.path.exists(audio_path):
-            print(f"Audio file not found: {audio_path}")
+            log.error("audio_file_not_found", rate_per_second=1, burst=5, path=audio_path)
             return
 
-        with open(audio_path, 'rb') as pcm_file:
-            chunk = pcm_file.read(64000*10)
-            self.audio_raw_data_sender.send(chunk, 32000, zoom.ZoomSDKAudioChannel_Mono)
+        # Streamed from disk in 20 ms chunks at real time, so clip length does not affect memory
+        sample_rate = 32000
+        def send_chunk(chunk):
+            sender = self.audio_raw_data_sender
+            return sender is not None and sender.send(chunk, sample_rate, zoom.ZoomSDKAudioChannel_Mono) == zoom.SDKERR_SUCCESS
+
+        if self.mic_audio_source:
+            self.mic_audio_source.cancel()
+        self.mic_audio_source = PacedAudioSource(
+            pcm_file_chunks(audio_path, PacedAudioSource.chunk_bytes(sample_rate)),
+            send_chunk,
+            sample_rate=sample_rate,
+            on_finished=lambda source: log.info("mic_audio_finished", **source.stats()),
+        )
+        self.mic_audio_source.start()
+
+    def on_mic_stop_send_callback(self):
+        log.info("mic_stop_send", rate_per_second=1, burst=5)
+        if self.mic_audio_source:
+            self.mic_audio_source.cancel()
+            self.mic_audio_source = None
+
+    def mark_first_audio(self):
+        self.startup_timeline.mark("first_audio_chunk")
+        self.startup_timeline.emit()
 
     def on_one_way_audio_raw_data_received_callback(self, data, node_id):
+        if not self.startup_timeline.emitted:
+            self.mark_first_audio()
+        if self.media_capture:
+            self.media_capture.record_audio(data, node_id)
+        tag = self.latency_tracer.tag(data.GetTimeStamp(), node_id)
         if os.environ.get('DEEPGRAM_API_KEY') is None:
-            volume = normalized_rms_audio(data.GetBuffer())
-            if self.audio_print_counter % 20 < 2 and volume > 0.01:
-                print("Received audio from user", self.participants_ctrl.GetUserByUserID(node_id).GetUserName(), "with volume", volume,"and timestamp", data.GetTimeStamp())
-                print("To get transcript add DEEPGRAM_API_KEY to the .env file")
-            self.audio_print_counter += 1
+            self.log_audio_volume(data, node_id, data.GetTimeStamp())
             return
 
         if node_id != self.my_participant_id:
-            self.write_to_deepgram(data)
+            self.write_to_deepgram(data, tag)
+
+    def log_audio_volume(self, data, node_id, timestamp):
+        # Rate limited before the volume is computed, so chunks that would not be logged cost nothing
+        if not log.allow("audio_volume", rate_per_second=2, burst=2):
+            return
+        volume = normalized_rms_audio(data)
+        if volume > 0.01:
+            user = self.participants_ctrl.GetUserByUserID(node_id)
+            log.emit("audio_volume", node_id=node_id, user_name=user.GetUserName() if user else None, volume=volume, timestamp=timestamp, hint="To get transcript add DEEPGRAM_API_KEY to the .env file")
+
+    def on_one_way_audio_raw_data_batch_received_callback(self, batch):
+        if not self.startup_timeline.emitted:
+            self.mark_first_audio()
+        if self.media_capture:
+            self.media_capture.record_audio_batch(batch)
+        buffer = memoryview(batch)
+        # Each participant's first chunk, with when it reached the native delegate, so latency includes the batching delay
+        first_chunks = {}
+        for node_id, timestamp, arrival_ns in zip(batch.GetNodeIds().tolist(), batch.GetTimeStamps().tolist(), batch.GetArrivalTimes().tolist()):
+            first_chunks.setdefault(node_id, (timestamp, arrival_ns))
+
+        for node_id, offset, length in batch.GetNodeSegments():
+            segment = buffer[offset:offset + length]
+            timestamp, arrival_ns = first_chunks[node_id]
+            if os.environ.get('DEEPGRAM_API_KEY') is None:
+                self.log_audio_volume(segment, node_id, timestamp)
+                continue
+
+            if node_id != self.my_participant_id and self.deepgram_transcriber:
+                tag = self.latency_tracer.tag(timestamp, node_id, received_at=arrival_ns / 1e9)
+                try:
+                    self.deepgram_transcriber.send(bytes(segment), tag)
+                except Exception as e:
+                    log.error("transcriber_send_failed", rate_per_second=1, error=str(e))
+
+    def flush_expired_audio_batch(self):
+        """Delivers a batch whose interval has passed without new audio. Runs from a GLib timeout; returns False to stop it once audio is gone."""
+        if self.audio_source is None:
+            return False
+        self.audio_source.flushExpiredAudioBatch()
+        return True
 
     def on_share_video_start_send_callback(self, sender):
-        print("on_share_video_start_send_callback called, sender =", sender)
-        number_of_frames = 26
-        yuv_frames = []
-        for frame in range(number_of_frames):
-            frame_path = f"sample_program/input_frames/frame_{(frame+1):02d}.png"
-            # Let's resize the frame to 1280x720 to test the video quality
-            # at higher resolution
-            frame_cv = cv2.imread(frame_path)
-            frame_cv = cv2.resize(frame_cv, (1280, 720))
-
-            # Send in YUV420 format
-            frame_cv = cv2.cvtColor(frame_cv, cv2.COLOR_BGR2YUV_I420)
-            yuv_frames.append(frame_cv.tobytes())
+        log.info("share_video_start_send", rate_per_second=1, burst=5)
+        from media_source import I420FrameCache, PacedFrameSender
+        # Converted to 1280x720 I420 once per machine, then memory mapped by every bot
+        frame_paths = [f"sample_program/input_frames/frame_{(frame+1):02d}.png" for frame in range(26)]
+        share_frames = I420FrameCache.open("share", frame_paths, 1280, 720)
 
         self.share_video_sender = sender
 
-        def try_send_frame():
+        def try_send_frame(frame):
             if self.share_video_sender is None:
-                print("share_video_sender is None")
+                log.error("share_video_sender_missing", rate_per_second=1)
                 return False
-
-            # Shift the frame to the end of the list (circular buffer)
-            frame_bytes = yuv_frames.pop(0)
-            yuv_frames.append(frame_bytes)
-            result = self.share_video_sender.sendShareFrame(frame_bytes, 1280, 720, zoom.FrameDataFormat_I420_FULL)
+            result = self.share_video_sender.sendShareFrame(frame, share_frames.width, share_frames.height, zoom.FrameDataFormat_I420_FULL)
             if result != zoom.SDKERR_SUCCESS:
-                print(f"Failed to send frame: {result}")
+                log.error("share_frame_send_failed", rate_per_second=1, result=result)
                 return False
             return True
 
-        print(f"Sending frames every 200 milliseconds")
-        GLib.timeout_add(200, try_send_frame)
+        fps = float(os.environ.get('SHARE_FPS', '5'))
+        log.info("share_video_pacing_started", fps=fps)
+        self.share_video_pacer = PacedFrameSender(share_frames, try_send_frame, fps)
+        self.share_video_pacer.start()
 
     def on_share_video_stop_send_callback(self):
-        print("on_share_video_stop_send_callback called")
+        log.info("share_video_stop_send", rate_per_second=1, burst=5)
         self.share_video_sender = None
+        if self.share_video_pacer:
+            self.share_video_pacer.stop()
+            log.info("share_video_pacing", **self.share_video_pacer.stats())
+            self.share_video_pacer = None
 
     def on_share_audio_start_send_callback(self, sender):
-        print("on_share_audio_start_send_callback called, sender =", sender)
+        log.info("share_audio_start_send", rate_per_second=1, burst=5)
         self.share_audio_sender = sender
 
         audio_path = 'sample_program/input_audio/test_audio_16778240.pcm'
 
         if not os.path.exists(audio_path):
-            print(f"Audio file not found: {audio_path}")
+            log.error("audio_file_not_found", rate_per_second=1, burst=5, path=audio_path)
             return
 
         # Uncomment this to send audio as shared audio
@@ -423,31 +710,28 @@ class MeetingBot:
         #     self.audio_raw_data_sender.send(chunk, 32000, zoom.ZoomSDKAudioChannel_Mono)
 
     def on_share_audio_stop_send_callback(self):
-        print("on_share_audio_stop_send_callback called")
+        log.info("share_audio_stop_send", rate_per_second=1, burst=5)
         self.share_audio_sender = None
 
-    def write_to_deepgram(self, data):
+    def write_to_deepgram(self, data, tag=None):
+        # Audio that arrives before the transcriber has connected, or after it failed to, is not transcribed
+        if self.deepgram_transcriber is None:
+            return
         try:
+            # The transcriber keeps chunks for replay, so copy them out of the SDK buffer
             buffer_bytes = data.GetBuffer()
-            self.deepgram_transcriber.send(buffer_bytes)
-        except IOError as e:
-            print(f"Error: failed to open or write to audio file path: {path}. Error: {e}")
-            return
+            self.deepgram_transcriber.send(buffer_bytes, tag)
         except Exception as e:
-            print(f"Unexpected error occurred: {e}")
+            log.error("transcriber_send_failed", rate_per_second=1, error=str(e))
             return
 
     def write_to_file(self, path, data):
         try:
-            buffer_bytes = data.GetBuffer()
-
             with open(path, 'ab') as file:
-                file.write(buffer_bytes)
-        except IOError as e:
-            print(f"Error: failed to open or write to audio file path: {path}. Error: {e}")
-            return
+                # AudioRawData supports the buffer protocol, so this writes the SDK buffer without a copy
+                file.write(data)
         except Exception as e:
-            print(f"Unexpected error occurred: {e}")
+            log.error("audio_file_write_failed", rate_per_second=1, path=path, error=str(e))
             return
 
     def start_raw_recording(self):
@@ -456,82 +740,166 @@ class MeetingBot:
         can_start_recording_result = self.recording_ctrl.CanStartRawRecording()
         if can_start_recording_result != zoom.SDKERR_SUCCESS:
             self.recording_ctrl.RequestLocalRecordingPrivilege()
-            print("Requesting recording privilege.")
+            log.info("recording_privilege_requested", rate_per_second=1, burst=5, result=can_start_recording_result)
             return
 
         start_raw_recording_result = self.recording_ctrl.StartRawRecording()
         if start_raw_recording_result != zoom.SDKERR_SUCCESS:
-            print("Start raw recording failed.")
+            log.error("raw_recording_start_failed", rate_per_second=1, burst=5, result=start_raw_recording_result)
             return
 
         self.audio_helper = zoom.GetAudioRawdataHelper()
         if self.audio_helper is None:
-            print("audio_helper is None")
+            log.error("audio_helper_missing")
             return
 
         if self.audio_source is None:
-            self.audio_source = zoom.ZoomSDKAudioRawDataDelegateCallbacks(onOneWayAudioRawDataReceivedCallback=self.on_one_way_audio_raw_data_received_callback, collectPerformanceData=True)
+            if self.audio_shared_memory_ring:
+                self.audio_shared_memory_sink = zoom.AudioRawDataSharedMemorySink(self.audio_shared_memory_ring)
+                log.info("audio_shared_memory_ring", name=self.audio_shared_memory_sink.getName())
+            if self.audio_batch_interval_ms > 0:
+                self.audio_source = zoom.ZoomSDKAudioRawDataDelegateCallbacks(onOneWayAudioRawDataBatchReceivedCallback=self.on_one_way_audio_raw_data_batch_received_callback, audioBatchIntervalMilliseconds=self.audio_batch_interval_ms, sharedMemorySink=self.audio_shared_memory_sink, collectPerformanceData=self.collect_performance_data)
+                # A batch is otherwise only delivered when more audio arrives, which holds back the end of the last utterance
+                GLib.timeout_add(self.audio_batch_interval_ms, self.flush_expired_audio_batch)
+            else:
+                self.audio_source = zoom.ZoomSDKAudioRawDataDelegateCallbacks(onOneWayAudioRawDataReceivedCallback=self.on_one_way_audio_raw_data_received_callback, sharedMemorySink=self.audio_shared_memory_sink, collectPerformanceData=self.collect_performance_data)
 
         audio_helper_subscribe_result = self.audio_helper.subscribe(self.audio_source, False)
-        print("audio_helper_subscribe_result =",audio_helper_subscribe_result)
+        log.info("audio_helper_subscribe", result=audio_helper_subscribe_result)
 
-        self.virtual_audio_mic_event_passthrough = zoom.ZoomSDKVirtualAudioMicEventCallbacks(onMicInitializeCallback=self.on_mic_initialize_callback,onMicStartSendCallback=self.on_mic_start_send_callback)
+        self.virtual_audio_mic_event_passthrough = zoom.ZoomSDKVirtualAudioMicEventCallbacks(onMicInitializeCallback=self.on_mic_initialize_callback,onMicStartSendCallback=self.on_mic_start_send_callback, onMicStopSendCallback=self.on_mic_stop_send_callback, collectPerformanceData=self.collect_performance_data)
         audio_helper_set_external_audio_source_result = self.audio_helper.setExternalAudioSource(self.virtual_audio_mic_event_passthrough)
-        print("audio_helper_set_external_audio_source_result =", audio_helper_set_external_audio_source_result)
-
-        self.renderer_delegate = zoom.ZoomSDKRendererDelegateCallbacks(onRawDataFrameReceivedCallback=self.on_raw_data_frame_received_callback)
-        self.video_helper = zoom.createRenderer(self.renderer_delegate)
-
-        self.video_helper.setRawDataResolution(zoom.ZoomSDKResolution_720P)
-        subscribe_result = self.video_helper.subscribe(self.other_participant_id, zoom.ZoomSDKRawDataType.RAW_DATA_TYPE_VIDEO)
-        print("video_helper subscribe_result =", subscribe_result)
+        log.info("audio_helper_set_external_audio_source", result=audio_helper_set_external_audio_source_result)
+
+        if self.use_video_recording:
+            from video_recorder import SegmentedVideoRecorder
+            self.video_recorder = SegmentedVideoRecorder(
+                fps=int(os.environ.get('VIDEO_RECORDING_FPS', '15')),
+                segment_seconds=int(os.environ.get('VIDEO_RECORDING_SEGMENT_SECONDS', '60')),
+            )
+        # Still frames are still captured unless VIDEO_CAPTURE_FORMAT=none
+        if os.environ.get('VIDEO_CAPTURE_FORMAT') != 'none':
+            from video_capture import FrameSampler
+            fps = os.environ.get('VIDEO_CAPTURE_FPS')
+            interval_seconds = os.environ.get('VIDEO_CAPTURE_INTERVAL_SECONDS')
+            make_sampler = lambda: FrameSampler(
+                every_n_frames=10,
+                fps=float(fps) if fps else None,
+                interval_seconds=float(interval_seconds) if interval_seconds else None,
+            )
+            self.video_capture = self.create_video_capture("sample_program/out/video_frames", make_sampler)
+            GLib.timeout_add_seconds(30, self.video_capture.report)
+
+            # Screen shares are mostly static, so every share frame is checked for a slide change at most twice a second
+            self.share_capture = self.create_video_capture("sample_program/out/share_frames", lambda: FrameSampler(interval_seconds=0.5))
+            GLib.timeout_add_seconds(30, self.share_capture.report)
+            self.share_renderer_delegate = zoom.ZoomSDKRendererDelegateCallbacks(onRawDataFrameReceivedCallback=self.on_share_raw_data_frame_received_callback, collectPerformanceData=self.collect_performance_data)
+            self.share_renderer = zoom.createRenderer(self.share_renderer_delegate)
+            self.subscribe_share_renderer()
+        # Renderers follow the active speakers, and drop resolution when CPU or frame callback time runs over budget
+        self.video_renderer_pool = ActiveSpeakerRendererPool(
+            self.on_raw_data_frame_received_callback,
+            max_streams=int(os.environ.get('VIDEO_MAX_STREAMS', '2')),
+            idle_seconds=int(os.environ.get('VIDEO_IDLE_SECONDS', '30')),
+            cpu_budget_cores=float(os.environ.get('VIDEO_CPU_BUDGET_CORES', '1.0')),
+            callback_p99_budget_us=int(os.environ.get('VIDEO_CALLBACK_P99_BUDGET_US', '20000')),
+            excluded_user_ids=[self.my_participant_id],
+            collect_performance_data=self.collect_performance_data,
+        )
+        # Until someone speaks, show the first other participant as before
+        if self.other_participant_id is not None:
+            self.video_renderer_pool.on_active_speakers([self.other_participant_id])
+        self.video_renderer_pool.start()
 
         self.share_helper = zoom.GetRawdataShareSourceHelper()
         self.share_video_renderer_delegate = zoom.ShareSourceCallbacks(
             onStartSendCallback=self.on_share_video_start_send_callback,
-            onStopSendCallback=self.on_share_video_stop_send_callback
+            onStopSendCallback=self.on_share_video_stop_send_callback,
+            collectPerformanceData=self.collect_performance_data
         )
         self.share_audio_renderer_delegate = zoom.ShareAudioCallbacks(
             onStartSendAudioCallback=self.on_share_audio_start_send_callback,
-            onStopSendAudioCallback=self.on_share_audio_stop_send_callback
+            onStopSendAudioCallback=self.on_share_audio_stop_send_callback,
+            collectPerformanceData=self.collect_performance_data
         )
         self.share_helper.setExternalShareSource(self.share_video_renderer_delegate, self.share_audio_renderer_delegate)
         sharing_result = self.meeting_sharing_controller.ResumeCurrentSharing()
-        print("sharing_result =", sharing_result)
+        log.info("resume_current_sharing", result=sharing_result)
 
 
-        self.virtual_camera_video_source = zoom.ZoomSDKVideoSourceCallbacks(onInitializeCallback=self.on_virtual_camera_initialize_callback, onStartSendCallback=self.on_virtual_camera_start_send_callback)
+        self.virtual_camera_video_source = zoom.ZoomSDKVideoSourceCallbacks(onInitializeCallback=self.on_virtual_camera_initialize_callback, onStartSendCallback=self.on_virtual_camera_start_send_callback, onStopSendCallback=self.on_virtual_camera_stop_send_callback, collectPerformanceData=self.collect_performance_data)
         self.video_source_helper = zoom.GetRawdataVideoSourceHelper()
         if self.video_source_helper:
-            print("video_source_helper is not None")
             set_external_video_source_result = self.video_source_helper.setExternalVideoSource(self.virtual_camera_video_source)
-            print("set_external_video_source_result =", set_external_video_source_result)
+            log.info("set_external_video_source", result=set_external_video_source_result)
             if set_external_video_source_result == zoom.SDKERR_SUCCESS:
-                print("starting video")
                 self.meeting_video_controller = self.meeting_service.GetMeetingVideoController()
-                print("meeting_video_controller =", self.meeting_video_controller)
-                print("unmuting video")
-                self.meeting_video_controller.UnmuteVideo()
-                print("unmuted video")
+                log.info("video_unmute", result=self.meeting_video_controller.UnmuteVideo())
         else:
-            print("video_source_helper is None")
+            log.error("video_source_helper_missing")
 
     def on_virtual_camera_start_send_callback(self):
-        print("on_virtual_camera_start_send_callback called")
-        if self.video_sender:
-            red_frame = create_red_yuv420_frame(640, 360)
-            self.video_sender.sendVideoFrame(red_frame, 640, 360, 0, zoom.FrameDataFormat_I420_FULL)
+        log.info("virtual_camera_start_send", rate_per_second=1, burst=5)
+        if self.video_sender is None or self.virtual_camera_pacer:
+            return
+        from media_source import I420FrameCache, PacedFrameSender
+        camera_frames = I420FrameCache.open("camera", [create_red_yuv420_frame(640, 360)], 640, 360)
+
+        def send_camera_frame(frame):
+            if self.video_sender is None:
+                return False
+            return self.video_sender.sendVideoFrame(frame, camera_frames.width, camera_frames.height, 0, zoom.FrameDataFormat_I420_FULL) == zoom.SDKERR_SUCCESS
+
+        self.virtual_camera_pacer = PacedFrameSender(camera_frames, send_camera_frame, float(os.environ.get('VIRTUAL_CAMERA_FPS', '5')))
+        self.virtual_camera_pacer.start()
+
+    def on_virtual_camera_stop_send_callback(self):
+        log.info("virtual_camera_stop_send", rate_per_second=1, burst=5)
+        if self.virtual_camera_pacer:
+            self.virtual_camera_pacer.stop()
+            log.info("virtual_camera_pacing", **self.virtual_camera_pacer.stats())
+            self.virtual_camera_pacer = None
 
     def on_virtual_camera_initialize_callback(self, video_sender, support_cap_list, suggest_cap):
-        print("on_virtual_camera_initialize_callback called")
+        log.info("virtual_camera_initialized", rate_per_second=1, burst=5)
         self.video_sender = video_sender
 
-    def on_raw_data_frame_received_callback(self, data):
-        if self.video_frame_counter % 10 == 0:
-            frame_number = int(self.video_frame_counter / 10)
-            save_yuv420_frame_as_png(data.GetBuffer(), data.GetStreamWidth(), data.GetStreamHeight(), f"sample_program/out/video_frames/output_{frame_number:06d}.png")
-            print(f"Saved frame {frame_number} to sample_program/out/video_frames/output_{frame_number:06d}.png")
-        self.video_frame_counter += 1
+    def create_video_capture(self, output_dir, make_sampler):
+        from video_capture import VideoCapturePipeline
+        from scene_change import SceneChangeDetector
+        # Only frames whose content changed since the stream's last saved one are kept, unless VIDEO_CAPTURE_CHANGE_DETECTION=false
+        make_change_detector = None
+        if os.environ.get('VIDEO_CAPTURE_CHANGE_DETECTION', 'true') == 'true':
+            change_threshold = os.environ.get('VIDEO_CAPTURE_CHANGE_THRESHOLD')
+            make_change_detector = lambda: SceneChangeDetector(
+                threshold=float(change_threshold) if change_threshold else None,
+                method=os.environ.get('VIDEO_CAPTURE_CHANGE_METHOD', 'diff'),
+            )
+        max_width = os.environ.get('VIDEO_CAPTURE_WIDTH')
+        return VideoCapturePipeline(
+            output_dir=output_dir,
+            make_sampler=make_sampler,
+            make_change_detector=make_change_detector,
+            output_format=os.environ.get('VIDEO_CAPTURE_FORMAT', 'jpeg'),
+            quality=int(os.environ.get('VIDEO_CAPTURE_QUALITY', '85')),
+            max_width=int(max_width) if max_width else None,
+            workers=int(os.environ.get('VIDEO_CAPTURE_WORKERS', '2')),
+            queue_size=int(os.environ.get('VIDEO_CAPTURE_QUEUE_SIZE', '8')),
+        )
+
+    def on_raw_data_frame_received_callback(self, data, user_id):
+        if self.media_capture:
+            self.media_capture.record_frame(data, user_id)
+        # The recording follows the latest active speaker; stills are taken of every subscribed stream
+        if self.video_recorder and user_id == self.video_renderer_pool.primary_user_id:
+            self.video_recorder.submit(data)
+        if self.video_capture:
+            self.video_capture.submit(data, user_id)
+
+    def on_share_raw_data_frame_received_callback(self, data):
+        if self.media_capture:
+            self.media_capture.record_frame(data, self.other_share_source_id, share=True)
+        self.share_capture.submit(data, self.other_share_source_id)
 
     def stop_raw_recording(self):
         rec_ctrl = self.meeting_service.StopRawRecording()
@@ -570,7 +938,8 @@ class MeetingBot:
         param.eAudioRawdataSamplingRate = zoom.AudioRawdataSamplingRate.AudioRawdataSamplingRate_32K
 
         join_result = self.meeting_service.Join(join_param)
-        print("join_result =",join_result)
+        log.info("join_result", result=join_result)
+        self.startup_timeline.mark("join_result")
 
         self.audio_settings = self.setting_service.GetAudioSettings()
         self.audio_settings.EnableAutoJoinAudio(True)
@@ -580,16 +949,18 @@ class MeetingBot:
             handler.Accept()
 
     def auth_return(self, result):
+        self.startup_timeline.mark("auth_callback")
         if result == zoom.AUTHRET_SUCCESS:
-            print("Auth completed successfully.")
+            log.info("auth_completed")
             return self.join_meeting()
 
         raise Exception("Failed to authorize. result =", result)
 
     def meeting_status_changed(self, status, iResult):
-        print("meeting_status_changed called. status =",status,"iResult=",iResult)
+        log.info("meeting_status_changed", rate_per_second=2, burst=10, status=status, result=iResult)
 
         if status == zoom.MEETING_STATUS_INMEETING:
+            self.startup_timeline.mark("in_meeting")
             return self.on_join()
 
     def create_services(self):
@@ -597,13 +968,13 @@ class MeetingBot:
 
         self.setting_service = zoom.CreateSettingService()
 
-        self.meeting_service_event = zoom.MeetingServiceEventCallbacks(onMeetingStatusChangedCallback=self.meeting_status_changed)
+        self.meeting_service_event = zoom.MeetingServiceEventCallbacks(onMeetingStatusChangedCallback=self.meeting_status_changed, collectPerformanceData=self.collect_performance_data)
 
         meeting_service_set_revent_result = self.meeting_service.SetEvent(self.meeting_service_event)
         if meeting_service_set_revent_result != zoom.SDKERR_SUCCESS:
             raise Exception("Meeting Service set event failed")
 
-        self.auth_event = zoom.AuthServiceEventCallbacks(onAuthenticationReturnCallback=self.auth_return)
+        self.auth_event = zoom.AuthServiceEventCallbacks(onAuthenticationReturnCallback=self.auth_return, collectPerformanceData=self.collect_performance_data)
 
         self.auth_service = zoom.CreateAuthService()
 
@@ -612,7 +983,7 @@ class MeetingBot:
 
         # Use the auth service
         auth_context = zoom.AuthContext()
-        auth_context.jwt_token = generate_jwt(os.environ.get('ZOOM_APP_CLIENT_ID'), os.environ.get('ZOOM_APP_CLIENT_SECRET'))
+        auth_context.jwt_token = self.jwt_future.result()
 
         result = self.auth_service.SDKAuth(auth_context)
 
@@ -0,0 +1,196 @@
+import os
+import re
+import threading
+
+import numpy as np
+
+STOP_WORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being below between both but by
+can could did do does doing down during each few for from further get got had has have having he her here hers him
+his how i if in into is it its itself just know let like me more most my no nor not now of off oh ok okay on once
+only or other our ours out over own really right same she should so some such than that the their them then there
+these they this those through to too um uh under until up very was we well were what when where which while who why
+will with would yeah yes you your yours
+actually basically kind sort think thing things mean guess going gonna wanna maybe stuff sure
+""".split())
+
+WORD_PATTERN = re.compile(r"[a-z0-9']+")
+SENTENCE_END_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+# Commitments, requests and deadlines, as spoken in meetings; joined into one pattern so each sentence is scanned once
+ACTION_ITEM_PATTERN = re.compile("|".join((
+    r"\b(i|we|you|he|she|they)('ll| will| need to| needs to| have to| has to| must| should| are going to| am going to| is going to)\b",
+    r"\b(can|could|would) you\b",
+    r"\blet's\b",
+    r"\b(action item|to-?do|follow[ -]up|next steps?|take care of|make sure|assign(ed)? to)\b",
+    r"\bby (monday|tuesday|wednesday|thursday|friday|tomorrow|tonight|next week|end of (the )?(day|week|month)|eod|eow)\b",
+)), re.IGNORECASE)
+
+def split_sentences(text):
+    return [sentence.strip() for sentence in SENTENCE_END_PATTERN.split(text) if sentence.strip()]
+
+def tokenize(sentence):
+    return [word for word in WORD_PATTERN.findall(sentence.lower()) if word not in STOP_WORDS and len(word) > 1]
+
+def is_action_item(sentence):
+    return ACTION_ITEM_PATTERN.search(sentence) is not None
+
+class MeetingNotesEngine:
+    """
+    Builds extractive notes while the meeting runs. Each final transcript segment is split
+    into sentences whose term counts are appended to a sparse matrix held as flat NumPy
+    arrays (one entry per distinct term per sentence). Sentences are scored by TF-IDF
+    degree centrality, their summed cosine similarity to every other sentence, which is
+    one TextRank iteration and is computed in a single vectorized pass over the non-zero
+    entries, so a rescore is O(terms) rather than O(sentences squared). Rescoring waits
+    until rescore_fraction of the sentences are new, which keeps the amortized cost of a
+    segment flat as the meeting grows; summary() rescores any remainder. The summary is the
+    top_k sentences, skipping near duplicates, in meeting order. Sentences that read as
+    commitments, requests or deadlines are kept as action items as they arrive.
+    """
+    def __init__(self, top_k=8, min_words=4, duplicate_similarity=0.6, rescore_fraction=0.05):
+        self.top_k = top_k
+        self.min_words = min_words
+        self.duplicate_similarity = duplicate_similarity
+        self.rescore_fraction = rescore_fraction
+        self.lock = threading.Lock()
+
+        self.vocabulary = {}
+        self.document_frequency = np.zeros(1024, dtype=np.int32)
+        # Sparse sentence x term matrix in coordinate form
+        self.rows = np.zeros(4096, dtype=np.int32)
+        self.terms = np.zeros(4096, dtype=np.int32)
+        self.counts = np.zeros(4096, dtype=np.float32)
+        self.nnz = 0
+
+        self.sentences = []
+        self.word_counts = []
+        self.action_items = []
+        self.scores = np.zeros(0, dtype=np.float32)
+        self.unscored = 0
+
+    @staticmethod
+    def grow(array, size):
+        if size <= len(array):
+            return array
+        grown = np.zeros(max(size, len(array) * 2), dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
+
+    def add_segment(self, text, start=None, end=None, speaker=None):
+        """Adds a final transcript segment; returns the action items found in it"""
+        found = []
+        with self.lock:
+            for sentence in split_sentences(text):
+                words = tokenize(sentence)
+                if not words:
+                    continue
+                row = len(self.sentences)
+                self.sentences.append({"text": sentence, "start": start, "end": end, "speaker": speaker})
+                self.word_counts.append(len(words))
+
+                term_counts = {}
+                for word in words:
+                    term = self.vocabulary.get(word)
+                    if term is None:
+                        term = self.vocabulary[word] = len(self.vocabulary)
+                    term_counts[term] = term_counts.get(term, 0) + 1
+
+                self.document_frequency = self.grow(self.document_frequency, len(self.vocabulary))
+                terms = np.fromiter(term_counts.keys(), dtype=np.int32, count=len(term_counts))
+                self.document_frequency[terms] += 1
+
+                end_nnz = self.nnz + len(terms)
+                self.rows = self.grow(self.rows, end_nnz)
+                self.terms = self.grow(self.terms, end_nnz)
+                self.counts = self.grow(self.counts, end_nnz)
+                self.rows[self.nnz:end_nnz] = row
+                self.terms[self.nnz:end_nnz] = terms
+                self.counts[self.nnz:end_nnz] = np.fromiter(term_counts.values(), dtype=np.float32, count=len(term_counts))
+                self.nnz = end_nnz
+
+                if is_action_item(sentence):
+                    item = dict(self.sentences[row])
+                    self.action_items.append(item)
+                    found.append(item)
+                self.unscored += 1
+
+            if self.unscored >= self.rescore_fraction * len(self.sentences):
+                self.rescore()
+        return found
+
+    def normalized_weights(self):
+        """TF-IDF weight of every non-zero entry, with each sentence scaled to unit length"""
+        sentence_count = len(self.sentences)
+        rows = self.rows[:self.nnz]
+        terms = self.terms[:self.nnz]
+        idf = np.log((1 + sentence_count) / (1 + self.document_frequency[:len(self.vocabulary)])) + 1
+        weights = self.counts[:self.nnz] * idf[terms]
+        norms = np.sqrt(np.bincount(rows, weights * weights, minlength=sentence_count))
+        return weights / norms[rows]
+
+    def rescore(self):
+        self.unscored = 0
+        sentence_count = len(self.sentences)
+        if sentence_count == 0:
+            return
+        rows = self.rows[:self.nnz]
+        terms = self.terms[:self.nnz]
+        weights = self.normalized_weights()
+        # Sum of all sentence vectors; a sentence's dot product with it, less its own unit length,
+        # is its summed cosine similarity to every other sentence
+        centroid = np.bincount(terms, weights, minlength=len(self.vocabulary))
+        similarity = np.bincount(rows, weights * centroid[terms], minlength=sentence_count) - 1
+        # Short fragments ("Sounds good.") say little however central they are
+        length_factor = np.minimum(1, np.asarray(self.word_counts, dtype=np.float32) / self.min_words)
+        self.scores = similarity / max(sentence_count - 1, 1) * length_factor
+
+    def sentence_vector(self, weights, row, row_starts):
+        begin, end = row_starts[row], row_starts[row + 1]
+        return dict(zip(self.terms[begin:end].tolist(), weights[begin:end].tolist()))
+
+    def summary(self):
+        """The top_k sentences, most central first when choosing but returned in meeting order"""
+        with self.lock:
+            if self.unscored:
+                self.rescore()
+            if len(self.scores) == 0:
+                return []
+            weights = self.normalized_weights()
+            # Entries were appended sentence by sentence, so each sentence's entries are contiguous
+            row_starts = np.searchsorted(self.rows[:self.nnz], np.arange(len(self.sentences) + 1))
+            # Bounded, so a meeting that keeps repeating itself cannot make this scan every sentence
+            candidates = np.argsort(-self.scores)[:self.top_k * 50]
+            chosen = []
+            chosen_vectors = []
+            for row in candidates.tolist():
+                vector = self.sentence_vector(weights, row, row_starts)
+                if any(sum(weight * other.get(term, 0) for term, weight in vector.items()) > self.duplicate_similarity for other in chosen_vectors):
+                    continue
+                chosen.append(row)
+                chosen_vectors.append(vector)
+                if len(chosen) == self.top_k:
+                    break
+            return [dict(self.sentences[row], score=float(self.scores[row])) for row in sorted(chosen)]
+
+    def notes(self):
+        summary = self.summary()
+        with self.lock:
+            return {"summary": summary, "action_items": list(self.action_items), "sentences": len(self.sentences)}
+
+    def to_markdown(self):
+        notes = self.notes()
+        lines = ["# Meeting notes", "", "## Summary", ""]
+        lines += [f"- {sentence['text']}" for sentence in notes["summary"]] or ["- Nothing was transcribed"]
+        lines += ["", "## Action items", ""]
+        lines += [f"- {item['text']}" for item in notes["action_items"]] or ["- None found"]
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as file:
+                file.write(self.to_markdown())
+            print(f"Meeting notes written to {path}")
+        except IOError as e:
+            print(f"Error: failed to write meeting notes to {path}. Error: {e}")
@@ -0,0 +1,193 @@
+import collections
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+
+class RecordSpool:
+    """
+    Durable FIFO of serialized records in a local SQLite database, used while the backend is
+    slow or down. Each batch is appended in a single transaction, and the database runs in
+    WAL mode with synchronous=NORMAL, so spooling a batch costs about one sequential write.
+    """
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Only used from the client's worker thread after construction
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS records (id INTEGER PRIMARY KEY AUTOINCREMENT, body TEXT NOT NULL)")
+        self.db.commit()
+        # The worker thread spools and drains while stats() counts from the main loop
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        # Counted rather than cached, since another process may have drained the same file
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def append(self, bodies):
+        with self.lock, self.db:
+            self.db.executemany("INSERT INTO records (body) VALUES (?)", ((body,) for body in bodies))
+
+    def peek(self, limit):
+        """Returns the oldest spooled records as (id, body) pairs"""
+        with self.lock:
+            return self.db.execute("SELECT id, body FROM records ORDER BY id LIMIT ?", (limit,)).fetchall()
+
+    def remove_through(self, last_id):
+        with self.lock, self.db:
+            self.db.execute("DELETE FROM records WHERE id <= ?", (last_id,))
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+class HttpBatchSender:
+    """Posts a batch of records to the meetings backend as one JSON request; raises when it is not accepted"""
+    def __init__(self, url, api_key=None, timeout=5):
+        self.url = url
+        self.session = requests.Session()
+        self.session.headers['Content-Type'] = 'application/json'
+        if api_key:
+            self.session.headers['Authorization'] = f'Bearer {api_key}'
+        self.timeout = timeout
+
+    def __call__(self, bodies):
+        # The records are already serialized, so the batch is joined instead of encoded again
+        payload = '{"records":[' + ','.join(bodies) + ']}'
+        response = self.session.post(self.url, data=payload.encode(), timeout=self.timeout)
+        response.raise_for_status()
+
+class MeetingRecordClient:
+    """
+    Persists transcript segments and chat messages. Callers only append to an in-memory
+    queue, so SDK and transcription callbacks never wait on the network or the disk. A
+    worker thread sends records in batches of up to batch_size, or whatever has queued
+    after flush_interval_seconds. While the backend fails, batches go to a local spool,
+    sending backs off, and the spool is drained oldest first before any newer records, so
+    the backend receives records in order. Records still spooled when the bot exits are
+    sent by the next bot that opens the same spool. Concurrent bots need spools of their
+    own, or they would send each other's spooled records twice; the default is per meeting.
+    """
+    def __init__(self, send_batch, spool_path=None, meeting_id=None, batch_size=100, flush_interval_seconds=2, max_queue=10000, max_backoff_seconds=60):
+        self.send_batch = send_batch
+        self.spool = RecordSpool(spool_path or f"sample_program/out/meeting_records_{meeting_id}.sqlite3")
+        self.meeting_id = meeting_id
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_queue = max_queue
+        self.max_backoff_seconds = max_backoff_seconds
+        self.queue = collections.deque()
+        self.condition = threading.Condition()
+        self.stopping = False
+        self.backoff = 0
+        self.retry_at = 0
+        self.sent = 0
+        self.spooled = 0
+        self.dropped = 0
+        self.failures = 0
+        self.thread = threading.Thread(target=self.run, name="meeting-records", daemon=True)
+        self.thread.start()
+
+    def add(self, kind, **fields):
+        record = {"kind": kind, "meeting_id": self.meeting_id, "time": time.time(), **fields}
+        with self.condition:
+            if self.stopping or len(self.queue) >= self.max_queue:
+                self.dropped += 1
+                return
+            self.queue.append(record)
+            if len(self.queue) >= self.batch_size:
+                self.condition.notify()
+
+    def add_transcript(self, text, start=None, end=None, speaker=None):
+        self.add("transcript", text=text, start=start, end=end, speaker=speaker)
+
+    def add_chat(self, message_id, sender_id, sender_name, content, timestamp, to_all=True):
+        self.add("chat", message_id=message_id, sender_id=sender_id, sender_name=sender_name, content=content, timestamp=timestamp, to_all=to_all)
+
+    def take_batch(self):
+        """Waits until a full batch is queued, the flush interval passes or the client stops"""
+        deadline = time.monotonic() + self.flush_interval_seconds
+        with self.condition:
+            while not self.stopping and len(self.queue) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+            count = min(len(self.queue), self.batch_size)
+            return [self.queue.popleft() for _ in range(count)]
+
+    def try_send(self, bodies):
+        if time.monotonic() < self.retry_at:
+            return False
+        try:
+            self.send_batch(bodies)
+        except Exception as e:
+            self.failures += 1
+            self.backoff = min(max(self.backoff * 2, 1), self.max_backoff_seconds)
+            self.retry_at = time.monotonic() + self.backoff
+            print(f"Error: failed to send {len(bodies)} meeting records, retrying in {self.backoff}s. Error: {e}")
+            return False
+        self.backoff = 0
+        self.sent += len(bodies)
+        return True
+
+    def drain_spool(self):
+        while True:
+            rows = self.spool.peek(self.batch_size)
+            if not rows:
+                return True
+            if not self.try_send([body for _, body in rows]):
+                return False
+            self.spool.remove_through(rows[-1][0])
+
+    def process(self, records):
+        bodies = [json.dumps(record) for record in records]
+        # Newer records wait behind spooled ones so the backend receives them in order
+        if self.drain_spool() and bodies and self.try_send(bodies):
+            return
+        if bodies:
+            self.spool.append(bodies)
+            self.spooled += len(bodies)
+
+    def run(self):
+        while True:
+            records = self.take_batch()
+            try:
+                self.process(records)
+            except Exception as e:
+                print(f"Error persisting meeting records: {e}")
+            with self.condition:
+                if self.stopping and not self.queue:
+                    return
+
+    def stop(self, timeout=10):
+        """Sends or spools everything queued, then closes the spool"""
+        with self.condition:
+            self.stopping = True
+            self.condition.notify()
+        self.thread.join(timeout)
+        if not self.thread.is_alive():
+            self.spool.close()
+
+    def stats(self):
+        return {
+            "queued": len(self.queue),
+            "sent": self.sent,
+            "spooled": self.spooled,
+            "spool_backlog": len(self.spool),
+            "dropped": self.dropped,
+            "failures": self.failures,
+        }
+
+    def report(self):
+        print(f"Meeting records: {self.stats()}")
+        # Keep the GLib timeout running
+        return True
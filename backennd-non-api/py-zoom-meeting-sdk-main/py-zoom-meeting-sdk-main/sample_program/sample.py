@@ -1,3 +1,6 @@
+from startup_timeline import StartupTimeline
+startup_timeline = StartupTimeline()
+
 import zoom_meeting_sdk as zoom
 import time
 import jwt
@@ -5,6 +8,7 @@ from datetime import datetime, timedelta
 from typing import Callable, Optional
 import asyncio
 from meeting_bot import MeetingBot
+from glib_asyncio import GLibEventLoop
 from dotenv import load_dotenv
 import signal
 import sys
@@ -13,11 +17,15 @@ gi.require_version('GLib', '2.0')
 from gi.repository import GLib
 import os
 
+startup_timeline.mark("imports")
+
 class ZoomBotRunner:
     def __init__(self):
         self.bot = None
-        self.main_loop = None
+        self.event_loop = None
         self.shutdown_requested = False
+        self.profiler = None
+        self.profiler_seconds = 30
 
     def exit_process(self):
         """Clean shutdown of the bot and main loop"""
@@ -29,6 +37,9 @@ class ZoomBotRunner:
         self.shutdown_requested = True
         
         try:
+            if self.profiler:
+                # Writes what was sampled so far, which covers a shutdown that stalls
+                self.profiler.stop()
             if self.bot:
                 print("Leaving meeting...")
                 self.bot.leave()
@@ -49,40 +60,63 @@ class ZoomBotRunner:
         os._exit(0)  # Use os._exit() to force immediate termination
         return False
 
-    def on_signal(self, signum, frame):
-        """Signal handler for SIGINT and SIGTERM"""
+    def on_signal(self, signum):
+        """GLib Unix signal source callback for SIGINT and SIGTERM, runs on the main loop"""
         print(f"\nReceived signal {signum}")
-        # Schedule the exit process to run soon, but not immediately
-        if self.main_loop:
-            GLib.timeout_add(100, self.exit_process)
-        else:
-            self.exit_process()
+        self.exit_process()
+        # Remove the signal source
+        return False
 
-    def on_timeout(self):
-        """Regular timeout callback"""
-        if self.shutdown_requested:
-            return False
+    def on_dump_latency(self):
+        """GLib Unix signal source callback for SIGUSR1, prints the live audio latency histograms"""
+        if self.bot:
+            print(self.bot.latency_tracer.format())
+        return True
+
+    def on_profile(self):
+        """GLib Unix signal source callback for SIGUSR2, samples every thread's stack for PROFILER_SECONDS"""
+        if not self.profiler.start(self.profiler_seconds):
+            print("A profile is already running")
         return True
 
+    def add_profiler_sources(self):
+        """Disabled by default; unless PROFILER_ENABLED is true nothing is imported and SIGUSR2 keeps its default action"""
+        if os.environ.get('PROFILER_ENABLED') != 'true':
+            return
+        from stack_profiler import StackSampler
+        self.profiler = StackSampler(interval_seconds=float(os.environ.get('PROFILER_INTERVAL_MS', '10')) / 1000)
+        self.profiler_seconds = float(os.environ.get('PROFILER_SECONDS', '30'))
+        GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, signal.SIGUSR2, self.on_profile)
+        # For a bot in a container, where a file in a mounted directory is easier to reach than the process
+        trigger_path = os.environ.get('PROFILER_TRIGGER_PATH')
+        if trigger_path:
+            GLib.timeout_add_seconds(1, self.profiler.check_trigger_file, trigger_path, self.profiler_seconds)
+
+    def add_signal_sources(self):
+        # Delivered by GLib as main loop events, so shutdown needs no polling timeout
+        GLib.unix_signal_add(GLib.PRIORITY_HIGH, signal.SIGINT, self.on_signal, signal.SIGINT)
+        GLib.unix_signal_add(GLib.PRIORITY_HIGH, signal.SIGTERM, self.on_signal, signal.SIGTERM)
+        GLib.unix_signal_add(GLib.PRIORITY_DEFAULT, signal.SIGUSR1, self.on_dump_latency)
+        self.add_profiler_sources()
+
     def run(self):
         """Main run method"""
-        self.bot = MeetingBot()
+        # One loop runs GLib sources and asyncio tasks, so async sinks need no threads of their own
+        self.event_loop = GLibEventLoop()
+        asyncio.set_event_loop(self.event_loop)
+        self.add_signal_sources()
+
+        self.bot = MeetingBot(startup_timeline=startup_timeline)
+        self.bot.event_loop = self.event_loop
         try:
             self.bot.init()
         except Exception as e:
             print(e)
             self.exit_process()
-        
-
-        # Create a GLib main loop
-        self.main_loop = GLib.MainLoop()
-
-        # Add a timeout function that will be called every 100ms
-        GLib.timeout_add(100, self.on_timeout)
 
         try:
             print("Starting main event loop")
-            self.main_loop.run()
+            self.event_loop.run_forever()
         except KeyboardInterrupt:
             print("Interrupted by user, shutting down...")
         except Exception as e:
@@ -95,12 +129,8 @@ def main():
     
     runner = ZoomBotRunner()
     
-    # Set up signal handlers
-    signal.signal(signal.SIGINT, runner.on_signal)
-    signal.signal(signal.SIGTERM, runner.on_signal)
-    
     # Run the Meeting Bot
     runner.run()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
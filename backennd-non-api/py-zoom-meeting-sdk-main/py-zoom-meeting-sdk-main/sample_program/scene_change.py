@@ -0,0 +1,76 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# Default thresholds, tuned so compression noise on a static slide never triggers and a new slide always does
+DEFAULT_THRESHOLDS = {"diff": 0.005, "dhash": 0.06}
+
+class SceneChangeDetector:
+    """
+    Decides whether a frame shows new content, such as a new slide or a different speaker,
+    by comparing a small downscaled copy of its Y plane with the last keyframe. Comparing
+    with the last keyframe rather than the previous frame also catches slow changes.
+
+    method "diff" scores the share of thumbnail pixels that changed by more than
+    pixel_threshold, from 0 to 1, so a few changed lines of text count while compression
+    noise, which the downscale averages away, does not.
+    method "dhash" scores the share of differing bits in a 64 bit difference hash, from 0 to 1;
+    it ignores brightness shifts better, at the cost of missing small edits.
+
+    Safe to call from several renderer threads; the keyframe is only read and replaced under a lock.
+    """
+    def __init__(self, threshold=None, method="diff", thumbnail_size=(64, 36), pixel_threshold=16, min_interval_seconds=0):
+        if method not in ("diff", "dhash"):
+            raise ValueError(f"Unknown scene change method {method}, expected {' or '.join(DEFAULT_THRESHOLDS)}")
+        self.threshold = DEFAULT_THRESHOLDS[method] if threshold is None else threshold
+        self.method = method
+        self.thumbnail_size = thumbnail_size
+        self.pixel_threshold = pixel_threshold
+        self.min_interval_seconds = min_interval_seconds
+        self.lock = threading.Lock()
+        self.keyframe = None
+        self.last_keyframe_at = None
+
+    def fingerprint(self, y_plane):
+        # Skipping rows and columns first leaves INTER_AREA about 4x4 pixels to average per
+        # thumbnail pixel, which still smooths noise but is several times cheaper on 720p and up
+        width, height = self.thumbnail_size
+        step = max(1, min(y_plane.shape[0] // (4 * height), y_plane.shape[1] // (4 * width)))
+        thumbnail = cv2.resize(y_plane[::step, ::step], self.thumbnail_size, interpolation=cv2.INTER_AREA)
+        if self.method == "dhash":
+            hash_thumbnail = cv2.resize(thumbnail, (9, 8), interpolation=cv2.INTER_AREA)
+            return hash_thumbnail[:, 1:] > hash_thumbnail[:, :-1]
+        return thumbnail
+
+    def score(self, fingerprint):
+        if self.method == "dhash":
+            return np.count_nonzero(fingerprint != self.keyframe) / fingerprint.size
+        return np.count_nonzero(cv2.absdiff(fingerprint, self.keyframe) > self.pixel_threshold) / fingerprint.size
+
+    def check(self, y_plane, now=None):
+        """
+        Returns the change score and makes y_plane the new reference when it differs enough
+        from the last keyframe, otherwise None. The first frame scores 1.0.
+        """
+        if now is None:
+            now = time.monotonic()
+        with self.lock:
+            if self.last_keyframe_at is not None and now - self.last_keyframe_at < self.min_interval_seconds:
+                return None
+        # The downscale is the costly part and only reads the frame, so it runs outside the lock
+        fingerprint = self.fingerprint(y_plane)
+        with self.lock:
+            score = 1.0
+            if self.keyframe is not None:
+                score = self.score(fingerprint)
+                if score < self.threshold:
+                    return None
+            self.keyframe = fingerprint
+            self.last_keyframe_at = now
+        return score
+
+    def is_keyframe(self, y_plane, now=None):
+        """Returns True and makes y_plane the new reference when it differs enough from the last keyframe"""
+        return self.check(y_plane, now) is not None
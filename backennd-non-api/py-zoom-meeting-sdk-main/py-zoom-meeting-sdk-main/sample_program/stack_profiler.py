@@ -0,0 +1,135 @@
+import collections
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+class StackSampler:
+    """
+    Samples every thread's Python stack for a while and writes them as collapsed stacks
+    (one "thread;outer;...;inner count" line per distinct stack), the input of
+    flamegraph.pl and speedscope. It is idle until start() is called, and while running
+    it costs one sys._current_frames() walk per interval on its own thread.
+
+    SDK callback threads show up while they run Python. Each sample's leaf is tagged
+    [cpu] when the thread used at least half the interval of CPU since the previous
+    sample and [waiting] otherwise, so a callback stack that is mostly [waiting] is
+    blocked on the GIL, a lock or I/O rather than computing.
+    """
+    def __init__(self, interval_seconds=0.01, output_dir="sample_program/out/profiles"):
+        self.interval_seconds = interval_seconds
+        self.output_dir = output_dir
+        self.lock = threading.Lock()
+        self.thread = None
+        self.stopped = threading.Event()
+        self.stacks = collections.Counter()
+        self.samples = 0
+        self.sampling_seconds = 0
+        self.last_path = None
+
+    def start(self, seconds=30):
+        """Starts a profile of the next seconds on a background thread; False if one is already running"""
+        with self.lock:
+            if self.thread and self.thread.is_alive():
+                return False
+            self.stopped.clear()
+            self.thread = threading.Thread(target=self.run, args=(seconds,), name="stack-sampler", daemon=True)
+            self.thread.start()
+        print(f"Profiling all threads for {seconds}s")
+        return True
+
+    def stop(self, timeout=5):
+        self.stopped.set()
+        thread = self.thread
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    @staticmethod
+    def frame_label(code):
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    @staticmethod
+    def thread_cpu_seconds(ident):
+        try:
+            return time.clock_gettime(time.pthread_getcpuclockid(ident))
+        except (AttributeError, OSError):
+            return None
+
+    def sample(self, names, cpu_seconds):
+        own_ident = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(self.frame_label(frame.f_code))
+                frame = frame.f_back
+            labels.append(names.get(ident) or f"thread-{ident}")
+            labels.reverse()
+            cpu = self.thread_cpu_seconds(ident)
+            previous = cpu_seconds.get(ident)
+            cpu_seconds[ident] = cpu
+            if cpu is not None and previous is not None:
+                labels.append("[cpu]" if cpu - previous >= self.interval_seconds / 2 else "[waiting]")
+            self.stacks[";".join(labels)] += 1
+        self.samples += 1
+
+    def run(self, seconds):
+        self.stacks = collections.Counter()
+        self.samples = 0
+        self.sampling_seconds = 0
+        cpu_seconds = {}
+        start = time.monotonic()
+        deadline = start + seconds
+        next_sample = start
+        while not self.stopped.is_set() and time.monotonic() < deadline:
+            sample_start = time.perf_counter()
+            # Re-read every sample so threads started during the profile are named
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            self.sample(names, cpu_seconds)
+            self.sampling_seconds += time.perf_counter() - sample_start
+            next_sample += self.interval_seconds
+            delay = next_sample - time.monotonic()
+            if delay > 0:
+                self.stopped.wait(delay)
+            else:
+                # Fell behind, for example while the GIL was held elsewhere; skip the missed samples
+                next_sample = time.monotonic()
+        self.write(time.monotonic() - start)
+
+    def write(self, elapsed):
+        path = os.path.join(self.output_dir, f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.collapsed")
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            with open(path, "w") as file:
+                for stack, count in sorted(self.stacks.items()):
+                    file.write(f"{stack} {count}\n")
+        except IOError as e:
+            print(f"Error: failed to write profile to {path}. Error: {e}")
+            return
+        self.last_path = path
+        overhead = self.sampling_seconds / elapsed if elapsed else 0
+        print(f"Profile written to {path}: {self.samples} samples over {elapsed:.1f}s, sampling took {overhead * 100:.2f}% of one core")
+
+    def check_trigger_file(self, path, default_seconds):
+        """
+        Starts a profile when path exists, then removes it; the file may hold the number of
+        seconds. Meant to run from a GLib timeout, for processes that are easier to reach
+        through a shared directory than with a signal. Returns True to keep the timeout running.
+        """
+        try:
+            with open(path) as file:
+                content = file.read().strip()
+            os.remove(path)
+        except FileNotFoundError:
+            return True
+        except IOError as e:
+            print(f"Error: failed to read profile trigger {path}. Error: {e}")
+            return True
+        try:
+            seconds = float(content) if content else default_seconds
+        except ValueError:
+            seconds = default_seconds
+        self.start(seconds)
+        return True
@@ -0,0 +1,36 @@
+import json
+import os
+import threading
+import time
+
+# Imported first by sample.py, so phases are measured from about when the bot's own code starts running
+PROCESS_START = time.monotonic()
+
+class StartupTimeline:
+    """Records when each start-up phase of the bot finished, relative to process start, and emits them once as one line"""
+    def __init__(self, path="sample_program/out/startup_timeline.jsonl", start=PROCESS_START):
+        self.path = path
+        self.start = start
+        self.phases = {}
+        self.lock = threading.Lock()
+        self.emitted = False
+
+    def mark(self, phase):
+        """Records the first time a phase is reached; later marks of the same phase are ignored"""
+        elapsed = time.monotonic() - self.start
+        with self.lock:
+            self.phases.setdefault(phase, elapsed)
+
+    def emit(self):
+        with self.lock:
+            if self.emitted:
+                return
+            self.emitted = True
+            phases = dict(self.phases)
+        print("Startup timeline: " + ", ".join(f"{phase}={seconds * 1000:.0f}ms" for phase, seconds in phases.items()))
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a") as file:
+                file.write(json.dumps({"time": time.time(), "phases_ms": {phase: round(seconds * 1000, 1) for phase, seconds in phases.items()}}) + "\n")
+        except IOError as e:
+            print(f"Error: failed to write startup timeline to {self.path}. Error: {e}")
@@ -0,0 +1,468 @@
+import bisect
+import fcntl
+import itertools
+import json
+import mmap
+import os
+import queue
+import struct
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from meeting_notes import tokenize
+
+# Segment file layout: this header, padded to SEGMENT_DATA_OFFSET, then the sections in SEGMENT_SECTIONS order
+SEGMENT_MAGIC = b"ZTIDX001"
+SEGMENT_SECTIONS = ("names", "docs", "texts", "term_offsets", "terms", "postings_offsets", "doc_freqs", "postings")
+SEGMENT_HEADER = struct.Struct("<8sQII" + "QQ" * len(SEGMENT_SECTIONS))
+SEGMENT_DATA_OFFSET = 256
+
+# One entry per transcript segment; meeting and speaker index the segment's names table
+DOC_DTYPE = np.dtype([("meeting", "<u4"), ("speaker", "<u4"), ("start", "<f8"), ("end", "<f8"), ("text_offset", "<u8"), ("text_length", "<u4")])
+
+def encode_postings(doc_ids, doc_freqs):
+    """
+    Compresses the postings of all terms at once. doc_ids holds each term's ascending doc
+    ids back to back, doc_freqs how many belong to each term. Ids are delta encoded within
+    each term and written as variable length integers, 7 bits per byte with the high bit
+    set on all but a value's last byte. Returns the bytes and each term's byte offset.
+    """
+    term_starts = np.cumsum(doc_freqs) - doc_freqs
+    values = np.diff(doc_ids.astype(np.int64), prepend=0)
+    values[term_starts] = doc_ids[term_starts]
+    lengths = np.ones(len(values), dtype=np.int64)
+    for byte in range(1, 5):
+        lengths += values >= 1 << (7 * byte)
+    ends = np.cumsum(lengths)
+    positions = ends - lengths
+    encoded = np.zeros(int(ends[-1]) if len(ends) else 0, dtype=np.uint8)
+    for byte in range(5):
+        has_byte = lengths > byte
+        encoded[positions[has_byte] + byte] = ((values[has_byte] >> (7 * byte)) & 0x7F) | np.where(lengths[has_byte] > byte + 1, 0x80, 0)
+    offsets = np.zeros(len(doc_freqs) + 1, dtype=np.uint64)
+    offsets[1:] = ends[np.cumsum(doc_freqs) - 1]
+    return encoded.tobytes(), offsets
+
+def decode_varints(encoded):
+    """Decodes a uint8 array of variable length integers"""
+    if len(encoded) == 0:
+        return np.zeros(0, dtype=np.int64)
+    last_bytes = (encoded & 0x80) == 0
+    value_starts = np.flatnonzero(np.concatenate(([True], last_bytes[:-1])))
+    value_index = np.cumsum(last_bytes) - last_bytes
+    shifts = 7 * (np.arange(len(encoded)) - value_starts[value_index])
+    parts = (encoded & 0x7F).astype(np.int64) << shifts
+    # Values fit in 35 bits, which float64 sums represent exactly
+    return np.bincount(value_index, parts, minlength=len(value_starts)).astype(np.int64)
+
+def decode_postings(encoded, doc_freqs):
+    """Inverse of encode_postings: every term's doc ids back to back"""
+    values = decode_varints(encoded)
+    totals = np.cumsum(values)
+    term_starts = np.cumsum(doc_freqs) - doc_freqs
+    return (totals - np.repeat(totals[term_starts] - values[term_starts], doc_freqs)).astype(np.uint32)
+
+def write_segment(path, doc_base, names, docs, texts, terms, doc_freqs, postings):
+    """
+    Writes an immutable segment: names is the meeting id and speaker table that docs index,
+    docs a DOC_DTYPE array whose text offsets point into texts, terms the sorted terms and
+    postings their ascending local doc ids back to back, doc_freqs[i] of them for terms[i].
+    """
+    encoded_terms = [term.encode() for term in terms]
+    term_offsets = np.zeros(len(terms) + 1, dtype=np.uint32)
+    term_offsets[1:] = np.cumsum([len(term) for term in encoded_terms])
+    postings_bytes, postings_offsets = encode_postings(postings, doc_freqs)
+
+    sections = {
+        "names": json.dumps(names).encode(),
+        "docs": docs.tobytes(),
+        "texts": bytes(texts),
+        "term_offsets": term_offsets.tobytes(),
+        "terms": b"".join(encoded_terms),
+        "postings_offsets": postings_offsets.tobytes(),
+        "doc_freqs": np.asarray(doc_freqs, dtype=np.uint32).tobytes(),
+        "postings": postings_bytes,
+    }
+    layout = []
+    offset = SEGMENT_DATA_OFFSET
+    for name in SEGMENT_SECTIONS:
+        layout += [offset, len(sections[name])]
+        # Keeps the numeric sections aligned to their item size
+        offset += (len(sections[name]) + 7) // 8 * 8
+
+    directory = os.path.dirname(path)
+    # Written to a temporary file and renamed, so readers never map a partial segment
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, doc_base, len(docs), len(terms), *layout).ljust(SEGMENT_DATA_OFFSET, b"\0"))
+            for name in SEGMENT_SECTIONS:
+                file.write(sections[name].ljust((len(sections[name]) + 7) // 8 * 8, b"\0"))
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+class IndexSegment:
+    """A memory mapped segment; its docs have the global ids doc_base to doc_base + doc_count - 1"""
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+        with open(path, "rb") as file:
+            self.memory = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = SEGMENT_HEADER.unpack_from(self.memory, 0)
+        magic, self.doc_base, self.doc_count, self.term_count = header[:4]
+        if magic != SEGMENT_MAGIC:
+            raise ValueError(f"{path} is not a transcript index segment")
+        self.sections = {name: (header[4 + index * 2], header[5 + index * 2]) for index, name in enumerate(SEGMENT_SECTIONS)}
+        offset, length = self.sections["names"]
+        self.names = json.loads(self.memory[offset:offset + length])
+        self.docs = self.array("docs", DOC_DTYPE)
+        self.term_offsets = self.array("term_offsets", np.uint32)
+        self.postings_offsets = self.array("postings_offsets", np.uint64)
+        self.doc_freqs = self.array("doc_freqs", np.uint32)
+        self.terms_start = self.sections["terms"][0]
+        self.postings_start = self.sections["postings"][0]
+        self.texts_start = self.sections["texts"][0]
+
+    def array(self, section, dtype):
+        offset, length = self.sections[section]
+        return np.frombuffer(self.memory, dtype=dtype, count=length // np.dtype(dtype).itemsize, offset=offset)
+
+    def term(self, index):
+        return self.memory[self.terms_start + int(self.term_offsets[index]):self.terms_start + int(self.term_offsets[index + 1])]
+
+    def terms(self):
+        return [self.term(index).decode() for index in range(self.term_count)]
+
+    def find_term(self, term):
+        encoded = term.encode()
+        index = bisect.bisect_left(range(self.term_count), encoded, key=self.term)
+        if index < self.term_count and self.term(index) == encoded:
+            return index
+        return None
+
+    def postings_at(self, index):
+        begin = self.postings_start + int(self.postings_offsets[index])
+        end = self.postings_start + int(self.postings_offsets[index + 1])
+        encoded = np.frombuffer(self.memory, dtype=np.uint8, count=end - begin, offset=begin)
+        return decode_postings(encoded, self.doc_freqs[index:index + 1])
+
+    def all_postings(self):
+        """Every term's doc ids back to back, decoded in one pass"""
+        return decode_postings(self.array("postings", np.uint8), self.doc_freqs)
+
+    def texts(self):
+        offset, length = self.sections["texts"]
+        return self.memory[offset:offset + length]
+
+    def postings(self, term):
+        """Local doc ids containing term, ascending"""
+        index = self.find_term(term)
+        if index is None:
+            return np.zeros(0, dtype=np.uint32)
+        return self.postings_at(index)
+
+    def doc(self, local_id):
+        record = self.docs[local_id]
+        offset = self.texts_start + int(record["text_offset"])
+        start, end = float(record["start"]), float(record["end"])
+        return (
+            self.names[record["meeting"]],
+            self.names[record["speaker"]],
+            None if np.isnan(start) else start,
+            None if np.isnan(end) else end,
+            self.memory[offset:offset + int(record["text_length"])].decode(),
+        )
+
+class MemorySegment:
+    """Docs added since the last flush, searchable before they reach disk"""
+    def __init__(self, doc_base):
+        self.doc_base = doc_base
+        self.docs = []
+        self.term_postings = {}
+
+    @property
+    def doc_count(self):
+        return len(self.docs)
+
+    def add(self, doc):
+        local_id = len(self.docs)
+        self.docs.append(doc)
+        for term in set(tokenize(doc[4])):
+            self.term_postings.setdefault(term, []).append(local_id)
+
+    def postings(self, term):
+        return np.asarray(self.term_postings.get(term, ()), dtype=np.uint32)
+
+    def doc(self, local_id):
+        return self.docs[local_id]
+
+    def freeze(self):
+        """The segment as write_segment arguments"""
+        names = {}
+        docs = np.zeros(len(self.docs), dtype=DOC_DTYPE)
+        texts = bytearray()
+        for index, (meeting_id, speaker, start, end, text) in enumerate(self.docs):
+            encoded = text.encode()
+            docs[index] = (names.setdefault(meeting_id, len(names)), names.setdefault(speaker, len(names)), np.nan if start is None else start, np.nan if end is None else end, len(texts), len(encoded))
+            texts += encoded
+        terms = sorted(self.term_postings)
+        doc_freqs = np.array([len(self.term_postings[term]) for term in terms], dtype=np.uint32)
+        postings = np.fromiter(itertools.chain.from_iterable(self.term_postings[term] for term in terms), dtype=np.uint32, count=int(doc_freqs.sum()))
+        return list(names), docs, texts, terms, doc_freqs, postings
+
+def search_sources(sources, query, limit):
+    """Docs of sources, oldest first, containing every term of the query, newest first"""
+    terms = set(tokenize(query))
+    if not terms:
+        return []
+    hits = []
+    for source in reversed(sources):
+        matches = None
+        # Rarest terms first, so the intersection shrinks as early as possible
+        for postings in sorted((source.postings(term) for term in terms), key=len):
+            matches = postings if matches is None else np.intersect1d(matches, postings, assume_unique=True)
+            if len(matches) == 0:
+                break
+        for local_id in matches[::-1][:limit - len(hits)].tolist():
+            meeting_id, speaker, start, end, text = source.doc(local_id)
+            hits.append({"doc_id": source.doc_base + local_id, "meeting_id": meeting_id, "speaker": speaker, "start": start, "end": end, "text": text})
+        if len(hits) >= limit:
+            break
+    return hits
+
+class TranscriptIndex:
+    """
+    Full-text index over finalized transcript segments, built as they arrive. Added
+    segments are searchable at once from an in-memory segment, which is written out as an
+    immutable, memory mapped segment file every flush_docs docs or flush_interval_seconds.
+    A background thread writes the files and, when there are more than merge_factor
+    segments, merges the adjacent run with the fewest docs into one, so doc ids stay in
+    the order docs were added and searches touch few files. Postings are delta encoded doc
+    ids stored as variable length integers. segments.json names the live segments and is
+    replaced atomically, so a crash leaves either the old or the new set. One process
+    writes an index at a time; concurrent bots each write their own directory under a
+    shared root, which TranscriptIndexReader searches as one.
+    """
+    def __init__(self, directory="sample_program/out/transcript_index", flush_docs=2000, merge_factor=10, flush_interval_seconds=60):
+        self.directory = directory
+        self.flush_docs = flush_docs
+        self.merge_factor = merge_factor
+        # Other processes only see written segments, so a slow meeting is still flushed regularly
+        self.flush_interval_seconds = flush_interval_seconds
+        self.memory_since = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+        self.lock_file = open(os.path.join(directory, "write.lock"), "w")
+        try:
+            fcntl.flock(self.lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self.lock_file.close()
+            raise IOError(f"Transcript index {directory} is already open for writing by another process")
+
+        self.lock = threading.Lock()
+        self.manifest_path = os.path.join(directory, "segments.json")
+        manifest = {"segments": [], "next_doc_id": 0, "generation": 0}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path) as file:
+                manifest = json.load(file)
+        self.generation = manifest["generation"]
+        self.segments = [IndexSegment(os.path.join(directory, name)) for name in manifest["segments"]]
+        self.remove_unlisted_files(manifest["segments"])
+        self.memory_segment = MemorySegment(manifest["next_doc_id"])
+        # Flushed memory segments waiting for the background thread to write them
+        self.pending = []
+        self.tasks = queue.Queue()
+        self.thread = threading.Thread(target=self.run, name="transcript-index", daemon=True)
+        self.thread.start()
+
+    def remove_unlisted_files(self, listed):
+        for name in os.listdir(self.directory):
+            if name.endswith((".seg", ".tmp")) and name not in listed:
+                os.unlink(os.path.join(self.directory, name))
+
+    def add(self, meeting_id, text, start=None, end=None, speaker=None):
+        with self.lock:
+            if self.memory_segment.doc_count == 0:
+                self.memory_since = time.monotonic()
+            self.memory_segment.add((meeting_id, speaker, start, end, text))
+            if self.memory_segment.doc_count >= self.flush_docs or time.monotonic() - self.memory_since >= self.flush_interval_seconds:
+                self.flush_locked()
+
+    def flush(self):
+        with self.lock:
+            self.flush_locked()
+
+    def flush_locked(self):
+        segment = self.memory_segment
+        if segment.doc_count == 0:
+            return
+        self.pending.append(segment)
+        self.memory_segment = MemorySegment(segment.doc_base + segment.doc_count)
+        self.tasks.put(segment)
+
+    def next_path(self):
+        self.generation += 1
+        return os.path.join(self.directory, f"{self.generation:08d}.seg")
+
+    def write_manifest(self, segments):
+        manifest = {
+            "segments": [segment.name for segment in segments],
+            "next_doc_id": segments[-1].doc_base + segments[-1].doc_count if segments else 0,
+            "generation": self.generation,
+        }
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(manifest, file)
+        os.replace(temp_path, self.manifest_path)
+
+    def run(self):
+        while True:
+            memory_segment = self.tasks.get()
+            if memory_segment is None:
+                return
+            try:
+                path = self.next_path()
+                write_segment(path, memory_segment.doc_base, *memory_segment.freeze())
+                segment = IndexSegment(path)
+                with self.lock:
+                    self.segments = self.segments + [segment]
+                    self.pending.remove(memory_segment)
+                    self.write_manifest(self.segments)
+                if len(self.segments) > self.merge_factor:
+                    self.merge()
+            except Exception as e:
+                print(f"Error writing transcript index segment: {e}")
+
+    def merge(self):
+        """Merges the run of merge_factor adjacent segments with the fewest docs"""
+        segments = self.segments
+        sizes = [segment.doc_count for segment in segments]
+        begin = min(range(len(segments) - self.merge_factor + 1), key=lambda index: sum(sizes[index:index + self.merge_factor]))
+        run = segments[begin:begin + self.merge_factor]
+        doc_base = run[0].doc_base
+
+        names = {}
+        docs = []
+        texts = []
+        text_length = 0
+        term_ids = {}
+        posting_terms = []
+        postings = []
+        for segment in run:
+            # Remap the segment's name indexes and text offsets into the merged tables
+            name_map = np.array([names.setdefault(name, len(names)) for name in segment.names], dtype=np.uint32)
+            segment_docs = segment.docs.copy()
+            segment_docs["meeting"] = name_map[segment_docs["meeting"]]
+            segment_docs["speaker"] = name_map[segment_docs["speaker"]]
+            segment_docs["text_offset"] += text_length
+            docs.append(segment_docs)
+            segment_texts = segment.texts()
+            texts.append(segment_texts)
+            text_length += len(segment_texts)
+
+            term_map = np.array([term_ids.setdefault(term, len(term_ids)) for term in segment.terms()], dtype=np.int64)
+            posting_terms.append(np.repeat(term_map, segment.doc_freqs))
+            postings.append(segment.all_postings() + np.uint32(segment.doc_base - doc_base))
+
+        terms = sorted(term_ids)
+        # Merged term ids in sorted term order
+        rank = np.empty(len(terms), dtype=np.int64)
+        rank[[term_ids[term] for term in terms]] = np.arange(len(terms))
+        posting_terms = rank[np.concatenate(posting_terms)]
+        postings = np.concatenate(postings)
+        order = np.lexsort((postings, posting_terms))
+        doc_freqs = np.bincount(posting_terms, minlength=len(terms)).astype(np.uint32)
+
+        path = self.next_path()
+        write_segment(path, doc_base, list(names), np.concatenate(docs), b"".join(texts), terms, doc_freqs, postings[order])
+        merged = IndexSegment(path)
+        with self.lock:
+            # Flushes only append, so the run is still at the same place in the list
+            self.segments = self.segments[:begin] + [merged] + self.segments[begin + self.merge_factor:]
+            self.write_manifest(self.segments)
+        # Searches still holding the old segments keep their mappings of the unlinked files
+        for segment in run:
+            os.unlink(segment.path)
+
+    def search(self, query, limit=20):
+        """
+        Transcript segments containing every term of the query, newest first, as dicts with
+        the meeting id, speaker, start and end seconds and text
+        """
+        with self.lock:
+            sources = self.segments + self.pending + [self.memory_segment]
+        return search_sources(sources, query, limit)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "segments": len(self.segments),
+                "docs": self.memory_segment.doc_base + self.memory_segment.doc_count,
+                "bytes": sum(len(segment.memory) for segment in self.segments),
+            }
+
+    def close(self, timeout=30):
+        """Writes out everything added and waits for the background thread"""
+        self.flush()
+        self.tasks.put(None)
+        self.thread.join(timeout)
+        self.lock_file.close()
+
+class TranscriptIndexReader:
+    """
+    Searches every index under root as one, read only and without the write lock, so it
+    can run while bots are writing. Each subdirectory with a segments.json is one bot's
+    TranscriptIndex; a manifest is reread when it changes. Hits name their index and come
+    from the most recently written index first, newest first within it.
+    """
+    def __init__(self, root="sample_program/out/transcript_index"):
+        self.root = root
+        # index name: (manifest mtime, segments)
+        self.indexes = {}
+
+    def load(self, directory, manifest_path):
+        with open(manifest_path) as file:
+            manifest = json.load(file)
+        cached = {segment.name: segment for segment in self.indexes.get(os.path.basename(directory), (0, []))[1]}
+        return [cached.get(name) or IndexSegment(os.path.join(directory, name)) for name in manifest["segments"]]
+
+    def refresh(self):
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            names = []
+        indexes = {}
+        for name in names:
+            directory = os.path.join(self.root, name)
+            manifest_path = os.path.join(directory, "segments.json")
+            try:
+                mtime = os.stat(manifest_path).st_mtime
+            except OSError:
+                continue
+            cached = self.indexes.get(name)
+            if cached and cached[0] == mtime:
+                indexes[name] = cached
+                continue
+            try:
+                indexes[name] = (mtime, self.load(directory, manifest_path))
+            except (OSError, ValueError) as e:
+                # A merge can remove a listed segment between reading the manifest and opening it; the next refresh sees the new manifest
+                print(f"Error reading transcript index {directory}: {e}")
+                if cached:
+                    indexes[name] = cached
+        self.indexes = indexes
+
+    def search(self, query, limit=20):
+        self.refresh()
+        hits = []
+        for name, (mtime, segments) in sorted(self.indexes.items(), key=lambda item: item[1][0], reverse=True):
+            for hit in search_sources(segments, query, limit - len(hits)):
+                hit["index"] = name
+                hits.append(hit)
+            if len(hits) >= limit:
+                break
+        return hits
@@ -0,0 +1,171 @@
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+import cv2
+
+OUTPUT_FORMATS = {
+    # format: (file extension, cv2.imwrite params, color)
+    "jpeg": ("jpg", lambda quality: [cv2.IMWRITE_JPEG_QUALITY, quality], True),
+    "webp": ("webp", lambda quality: [cv2.IMWRITE_WEBP_QUALITY, quality], True),
+    "png": ("png", lambda quality: [cv2.IMWRITE_PNG_COMPRESSION, 1], True),
+    # Grayscale thumbnail straight from the Y plane, no color conversion at all
+    "y_thumbnail": ("jpg", lambda quality: [cv2.IMWRITE_JPEG_QUALITY, quality], False),
+}
+
+class FrameSampler:
+    """Decides which frames to capture: every Nth frame, a target frames per second, or one frame per interval"""
+    def __init__(self, every_n_frames=None, fps=None, interval_seconds=None):
+        if fps:
+            interval_seconds = 1 / fps
+        self.every_n_frames = every_n_frames
+        self.interval_seconds = interval_seconds
+        self.frame_count = 0
+        self.next_sample_at = 0
+
+    def should_sample(self, now=None):
+        self.frame_count += 1
+        if self.interval_seconds:
+            if now is None:
+                now = time.monotonic()
+            if now < self.next_sample_at:
+                return False
+            # Advance from the previous deadline so the rate does not drift with callback jitter
+            self.next_sample_at = max(self.next_sample_at + self.interval_seconds, now)
+            return True
+        return (self.frame_count - 1) % (self.every_n_frames or 1) == 0
+
+class VideoCapturePipeline:
+    """
+    Captures sampled video frames on a bounded pool of worker threads, so color
+    conversion and image encoding never run on the SDK renderer thread. Queued frames
+    are zero-copy views that hold a reference to the SDK frame, so the queue size also
+    bounds how many SDK frames are held. Frames that arrive while the queue is full are
+    dropped and counted. With make_change_detector, sampled frames that show the same
+    content as the last saved one of their stream are skipped before anything is queued.
+    Each stream, one per user_id, gets its own sampler and change detector from the make_
+    factories, so interleaved participants neither look like scene changes nor share a
+    frame count. Every saved frame is listed in index.jsonl with its stream and capture time.
+    """
+    def __init__(self, output_dir="sample_program/out/video_frames", make_sampler=None, output_format="jpeg", quality=85, max_width=None, workers=2, queue_size=8, make_change_detector=None):
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown video capture format {output_format}, expected one of {', '.join(OUTPUT_FORMATS)}")
+        self.output_dir = output_dir
+        self.make_sampler = make_sampler or (lambda: FrameSampler(every_n_frames=10))
+        self.output_format = output_format
+        self.extension, make_params, self.color = OUTPUT_FORMATS[output_format]
+        self.write_params = make_params(quality)
+        self.max_width = max_width
+        self.make_change_detector = make_change_detector
+        # user_id: [sampler, change detector]
+        self.streams = {}
+        self.index_path = os.path.join(output_dir, "index.jsonl")
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.lock = threading.Lock()
+        self.frame_number = 0
+        self.counts = {"received": 0, "sampled": 0, "unchanged": 0, "dropped": 0, "written": 0, "failed": 0}
+        self.last_reported_drops = 0
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.workers = [threading.Thread(target=self.worker_loop, name=f"video-capture-{i}", daemon=True) for i in range(workers)]
+        for worker in self.workers:
+            worker.start()
+
+    def stream(self, user_id):
+        stream = self.streams.get(user_id)
+        if stream is None:
+            stream = self.streams[user_id] = [self.make_sampler(), self.make_change_detector() if self.make_change_detector else None]
+        return stream
+
+    def submit(self, data, user_id=None):
+        """Called on the SDK renderer thread with a YUVRawDataI420. Only takes views and enqueues them."""
+        with self.lock:
+            self.counts["received"] += 1
+            sampler, change_detector = self.stream(user_id)
+            if not sampler.should_sample():
+                return False
+            self.counts["sampled"] += 1
+
+        y_plane = data.GetYPlaneView()
+        score = None
+        if change_detector:
+            # The score comes back with the decision, so it always belongs to this frame
+            score = change_detector.check(y_plane)
+            if score is None:
+                with self.lock:
+                    self.counts["unchanged"] += 1
+                return False
+
+        with self.lock:
+            frame_number = self.frame_number
+            self.frame_number += 1
+        frame = data.GetBufferView() if self.color else y_plane
+        try:
+            self.queue.put_nowait((frame_number, user_id, datetime.now(), data.GetTimeStamp(), score, data.GetStreamWidth(), data.GetStreamHeight(), frame))
+        except queue.Full:
+            with self.lock:
+                self.counts["dropped"] += 1
+            return False
+        return True
+
+    def convert(self, frame, width, height):
+        if self.color:
+            image = cv2.cvtColor(frame, cv2.COLOR_YUV2BGR_I420)
+        else:
+            image = frame
+        if self.max_width and width > self.max_width:
+            scaled_height = max(1, round(height * self.max_width / width))
+            image = cv2.resize(image, (self.max_width, scaled_height), interpolation=cv2.INTER_AREA)
+        return image
+
+    def worker_loop(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            frame_number, user_id, captured_at, timestamp, score, width, height, frame = item
+            stream_part = "" if user_id is None else f"_{user_id}"
+            path = os.path.join(self.output_dir, f"output_{frame_number:06d}{stream_part}_{timestamp}.{self.extension}")
+            try:
+                ok = cv2.imwrite(path, self.convert(frame, width, height), self.write_params)
+            except Exception as e:
+                print(f"Error saving frame to {path}: {e}")
+                ok = False
+            # Drop the view now so the SDK frame is released without waiting for the next item
+            del frame, item
+            with self.lock:
+                self.counts["written" if ok else "failed"] += 1
+                if ok:
+                    self.write_index_entry({"path": os.path.basename(path), "user_id": user_id, "time": captured_at.isoformat(), "sdk_timestamp": timestamp, "score": score})
+
+    def write_index_entry(self, entry):
+        try:
+            with open(self.index_path, "a") as file:
+                file.write(json.dumps(entry) + "\n")
+        except IOError as e:
+            print(f"Error writing video capture index {self.index_path}: {e}")
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counts, queued=self.queue.qsize())
+
+    def report(self):
+        """Logs a summary line, meant to run from a GLib timeout. Returns True to keep the timeout running."""
+        stats = self.stats()
+        new_drops = stats["dropped"] - self.last_reported_drops
+        self.last_reported_drops = stats["dropped"]
+        print(f"Video capture {self.output_dir}: {stats['written']} written, {stats['sampled']} sampled of {stats['received']} frames, {stats['unchanged']} unchanged, {stats['dropped']} dropped ({new_drops} new), {stats['queued']} queued")
+        return True
+
+    def stop(self, timeout=5):
+        for _ in self.workers:
+            try:
+                self.queue.put(None, timeout=timeout)
+            except queue.Full:
+                break
+        for worker in self.workers:
+            worker.join(timeout)
+        self.report()
@@ -0,0 +1,212 @@
+import json
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from datetime import datetime, timedelta
+
+import cv2
+
+class VideoSegment:
+    """One container file being written, fed either through an ffmpeg pipe or cv2.VideoWriter"""
+    def __init__(self, path, width, height, fps, backend, ffmpeg_path, crf):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.backend = backend
+        self.frames = 0
+        self.process = None
+        self.writer = None
+        if backend == "ffmpeg":
+            # I420 goes straight into the encoder, no color conversion in Python
+            self.process = subprocess.Popen(
+                [ffmpeg_path, "-loglevel", "error", "-y",
+                 "-f", "rawvideo", "-pix_fmt", "yuv420p", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+                 "-c:v", "libx264", "-preset", "veryfast", "-crf", str(crf), "-pix_fmt", "yuv420p",
+                 "-movflags", "+frag_keyframe+empty_moov", path],
+                stdin=subprocess.PIPE,
+            )
+        else:
+            self.writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+            if not self.writer.isOpened():
+                raise IOError(f"cv2.VideoWriter could not open {path}")
+
+    def write(self, frame):
+        if self.process:
+            self.process.stdin.write(frame)
+        else:
+            self.writer.write(cv2.cvtColor(frame, cv2.COLOR_YUV2BGR_I420))
+        self.frames += 1
+
+    def close(self):
+        if self.process:
+            self.process.stdin.close()
+            self.process.wait()
+        else:
+            self.writer.release()
+
+    def abandon(self):
+        """Closes the segment after a failed write without raising, and reaps ffmpeg so it does not linger"""
+        try:
+            if self.process:
+                self.process.stdin.close()
+            else:
+                self.writer.release()
+        except Exception:
+            pass
+        if self.process:
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+class SegmentedVideoRecorder:
+    """
+    Records I420 frames into rotating video segments on a writer thread. Frames are placed
+    on a constant frame rate timeline by their capture timestamps: a frame is repeated to
+    fill a gap and skipped when its slot is already filled. Every finished segment is
+    appended to index.jsonl with its start and end times, so recordings can be lined up
+    with transcripts. Frames that arrive while the queue is full are dropped and counted.
+    """
+    def __init__(self, output_dir="sample_program/out/video_recording", fps=15, segment_seconds=60, backend=None, ffmpeg_path="ffmpeg", crf=28, queue_size=30):
+        if backend is None:
+            backend = "ffmpeg" if shutil.which(ffmpeg_path) else "opencv"
+        if backend not in ("ffmpeg", "opencv"):
+            raise ValueError(f"Unknown video recording backend {backend}, expected ffmpeg or opencv")
+        self.output_dir = output_dir
+        self.fps = fps
+        self.segment_seconds = segment_seconds
+        self.backend = backend
+        self.ffmpeg_path = ffmpeg_path
+        self.crf = crf
+        self.index_path = os.path.join(output_dir, "index.jsonl")
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.lock = threading.Lock()
+        self.counts = {"received": 0, "queue_dropped": 0, "written": 0, "repeated": 0, "skipped": 0, "segments": 0}
+
+        self.segment = None
+        self.segment_number = 0
+        self.segment_start = None
+        self.segment_wallclock = None
+        # Maps time.monotonic() capture timestamps to wall clock times for the index
+        self.wallclock_origin = datetime.now() - timedelta(seconds=time.monotonic())
+        self.first_sdk_timestamp = None
+        self.last_sdk_timestamp = None
+        self.last_frame = None
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.thread = threading.Thread(target=self.writer_loop, name="video-recorder", daemon=True)
+        self.thread.start()
+
+    def submit(self, data, timestamp=None):
+        """Called on the SDK renderer thread with a YUVRawDataI420 and its time.monotonic() capture time. Only takes a view and enqueues it."""
+        if timestamp is None:
+            timestamp = time.monotonic()
+        item = (timestamp, data.GetTimeStamp(), data.GetStreamWidth(), data.GetStreamHeight(), data.GetBufferView())
+        with self.lock:
+            self.counts["received"] += 1
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            with self.lock:
+                self.counts["queue_dropped"] += 1
+            return False
+        return True
+
+    def start_segment(self, timestamp, width, height):
+        path = os.path.join(self.output_dir, f"segment_{self.segment_number:05d}.mp4")
+        self.segment = VideoSegment(path, width, height, self.fps, self.backend, self.ffmpeg_path, self.crf)
+        self.segment_number += 1
+        self.segment_start = timestamp
+        self.segment_wallclock = self.wallclock_origin + timedelta(seconds=timestamp)
+        self.first_sdk_timestamp = None
+
+    def finish_segment(self):
+        if not self.segment:
+            return
+        self.segment.close()
+        duration = self.segment.frames / self.fps
+        entry = {
+            "path": os.path.basename(self.segment.path),
+            "start": self.segment_wallclock.isoformat(),
+            "end": (self.segment_wallclock + timedelta(seconds=duration)).isoformat(),
+            "duration_seconds": duration,
+            "frames": self.segment.frames,
+            "fps": self.fps,
+            "width": self.segment.width,
+            "height": self.segment.height,
+            "first_sdk_timestamp": self.first_sdk_timestamp,
+            "last_sdk_timestamp": self.last_sdk_timestamp,
+            "bytes": os.path.getsize(self.segment.path) if os.path.exists(self.segment.path) else 0,
+        }
+        try:
+            with open(self.index_path, "a") as file:
+                file.write(json.dumps(entry) + "\n")
+        except IOError as e:
+            print(f"Error writing video segment index {self.index_path}: {e}")
+        with self.lock:
+            self.counts["segments"] += 1
+        self.segment = None
+        self.last_frame = None
+
+    def write_frame(self, timestamp, sdk_timestamp, width, height, frame):
+        if self.segment and (width != self.segment.width or height != self.segment.height or timestamp - self.segment_start >= self.segment_seconds):
+            self.finish_segment()
+        if not self.segment:
+            self.start_segment(timestamp, width, height)
+
+        # Slot of this frame on the segment's constant frame rate timeline
+        slot = round((timestamp - self.segment_start) * self.fps)
+        if slot < self.segment.frames:
+            with self.lock:
+                self.counts["skipped"] += 1
+            return
+
+        repeats = 0
+        while self.last_frame is not None and self.segment.frames < slot:
+            self.segment.write(self.last_frame)
+            repeats += 1
+        self.segment.write(frame)
+        self.last_frame = frame
+        if self.first_sdk_timestamp is None:
+            self.first_sdk_timestamp = sdk_timestamp
+        self.last_sdk_timestamp = sdk_timestamp
+        with self.lock:
+            self.counts["written"] += 1
+            self.counts["repeated"] += repeats
+
+    def writer_loop(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            try:
+                self.write_frame(*item)
+            except Exception as e:
+                # Any failure abandons the segment but keeps the thread draining the queue, so stop() never waits on a full one
+                print(f"Error recording video frame: {e}")
+                if self.segment:
+                    self.segment.abandon()
+                self.segment = None
+                self.last_frame = None
+            del item
+        try:
+            self.finish_segment()
+        except Exception as e:
+            print(f"Error finishing video segment: {e}")
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counts, queued=self.queue.qsize(), backend=self.backend)
+
+    def stop(self, timeout=10):
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self.thread.join(timeout)
+        stats = self.stats()
+        print(f"Video recording: {stats['segments']} segments, {stats['written']} frames written, {stats['repeated']} repeated, {stats['skipped']} skipped, {stats['queue_dropped']} dropped")
@@ -0,0 +1,162 @@
+import zoom_meeting_sdk as zoom
+import math
+import time
+
+import gi
+gi.require_version('GLib', '2.0')
+from gi.repository import GLib
+
+# Lowest to highest; streams move along this ladder one step at a time
+RESOLUTION_LADDER = [
+    zoom.ZoomSDKResolution_90P,
+    zoom.ZoomSDKResolution_180P,
+    zoom.ZoomSDKResolution_360P,
+    zoom.ZoomSDKResolution_720P,
+    zoom.ZoomSDKResolution_1080P,
+]
+
+def window_percentile(previous, current, fraction):
+    """Percentile in microseconds of the calls recorded between two CallbackPerformanceData snapshots of one collector"""
+    counts = [now - before for now, before in zip(current.processingTimeBinCounts, previous.processingTimeBinCounts)]
+    calls = sum(counts)
+    if calls == 0:
+        return 0
+    target = max(1, math.ceil(fraction * calls))
+    seen = 0
+    for index, count in enumerate(counts):
+        seen += count
+        if seen >= target:
+            return zoom.CallbackPerformanceData.getBinUpperBound(index)
+    return current.maxProcessingTimeMicroseconds
+
+class RendererStream:
+    """One pooled renderer and the user it is currently subscribed to, if any"""
+    def __init__(self, pool, collect_performance_data):
+        self.user_id = None
+        self.last_active = 0
+        self.resolution_index = pool.max_resolution_index
+        self.delegate = zoom.ZoomSDKRendererDelegateCallbacks(onRawDataFrameReceivedCallback=lambda data: pool.on_frame(data, self.user_id), collectPerformanceData=collect_performance_data)
+        self.renderer = zoom.createRenderer(self.delegate)
+        self.performance_snapshot = self.delegate.getPerformanceData()
+
+class ActiveSpeakerRendererPool:
+    """
+    Subscribes renderers to the most recent active speakers, up to max_streams at once.
+    A new speaker takes a free renderer, or the one of the least recently active speaker.
+    Streams of speakers silent for idle_seconds are unsubscribed, so the SDK stops decoding
+    them. Every check_interval_seconds the pool compares process CPU and each stream's p99
+    frame callback time with their budgets: over budget, the highest resolution stream
+    steps down one resolution; comfortably under budget for several checks in a row, the
+    lowest one steps back up.
+    """
+    def __init__(self, on_frame, max_streams=2, max_resolution=zoom.ZoomSDKResolution_720P, min_resolution=zoom.ZoomSDKResolution_180P, idle_seconds=30, cpu_budget_cores=1.0, callback_p99_budget_us=20000, check_interval_seconds=5, excluded_user_ids=(), collect_performance_data=True):
+        self.on_frame = on_frame
+        self.max_streams = max_streams
+        self.max_resolution_index = RESOLUTION_LADDER.index(max_resolution)
+        self.min_resolution_index = RESOLUTION_LADDER.index(min_resolution)
+        self.idle_seconds = idle_seconds
+        self.cpu_budget_cores = cpu_budget_cores
+        self.callback_p99_budget_us = callback_p99_budget_us
+        self.check_interval_seconds = check_interval_seconds
+        self.excluded_user_ids = set(excluded_user_ids)
+        self.collect_performance_data = collect_performance_data
+        self.streams = []
+        self.primary_user_id = None
+        self.good_checks = 0
+        self.timeout_id = None
+        self.last_check_wall = time.monotonic()
+        self.last_check_cpu = time.process_time()
+
+    def start(self):
+        if self.timeout_id is None:
+            self.timeout_id = GLib.timeout_add_seconds(self.check_interval_seconds, self.check)
+
+    def stop(self):
+        if self.timeout_id is not None:
+            GLib.source_remove(self.timeout_id)
+            self.timeout_id = None
+        for stream in self.streams:
+            if stream.user_id is not None:
+                stream.renderer.unSubscribe()
+                stream.user_id = None
+
+    def stream_for(self, user_id):
+        for stream in self.streams:
+            if stream.user_id == user_id:
+                return stream
+        return None
+
+    def subscribe(self, stream, user_id):
+        if stream.user_id is not None:
+            stream.renderer.unSubscribe()
+        stream.user_id = user_id
+        stream.renderer.setRawDataResolution(RESOLUTION_LADDER[stream.resolution_index])
+        result = stream.renderer.subscribe(user_id, zoom.ZoomSDKRawDataType.RAW_DATA_TYPE_VIDEO)
+        if result != zoom.SDKERR_SUCCESS:
+            print(f"Failed to subscribe renderer to user {user_id}: {result}")
+            stream.user_id = None
+
+    def on_active_speakers(self, user_ids):
+        """Call with the user ids from onUserActiveAudioChangeCallback"""
+        now = time.monotonic()
+        for user_id in user_ids:
+            if user_id in self.excluded_user_ids:
+                continue
+            self.primary_user_id = user_id
+            stream = self.stream_for(user_id)
+            if stream is None:
+                stream = next((stream for stream in self.streams if stream.user_id is None), None)
+                if stream is None and len(self.streams) < self.max_streams:
+                    stream = RendererStream(self, self.collect_performance_data)
+                    self.streams.append(stream)
+                if stream is None:
+                    stream = min(self.streams, key=lambda stream: stream.last_active)
+                self.subscribe(stream, user_id)
+            stream.last_active = now
+
+    def set_resolution(self, stream, resolution_index):
+        stream.resolution_index = resolution_index
+        stream.renderer.setRawDataResolution(RESOLUTION_LADDER[resolution_index])
+        print(f"Renderer for user {stream.user_id} now at {RESOLUTION_LADDER[resolution_index]}")
+
+    def check(self):
+        now = time.monotonic()
+        cpu = time.process_time()
+        cpu_cores = (cpu - self.last_check_cpu) / max(now - self.last_check_wall, 1e-6)
+        self.last_check_wall = now
+        self.last_check_cpu = cpu
+
+        active = []
+        worst_p99_us = 0
+        for stream in self.streams:
+            snapshot = stream.delegate.getPerformanceData()
+            p99_us = window_percentile(stream.performance_snapshot, snapshot, 0.99)
+            stream.performance_snapshot = snapshot
+            if stream.user_id is None:
+                continue
+            if now - stream.last_active > self.idle_seconds:
+                stream.renderer.unSubscribe()
+                stream.user_id = None
+                continue
+            active.append(stream)
+            worst_p99_us = max(worst_p99_us, p99_us)
+
+        if not active:
+            return True
+        if cpu_cores > self.cpu_budget_cores or worst_p99_us > self.callback_p99_budget_us:
+            self.good_checks = 0
+            stream = max(active, key=lambda stream: stream.resolution_index)
+            if stream.resolution_index > self.min_resolution_index:
+                self.set_resolution(stream, stream.resolution_index - 1)
+        elif cpu_cores < self.cpu_budget_cores / 2 and worst_p99_us < self.callback_p99_budget_us / 2:
+            # Step up slowly, so a stream does not flap between two resolutions
+            self.good_checks += 1
+            stream = min(active, key=lambda stream: stream.resolution_index)
+            if self.good_checks >= 3 and stream.resolution_index < self.max_resolution_index:
+                self.set_resolution(stream, stream.resolution_index + 1)
+                self.good_checks = 0
+        else:
+            self.good_checks = 0
+
+        # Keep the GLib timeout running
+        return True
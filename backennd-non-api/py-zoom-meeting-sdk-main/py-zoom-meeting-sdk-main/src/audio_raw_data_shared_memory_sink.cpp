@@ -0,0 +1,138 @@
+#include <nanobind/nanobind.h>
+#include <nanobind/stl/string.h>
+
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+#include <cerrno>
+#include <cstring>
+#include <new>
+#include <stdexcept>
+
+#include "audio_raw_data_shared_memory_sink.h"
+
+namespace nb = nanobind;
+using namespace std;
+
+static uint64_t roundUpToPowerOfTwo(uint64_t value) {
+    uint64_t result = 1;
+    while (result < value)
+        result <<= 1;
+    return result;
+}
+
+static string systemError(const string& action, const string& name) {
+    return action + " " + name + " failed: " + strerror(errno);
+}
+
+AudioRawDataSharedMemorySink::AudioRawDataSharedMemorySink(const string& name, size_t capacityBytes)
+    : m_name(name[0] == '/' ? name : "/" + name),
+      m_fd(-1),
+      m_memory(nullptr),
+      m_capacity(roundUpToPowerOfTwo(capacityBytes < 4096 ? 4096 : capacityBytes)),
+      m_writePosition(0),
+      m_unlinked(false) {
+    m_mappingSize = AUDIO_RING_DATA_OFFSET + m_capacity;
+
+    m_fd = shm_open(m_name.c_str(), O_CREAT | O_RDWR | O_TRUNC, 0600);
+    if (m_fd < 0)
+        throw runtime_error(systemError("shm_open", m_name));
+    if (ftruncate(m_fd, (off_t) m_mappingSize) != 0) {
+        string error = systemError("ftruncate", m_name);
+        close(m_fd);
+        shm_unlink(m_name.c_str());
+        throw runtime_error(error);
+    }
+    void* memory = mmap(nullptr, m_mappingSize, PROT_READ | PROT_WRITE, MAP_SHARED, m_fd, 0);
+    if (memory == MAP_FAILED) {
+        string error = systemError("mmap", m_name);
+        close(m_fd);
+        shm_unlink(m_name.c_str());
+        throw runtime_error(error);
+    }
+    m_memory = static_cast<uint8_t*>(memory);
+
+    m_sharedWritePosition = new (m_memory + 64) atomic<uint64_t>(0);
+    m_writtenChunks = new (m_memory + 72) atomic<uint64_t>(0);
+    m_droppedChunks = new (m_memory + 80) atomic<uint64_t>(0);
+    m_droppedBytes = new (m_memory + 88) atomic<uint64_t>(0);
+    m_sharedReadPosition = new (m_memory + 128) atomic<uint64_t>(0);
+
+    uint32_t magic = AUDIO_RING_MAGIC;
+    uint32_t version = AUDIO_RING_VERSION;
+    uint64_t dataOffset = AUDIO_RING_DATA_OFFSET;
+    uint32_t recordHeaderSize = AUDIO_RING_RECORD_HEADER_SIZE;
+    memcpy(m_memory + 4, &version, sizeof(version));
+    memcpy(m_memory + 8, &m_capacity, sizeof(m_capacity));
+    memcpy(m_memory + 16, &dataOffset, sizeof(dataOffset));
+    memcpy(m_memory + 24, &recordHeaderSize, sizeof(recordHeaderSize));
+    // Readers check the magic last, so they never attach to a half initialized ring
+    atomic_thread_fence(memory_order_release);
+    memcpy(m_memory, &magic, sizeof(magic));
+}
+
+AudioRawDataSharedMemorySink::~AudioRawDataSharedMemorySink() {
+    if (m_memory)
+        munmap(m_memory, m_mappingSize);
+    if (m_fd >= 0)
+        close(m_fd);
+    unlink();
+}
+
+void AudioRawDataSharedMemorySink::unlink() {
+    lock_guard<mutex> guard(m_writeLock);
+    if (m_unlinked)
+        return;
+    shm_unlink(m_name.c_str());
+    m_unlinked = true;
+}
+
+void AudioRawDataSharedMemorySink::copyIn(uint64_t position, const void* data, size_t len) {
+    uint8_t* base = m_memory + AUDIO_RING_DATA_OFFSET;
+    size_t offset = position & (m_capacity - 1);
+    size_t first = min(len, (size_t) (m_capacity - offset));
+    memcpy(base + offset, data, first);
+    if (first < len)
+        memcpy(base, static_cast<const uint8_t*>(data) + first, len - first);
+}
+
+bool AudioRawDataSharedMemorySink::write(const char* data, uint32_t len, uint32_t nodeId, uint64_t timeStamp, uint32_t sampleRate, uint16_t channelNum, AudioRawDataSource source) {
+    lock_guard<mutex> guard(m_writeLock);
+    uint64_t recordSize = (AUDIO_RING_RECORD_HEADER_SIZE + (uint64_t) len + 7) & ~(uint64_t) 7;
+    uint64_t readPosition = m_sharedReadPosition->load(memory_order_acquire);
+    if (m_capacity - (m_writePosition - readPosition) < recordSize) {
+        m_droppedChunks->fetch_add(1, memory_order_relaxed);
+        m_droppedBytes->fetch_add(len, memory_order_relaxed);
+        return false;
+    }
+
+    uint8_t header[AUDIO_RING_RECORD_HEADER_SIZE];
+    uint16_t sourceValue = source;
+    memcpy(header, &len, 4);
+    memcpy(header + 4, &nodeId, 4);
+    memcpy(header + 8, &timeStamp, 8);
+    memcpy(header + 16, &sampleRate, 4);
+    memcpy(header + 20, &channelNum, 2);
+    memcpy(header + 22, &sourceValue, 2);
+    copyIn(m_writePosition, header, sizeof(header));
+    copyIn(m_writePosition + sizeof(header), data, len);
+
+    m_writePosition += recordSize;
+    m_sharedWritePosition->store(m_writePosition, memory_order_release);
+    m_writtenChunks->fetch_add(1, memory_order_relaxed);
+    return true;
+}
+
+void init_audio_raw_data_shared_memory_sink(nb::module_ &m) {
+    nb::class_<AudioRawDataSharedMemorySink>(m, "AudioRawDataSharedMemorySink")
+        .def(nb::init<const string&, size_t>(), nb::arg("name"), nb::arg("capacityBytes") = 16 * 1024 * 1024)
+        .def("getName", &AudioRawDataSharedMemorySink::getName)
+        .def("getCapacity", &AudioRawDataSharedMemorySink::getCapacity)
+        .def("getWrittenChunks", &AudioRawDataSharedMemorySink::getWrittenChunks)
+        .def("getDroppedChunks", &AudioRawDataSharedMemorySink::getDroppedChunks)
+        .def("getDroppedBytes", &AudioRawDataSharedMemorySink::getDroppedBytes)
+        .def("getPendingBytes", &AudioRawDataSharedMemorySink::getPendingBytes)
+        .def("unlink", &AudioRawDataSharedMemorySink::unlink);
+}
@@ -0,0 +1,95 @@
+#ifndef AUDIO_RAW_DATA_SHARED_MEMORY_SINK_H
+#define AUDIO_RAW_DATA_SHARED_MEMORY_SINK_H
+
+#include <atomic>
+#include <cstddef>
+#include <cstdint>
+#include <mutex>
+#include <string>
+
+using namespace std;
+
+/*
+Shared memory layout, read by sample_program/audio_ring_reader.py. All integers are
+little endian. Positions count bytes written since the ring was created, so the
+offset of a position in the data area is position % capacity.
+
+    0   uint32 magic ("ZARB")
+    4   uint32 version
+    8   uint64 capacity, a power of two
+    16  uint64 data offset
+    24  uint32 record header size
+    64  uint64 write position, published by the producer after a record is complete
+    72  uint64 written chunks
+    80  uint64 dropped chunks
+    88  uint64 dropped bytes
+    128 uint64 read position, published by the consumer after it consumed a record
+
+Each record is a header followed by the PCM payload, padded to 8 bytes. Records wrap
+around the end of the data area byte by byte.
+
+    0   uint32 payload length
+    4   uint32 node id
+    8   uint64 SDK timestamp
+    16  uint32 sample rate
+    20  uint16 channel count
+    22  uint16 source (AudioRawDataSource)
+*/
+#define AUDIO_RING_MAGIC 0x4252415A
+#define AUDIO_RING_VERSION 1
+#define AUDIO_RING_DATA_OFFSET 256
+#define AUDIO_RING_RECORD_HEADER_SIZE 24
+
+enum AudioRawDataSource : uint16_t {
+    AUDIO_RAW_DATA_SOURCE_ONE_WAY = 0,
+    AUDIO_RAW_DATA_SOURCE_MIXED = 1,
+    AUDIO_RAW_DATA_SOURCE_SHARE = 2,
+};
+
+/*
+Single producer, single consumer ring of audio chunks in POSIX shared memory, so
+transcription, recording or analytics can run in other processes. The consumer side is
+lock-free and the producer never waits on it: when the consumer falls behind, chunks that
+do not fit are dropped and counted as overruns. The SDK does not promise that mixed,
+one-way and share audio arrive on one thread, so writers in this process are serialized
+by a mutex, which is uncontended when they do.
+*/
+class AudioRawDataSharedMemorySink {
+private:
+    string m_name;
+    int m_fd;
+    uint8_t* m_memory;
+    size_t m_mappingSize;
+    uint64_t m_capacity;
+    uint64_t m_writePosition;
+    mutex m_writeLock;
+    bool m_unlinked;
+
+    atomic<uint64_t>* m_sharedWritePosition;
+    atomic<uint64_t>* m_writtenChunks;
+    atomic<uint64_t>* m_droppedChunks;
+    atomic<uint64_t>* m_droppedBytes;
+    atomic<uint64_t>* m_sharedReadPosition;
+
+    void copyIn(uint64_t position, const void* data, size_t len);
+
+public:
+    AudioRawDataSharedMemorySink(const string& name, size_t capacityBytes);
+    ~AudioRawDataSharedMemorySink();
+    AudioRawDataSharedMemorySink(const AudioRawDataSharedMemorySink&) = delete;
+    AudioRawDataSharedMemorySink& operator=(const AudioRawDataSharedMemorySink&) = delete;
+
+    bool write(const char* data, uint32_t len, uint32_t nodeId, uint64_t timeStamp, uint32_t sampleRate, uint16_t channelNum, AudioRawDataSource source);
+    // Removes the name from /dev/shm; attached readers keep their mapping. Called on cleanup,
+    // since the runner exits with os._exit and the destructor may never run.
+    void unlink();
+
+    const string& getName() const { return m_name; }
+    uint64_t getCapacity() const { return m_capacity; }
+    uint64_t getWrittenChunks() const { return m_writtenChunks->load(memory_order_relaxed); }
+    uint64_t getDroppedChunks() const { return m_droppedChunks->load(memory_order_relaxed); }
+    uint64_t getDroppedBytes() const { return m_droppedBytes->load(memory_order_relaxed); }
+    uint64_t getPendingBytes() const { return m_writePosition - m_sharedReadPosition->load(memory_order_acquire); }
+};
+
+#endif
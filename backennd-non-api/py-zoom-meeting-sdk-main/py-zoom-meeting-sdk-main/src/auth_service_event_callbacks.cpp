@@ -12,6 +12,8 @@
 #include <functional>
 #include <memory>
 
+#include "utilities.h"
+
 namespace nb = nanobind;
 using namespace std;
 using namespace ZOOMSDK;
@@ -23,42 +25,53 @@ private:
     function<void()> m_onLogoutCallback;
     function<void()> m_onZoomIdentityExpiredCallback;
     function<void()> m_onZoomAuthIdentityExpiredCallback;
+    CallbackPerformanceCollector m_performance;
 public:
     AuthServiceEventCallbacks(
         const function<void(ZOOM_SDK_NAMESPACE::AuthResult)> & onAuthenticationReturnCallback = nullptr,
         const function<void(ZOOM_SDK_NAMESPACE::LOGINSTATUS ret, ZOOM_SDK_NAMESPACE::IAccountInfo* pAccountInfo, ZOOM_SDK_NAMESPACE::LoginFailReason reason)> & onLoginReturnWithReasonCallback = nullptr,
         const function<void()> & onLogoutCallback = nullptr,
         const function<void()> & onZoomIdentityExpiredCallback = nullptr,
-        const function<void()> & onZoomAuthIdentityExpiredCallback = nullptr
+        const function<void()> & onZoomAuthIdentityExpiredCallback = nullptr,
+        bool collectPerformanceData = false
     ) : m_onAuthenticationReturnCallback(onAuthenticationReturnCallback),
         m_onLoginReturnWithReasonCallback(onLoginReturnWithReasonCallback),
         m_onLogoutCallback(onLogoutCallback),
         m_onZoomIdentityExpiredCallback(onZoomIdentityExpiredCallback),
-        m_onZoomAuthIdentityExpiredCallback(onZoomAuthIdentityExpiredCallback) {}
+        m_onZoomAuthIdentityExpiredCallback(onZoomAuthIdentityExpiredCallback),
+        m_performance("AuthServiceEventCallbacks", collectPerformanceData) {}
 
     void onAuthenticationReturn(ZOOM_SDK_NAMESPACE::AuthResult ret) override {
         if (m_onAuthenticationReturnCallback)
-            m_onAuthenticationReturnCallback(ret);
+            m_performance.invoke(m_onAuthenticationReturnCallback, ret);
     }
 
     void onLoginReturnWithReason(ZOOM_SDK_NAMESPACE::LOGINSTATUS ret, ZOOM_SDK_NAMESPACE::IAccountInfo* pAccountInfo, ZOOM_SDK_NAMESPACE::LoginFailReason reason) override {
         if (m_onLoginReturnWithReasonCallback)
-            m_onLoginReturnWithReasonCallback(ret, pAccountInfo, reason);
+            m_performance.invoke(m_onLoginReturnWithReasonCallback, ret, pAccountInfo, reason);
     }
 
     void onLogout() override {
         if (m_onLogoutCallback)
-            m_onLogoutCallback();
+            m_performance.invoke(m_onLogoutCallback);
     }
 
     void onZoomIdentityExpired() override {
         if (m_onZoomIdentityExpiredCallback)
-            m_onZoomIdentityExpiredCallback();
+            m_performance.invoke(m_onZoomIdentityExpiredCallback);
     }
 
     void onZoomAuthIdentityExpired() override {
         if (m_onZoomAuthIdentityExpiredCallback)
-            m_onZoomAuthIdentityExpiredCallback();
+            m_performance.invoke(m_onZoomAuthIdentityExpiredCallback);
+    }
+
+    CallbackPerformanceData getPerformanceData() const {
+        return m_performance.getData();
+    }
+
+    void resetPerformanceData() {
+        m_performance.reset();
     }
 };
 
@@ -70,14 +83,18 @@ void init_auth_service_event_callbacks(nb::module_ &m) {
             function<void(ZOOM_SDK_NAMESPACE::LOGINSTATUS,ZOOM_SDK_NAMESPACE::IAccountInfo*,ZOOM_SDK_NAMESPACE::LoginFailReason)>&,
             function<void()>&,
             function<void()>&,
-            function<void()>&
+            function<void()>&,
+            bool
         >(),
         nb::arg("onAuthenticationReturnCallback") = nullptr,
         nb::arg("onLoginReturnWithReasonCallback") = nullptr,
         nb::arg("onLogoutCallback") = nullptr,
         nb::arg("onZoomIdentityExpiredCallback") = nullptr,
-        nb::arg("onZoomAuthIdentityExpiredCallback") = nullptr
-    );
+        nb::arg("onZoomAuthIdentityExpiredCallback") = nullptr,
+        nb::arg("collectPerformanceData") = false
+    )
+    .def("getPerformanceData", &AuthServiceEventCallbacks::getPerformanceData)
+    .def("resetPerformanceData", &AuthServiceEventCallbacks::resetPerformanceData);
 
     /*
     .def("onAuthenticationReturn", &AuthServiceEventCallbacks::onAuthenticationReturn)
@@ -38,6 +38,8 @@
 #include <functional>
 #include <memory>
 
+#include "utilities.h"
+
 namespace nb = nanobind;
 using namespace ZOOMSDK;
 
@@ -60,7 +62,9 @@ void init_rawdata_audio_helper_interface_binding(nb::module_ &m) {
         .def("onMicUninitialized", &ZOOM_SDK_NAMESPACE::IZoomSDKVirtualAudioMicEvent::onMicUninitialized);
 
     nb::class_<ZOOM_SDK_NAMESPACE::IZoomSDKAudioRawDataSender>(m, "IZoomSDKAudioRawDataSender")
-        .def("send", [](ZOOM_SDK_NAMESPACE::IZoomSDKAudioRawDataSender& self, nb::bytes data, int sample_rate, ZOOM_SDK_NAMESPACE::ZoomSDKAudioChannel channel) -> ZOOM_SDK_NAMESPACE::SDKError {
-            return self.send((char*) data.c_str(), data.size(), sample_rate, channel);
+        .def("send", [](ZOOM_SDK_NAMESPACE::IZoomSDKAudioRawDataSender& self, nb::handle data, int sample_rate, ZOOM_SDK_NAMESPACE::ZoomSDKAudioChannel channel) -> ZOOM_SDK_NAMESPACE::SDKError {
+            ContiguousBuffer buffer(data);
+            nb::gil_scoped_release release;
+            return self.send(buffer.data(), buffer.size(), sample_rate, channel);
         });
 }
\ No newline at end of file
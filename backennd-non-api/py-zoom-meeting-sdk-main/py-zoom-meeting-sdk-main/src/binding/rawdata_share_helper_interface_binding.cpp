@@ -38,25 +38,66 @@
 #include <iostream>
 #include <functional>
 #include <memory>
+#include <vector>
+
+#include "utilities.h"
 
 namespace nb = nanobind;
 using namespace ZOOMSDK;
 
+#ifdef ZOOM_SDK_BENCHMARK_HELPERS
+/*
+IZoomSDKShareSender that copies frames into memory instead of sending them to a meeting,
+so the share send path can be benchmarked and exercised without joining one. Only built
+with the ZOOM_SDK_BUILD_BENCHMARK_HELPERS CMake option.
+*/
+class MemoryShareSender : public IZoomSDKShareSender {
+private:
+    std::vector<char> m_lastFrame;
+    uint64_t m_frameCount = 0;
+    uint64_t m_byteCount = 0;
+
+public:
+    SDKError sendShareFrame(char* frameBuffer, int width, int height, int frameLength, FrameDataFormat format) override {
+        m_lastFrame.assign(frameBuffer, frameBuffer + frameLength);
+        m_frameCount++;
+        m_byteCount += frameLength;
+        return SDKERR_SUCCESS;
+    }
+
+    uint64_t getFrameCount() const { return m_frameCount; }
+    uint64_t getByteCount() const { return m_byteCount; }
+    nb::bytes getLastFrame() const { return nb::bytes(m_lastFrame.data(), m_lastFrame.size()); }
+};
+#endif
+
 void init_rawdata_share_helper_interface_binding(nb::module_ &m) {
     nb::class_<ZOOM_SDK_NAMESPACE::IZoomSDKShareSourceHelper>(m, "IZoomSDKShareSourceHelper")
         .def("setExternalShareSource", &ZOOM_SDK_NAMESPACE::IZoomSDKShareSourceHelper::setExternalShareSource)
         .def("setSharePureAudioSource", &ZOOM_SDK_NAMESPACE::IZoomSDKShareSourceHelper::setSharePureAudioSource);
 
     nb::class_<ZOOM_SDK_NAMESPACE::IZoomSDKShareAudioSender>(m, "IZoomSDKShareAudioSender")
-        .def("send", [](ZOOM_SDK_NAMESPACE::IZoomSDKShareAudioSender& self, nb::bytes data, int sample_rate, ZOOM_SDK_NAMESPACE::ZoomSDKAudioChannel channel) -> ZOOM_SDK_NAMESPACE::SDKError {
-            return self.sendShareAudio((char*) data.c_str(), data.size(), sample_rate, channel);
+        .def("send", [](ZOOM_SDK_NAMESPACE::IZoomSDKShareAudioSender& self, nb::handle data, int sample_rate, ZOOM_SDK_NAMESPACE::ZoomSDKAudioChannel channel) -> ZOOM_SDK_NAMESPACE::SDKError {
+            ContiguousBuffer buffer(data);
+            nb::gil_scoped_release release;
+            return self.sendShareAudio(buffer.data(), buffer.size(), sample_rate, channel);
         });
 
     nb::class_<ZOOM_SDK_NAMESPACE::IZoomSDKShareSender>(m, "IZoomSDKShareSender")
-        .def("sendShareFrame", [](IZoomSDKShareSender& self, nb::bytes frameBuffer, int width, int height, FrameDataFormat format = FrameDataFormat_I420_FULL) -> SDKError {
-            return self.sendShareFrame((char*)frameBuffer.c_str(), width, height, frameBuffer.size(), format);
+        .def("sendShareFrame", [](IZoomSDKShareSender& self, nb::handle frameBuffer, int width, int height, FrameDataFormat format = FrameDataFormat_I420_FULL) -> SDKError {
+            ContiguousBuffer buffer(frameBuffer);
+            nb::gil_scoped_release release;
+            return self.sendShareFrame(buffer.data(), width, height, (int) buffer.size(), format);
         });
 
+#ifdef ZOOM_SDK_BENCHMARK_HELPERS
+    nb::class_<MemoryShareSender, IZoomSDKShareSender>(m, "MemoryShareSender")
+        .def(nb::init<>())
+        .def("getFrameCount", &MemoryShareSender::getFrameCount)
+        .def("getByteCount", &MemoryShareSender::getByteCount)
+        .def("getLastFrame", &MemoryShareSender::getLastFrame);
+#endif
+
     nb::class_<ZOOM_SDK_NAMESPACE::IZoomSDKShareSource>(m, "IZoomSDKShareSource")
         .def("onStartSend", &ZOOM_SDK_NAMESPACE::IZoomSDKShareSource::onStartSend)
         .def("onStopSend", &ZOOM_SDK_NAMESPACE::IZoomSDKShareSource::onStopSend);
@@ -39,6 +39,8 @@
 #include <functional>
 #include <memory>
 
+#include "utilities.h"
+
 namespace nb = nanobind;
 using namespace ZOOMSDK;
 
@@ -49,8 +51,10 @@ void init_rawdata_video_source_helper_interface_binding(nb::module_ &m) {
 
     // Bind IZoomSDKVideoSender
     nb::class_<IZoomSDKVideoSender>(m, "IZoomSDKVideoSender")
-        .def("sendVideoFrame", [](IZoomSDKVideoSender& self, nb::bytes frameBuffer, int width, int height, int rotation, FrameDataFormat format = FrameDataFormat_I420_FULL) -> SDKError {
-            return self.sendVideoFrame((char*)frameBuffer.c_str(), width, height, frameBuffer.size(), rotation, format);
+        .def("sendVideoFrame", [](IZoomSDKVideoSender& self, nb::handle frameBuffer, int width, int height, int rotation, FrameDataFormat format = FrameDataFormat_I420_FULL) -> SDKError {
+            ContiguousBuffer buffer(frameBuffer);
+            nb::gil_scoped_release release;
+            return self.sendVideoFrame(buffer.data(), width, height, (int) buffer.size(), rotation, format);
         });
 
     // Bind VideoSourceCapability
@@ -4,6 +4,7 @@
 #include <nanobind/stl/function.h>
 #include <nanobind/stl/shared_ptr.h>
 #include <nanobind/stl/unique_ptr.h>
+#include <nanobind/ndarray.h>
 
 #include "zoom_sdk.h"
 
@@ -37,20 +38,98 @@
 #include <iostream>
 #include <functional>
 #include <memory>
+#include <vector>
 
 namespace nb = nanobind;
 using namespace ZOOMSDK;
 
+#ifdef ZOOM_SDK_BENCHMARK_HELPERS
+/*
+AudioRawData that owns a copy of its PCM data, so the AudioRawData accessors and the audio
+delegate can be benchmarked outside of a meeting. Only built with the
+ZOOM_SDK_BUILD_BENCHMARK_HELPERS CMake option.
+*/
+class OwnedAudioRawData : public AudioRawData {
+private:
+    std::vector<char> m_buffer;
+    unsigned int m_sampleRate;
+    unsigned int m_channelNum;
+    unsigned long long m_timeStamp;
+
+public:
+    OwnedAudioRawData(nb::bytes buffer, unsigned int sampleRate, unsigned int channelNum, unsigned long long timeStamp)
+        : m_buffer(buffer.c_str(), buffer.c_str() + buffer.size()),
+          m_sampleRate(sampleRate),
+          m_channelNum(channelNum),
+          m_timeStamp(timeStamp) {}
+
+    bool CanAddRef() override { return false; }
+    bool AddRef() override { return false; }
+    int Release() override { return 0; }
+    char* GetBuffer() override { return m_buffer.data(); }
+    unsigned int GetBufferLen() override { return (unsigned int) m_buffer.size(); }
+    unsigned int GetSampleRate() override { return m_sampleRate; }
+    unsigned int GetChannelNum() override { return m_channelNum; }
+    unsigned long long GetTimeStamp() override { return m_timeStamp; }
+};
+#endif
+
+// AudioRawData exposes its PCM data through the buffer protocol, so memoryview(data),
+// file.write(data) or numpy.frombuffer(data, numpy.int16) read the SDK memory without a copy.
+// The SDK reuses the memory once the callback that delivered it returns, so views must
+// not be kept past the callback; use GetBuffer, which returns a copy, for data that is kept.
+static int audioRawDataGetBuffer(PyObject* exporter, Py_buffer* view, int flags) {
+    AudioRawData* self = nb::inst_ptr<AudioRawData>(exporter);
+    return PyBuffer_FillInfo(view, exporter, self->GetBuffer(), (Py_ssize_t) self->GetBufferLen(), 1, flags);
+}
+
+static PyType_Slot audioRawDataSlots[] = {
+    { Py_bf_getbuffer, (void *) audioRawDataGetBuffer },
+    { 0, nullptr }
+};
+
+typedef nb::ndarray<nb::numpy, const uint8_t, nb::ndim<2>, nb::c_contig> YUVPlaneView;
+
+// NumPy view of one plane of a frame. When the frame supports AddRef the view holds a
+// reference that is released once the array is garbage collected, so it can be kept past
+// the callback without a copy. Otherwise the array has no owner and NumPy gets a copy.
+static YUVPlaneView yuvPlaneView(YUVRawDataI420& frame, const char* data, size_t rows, size_t cols) {
+    nb::object owner;
+    if (frame.CanAddRef() && frame.AddRef()) {
+        owner = nb::capsule(&frame, [](void* p) noexcept {
+            static_cast<YUVRawDataI420*>(p)->Release();
+        });
+    }
+    return YUVPlaneView(reinterpret_cast<const uint8_t*>(data), { rows, cols }, owner);
+}
+
 void init_zoom_sdk_raw_data_def_interface_binding(nb::module_ &m) {
-    nb::class_<AudioRawData>(m, "AudioRawData")
+    nb::class_<AudioRawData>(m, "AudioRawData", nb::type_slots(audioRawDataSlots))
     .def("GetBuffer", [](AudioRawData& self) -> nb::bytes {
         return nb::bytes(self.GetBuffer(), self.GetBufferLen());
      })
+    .def("GetBufferView", [](nb::handle self) -> nb::object {
+        PyObject* view = PyMemoryView_FromObject(self.ptr());
+        if (!view)
+            throw nb::python_error();
+        return nb::steal(view);
+     })
     .def("GetBufferLen", &AudioRawData::GetBufferLen)
+    .def("__len__", &AudioRawData::GetBufferLen)
     .def("GetSampleRate", &AudioRawData::GetSampleRate)
     .def("GetChannelNum", &AudioRawData::GetChannelNum)
     .def("GetTimeStamp", &AudioRawData::GetTimeStamp);
 
+#ifdef ZOOM_SDK_BENCHMARK_HELPERS
+    nb::class_<OwnedAudioRawData, AudioRawData>(m, "OwnedAudioRawData")
+    .def(nb::init<nb::bytes, unsigned int, unsigned int, unsigned long long>(),
+        nb::arg("buffer"),
+        nb::arg("sampleRate"),
+        nb::arg("channelNum") = 1,
+        nb::arg("timeStamp") = 0
+    );
+#endif
+
     nb::class_<YUVRawDataI420>(m, "YUVRawDataI420")
         .def("CanAddRef", &YUVRawDataI420::CanAddRef)
         .def("AddRef", &YUVRawDataI420::AddRef)
@@ -70,6 +149,19 @@ void init_zoom_sdk_raw_data_def_interface_binding(nb::module_ &m) {
         .def("GetBuffer", [](YUVRawDataI420& self) -> nb::bytes {
             return nb::bytes(self.GetBuffer(), self.GetBufferLen());
         })
+        .def("GetYPlaneView", [](YUVRawDataI420& self) {
+            return yuvPlaneView(self, self.GetYBuffer(), self.GetStreamHeight(), self.GetStreamWidth());
+        })
+        .def("GetUPlaneView", [](YUVRawDataI420& self) {
+            return yuvPlaneView(self, self.GetUBuffer(), self.GetStreamHeight() / 2, self.GetStreamWidth() / 2);
+        })
+        .def("GetVPlaneView", [](YUVRawDataI420& self) {
+            return yuvPlaneView(self, self.GetVBuffer(), self.GetStreamHeight() / 2, self.GetStreamWidth() / 2);
+        })
+        .def("GetBufferView", [](YUVRawDataI420& self) {
+            // The whole I420 frame as a (height * 3 / 2, width) array, the layout cv2.COLOR_YUV2BGR_I420 expects
+            return yuvPlaneView(self, self.GetBuffer(), self.GetStreamHeight() * 3 / 2, self.GetStreamWidth());
+        })
         .def("GetBufferLen", &YUVRawDataI420::GetBufferLen)
         .def("GetAlphaBufferLen", &YUVRawDataI420::GetAlphaBufferLen)
         .def("IsLimitedI420", &YUVRawDataI420::IsLimitedI420)
@@ -38,6 +38,8 @@
 #include <functional>
 #include <memory>
 
+#include "utilities.h"
+
 namespace nb = nanobind;
 using namespace ZOOMSDK;
 using namespace std;
@@ -49,6 +51,7 @@ private:
     function<void(IRequestStartAudioHandler*)> m_onHostRequestStartAudioCallback;
     function<void(const zchar_t*)> m_onJoin3rdPartyTelephonyAudioCallback;
     function<void(bool)> m_onMuteOnEntryStatusChangeCallback;
+    CallbackPerformanceCollector m_performance;
 
 public:
     MeetingAudioCtrlEventCallbacks(
@@ -56,12 +59,14 @@ public:
         const function<void(vector<unsigned int>)>& onUserActiveAudioChangeCallback = nullptr,
         const function<void(IRequestStartAudioHandler*)>& onHostRequestStartAudioCallback = nullptr,
         const function<void(const zchar_t*)>& onJoin3rdPartyTelephonyAudioCallback = nullptr,
-        const function<void(bool)>& onMuteOnEntryStatusChangeCallback = nullptr
+        const function<void(bool)>& onMuteOnEntryStatusChangeCallback = nullptr,
+        bool collectPerformanceData = false
     ) : m_onUserAudioStatusChangeCallback(onUserAudioStatusChangeCallback),
         m_onUserActiveAudioChangeCallback(onUserActiveAudioChangeCallback),
         m_onHostRequestStartAudioCallback(onHostRequestStartAudioCallback),
         m_onJoin3rdPartyTelephonyAudioCallback(onJoin3rdPartyTelephonyAudioCallback),
-        m_onMuteOnEntryStatusChangeCallback(onMuteOnEntryStatusChangeCallback) {}
+        m_onMuteOnEntryStatusChangeCallback(onMuteOnEntryStatusChangeCallback),
+        m_performance("MeetingAudioCtrlEventCallbacks", collectPerformanceData) {}
 
     void onUserAudioStatusChange(IList<IUserAudioStatus*>* lstAudioStatusChange, const zchar_t* strAudioStatusList = NULL) override {
         if (m_onUserAudioStatusChangeCallback) {
@@ -73,7 +78,7 @@ public:
                     result.push_back(lstAudioStatusChange->GetItem(i));
                 }
             }
-            m_onUserAudioStatusChangeCallback(result, strAudioStatusList);
+            m_performance.invoke(m_onUserAudioStatusChangeCallback, result, strAudioStatusList);
         }
     }
 
@@ -87,23 +92,31 @@ public:
                     result.push_back(plstActiveAudio->GetItem(i));
                 }
             }
-            m_onUserActiveAudioChangeCallback(result);
+            m_performance.invoke(m_onUserActiveAudioChangeCallback, result);
         }
     }
 
     void onHostRequestStartAudio(IRequestStartAudioHandler* handler_) override {
         if (m_onHostRequestStartAudioCallback)
-            m_onHostRequestStartAudioCallback(handler_);
+            m_performance.invoke(m_onHostRequestStartAudioCallback, handler_);
     }
 
     void onJoin3rdPartyTelephonyAudio(const zchar_t* audioInfo) override {
         if (m_onJoin3rdPartyTelephonyAudioCallback)
-            m_onJoin3rdPartyTelephonyAudioCallback(audioInfo);
+            m_performance.invoke(m_onJoin3rdPartyTelephonyAudioCallback, audioInfo);
     }
 
     void onMuteOnEntryStatusChange(bool bEnabled) override {
         if (m_onMuteOnEntryStatusChangeCallback)
-            m_onMuteOnEntryStatusChangeCallback(bEnabled);
+            m_performance.invoke(m_onMuteOnEntryStatusChangeCallback, bEnabled);
+    }
+
+    CallbackPerformanceData getPerformanceData() const {
+        return m_performance.getData();
+    }
+
+    void resetPerformanceData() {
+        m_performance.reset();
     }
 };
 
@@ -114,12 +127,16 @@ void init_meeting_audio_ctrl_event_callbacks(nb::module_ &m) {
         const function<void(vector<unsigned int>)>&,
         const function<void(IRequestStartAudioHandler*)>&,
         const function<void(const zchar_t*)>&,
-        const function<void(bool)>&
+        const function<void(bool)>&,
+        bool
     >(),
         nb::arg("onUserAudioStatusChangeCallback") = nullptr,
         nb::arg("onUserActiveAudioChangeCallback") = nullptr,
         nb::arg("onHostRequestStartAudioCallback") = nullptr,
         nb::arg("onJoin3rdPartyTelephonyAudioCallback") = nullptr,
-        nb::arg("onMuteOnEntryStatusChangeCallback") = nullptr
-    );
+        nb::arg("onMuteOnEntryStatusChangeCallback") = nullptr,
+        nb::arg("collectPerformanceData") = false
+    )
+    .def("getPerformanceData", &MeetingAudioCtrlEventCallbacks::getPerformanceData)
+    .def("resetPerformanceData", &MeetingAudioCtrlEventCallbacks::resetPerformanceData);
 }
\ No newline at end of file
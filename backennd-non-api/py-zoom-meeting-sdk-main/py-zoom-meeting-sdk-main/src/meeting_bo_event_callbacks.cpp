@@ -10,6 +10,8 @@
 #include "meeting_service_interface.h"
 #include "meeting_service_components/meeting_breakout_rooms_interface_v2.h"
 
+#include "utilities.h"
+
 namespace nb = nanobind;
 using namespace std;
 using namespace ZOOMSDK;
@@ -32,6 +34,7 @@ private:
   function<void(BO_STATUS)> m_onBOStatusChangedCallback;
   function<void(const zchar_t*, const zchar_t*)> m_onBOSwitchRequestReceivedCallback;
   function<void(bool)> m_onBroadcastBOVoiceStatusCallback;
+  CallbackPerformanceCollector m_performance;
 
 public:
   MeetingBOEventCallbacks(
@@ -50,7 +53,8 @@ public:
     const function<void(const zchar_t*, IReturnToMainSessionHandler*)>& onHostInviteReturnToMainSessionCallback = nullptr,
     const function<void(BO_STATUS)>& onBOStatusChangedCallback = nullptr,
     const function<void(const zchar_t*, const zchar_t*)>& onBOSwitchRequestReceivedCallback = nullptr,
-    const function<void(bool)>& onBroadcastBOVoiceStatusCallback = nullptr
+    const function<void(bool)>& onBroadcastBOVoiceStatusCallback = nullptr,
+    bool collectPerformanceData = false
   ) : m_onHasAttendeeRightsNotificationCallback(onHasAttendeeRightsNotificationCallback),
       m_onHasCreatorRightsNotificationCallback(onHasCreatorRightsNotificationCallback),
       m_onHasAdminRightsNotificationCallback(onHasAdminRightsNotificationCallback),
@@ -66,87 +70,96 @@ public:
       m_onHostInviteReturnToMainSessionCallback(onHostInviteReturnToMainSessionCallback),
       m_onBOStatusChangedCallback(onBOStatusChangedCallback),
       m_onBOSwitchRequestReceivedCallback(onBOSwitchRequestReceivedCallback),
-      m_onBroadcastBOVoiceStatusCallback(onBroadcastBOVoiceStatusCallback)
+      m_onBroadcastBOVoiceStatusCallback(onBroadcastBOVoiceStatusCallback),
+      m_performance("MeetingBOEventCallbacks", collectPerformanceData)
       {}
 
   void onHasCreatorRightsNotification(IBOCreator* pCreatorObj) override {
     if (m_onHasCreatorRightsNotificationCallback)
-      m_onHasCreatorRightsNotificationCallback(pCreatorObj);
+      m_performance.invoke(m_onHasCreatorRightsNotificationCallback, pCreatorObj);
   }
 
   void onHasAdminRightsNotification(IBOAdmin* pAdminObj) override {
     if (m_onHasAdminRightsNotificationCallback)
-      m_onHasAdminRightsNotificationCallback(pAdminObj);
+      m_performance.invoke(m_onHasAdminRightsNotificationCallback, pAdminObj);
   }
 
   void onHasAssistantRightsNotification(IBOAssistant* pAssistantObj) override {
     if (m_onHasAssistantRightsNotificationCallback)
-      m_onHasAssistantRightsNotificationCallback(pAssistantObj);
+      m_performance.invoke(m_onHasAssistantRightsNotificationCallback, pAssistantObj);
   }
 
   void onHasAttendeeRightsNotification(IBOAttendee* pAttendeeObj) override {
     if (m_onHasAttendeeRightsNotificationCallback)
-      m_onHasAttendeeRightsNotificationCallback(pAttendeeObj);
+      m_performance.invoke(m_onHasAttendeeRightsNotificationCallback, pAttendeeObj);
   }
 
   void onHasDataHelperRightsNotification(IBOData* pDataHelperObj) override {
     if (m_onHasDataHelperRightsNotificationCallback)
-      m_onHasDataHelperRightsNotificationCallback(pDataHelperObj);
+      m_performance.invoke(m_onHasDataHelperRightsNotificationCallback, pDataHelperObj);
   }
 
   void onLostCreatorRightsNotification() override {
     if (m_onLostCreatorRightsNotificationCallback)
-      m_onLostCreatorRightsNotificationCallback();
+      m_performance.invoke(m_onLostCreatorRightsNotificationCallback);
   }
 
   void onLostAdminRightsNotification() override {
     if (m_onLostAdminRightsNotificationCallback)
-      m_onLostAdminRightsNotificationCallback();
+      m_performance.invoke(m_onLostAdminRightsNotificationCallback);
   }
 
   void onLostAssistantRightsNotification() override {
     if (m_onLostAssistantRightsNotificationCallback)
-      m_onLostAssistantRightsNotificationCallback();
+      m_performance.invoke(m_onLostAssistantRightsNotificationCallback);
   }
 
   void onLostAttendeeRightsNotification() override {
     if (m_onLostAttendeeRightsNotificationCallback)
-      m_onLostAttendeeRightsNotificationCallback();
+      m_performance.invoke(m_onLostAttendeeRightsNotificationCallback);
   }
 
   void onLostDataHelperRightsNotification() override {
     if (m_onLostDataHelperRightsNotificationCallback)
-      m_onLostDataHelperRightsNotificationCallback();
+      m_performance.invoke(m_onLostDataHelperRightsNotificationCallback);
   }
 
   void onNewBroadcastMessageReceived(const zchar_t* strMsg, unsigned int nSenderID, const zchar_t* strSenderName) override {
     if (m_onNewBroadcastMessageReceivedCallback)
-      m_onNewBroadcastMessageReceivedCallback(strMsg, nSenderID, strSenderName);
+      m_performance.invoke(m_onNewBroadcastMessageReceivedCallback, strMsg, nSenderID, strSenderName);
   }
 
   void onBOStopCountDown(unsigned int nSeconds) override {
     if (m_onBOStopCountDownCallback)
-      m_onBOStopCountDownCallback(nSeconds);
+      m_performance.invoke(m_onBOStopCountDownCallback, nSeconds);
   }
 
   void onHostInviteReturnToMainSession(const zchar_t* strName, IReturnToMainSessionHandler* handler) override {
     if (m_onHostInviteReturnToMainSessionCallback)
-      m_onHostInviteReturnToMainSessionCallback(strName, handler);
+      m_performance.invoke(m_onHostInviteReturnToMainSessionCallback, strName, handler);
   }
 
   void onBOStatusChanged(BO_STATUS eStatus) override {
     if (m_onBOStatusChangedCallback)
-      m_onBOStatusChangedCallback(eStatus);
+      m_performance.invoke(m_onBOStatusChangedCallback, eStatus);
   }
 
   void onBOSwitchRequestReceived(const zchar_t* strNewBOName, const zchar_t* strNewBOID) override {
     if (m_onBOSwitchRequestReceivedCallback)
-      m_onBOSwitchRequestReceivedCallback(strNewBOName, strNewBOID);
+      m_performance.invoke(m_onBOSwitchRequestReceivedCallback, strNewBOName, strNewBOID);
   }
 
   void onBroadcastBOVoiceStatus(bool bStart) override {
     if (m_onBroadcastBOVoiceStatusCallback)
-      m_onBroadcastBOVoiceStatusCallback(bStart);
+      m_performance.invoke(m_onBroadcastBOVoiceStatusCallback, bStart);
+  }
+
+  CallbackPerformanceData getPerformanceData() const {
+    return m_performance.getData();
+  }
+
+  void resetPerformanceData() {
+    m_performance.reset();
   }
 };
 
@@ -168,7 +181,8 @@ void init_meeting_bo_event_callbacks(nb::module_ &m) {
       const function<void(const zchar_t*, IReturnToMainSessionHandler*)>&,
       const function<void(BO_STATUS)>&,
       const function<void(const zchar_t*, const zchar_t*)>&,
-      const function<void(bool)>&
+      const function<void(bool)>&,
+      bool
     >(),
       nb::arg("onHasAttendeeRightsNotificationCallback") = nullptr,
       nb::arg("onHasCreatorRightsNotificationCallback") = nullptr,
@@ -185,6 +199,9 @@ void init_meeting_bo_event_callbacks(nb::module_ &m) {
       nb::arg("onHostInviteReturnToMainSessionCallback") = nullptr,
       nb::arg("onBOStatusChangedCallback") = nullptr,
       nb::arg("onBOSwitchRequestReceivedCallback") = nullptr,
-      nb::arg("onBroadcastBOVoiceStatusCallback") = nullptr
-    );
+      nb::arg("onBroadcastBOVoiceStatusCallback") = nullptr,
+      nb::arg("collectPerformanceData") = false
+    )
+    .def("getPerformanceData", &MeetingBOEventCallbacks::getPerformanceData)
+    .def("resetPerformanceData", &MeetingBOEventCallbacks::resetPerformanceData);
 }
@@ -10,6 +10,8 @@
 #include "meeting_service_interface.h"
 #include "meeting_service_components/meeting_chat_interface.h"
 
+#include "utilities.h"
+
 namespace nb = nanobind;
 using namespace ZOOMSDK;
 using namespace std;
@@ -24,6 +26,7 @@ private:
     function<void(ISDKFileSender*)> m_onFileSendStartCallback;
     function<void(ISDKFileReceiver*)> m_onFileReceivedCallback;
     function<void(SDKFileTransferInfo*)> m_onFileTransferProgressCallback;
+    CallbackPerformanceCollector m_performance;
 
 public:
     MeetingChatEventCallbacks(
@@ -34,7 +37,8 @@ public:
         const function<void(bool)>& onShareMeetingChatStatusChangedCallback = nullptr,
         const function<void(ISDKFileSender*)>& onFileSendStartCallback = nullptr,
         const function<void(ISDKFileReceiver*)>& onFileReceivedCallback = nullptr,
-        const function<void(SDKFileTransferInfo*)>& onFileTransferProgressCallback = nullptr
+        const function<void(SDKFileTransferInfo*)>& onFileTransferProgressCallback = nullptr,
+        bool collectPerformanceData = false
     ) : m_onChatMsgNotificationCallback(onChatMsgNotificationCallback),
         m_onChatStatusChangedNotificationCallback(onChatStatusChangedNotificationCallback),
         m_onChatMsgDeleteNotificationCallback(onChatMsgDeleteNotificationCallback),
@@ -42,46 +46,55 @@ public:
         m_onShareMeetingChatStatusChangedCallback(onShareMeetingChatStatusChangedCallback),
         m_onFileSendStartCallback(onFileSendStartCallback),
         m_onFileReceivedCallback(onFileReceivedCallback),
-        m_onFileTransferProgressCallback(onFileTransferProgressCallback) {}
+        m_onFileTransferProgressCallback(onFileTransferProgressCallback),
+        m_performance("MeetingChatEventCallbacks", collectPerformanceData) {}
 
     void onChatMsgNotification(IChatMsgInfo* chatMsg, const zchar_t* content = NULL) override {
         if (m_onChatMsgNotificationCallback)
-            m_onChatMsgNotificationCallback(chatMsg, content);
+            m_performance.invoke(m_onChatMsgNotificationCallback, chatMsg, content);
     }
 
     void onChatStatusChangedNotification(ChatStatus* status_) override {
         if (m_onChatStatusChangedNotificationCallback)
-            m_onChatStatusChangedNotificationCallback(status_);
+            m_performance.invoke(m_onChatStatusChangedNotificationCallback, status_);
     }
 
     void onChatMsgDeleteNotification(const zchar_t* msgID, SDKChatMessageDeleteType deleteBy) override {
         if (m_onChatMsgDeleteNotificationCallback)
-            m_onChatMsgDeleteNotificationCallback(msgID, deleteBy);
+            m_performance.invoke(m_onChatMsgDeleteNotificationCallback, msgID, deleteBy);
     }
 
     void onChatMessageEditNotification(IChatMsgInfo* chatMsg) override {
         if (m_onChatMessageEditNotificationCallback)
-            m_onChatMessageEditNotificationCallback(chatMsg);
+            m_performance.invoke(m_onChatMessageEditNotificationCallback, chatMsg);
     }
 
     void onShareMeetingChatStatusChanged(bool isStart) override {
         if (m_onShareMeetingChatStatusChangedCallback)
-            m_onShareMeetingChatStatusChangedCallback(isStart);
+            m_performance.invoke(m_onShareMeetingChatStatusChangedCallback, isStart);
     }
 
     void onFileSendStart(ISDKFileSender* sender) override {
         if (m_onFileSendStartCallback)
-            m_onFileSendStartCallback(sender);
+            m_performance.invoke(m_onFileSendStartCallback, sender);
     }
 
     void onFileReceived(ISDKFileReceiver* receiver) override {
         if (m_onFileReceivedCallback)
-            m_onFileReceivedCallback(receiver);
+            m_performance.invoke(m_onFileReceivedCallback, receiver);
     }
 
     void onFileTransferProgress(SDKFileTransferInfo* info) override {
         if (m_onFileTransferProgressCallback)
-            m_onFileTransferProgressCallback(info);
+            m_performance.invoke(m_onFileTransferProgressCallback, info);
+    }
+
+    CallbackPerformanceData getPerformanceData() const {
+        return m_performance.getData();
+    }
+
+    void resetPerformanceData() {
+        m_performance.reset();
     }
 };
 
@@ -95,7 +108,8 @@ void init_meeting_chat_event_callbacks(nb::module_ &m) {
             const function<void(bool)>&,
             const function<void(ISDKFileSender*)>&,
             const function<void(ISDKFileReceiver*)>&,
-            const function<void(SDKFileTransferInfo*)>&
+            const function<void(SDKFileTransferInfo*)>&,
+            bool
         >(),
             nb::arg("onChatMsgNotificationCallback") = nullptr,
             nb::arg("onChatStatusChangedNotificationCallback") = nullptr,
@@ -104,6 +118,9 @@ void init_meeting_chat_event_callbacks(nb::module_ &m) {
             nb::arg("onShareMeetingChatStatusChangedCallback") = nullptr,
             nb::arg("onFileSendStartCallback") = nullptr,
             nb::arg("onFileReceivedCallback") = nullptr,
-            nb::arg("onFileTransferProgressCallback") = nullptr
-        );
+            nb::arg("onFileTransferProgressCallback") = nullptr,
+            nb::arg("collectPerformanceData") = false
+        )
+        .def("getPerformanceData", &MeetingChatEventCallbacks::getPerformanceData)
+        .def("resetPerformanceData", &MeetingChatEventCallbacks::resetPerformanceData);
 }
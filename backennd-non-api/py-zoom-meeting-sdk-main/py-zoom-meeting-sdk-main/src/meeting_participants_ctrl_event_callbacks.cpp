@@ -38,6 +38,8 @@
 #include <functional>
 #include <memory>
 
+#include "utilities.h"
+
 namespace nb = nanobind;
 using namespace ZOOMSDK;
 using namespace std;
@@ -66,6 +68,7 @@ private:
     function<void(unsigned int)> m_onBotAuthorizerRelationChangedCallback;
     function<void(bool, unsigned int)> m_onVirtualNameTagStatusChangedCallback;
     function<void(unsigned int)> m_onVirtualNameTagRosterInfoUpdatedCallback;
+    CallbackPerformanceCollector m_performance;
 
 public:
     MeetingParticipantsCtrlEventCallbacks(
@@ -90,7 +93,8 @@ public:
         const function<void(FocusModeShareType)>& onFocusModeShareTypeChangedCallback = nullptr,
         const function<void(unsigned int)>& onBotAuthorizerRelationChangedCallback = nullptr,
         const function<void(bool, unsigned int)>& onVirtualNameTagStatusChangedCallback = nullptr,
-        const function<void(unsigned int)>& onVirtualNameTagRosterInfoUpdatedCallback = nullptr
+        const function<void(unsigned int)>& onVirtualNameTagRosterInfoUpdatedCallback = nullptr,
+        bool collectPerformanceData = false
     ) : m_onUserJoinCallback(onUserJoinCallback),
         m_onUserLeftCallback(onUserLeftCallback),
         m_onHostChangeNotificationCallback(onHostChangeNotificationCallback),
@@ -112,7 +116,8 @@ public:
         m_onFocusModeShareTypeChangedCallback(onFocusModeShareTypeChangedCallback),
         m_onBotAuthorizerRelationChangedCallback(onBotAuthorizerRelationChangedCallback),
         m_onVirtualNameTagStatusChangedCallback(onVirtualNameTagStatusChangedCallback),
-        m_onVirtualNameTagRosterInfoUpdatedCallback(onVirtualNameTagRosterInfoUpdatedCallback) {}
+        m_onVirtualNameTagRosterInfoUpdatedCallback(onVirtualNameTagRosterInfoUpdatedCallback),
+        m_performance("MeetingParticipantsCtrlEventCallbacks", collectPerformanceData) {}
 
     void onUserJoin(IList<unsigned int>* lstUserID, const zchar_t* strUserList = NULL) override {
         if (m_onUserJoinCallback) {
@@ -124,7 +129,7 @@ public:
                     result.push_back(lstUserID->GetItem(i));
                 }
             }
-            m_onUserJoinCallback(result, strUserList);
+            m_performance.invoke(m_onUserJoinCallback, result, strUserList);
         }
     }
 
@@ -138,18 +143,18 @@ public:
                     result.push_back(lstUserID->GetItem(i));
                 }
             }
-            m_onUserLeftCallback(result, strUserList);
+            m_performance.invoke(m_onUserLeftCallback, result, strUserList);
         }
     }
 
     void onHostChangeNotification(unsigned int userId) override {
         if (m_onHostChangeNotificationCallback)
-            m_onHostChangeNotificationCallback(userId);
+            m_performance.invoke(m_onHostChangeNotificationCallback, userId);
     }
 
     void onLowOrRaiseHandStatusChanged(bool bLow, unsigned int userid) override {
         if (m_onLowOrRaiseHandStatusChangedCallback)
-            m_onLowOrRaiseHandStatusChangedCallback(bLow, userid);
+            m_performance.invoke(m_onLowOrRaiseHandStatusChangedCallback, bLow, userid);
     }
 
     void onUserNamesChanged(IList<unsigned int>* lstUserID) override {
@@ -162,93 +167,101 @@ public:
                     result.push_back(lstUserID->GetItem(i));
                 }
             }
-            m_onUserNamesChangedCallback(result);
+            m_performance.invoke(m_onUserNamesChangedCallback, result);
         }
     }
 
     void onCoHostChangeNotification(unsigned int userId, bool isCoHost) override {
         if (m_onCoHostChangeNotificationCallback)
-            m_onCoHostChangeNotificationCallback(userId, isCoHost);
+            m_performance.invoke(m_onCoHostChangeNotificationCallback, userId, isCoHost);
     }
 
     void onInvalidReclaimHostkey() override {
         if (m_onInvalidReclaimHostkeyCallback)
-            m_onInvalidReclaimHostkeyCallback();
+            m_performance.invoke(m_onInvalidReclaimHostkeyCallback);
     }
 
     void onAllHandsLowered() override {
         if (m_onAllHandsLoweredCallback)
-            m_onAllHandsLoweredCallback();
+            m_performance.invoke(m_onAllHandsLoweredCallback);
     }
 
     void onLocalRecordingStatusChanged(unsigned int user_id, RecordingStatus status) override {
         if (m_onLocalRecordingStatusChangedCallback)
-            m_onLocalRecordingStatusChangedCallback(user_id, status);
+            m_performance.invoke(m_onLocalRecordingStatusChangedCallback, user_id, status);
     }
 
     void onAllowParticipantsRenameNotification(bool bAllow) override {
         if (m_onAllowParticipantsRenameNotificationCallback)
-            m_onAllowParticipantsRenameNotificationCallback(bAllow);
+            m_performance.invoke(m_onAllowParticipantsRenameNotificationCallback, bAllow);
     }
 
     void onAllowParticipantsUnmuteSelfNotification(bool bAllow) override {
         if (m_onAllowParticipantsUnmuteSelfNotificationCallback)
-            m_onAllowParticipantsUnmuteSelfNotificationCallback(bAllow);
+            m_performance.invoke(m_onAllowParticipantsUnmuteSelfNotificationCallback, bAllow);
     }
 
     void onAllowParticipantsStartVideoNotification(bool bAllow) override {
         if (m_onAllowParticipantsStartVideoNotificationCallback)
-            m_onAllowParticipantsStartVideoNotificationCallback(bAllow);
+            m_performance.invoke(m_onAllowParticipantsStartVideoNotificationCallback, bAllow);
     }
 
     void onAllowParticipantsShareWhiteBoardNotification(bool bAllow) override {
         if (m_onAllowParticipantsShareWhiteBoardNotificationCallback)
-            m_onAllowParticipantsShareWhiteBoardNotificationCallback(bAllow);
+            m_performance.invoke(m_onAllowParticipantsShareWhiteBoardNotificationCallback, bAllow);
     }
 
     void onRequestLocalRecordingPrivilegeChanged(LocalRecordingRequestPrivilegeStatus status) override {
         if (m_onRequestLocalRecordingPrivilegeChangedCallback)
-            m_onRequestLocalRecordingPrivilegeChangedCallback(status);
+            m_performance.invoke(m_onRequestLocalRecordingPrivilegeChangedCallback, status);
     }
 
     void onAllowParticipantsRequestCloudRecording(bool bAllow) override {
         if (m_onAllowParticipantsRequestCloudRecordingCallback)
-            m_onAllowParticipantsRequestCloudRecordingCallback(bAllow);
+            m_performance.invoke(m_onAllowParticipantsRequestCloudRecordingCallback, bAllow);
     }
 
     void onInMeetingUserAvatarPathUpdated(unsigned int userID) override {
         if (m_onInMeetingUserAvatarPathUpdatedCallback)
-            m_onInMeetingUserAvatarPathUpdatedCallback(userID);
+            m_performance.invoke(m_onInMeetingUserAvatarPathUpdatedCallback, userID);
     }
 
     void onParticipantProfilePictureStatusChange(bool bHidden) override {
         if (m_onParticipantProfilePictureStatusChangeCallback)
-            m_onParticipantProfilePictureStatusChangeCallback(bHidden);
+            m_performance.invoke(m_onParticipantProfilePictureStatusChangeCallback, bHidden);
     }
 
     void onFocusModeStateChanged(bool bEnabled) override {
         if (m_onFocusModeStateChangedCallback)
-            m_onFocusModeStateChangedCallback(bEnabled);
+            m_performance.invoke(m_onFocusModeStateChangedCallback, bEnabled);
     }
 
     void onFocusModeShareTypeChanged(FocusModeShareType type) override {
         if (m_onFocusModeShareTypeChangedCallback)
-            m_onFocusModeShareTypeChangedCallback(type);
+            m_performance.invoke(m_onFocusModeShareTypeChangedCallback, type);
     }
 
     void onBotAuthorizerRelationChanged(unsigned int authorizeUserID) override {
         if (m_onBotAuthorizerRelationChangedCallback)
-            m_onBotAuthorizerRelationChangedCallback(authorizeUserID);
+            m_performance.invoke(m_onBotAuthorizerRelationChangedCallback, authorizeUserID);
     }
 
     void onVirtualNameTagStatusChanged(bool bOn, unsigned int userID) override {
         if (m_onVirtualNameTagStatusChangedCallback)
-            m_onVirtualNameTagStatusChangedCallback(bOn, userID);
+            m_performance.invoke(m_onVirtualNameTagStatusChangedCallback, bOn, userID);
     }
 
     void onVirtualNameTagRosterInfoUpdated(unsigned int userID) override {
         if (m_onVirtualNameTagRosterInfoUpdatedCallback)
-            m_onVirtualNameTagRosterInfoUpdatedCallback(userID);
+            m_performance.invoke(m_onVirtualNameTagRosterInfoUpdatedCallback, userID);
+    }
+
+    CallbackPerformanceData getPerformanceData() const {
+        return m_performance.getData();
+    }
+
+    void resetPerformanceData() {
+        m_performance.reset();
     }
 };
 
@@ -276,7 +289,8 @@ void init_meeting_participants_ctrl_event_callbacks(nb::module_ &m) {
         const function<void(FocusModeShareType)>&,
         const function<void(unsigned int)>&,
         const function<void(bool, unsigned int)>&,
-        const function<void(unsigned int)>&
+        const function<void(unsigned int)>&,
+        bool
     >(),
         nb::arg("onUserJoinCallback") = nullptr,
         nb::arg("onUserLeftCallback") = nullptr,
@@ -299,6 +313,9 @@ void init_meeting_participants_ctrl_event_callbacks(nb::module_ &m) {
         nb::arg("onFocusModeShareTypeChangedCallback") = nullptr,
         nb::arg("onBotAuthorizerRelationChangedCallback") = nullptr,
         nb::arg("onVirtualNameTagStatusChangedCallback") = nullptr,
-        nb::arg("onVirtualNameTagRosterInfoUpdatedCallback") = nullptr
-    );
+        nb::arg("onVirtualNameTagRosterInfoUpdatedCallback") = nullptr,
+        nb::arg("collectPerformanceData") = false
+    )
+    .def("getPerformanceData", &MeetingParticipantsCtrlEventCallbacks::getPerformanceData)
+    .def("resetPerformanceData", &MeetingParticipantsCtrlEventCallbacks::resetPerformanceData);
 }
@@ -37,6 +37,8 @@
 #include <functional>
 #include <memory>
 
+#include "utilities.h"
+
 namespace nb = nanobind;
 using namespace ZOOMSDK;
 using namespace std;
@@ -54,6 +56,7 @@ private:
     function<void(ZOOM_SDK_NAMESPACE::IRequestEnableAndStartSmartRecordingHandler*)> m_onEnableAndStartSmartRecordingRequestedCallback;
     function<void(ZOOM_SDK_NAMESPACE::ISmartRecordingEnableActionHandler*)> m_onSmartRecordingEnableActionCallbackFunc;
     function<void(ZOOM_SDK_NAMESPACE::TranscodingStatus, const zchar_t*)> m_onTranscodingStatusChangedCallback;
+    CallbackPerformanceCollector m_performance;
 
 public:
     MeetingRecordingCtrlEventCallbacks(
@@ -67,7 +70,8 @@ public:
         const function<void(time_t)>& onCloudRecordingStorageFullCallback = nullptr,
         const function<void(ZOOM_SDK_NAMESPACE::IRequestEnableAndStartSmartRecordingHandler*)>& onEnableAndStartSmartRecordingRequestedCallback = nullptr,
         const function<void(ZOOM_SDK_NAMESPACE::ISmartRecordingEnableActionHandler*)>& onSmartRecordingEnableActionCallbackFunc = nullptr,
-        const function<void(ZOOM_SDK_NAMESPACE::TranscodingStatus, const zchar_t*)>& onTranscodingStatusChangedCallback = nullptr
+        const function<void(ZOOM_SDK_NAMESPACE::TranscodingStatus, const zchar_t*)>& onTranscodingStatusChangedCallback = nullptr,
+        bool collectPerformanceData = false
     ) : m_onRecordingStatusCallback(onRecordingStatusCallback),
         m_onCloudRecordingStatusCallback(onCloudRecordingStatusCallback),
         m_onRecordPrivilegeChangedCallback(onRecordPrivilegeChangedCallback),
@@ -78,61 +82,70 @@ public:
         m_onCloudRecordingStorageFullCallback(onCloudRecordingStorageFullCallback),
         m_onEnableAndStartSmartRecordingRequestedCallback(onEnableAndStartSmartRecordingRequestedCallback),
         m_onSmartRecordingEnableActionCallbackFunc(onSmartRecordingEnableActionCallbackFunc),
-        m_onTranscodingStatusChangedCallback(onTranscodingStatusChangedCallback) {}
+        m_onTranscodingStatusChangedCallback(onTranscodingStatusChangedCallback),
+        m_performance("MeetingRecordingCtrlEventCallbacks", collectPerformanceData) {}
 
     void onRecordingStatus(ZOOM_SDK_NAMESPACE::RecordingStatus status) override {
         if (m_onRecordingStatusCallback)
-            m_onRecordingStatusCallback(status);
+            m_performance.invoke(m_onRecordingStatusCallback, status);
     }
 
     void onCloudRecordingStatus(ZOOM_SDK_NAMESPACE::RecordingStatus status) override {
         if (m_onCloudRecordingStatusCallback)
-            m_onCloudRecordingStatusCallback(status);
+            m_performance.invoke(m_onCloudRecordingStatusCallback, status);
     }
 
     void onRecordPrivilegeChanged(bool bCanRec) override {
         if (m_onRecordPrivilegeChangedCallback)
-            m_onRecordPrivilegeChangedCallback(bCanRec);
+            m_performance.invoke(m_onRecordPrivilegeChangedCallback, bCanRec);
     }
 
     void onLocalRecordingPrivilegeRequestStatus(ZOOM_SDK_NAMESPACE::RequestLocalRecordingStatus status) override {
         if (m_onLocalRecordingPrivilegeRequestStatusCallback)
-            m_onLocalRecordingPrivilegeRequestStatusCallback(status);
+            m_performance.invoke(m_onLocalRecordingPrivilegeRequestStatusCallback, status);
     }
 
     void onRequestCloudRecordingResponse(ZOOM_SDK_NAMESPACE::RequestStartCloudRecordingStatus status) override {
         if (m_onRequestCloudRecordingResponseCallback)
-            m_onRequestCloudRecordingResponseCallback(status);
+            m_performance.invoke(m_onRequestCloudRecordingResponseCallback, status);
     }
 
     void onLocalRecordingPrivilegeRequested(ZOOM_SDK_NAMESPACE::IRequestLocalRecordingPrivilegeHandler* handler) override {
         if (m_onLocalRecordingPrivilegeRequestedCallback)
-            m_onLocalRecordingPrivilegeRequestedCallback(handler);
+            m_performance.invoke(m_onLocalRecordingPrivilegeRequestedCallback, handler);
     }
 
     void onStartCloudRecordingRequested(ZOOM_SDK_NAMESPACE::IRequestStartCloudRecordingHandler* handler) override {
         if (m_onStartCloudRecordingRequestedCallback)
-            m_onStartCloudRecordingRequestedCallback(handler);
+            m_performance.invoke(m_onStartCloudRecordingRequestedCallback, handler);
     }
 
     void onCloudRecordingStorageFull(time_t gracePeriodDate) override {
         if (m_onCloudRecordingStorageFullCallback)
-            m_onCloudRecordingStorageFullCallback(gracePeriodDate);
+            m_performance.invoke(m_onCloudRecordingStorageFullCallback, gracePeriodDate);
     }
 
     void onEnableAndStartSmartRecordingRequested(ZOOM_SDK_NAMESPACE::IRequestEnableAndStartSmartRecordingHandler* handler) override {
         if (m_onEnableAndStartSmartRecordingRequestedCallback)
-            m_onEnableAndStartSmartRecordingRequestedCallback(handler);
+            m_performance.invoke(m_onEnableAndStartSmartRecordingRequestedCallback, handler);
     }
 
     void onSmartRecordingEnableActionCallback(ZOOM_SDK_NAMESPACE::ISmartRecordingEnableActionHandler* handler) override {
         if (m_onSmartRecordingEnableActionCallbackFunc)
-            m_onSmartRecordingEnableActionCallbackFunc(handler);
+            m_performance.invoke(m_onSmartRecordingEnableActionCallbackFunc, handler);
     }
 
     void onTranscodingStatusChanged(ZOOM_SDK_NAMESPACE::TranscodingStatus status, const zchar_t* path) override {
         if (m_onTranscodingStatusChangedCallback)
-            m_onTranscodingStatusChangedCallback(status, path);
+            m_performance.invoke(m_onTranscodingStatusChangedCallback, status, path);
+    }
+
+    CallbackPerformanceData getPerformanceData() const {
+        return m_performance.getData();
+    }
+
+    void resetPerformanceData() {
+        m_performance.reset();
     }
 };
 
@@ -149,7 +162,8 @@ void init_meeting_recording_ctrl_event_callbacks(nb::module_ &m) {
         const function<void(time_t)>&,
         const function<void(ZOOM_SDK_NAMESPACE::IRequestEnableAndStartSmartRecordingHandler*)>&,
         const function<void(ZOOM_SDK_NAMESPACE::ISmartRecordingEnableActionHandler*)>&,
-        const function<void(ZOOM_SDK_NAMESPACE::TranscodingStatus, const zchar_t*)>&
+        const function<void(ZOOM_SDK_NAMESPACE::TranscodingStatus, const zchar_t*)>&,
+        bool
     >(),
         nb::arg("onRecordingStatusCallback") = nullptr,
         nb::arg("onCloudRecordingStatusCallback") = nullptr,
@@ -161,6 +175,9 @@ void init_meeting_recording_ctrl_event_callbacks(nb::module_ &m) {
         nb::arg("onCloudRecordingStorageFullCallback") = nullptr,
         nb::arg("onEnableAndStartSmartRecordingRequestedCallback") = nullptr,
         nb::arg("onSmartRecordingEnableActionCallbackFunc") = nullptr,
-        nb::arg("onTranscodingStatusChangedCallback") = nullptr
-    );
+        nb::arg("onTranscodingStatusChangedCallback") = nullptr,
+        nb::arg("collectPerformanceData") = false
+    )
+    .def("getPerformanceData", &MeetingRecordingCtrlEventCallbacks::getPerformanceData)
+    .def("resetPerformanceData", &MeetingRecordingCtrlEventCallbacks::resetPerformanceData);
 }
\ No newline at end of file
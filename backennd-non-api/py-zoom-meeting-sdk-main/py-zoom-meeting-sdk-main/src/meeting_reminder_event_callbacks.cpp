@@ -12,6 +12,8 @@
 #include <functional>
 #include <memory>
 
+#include "utilities.h"
+
 namespace nb = nanobind;
 using namespace std;
 using namespace ZOOMSDK;
@@ -38,22 +40,33 @@ class MeetingReminderEventCallbacks : public ZOOM_SDK_NAMESPACE::IMeetingReminde
 private:
     function<void(ZOOM_SDK_NAMESPACE::IMeetingReminderContent*, ZOOM_SDK_NAMESPACE::IMeetingReminderHandler*)> m_onReminderNotifyCallback;
     function<void(ZOOM_SDK_NAMESPACE::IMeetingReminderContent*, ZOOM_SDK_NAMESPACE::IMeetingEnableReminderHandler*)> m_onEnableReminderNotifyCallback;
+    CallbackPerformanceCollector m_performance;
 
 public:
     MeetingReminderEventCallbacks(
         const function<void(ZOOM_SDK_NAMESPACE::IMeetingReminderContent*, ZOOM_SDK_NAMESPACE::IMeetingReminderHandler*)>& onReminderNotifyCallback = nullptr,
-        const function<void(ZOOM_SDK_NAMESPACE::IMeetingReminderContent*, ZOOM_SDK_NAMESPACE::IMeetingEnableReminderHandler*)>& onEnableReminderNotifyCallback = nullptr
+        const function<void(ZOOM_SDK_NAMESPACE::IMeetingReminderContent*, ZOOM_SDK_NAMESPACE::IMeetingEnableReminderHandler*)>& onEnableReminderNotifyCallback = nullptr,
+        bool collectPerformanceData = false
     ) : m_onReminderNotifyCallback(onReminderNotifyCallback),
-        m_onEnableReminderNotifyCallback(onEnableReminderNotifyCallback) {}
+        m_onEnableReminderNotifyCallback(onEnableReminderNotifyCallback),
+        m_performance("MeetingReminderEventCallbacks", collectPerformanceData) {}
 
     void onReminderNotify(ZOOM_SDK_NAMESPACE::IMeetingReminderContent* content, ZOOM_SDK_NAMESPACE::IMeetingReminderHandler* handle) override {
         if (m_onReminderNotifyCallback)
-            m_onReminderNotifyCallback(content, handle);
+            m_performance.invoke(m_onReminderNotifyCallback, content, handle);
     }
 
     void onEnableReminderNotify(ZOOM_SDK_NAMESPACE::IMeetingReminderContent* content, ZOOM_SDK_NAMESPACE::IMeetingEnableReminderHandler* handle) override {
         if (m_onEnableReminderNotifyCallback)
-            m_onEnableReminderNotifyCallback(content, handle);
+            m_performance.invoke(m_onEnableReminderNotifyCallback, content, handle);
+    }
+
+    CallbackPerformanceData getPerformanceData() const {
+        return m_performance.getData();
+    }
+
+    void resetPerformanceData() {
+        m_performance.reset();
     }
 };
 
@@ -62,9 +75,13 @@ void init_meeting_reminder_event_callbacks(nb::module_ &m) {
         .def(
             nb::init<
                 function<void(ZOOM_SDK_NAMESPACE::IMeetingReminderContent*, ZOOM_SDK_NAMESPACE::IMeetingReminderHandler*)>&,
-                function<void(ZOOM_SDK_NAMESPACE::IMeetingReminderContent*, ZOOM_SDK_NAMESPACE::IMeetingEnableReminderHandler*)>&
+                function<void(ZOOM_SDK_NAMESPACE::IMeetingReminderContent*, ZOOM_SDK_NAMESPACE::IMeetingEnableReminderHandler*)>&,
+                bool
             >(),
             nb::arg("onReminderNotifyCallback") = nullptr,
-            nb::arg("onEnableReminderNotifyCallback") = nullptr
-        );
+            nb::arg("onEnableReminderNotifyCallback") = nullptr,
+            nb::arg("collectPerformanceData") = false
+        )
+        .def("getPerformanceData", &MeetingReminderEventCallbacks::getPerformanceData)
+        .def("resetPerformanceData", &MeetingReminderEventCallbacks::resetPerformanceData);
 }
\ No newline at end of file
@@ -13,6 +13,8 @@
 #include <functional>
 #include <memory>
 
+#include "utilities.h"
+
 namespace nb = nanobind;
 using namespace std;
 using namespace ZOOMSDK;
@@ -57,6 +59,7 @@ private:
     std::function<void(bool)> m_onAICompanionActiveChangeNoticeCallback;
     std::function<void(const zchar_t*)> m_onMeetingTopicChangedCallback;
     std::function<void(const zchar_t*)> m_onMeetingFullToWatchLiveStreamCallback;
+    CallbackPerformanceCollector m_performance;
 
 public:
     MeetingServiceEventCallbacks(
@@ -66,48 +69,58 @@ public:
         const std::function<void()>& onSuspendParticipantsActivitiesCallback = nullptr,
         const std::function<void(bool)>& onAICompanionActiveChangeNoticeCallback = nullptr,
         const std::function<void(const zchar_t*)>& onMeetingTopicChangedCallback = nullptr,
-        const std::function<void(const zchar_t*)>& onMeetingFullToWatchLiveStreamCallback = nullptr
+        const std::function<void(const zchar_t*)>& onMeetingFullToWatchLiveStreamCallback = nullptr,
+        bool collectPerformanceData = false
     ) : m_onMeetingStatusChangedCallback(onMeetingStatusChangedCallback),
         m_onMeetingStatisticsWarningNotificationCallback(onMeetingStatisticsWarningNotificationCallback),
         m_onMeetingParameterNotificationCallback(onMeetingParameterNotificationCallback),
         m_onSuspendParticipantsActivitiesCallback(onSuspendParticipantsActivitiesCallback),
         m_onAICompanionActiveChangeNoticeCallback(onAICompanionActiveChangeNoticeCallback),
         m_onMeetingTopicChangedCallback(onMeetingTopicChangedCallback),
-        m_onMeetingFullToWatchLiveStreamCallback(onMeetingFullToWatchLiveStreamCallback) {}
+        m_onMeetingFullToWatchLiveStreamCallback(onMeetingFullToWatchLiveStreamCallback),
+        m_performance("MeetingServiceEventCallbacks", collectPerformanceData) {}
 
     void onMeetingStatusChanged(ZOOM_SDK_NAMESPACE::MeetingStatus status, int iResult = 0) override {
         if (m_onMeetingStatusChangedCallback)
-            m_onMeetingStatusChangedCallback(status, iResult);
+            m_performance.invoke(m_onMeetingStatusChangedCallback, status, iResult);
     }
 
     void onMeetingStatisticsWarningNotification(ZOOM_SDK_NAMESPACE::StatisticsWarningType type) override {
         if (m_onMeetingStatisticsWarningNotificationCallback)
-            m_onMeetingStatisticsWarningNotificationCallback(type);
+            m_performance.invoke(m_onMeetingStatisticsWarningNotificationCallback, type);
     }
 
     void onMeetingParameterNotification(const ZOOM_SDK_NAMESPACE::MeetingParameter* meeting_param) override {
         if (m_onMeetingParameterNotificationCallback)
-            m_onMeetingParameterNotificationCallback(meeting_param);
+            m_performance.invoke(m_onMeetingParameterNotificationCallback, meeting_param);
     }
 
     void onSuspendParticipantsActivities() override {
         if (m_onSuspendParticipantsActivitiesCallback)
-            m_onSuspendParticipantsActivitiesCallback();
+            m_performance.invoke(m_onSuspendParticipantsActivitiesCallback);
     }
 
     void onAICompanionActiveChangeNotice(bool bActive) override {
         if (m_onAICompanionActiveChangeNoticeCallback)
-            m_onAICompanionActiveChangeNoticeCallback(bActive);
+            m_performance.invoke(m_onAICompanionActiveChangeNoticeCallback, bActive);
     }
 
     void onMeetingTopicChanged(const zchar_t* sTopic) override {
         if (m_onMeetingTopicChangedCallback)
-            m_onMeetingTopicChangedCallback(sTopic);
+            m_performance.invoke(m_onMeetingTopicChangedCallback, sTopic);
     }
 
     void onMeetingFullToWatchLiveStream(const zchar_t* sLiveStreamUrl) override {
         if (m_onMeetingFullToWatchLiveStreamCallback)
-            m_onMeetingFullToWatchLiveStreamCallback(sLiveStreamUrl);
+            m_performance.invoke(m_onMeetingFullToWatchLiveStreamCallback, sLiveStreamUrl);
+    }
+
+    CallbackPerformanceData getPerformanceData() const {
+        return m_performance.getData();
+    }
+
+    void resetPerformanceData() {
+        m_performance.reset();
     }
 };
 
@@ -121,7 +134,8 @@ void init_meeting_service_event_callbacks(nb::module_ &m) {
                 std::function<void()>&,
                 std::function<void(bool)>&,
                 std::function<void(const zchar_t*)>&,
-                std::function<void(const zchar_t*)>&
+                std::function<void(const zchar_t*)>&,
+                bool
             >(),
             nb::arg("onMeetingStatusChangedCallback") = nullptr,
             nb::arg("onMeetingStatisticsWarningNotificationCallback") = nullptr,
@@ -129,7 +143,10 @@ void init_meeting_service_event_callbacks(nb::module_ &m) {
             nb::arg("onSuspendParticipantsActivitiesCallback") = nullptr,
             nb::arg("onAICompanionActiveChangeNoticeCallback") = nullptr,
             nb::arg("onMeetingTopicChangedCallback") = nullptr,
-            nb::arg("onMeetingFullToWatchLiveStreamCallback") = nullptr
-        );
+            nb::arg("onMeetingFullToWatchLiveStreamCallback") = nullptr,
+            nb::arg("collectPerformanceData") = false
+        )
+        .def("getPerformanceData", &MeetingServiceEventCallbacks::getPerformanceData)
+        .def("resetPerformanceData", &MeetingServiceEventCallbacks::resetPerformanceData);
 
 }
\ No newline at end of file
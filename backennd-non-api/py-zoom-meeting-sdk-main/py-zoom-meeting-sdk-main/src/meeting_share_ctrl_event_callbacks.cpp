@@ -13,6 +13,8 @@
 #include <functional>
 #include <memory>
 
+#include "utilities.h"
+
 namespace nb = nanobind;
 using namespace ZOOMSDK;
 
@@ -27,6 +29,7 @@ private:
     std::function<void(ZoomSDKVideoFileSharePlayError)> m_onVideoFileSharePlayErrorCallback;
     std::function<void()> m_onFailedToStartShareCallback;
     std::function<void(ZoomSDKSharingSourceInfo)> m_onOptimizingShareForVideoClipStatusChangedCallback;
+    CallbackPerformanceCollector m_performance;
 public:
     MeetingShareCtrlEventCallbacks(
         const std::function<void(ZoomSDKSharingSourceInfo)>& onSharingStatusCallback = nullptr,
@@ -37,7 +40,8 @@ public:
         const std::function<void()>& onSharedVideoEndedCallback = nullptr,
         const std::function<void(ZoomSDKVideoFileSharePlayError)>& onVideoFileSharePlayErrorCallback = nullptr,
         const std::function<void()>& onFailedToStartShareCallback = nullptr,
-        const std::function<void(ZoomSDKSharingSourceInfo)>& onOptimizingShareForVideoClipStatusChangedCallback = nullptr
+        const std::function<void(ZoomSDKSharingSourceInfo)>& onOptimizingShareForVideoClipStatusChangedCallback = nullptr,
+        bool collectPerformanceData = false
     ) : m_onSharingStatusCallback(onSharingStatusCallback),
         m_onLockShareStatusCallback(onLockShareStatusCallback),
         m_onShareContentNotificationCallback(onShareContentNotificationCallback),
@@ -46,51 +50,60 @@ public:
         m_onSharedVideoEndedCallback(onSharedVideoEndedCallback),
         m_onVideoFileSharePlayErrorCallback(onVideoFileSharePlayErrorCallback),
         m_onFailedToStartShareCallback(onFailedToStartShareCallback),
-        m_onOptimizingShareForVideoClipStatusChangedCallback(onOptimizingShareForVideoClipStatusChangedCallback) {}
+        m_onOptimizingShareForVideoClipStatusChangedCallback(onOptimizingShareForVideoClipStatusChangedCallback),
+        m_performance("MeetingShareCtrlEventCallbacks", collectPerformanceData) {}
 
     void onSharingStatus(ZoomSDKSharingSourceInfo shareInfo) override {
         if (m_onSharingStatusCallback)
-            m_onSharingStatusCallback(shareInfo);
+            m_performance.invoke(m_onSharingStatusCallback, shareInfo);
     }
 
     void onLockShareStatus(bool bLocked) override {
         if (m_onLockShareStatusCallback)
-            m_onLockShareStatusCallback(bLocked);
+            m_performance.invoke(m_onLockShareStatusCallback, bLocked);
     }
 
     void onShareContentNotification(ZoomSDKSharingSourceInfo shareInfo) override {
         if (m_onShareContentNotificationCallback)
-            m_onShareContentNotificationCallback(shareInfo);
+            m_performance.invoke(m_onShareContentNotificationCallback, shareInfo);
     }
 
     void onMultiShareSwitchToSingleShareNeedConfirm(IShareSwitchMultiToSingleConfirmHandler* handler) override {
         if (m_onMultiShareSwitchToSingleShareNeedConfirmCallback)
-            m_onMultiShareSwitchToSingleShareNeedConfirmCallback(handler);
+            m_performance.invoke(m_onMultiShareSwitchToSingleShareNeedConfirmCallback, handler);
     }
 
     void onShareSettingTypeChangedNotification(ShareSettingType type) override {
         if (m_onShareSettingTypeChangedNotificationCallback)
-            m_onShareSettingTypeChangedNotificationCallback(type);
+            m_performance.invoke(m_onShareSettingTypeChangedNotificationCallback, type);
     }
 
     void onSharedVideoEnded() override {
         if (m_onSharedVideoEndedCallback)
-            m_onSharedVideoEndedCallback();
+            m_performance.invoke(m_onSharedVideoEndedCallback);
     }
 
     void onVideoFileSharePlayError(ZoomSDKVideoFileSharePlayError error) override {
         if (m_onVideoFileSharePlayErrorCallback)
-            m_onVideoFileSharePlayErrorCallback(error);
+            m_performance.invoke(m_onVideoFileSharePlayErrorCallback, error);
     }
 
     void onFailedToStartShare() override {
         if (m_onFailedToStartShareCallback)
-            m_onFailedToStartShareCallback();
+            m_performance.invoke(m_onFailedToStartShareCallback);
     }
 
     void onOptimizingShareForVideoClipStatusChanged(ZoomSDKSharingSourceInfo shareInfo) override {
         if (m_onOptimizingShareForVideoClipStatusChangedCallback)
-            m_onOptimizingShareForVideoClipStatusChangedCallback(shareInfo);
+            m_performance.invoke(m_onOptimizingShareForVideoClipStatusChangedCallback, shareInfo);
+    }
+
+    CallbackPerformanceData getPerformanceData() const {
+        return m_performance.getData();
+    }
+
+    void resetPerformanceData() {
+        m_performance.reset();
     }
 };
 
@@ -105,7 +118,8 @@ void init_meeting_share_ctrl_event_callbacks(nb::module_ &m) {
             const std::function<void()>&,
             const std::function<void(ZoomSDKVideoFileSharePlayError)>&,
             const std::function<void()>&,
-            const std::function<void(ZoomSDKSharingSourceInfo)>&
+            const std::function<void(ZoomSDKSharingSourceInfo)>&,
+            bool
         >(),
             nb::arg("onSharingStatusCallback") = nullptr,
             nb::arg("onLockShareStatusCallback") = nullptr,
@@ -115,6 +129,9 @@ void init_meeting_share_ctrl_event_callbacks(nb::module_ &m) {
             nb::arg("onSharedVideoEndedCallback") = nullptr,
             nb::arg("onVideoFileSharePlayErrorCallback") = nullptr,
             nb::arg("onFailedToStartShareCallback") = nullptr,
-            nb::arg("onOptimizingShareForVideoClipStatusChangedCallback") = nullptr
-        );
+            nb::arg("onOptimizingShareForVideoClipStatusChangedCallback") = nullptr,
+            nb::arg("collectPerformanceData") = false
+        )
+        .def("getPerformanceData", &MeetingShareCtrlEventCallbacks::getPerformanceData)
+        .def("resetPerformanceData", &MeetingShareCtrlEventCallbacks::resetPerformanceData);
 }
\ No newline at end of file
@@ -37,6 +37,7 @@ void init_meeting_participants_ctrl_event_callbacks(nb::module_ &);
 void init_zoom_sdk_video_source_callbacks(nb::module_ &);
 void init_zoom_sdk_share_source_callbacks(nb::module_ &);
 void init_utilities(nb::module_ &);
+void init_audio_raw_data_shared_memory_sink(nb::module_ &);
 
 NB_MODULE(_zoom_meeting_sdk_impl, m) {
     m.doc() = "Python bindings for Zoom Meeting SDK";
@@ -79,4 +80,5 @@ NB_MODULE(_zoom_meeting_sdk_impl, m) {
     init_zoom_sdk_share_source_callbacks(m);
 
     init_utilities(m);
+    init_audio_raw_data_shared_memory_sink(m);
 }
@@ -3,7 +3,11 @@
 #include <nanobind/trampoline.h>
 #include <nanobind/stl/function.h>
 #include <nanobind/stl/vector.h>
+#include <nanobind/stl/map.h>
 
+#include <algorithm>
+#include <atomic>
+#include <cmath>
 #include <iostream>
 #include <functional>
 #include <memory>
@@ -14,49 +18,158 @@
 
 namespace nb = nanobind;
 using namespace std;
-#define PROCESSING_TIME_BIN_COUNT 200
 
 CallbackPerformanceData::CallbackPerformanceData() 
     : totalProcessingTimeMicroseconds(0),
       numCalls(0),
       maxProcessingTimeMicroseconds(0),
       minProcessingTimeMicroseconds(UINT64_MAX),
-      processingTimeBinCounts(PROCESSING_TIME_BIN_COUNT, 0),
-      processingTimeBinMax(20000),
-      processingTimeBinMin(0) {}
-
-CallbackPerformanceData::CallbackPerformanceData(const CallbackPerformanceData& other) 
-    : totalProcessingTimeMicroseconds(other.totalProcessingTimeMicroseconds),
-      numCalls(other.numCalls),
-      maxProcessingTimeMicroseconds(other.maxProcessingTimeMicroseconds),
-      minProcessingTimeMicroseconds(other.minProcessingTimeMicroseconds),
-      processingTimeBinCounts(other.processingTimeBinCounts),
-      processingTimeBinMax(other.processingTimeBinMax),
-      processingTimeBinMin(other.processingTimeBinMin) {}
+      processingTimeBinCounts(PROCESSING_TIME_BIN_COUNT, 0) {}
 
 void CallbackPerformanceData::updatePerformanceData(uint64_t processingTimeMicroseconds) {
-    std::lock_guard<std::mutex> lockGuard(lock);
     totalProcessingTimeMicroseconds += processingTimeMicroseconds;
     numCalls++;
-    int binIndex = ((processingTimeMicroseconds - processingTimeBinMin) * PROCESSING_TIME_BIN_COUNT) / (processingTimeBinMax - processingTimeBinMin);
-    if (binIndex >= PROCESSING_TIME_BIN_COUNT)
-        binIndex = PROCESSING_TIME_BIN_COUNT - 1;
-    if (binIndex < 0)
-        binIndex = 0;
-    processingTimeBinCounts[binIndex]++;
+    processingTimeBinCounts[getBinIndex(processingTimeMicroseconds)]++;
     if (processingTimeMicroseconds > maxProcessingTimeMicroseconds)
         maxProcessingTimeMicroseconds = processingTimeMicroseconds;
     if (processingTimeMicroseconds < minProcessingTimeMicroseconds)
         minProcessingTimeMicroseconds = processingTimeMicroseconds;
 }
 
+void CallbackPerformanceData::merge(const CallbackPerformanceData& other) {
+    totalProcessingTimeMicroseconds += other.totalProcessingTimeMicroseconds;
+    numCalls += other.numCalls;
+    maxProcessingTimeMicroseconds = std::max(maxProcessingTimeMicroseconds, other.maxProcessingTimeMicroseconds);
+    minProcessingTimeMicroseconds = std::min(minProcessingTimeMicroseconds, other.minProcessingTimeMicroseconds);
+    for (size_t i = 0; i < PROCESSING_TIME_BIN_COUNT && i < other.processingTimeBinCounts.size(); i++)
+        processingTimeBinCounts[i] += other.processingTimeBinCounts[i];
+}
+
+void CallbackPerformanceData::reset() {
+    totalProcessingTimeMicroseconds = 0;
+    numCalls = 0;
+    maxProcessingTimeMicroseconds = 0;
+    minProcessingTimeMicroseconds = UINT64_MAX;
+    std::fill(processingTimeBinCounts.begin(), processingTimeBinCounts.end(), 0);
+}
+
+// Upper bound of the bin holding the given fraction of calls, clamped to the observed min and max
+uint64_t CallbackPerformanceData::getPercentile(double fraction) const {
+    if (numCalls == 0)
+        return 0;
+    uint64_t target = (uint64_t) std::ceil(std::clamp(fraction, 0.0, 1.0) * numCalls);
+    if (target == 0)
+        target = 1;
+    uint64_t seen = 0;
+    for (size_t i = 0; i < processingTimeBinCounts.size(); i++) {
+        seen += processingTimeBinCounts[i];
+        if (seen >= target)
+            return std::clamp(getBinUpperBound(i), minProcessingTimeMicroseconds, maxProcessingTimeMicroseconds);
+    }
+    return maxProcessingTimeMicroseconds;
+}
+
+uint64_t CallbackPerformanceData::getBinLowerBound(size_t binIndex) {
+    if (binIndex < PROCESSING_TIME_SUB_BIN_COUNT)
+        return binIndex;
+    size_t shift = binIndex / PROCESSING_TIME_SUB_BIN_COUNT - 1;
+    return (uint64_t) (PROCESSING_TIME_SUB_BIN_COUNT + binIndex % PROCESSING_TIME_SUB_BIN_COUNT) << shift;
+}
+
+uint64_t CallbackPerformanceData::getBinUpperBound(size_t binIndex) {
+    if (binIndex >= PROCESSING_TIME_BIN_COUNT - 1)
+        return UINT64_MAX;
+    return getBinLowerBound(binIndex + 1) - 1;
+}
+
+CallbackPerformanceRecorder::CallbackPerformanceRecorder() {
+    reset();
+}
+
+CallbackPerformanceData CallbackPerformanceRecorder::snapshot() const {
+    CallbackPerformanceData data;
+    data.totalProcessingTimeMicroseconds = m_totalProcessingTimeMicroseconds.load(std::memory_order_relaxed);
+    data.numCalls = m_numCalls.load(std::memory_order_relaxed);
+    data.maxProcessingTimeMicroseconds = m_maxProcessingTimeMicroseconds.load(std::memory_order_relaxed);
+    data.minProcessingTimeMicroseconds = m_minProcessingTimeMicroseconds.load(std::memory_order_relaxed);
+    for (size_t i = 0; i < PROCESSING_TIME_BIN_COUNT; i++)
+        data.processingTimeBinCounts[i] = m_binCounts[i].load(std::memory_order_relaxed);
+    return data;
+}
+
+void CallbackPerformanceRecorder::reset() {
+    m_totalProcessingTimeMicroseconds.store(0, std::memory_order_relaxed);
+    m_numCalls.store(0, std::memory_order_relaxed);
+    m_maxProcessingTimeMicroseconds.store(0, std::memory_order_relaxed);
+    m_minProcessingTimeMicroseconds.store(UINT64_MAX, std::memory_order_relaxed);
+    for (auto& binCount : m_binCounts)
+        binCount.store(0, std::memory_order_relaxed);
+}
+
+static std::mutex collectorRegistryLock;
+static std::map<std::string, CallbackPerformanceCollector*> collectorRegistry;
+static std::atomic<uint64_t> collectorCounter(0);
+
+CallbackPerformanceCollector::CallbackPerformanceCollector(const string& className, bool enabled)
+    : m_name(className + "#" + std::to_string(++collectorCounter)),
+      m_enabled(enabled) {
+    if (!m_enabled)
+        return;
+    std::lock_guard<std::mutex> lockGuard(collectorRegistryLock);
+    collectorRegistry[m_name] = this;
+}
+
+CallbackPerformanceCollector::~CallbackPerformanceCollector() {
+    if (!m_enabled)
+        return;
+    std::lock_guard<std::mutex> lockGuard(collectorRegistryLock);
+    collectorRegistry.erase(m_name);
+}
+
+vector<string> listCallbackPerformanceCollectors() {
+    std::lock_guard<std::mutex> lockGuard(collectorRegistryLock);
+    vector<string> names;
+    names.reserve(collectorRegistry.size());
+    for (const auto& entry : collectorRegistry)
+        names.push_back(entry.first);
+    return names;
+}
+
+map<string, CallbackPerformanceData> getCallbackPerformanceDataSnapshot() {
+    std::lock_guard<std::mutex> lockGuard(collectorRegistryLock);
+    map<string, CallbackPerformanceData> snapshot;
+    for (const auto& entry : collectorRegistry)
+        snapshot.emplace(entry.first, entry.second->getData());
+    return snapshot;
+}
+
+void resetCallbackPerformanceData() {
+    std::lock_guard<std::mutex> lockGuard(collectorRegistryLock);
+    for (const auto& entry : collectorRegistry)
+        entry.second->reset();
+}
+
 void init_utilities(nb::module_ &m) {
-    nb::class_<CallbackPerformanceData>(m, "CallbackPerformanceData")        
+    nb::class_<CallbackPerformanceData>(m, "CallbackPerformanceData")
+        .def(nb::init<>())
         .def_ro("totalProcessingTimeMicroseconds", &CallbackPerformanceData::totalProcessingTimeMicroseconds)
         .def_ro("numCalls", &CallbackPerformanceData::numCalls)
         .def_ro("maxProcessingTimeMicroseconds", &CallbackPerformanceData::maxProcessingTimeMicroseconds)
         .def_ro("minProcessingTimeMicroseconds", &CallbackPerformanceData::minProcessingTimeMicroseconds)
         .def_ro("processingTimeBinCounts", &CallbackPerformanceData::processingTimeBinCounts)
-        .def_ro("processingTimeBinMax", &CallbackPerformanceData::processingTimeBinMax)
-        .def_ro("processingTimeBinMin", &CallbackPerformanceData::processingTimeBinMin);
+        .def_prop_ro("p50", [](const CallbackPerformanceData& data) { return data.getPercentile(0.5); })
+        .def_prop_ro("p90", [](const CallbackPerformanceData& data) { return data.getPercentile(0.9); })
+        .def_prop_ro("p99", [](const CallbackPerformanceData& data) { return data.getPercentile(0.99); })
+        .def_prop_ro("p999", [](const CallbackPerformanceData& data) { return data.getPercentile(0.999); })
+        .def("getPercentile", &CallbackPerformanceData::getPercentile, nb::arg("fraction"))
+        .def("record", &CallbackPerformanceData::updatePerformanceData, nb::arg("processingTimeMicroseconds"))
+        .def("merge", &CallbackPerformanceData::merge, nb::arg("other"))
+        .def("reset", &CallbackPerformanceData::reset)
+        .def_static("getBinIndex", &CallbackPerformanceData::getBinIndex, nb::arg("processingTimeMicroseconds"))
+        .def_static("getBinLowerBound", &CallbackPerformanceData::getBinLowerBound, nb::arg("binIndex"))
+        .def_static("getBinUpperBound", &CallbackPerformanceData::getBinUpperBound, nb::arg("binIndex"));
+
+    m.def("ListCallbackPerformanceCollectors", &listCallbackPerformanceCollectors);
+    m.def("GetCallbackPerformanceDataSnapshot", &getCallbackPerformanceDataSnapshot);
+    m.def("ResetCallbackPerformanceData", &resetCallbackPerformanceData);
 };
\ No newline at end of file
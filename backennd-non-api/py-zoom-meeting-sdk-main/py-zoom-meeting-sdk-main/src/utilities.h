@@ -8,27 +8,150 @@
 #include <nanobind/stl/vector.h>
 
 #include <iostream>
+#include <array>
+#include <atomic>
+#include <chrono>
 #include <functional>
+#include <map>
 #include <memory>
 #include <mutex>
+#include <string>
+#include <utility>
 #include <vector>
 
 namespace nb = nanobind;
 using namespace std;
 
+// Log-scaled, HDR-style bins: values below 8us get their own bin, above that every
+// power of two is split into 8 sub-bins (at most 12.5% relative error). Values of
+// 2^32us (~71 minutes) or more land in the last bin.
+#define PROCESSING_TIME_SUB_BIN_BITS 3
+#define PROCESSING_TIME_SUB_BIN_COUNT (1 << PROCESSING_TIME_SUB_BIN_BITS)
+#define PROCESSING_TIME_MAX_EXPONENT 32
+#define PROCESSING_TIME_BIN_COUNT ((PROCESSING_TIME_MAX_EXPONENT - PROCESSING_TIME_SUB_BIN_BITS + 1) * PROCESSING_TIME_SUB_BIN_COUNT)
+
+/*
+Plain snapshot of a collector's histogram. Snapshots share a fixed bin layout,
+so snapshots from different collectors, processes or time windows can be merged
+by adding them together.
+*/
 struct CallbackPerformanceData {
     uint64_t totalProcessingTimeMicroseconds;
     uint64_t numCalls;
     uint64_t maxProcessingTimeMicroseconds;
     uint64_t minProcessingTimeMicroseconds;
     std::vector<uint64_t> processingTimeBinCounts;
-    uint64_t processingTimeBinMax;
-    uint64_t processingTimeBinMin;
-    std::mutex lock;
 
     CallbackPerformanceData();
-    CallbackPerformanceData(const CallbackPerformanceData& other);
     void updatePerformanceData(uint64_t processingTimeMicroseconds);
+    void merge(const CallbackPerformanceData& other);
+    void reset();
+    uint64_t getPercentile(double fraction) const;
+
+    static size_t getBinIndex(uint64_t processingTimeMicroseconds) {
+        if (processingTimeMicroseconds < PROCESSING_TIME_SUB_BIN_COUNT)
+            return processingTimeMicroseconds;
+        int exponent = 63 - __builtin_clzll(processingTimeMicroseconds);
+        if (exponent >= PROCESSING_TIME_MAX_EXPONENT)
+            return PROCESSING_TIME_BIN_COUNT - 1;
+        int shift = exponent - PROCESSING_TIME_SUB_BIN_BITS;
+        return (shift + 1) * PROCESSING_TIME_SUB_BIN_COUNT + ((processingTimeMicroseconds >> shift) - PROCESSING_TIME_SUB_BIN_COUNT);
+    }
+    static uint64_t getBinLowerBound(size_t binIndex);
+    static uint64_t getBinUpperBound(size_t binIndex);
+};
+
+/*
+Lock-free recorder behind CallbackPerformanceCollector. Every update is a few
+relaxed atomic increments, so callbacks on SDK threads never block each other
+or a concurrent snapshot. A snapshot taken while callbacks are running may be
+off by the calls that are in flight.
+*/
+class CallbackPerformanceRecorder {
+private:
+    std::atomic<uint64_t> m_totalProcessingTimeMicroseconds;
+    std::atomic<uint64_t> m_numCalls;
+    std::atomic<uint64_t> m_maxProcessingTimeMicroseconds;
+    std::atomic<uint64_t> m_minProcessingTimeMicroseconds;
+    std::array<std::atomic<uint64_t>, PROCESSING_TIME_BIN_COUNT> m_binCounts;
+
+public:
+    CallbackPerformanceRecorder();
+
+    void record(uint64_t processingTimeMicroseconds) {
+        m_totalProcessingTimeMicroseconds.fetch_add(processingTimeMicroseconds, std::memory_order_relaxed);
+        m_numCalls.fetch_add(1, std::memory_order_relaxed);
+        m_binCounts[CallbackPerformanceData::getBinIndex(processingTimeMicroseconds)].fetch_add(1, std::memory_order_relaxed);
+
+        uint64_t current = m_maxProcessingTimeMicroseconds.load(std::memory_order_relaxed);
+        while (processingTimeMicroseconds > current && !m_maxProcessingTimeMicroseconds.compare_exchange_weak(current, processingTimeMicroseconds, std::memory_order_relaxed)) {}
+        current = m_minProcessingTimeMicroseconds.load(std::memory_order_relaxed);
+        while (processingTimeMicroseconds < current && !m_minProcessingTimeMicroseconds.compare_exchange_weak(current, processingTimeMicroseconds, std::memory_order_relaxed)) {}
+    }
+
+    CallbackPerformanceData snapshot() const;
+    void reset();
+};
+
+/*
+Times the Python callbacks of one callback wrapper instance. When enabled it
+registers itself under a unique name ("<ClassName>#<n>") so every live
+collector can be listed, snapshotted and reset from Python.
+*/
+class CallbackPerformanceCollector {
+private:
+    string m_name;
+    bool m_enabled;
+    CallbackPerformanceRecorder m_recorder;
+
+public:
+    CallbackPerformanceCollector(const string& className, bool enabled);
+    ~CallbackPerformanceCollector();
+    CallbackPerformanceCollector(const CallbackPerformanceCollector&) = delete;
+    CallbackPerformanceCollector& operator=(const CallbackPerformanceCollector&) = delete;
+
+    template <typename Callback, typename... Args>
+    void invoke(const Callback& callback, Args&&... args) {
+        if (!m_enabled) {
+            callback(std::forward<Args>(args)...);
+            return;
+        }
+        auto start = std::chrono::steady_clock::now();
+        callback(std::forward<Args>(args)...);
+        auto end = std::chrono::steady_clock::now();
+        m_recorder.record(std::chrono::duration_cast<std::chrono::microseconds>(end - start).count());
+    }
+
+    const string& getName() const { return m_name; }
+    bool isEnabled() const { return m_enabled; }
+    CallbackPerformanceData getData() const { return m_recorder.snapshot(); }
+    void reset() { m_recorder.reset(); }
 };
 
-#endif
\ No newline at end of file
+/*
+Borrows the memory of any C-contiguous buffer protocol object (bytes, bytearray,
+memoryview, NumPy arrays) without copying it. Construct and destroy it with the GIL
+held; the memory stays valid in between, so the GIL can be released while it is used.
+*/
+class ContiguousBuffer {
+private:
+    Py_buffer m_view;
+
+public:
+    explicit ContiguousBuffer(nb::handle object) {
+        if (PyObject_GetBuffer(object.ptr(), &m_view, PyBUF_C_CONTIGUOUS) != 0)
+            throw nb::python_error();
+    }
+    ~ContiguousBuffer() { PyBuffer_Release(&m_view); }
+    ContiguousBuffer(const ContiguousBuffer&) = delete;
+    ContiguousBuffer& operator=(const ContiguousBuffer&) = delete;
+
+    char* data() const { return static_cast<char*>(m_view.buf); }
+    size_t size() const { return (size_t) m_view.len; }
+};
+
+vector<string> listCallbackPerformanceCollectors();
+map<string, CallbackPerformanceData> getCallbackPerformanceDataSnapshot();
+void resetCallbackPerformanceData();
+
+#endif
@@ -3,6 +3,9 @@
 #include <nanobind/trampoline.h>
 #include <nanobind/stl/function.h>
 #include <nanobind/stl/vector.h>
+#include <nanobind/stl/shared_ptr.h>
+#include <nanobind/stl/tuple.h>
+#include <nanobind/ndarray.h>
 
 #include "zoom_sdk.h"
 #include "zoom_sdk_def.h"
@@ -13,11 +16,15 @@
 #include "rawdata/zoom_rawdata_api.h"
 
 #include "utilities.h"
+#include "audio_raw_data_shared_memory_sink.h"
 
 #include <iostream>
+#include <chrono>
 #include <functional>
+#include <map>
 #include <memory>
 #include <mutex>
+#include <tuple>
 #include <vector>
 
 namespace nb = nanobind;
@@ -41,107 +48,296 @@ public:
 };
 */
 
+/*
+One-way audio chunks coalesced on the native side. Chunks are grouped by node_id, so
+each participant's audio is contiguous in the buffer, and are in arrival order within
+a participant. The batch owns its memory and can be kept after the callback.
+arrivalTimes are when each chunk reached the delegate, in steady_clock nanoseconds,
+which on Linux is CLOCK_MONOTONIC, the clock behind Python's time.monotonic().
+*/
+class AudioRawDataBatch {
+public:
+    vector<char> buffer;
+    vector<uint32_t> nodeIds;
+    vector<uint64_t> timeStamps;
+    vector<uint64_t> arrivalTimes;
+    vector<uint32_t> offsets;
+    vector<uint32_t> lengths;
+    unsigned int sampleRate = 0;
+    unsigned int channelNum = 0;
+
+    // (node_id, offset, length) of each participant's contiguous audio
+    vector<tuple<uint32_t, uint32_t, uint32_t>> getNodeSegments() const {
+        vector<tuple<uint32_t, uint32_t, uint32_t>> segments;
+        for (size_t i = 0; i < nodeIds.size(); i++) {
+            if (!segments.empty() && get<0>(segments.back()) == nodeIds[i])
+                get<2>(segments.back()) += lengths[i];
+            else
+                segments.emplace_back(nodeIds[i], offsets[i], lengths[i]);
+        }
+        return segments;
+    }
+};
+
 class ZoomSDKAudioRawDataDelegateCallbacks : public ZOOM_SDK_NAMESPACE::IZoomSDKAudioRawDataDelegate {
 private:
+    struct PendingNodeAudio {
+        vector<char> data;
+        vector<uint64_t> timeStamps;
+        vector<uint64_t> arrivalTimes;
+        vector<uint32_t> lengths;
+    };
+
     function<void(AudioRawData*)> m_onMixedAudioRawDataReceivedCallback;
     function<void(AudioRawData*, uint32_t)> m_onOneWayAudioRawDataReceivedCallback;
     function<void(AudioRawData*)> m_onShareAudioRawDataReceivedCallback;
     function<void(AudioRawData*, const zchar_t*)> m_onOneWayInterpreterAudioRawDataReceivedCallback;
-    bool m_collectPerformanceData;
-    CallbackPerformanceData m_performanceData;
+    CallbackPerformanceCollector m_performance;
+
+    function<void(shared_ptr<AudioRawDataBatch>)> m_onOneWayAudioRawDataBatchReceivedCallback;
+    chrono::milliseconds m_audioBatchInterval;
+    size_t m_audioBatchMaxBytes;
+
+    shared_ptr<AudioRawDataSharedMemorySink> m_sharedMemorySink;
+
+    // m_pendingLock guards the pending chunks, m_deliveryLock keeps batches in order
+    // when the SDK thread and flushAudioBatch race. Neither is held with the GIL.
+    mutex m_pendingLock;
+    mutex m_deliveryLock;
+    map<uint32_t, PendingNodeAudio> m_pendingAudio;
+    size_t m_pendingBytes = 0;
+    size_t m_pendingChunks = 0;
+    unsigned int m_pendingSampleRate = 0;
+    unsigned int m_pendingChannelNum = 0;
+    chrono::steady_clock::time_point m_pendingSince;
+
+    // Moves the pending chunks into a batch. Node buffers are cleared rather than
+    // erased so their capacity is reused by the next batch. Requires m_pendingLock.
+    shared_ptr<AudioRawDataBatch> takePendingAudio() {
+        if (m_pendingChunks == 0)
+            return nullptr;
+
+        auto batch = make_shared<AudioRawDataBatch>();
+        batch->sampleRate = m_pendingSampleRate;
+        batch->channelNum = m_pendingChannelNum;
+        batch->buffer.reserve(m_pendingBytes);
+        batch->nodeIds.reserve(m_pendingChunks);
+        batch->timeStamps.reserve(m_pendingChunks);
+        batch->arrivalTimes.reserve(m_pendingChunks);
+        batch->offsets.reserve(m_pendingChunks);
+        batch->lengths.reserve(m_pendingChunks);
+
+        for (auto& entry : m_pendingAudio) {
+            PendingNodeAudio& pending = entry.second;
+            uint32_t offset = (uint32_t) batch->buffer.size();
+            batch->buffer.insert(batch->buffer.end(), pending.data.begin(), pending.data.end());
+            for (size_t i = 0; i < pending.lengths.size(); i++) {
+                batch->nodeIds.push_back(entry.first);
+                batch->timeStamps.push_back(pending.timeStamps[i]);
+                batch->arrivalTimes.push_back(pending.arrivalTimes[i]);
+                batch->offsets.push_back(offset);
+                batch->lengths.push_back(pending.lengths[i]);
+                offset += pending.lengths[i];
+            }
+            pending.data.clear();
+            pending.timeStamps.clear();
+            pending.arrivalTimes.clear();
+            pending.lengths.clear();
+        }
+
+        m_pendingBytes = 0;
+        m_pendingChunks = 0;
+        return batch;
+    }
+
+    void deliverAudioBatch(const shared_ptr<AudioRawDataBatch>& batch) {
+        if (batch)
+            m_performance.invoke(m_onOneWayAudioRawDataBatchReceivedCallback, batch);
+    }
+
+    void writeToSharedMemory(AudioRawData* data_, uint32_t user_id, AudioRawDataSource source) {
+        m_sharedMemorySink->write(data_->GetBuffer(), data_->GetBufferLen(), user_id, data_->GetTimeStamp(), data_->GetSampleRate(), (uint16_t) data_->GetChannelNum(), source);
+    }
+
+    void addToAudioBatch(AudioRawData* data_, uint32_t user_id) {
+        lock_guard<mutex> deliveryGuard(m_deliveryLock);
+        shared_ptr<AudioRawDataBatch> formatChangedBatch;
+        shared_ptr<AudioRawDataBatch> fullBatch;
+        {
+            lock_guard<mutex> pendingGuard(m_pendingLock);
+            auto now = chrono::steady_clock::now();
+
+            // A batch holds a single audio format
+            if (m_pendingChunks > 0 && (data_->GetSampleRate() != m_pendingSampleRate || data_->GetChannelNum() != m_pendingChannelNum))
+                formatChangedBatch = takePendingAudio();
+
+            if (m_pendingChunks == 0) {
+                m_pendingSince = now;
+                m_pendingSampleRate = data_->GetSampleRate();
+                m_pendingChannelNum = data_->GetChannelNum();
+            }
+
+            PendingNodeAudio& pending = m_pendingAudio[user_id];
+            pending.data.insert(pending.data.end(), data_->GetBuffer(), data_->GetBuffer() + data_->GetBufferLen());
+            pending.timeStamps.push_back(data_->GetTimeStamp());
+            pending.arrivalTimes.push_back((uint64_t) chrono::duration_cast<chrono::nanoseconds>(now.time_since_epoch()).count());
+            pending.lengths.push_back(data_->GetBufferLen());
+            m_pendingBytes += data_->GetBufferLen();
+            m_pendingChunks++;
+
+            bool bytesReached = m_audioBatchMaxBytes > 0 && m_pendingBytes >= m_audioBatchMaxBytes;
+            bool intervalReached = now - m_pendingSince >= m_audioBatchInterval;
+            if (bytesReached || intervalReached)
+                fullBatch = takePendingAudio();
+        }
+        deliverAudioBatch(formatChangedBatch);
+        deliverAudioBatch(fullBatch);
+    }
+
 public:
     ZoomSDKAudioRawDataDelegateCallbacks(
         const function<void(AudioRawData*)>& onMixedAudioRawDataReceivedCallback = nullptr,
         const function<void(AudioRawData*, uint32_t)>& onOneWayAudioRawDataReceivedCallback = nullptr,
         const function<void(AudioRawData*)>& onShareAudioRawDataReceivedCallback = nullptr,
         const function<void(AudioRawData*, const zchar_t*)>& onOneWayInterpreterAudioRawDataReceivedCallback = nullptr,
-        bool collectPerformanceData = false
+        bool collectPerformanceData = false,
+        const function<void(shared_ptr<AudioRawDataBatch>)>& onOneWayAudioRawDataBatchReceivedCallback = nullptr,
+        unsigned int audioBatchIntervalMilliseconds = 100,
+        size_t audioBatchMaxBytes = 0,
+        const shared_ptr<AudioRawDataSharedMemorySink>& sharedMemorySink = nullptr
     ) : m_onMixedAudioRawDataReceivedCallback(onMixedAudioRawDataReceivedCallback),
         m_onOneWayAudioRawDataReceivedCallback(onOneWayAudioRawDataReceivedCallback),
         m_onShareAudioRawDataReceivedCallback(onShareAudioRawDataReceivedCallback),
         m_onOneWayInterpreterAudioRawDataReceivedCallback(onOneWayInterpreterAudioRawDataReceivedCallback),
-        m_collectPerformanceData(collectPerformanceData) {}
+        m_performance("ZoomSDKAudioRawDataDelegateCallbacks", collectPerformanceData),
+        m_onOneWayAudioRawDataBatchReceivedCallback(onOneWayAudioRawDataBatchReceivedCallback),
+        m_audioBatchInterval(audioBatchIntervalMilliseconds),
+        m_audioBatchMaxBytes(audioBatchMaxBytes),
+        m_sharedMemorySink(sharedMemorySink) {}
 
     void onMixedAudioRawDataReceived(AudioRawData* data_) override {
+        if (m_sharedMemorySink)
+            writeToSharedMemory(data_, 0, AUDIO_RAW_DATA_SOURCE_MIXED);
         if (m_onMixedAudioRawDataReceivedCallback)
-        {
-            if (m_collectPerformanceData) {
-                auto start = std::chrono::high_resolution_clock::now();
-                m_onMixedAudioRawDataReceivedCallback(data_);
-                auto end = std::chrono::high_resolution_clock::now();
-                uint64_t processingTimeMicroseconds = std::chrono::duration_cast<std::chrono::microseconds>(end - start).count();
-                m_performanceData.updatePerformanceData(processingTimeMicroseconds);
-            }
-            else
-                m_onMixedAudioRawDataReceivedCallback(data_);
-        }
+            m_performance.invoke(m_onMixedAudioRawDataReceivedCallback, data_);
     }
 
     void onOneWayAudioRawDataReceived(AudioRawData* data_, uint32_t user_id) override {
+        if (m_sharedMemorySink)
+            writeToSharedMemory(data_, user_id, AUDIO_RAW_DATA_SOURCE_ONE_WAY);
+        if (m_onOneWayAudioRawDataBatchReceivedCallback)
+            addToAudioBatch(data_, user_id);
         if (m_onOneWayAudioRawDataReceivedCallback)
-        {
-            if (m_collectPerformanceData) {
-                auto start = std::chrono::high_resolution_clock::now();
-                m_onOneWayAudioRawDataReceivedCallback(data_, user_id);
-                auto end = std::chrono::high_resolution_clock::now();
-                uint64_t processingTimeMicroseconds = std::chrono::duration_cast<std::chrono::microseconds>(end - start).count();
-                m_performanceData.updatePerformanceData(processingTimeMicroseconds);
-            }
-            else
-                m_onOneWayAudioRawDataReceivedCallback(data_, user_id);
-        }
+            m_performance.invoke(m_onOneWayAudioRawDataReceivedCallback, data_, user_id);
     }
 
     void onShareAudioRawDataReceived(AudioRawData* data_) override {
+        if (m_sharedMemorySink)
+            writeToSharedMemory(data_, 0, AUDIO_RAW_DATA_SOURCE_SHARE);
         if (m_onShareAudioRawDataReceivedCallback)
-        {
-            if (m_collectPerformanceData) {
-                auto start = std::chrono::high_resolution_clock::now();
-                m_onShareAudioRawDataReceivedCallback(data_);
-                auto end = std::chrono::high_resolution_clock::now();
-                uint64_t processingTimeMicroseconds = std::chrono::duration_cast<std::chrono::microseconds>(end - start).count();
-                m_performanceData.updatePerformanceData(processingTimeMicroseconds);
-            }
-            else
-                m_onShareAudioRawDataReceivedCallback(data_);
-        }
+            m_performance.invoke(m_onShareAudioRawDataReceivedCallback, data_);
     }
 
     void onOneWayInterpreterAudioRawDataReceived(AudioRawData* data_, const zchar_t* pLanguageName) override {
         if (m_onOneWayInterpreterAudioRawDataReceivedCallback)
+            m_performance.invoke(m_onOneWayInterpreterAudioRawDataReceivedCallback, data_, pLanguageName);
+    }
+
+    // Delivers pending chunks now, e.g. when audio stops or before unsubscribing
+    void flushAudioBatch() {
+        lock_guard<mutex> deliveryGuard(m_deliveryLock);
+        shared_ptr<AudioRawDataBatch> batch;
         {
-            if (m_collectPerformanceData) {
-                auto start = std::chrono::high_resolution_clock::now();
-                m_onOneWayInterpreterAudioRawDataReceivedCallback(data_, pLanguageName);
-                auto end = std::chrono::high_resolution_clock::now();
-                uint64_t processingTimeMicroseconds = std::chrono::duration_cast<std::chrono::microseconds>(end - start).count();
-                m_performanceData.updatePerformanceData(processingTimeMicroseconds);
-            }
-            else
-                m_onOneWayInterpreterAudioRawDataReceivedCallback(data_, pLanguageName);
+            lock_guard<mutex> pendingGuard(m_pendingLock);
+            batch = takePendingAudio();
+        }
+        deliverAudioBatch(batch);
+    }
+
+    // Delivers pending chunks once the batch interval has passed. Chunks only trigger a
+    // batch when more audio arrives, so a timer calls this to deliver the end of an
+    // utterance when everyone has stopped speaking. Returns whether a batch was delivered.
+    bool flushExpiredAudioBatch() {
+        lock_guard<mutex> deliveryGuard(m_deliveryLock);
+        shared_ptr<AudioRawDataBatch> batch;
+        {
+            lock_guard<mutex> pendingGuard(m_pendingLock);
+            if (m_pendingChunks > 0 && chrono::steady_clock::now() - m_pendingSince >= m_audioBatchInterval)
+                batch = takePendingAudio();
         }
+        deliverAudioBatch(batch);
+        return batch != nullptr;
+    }
+
+    CallbackPerformanceData getPerformanceData() const {
+        return m_performance.getData();
     }
 
-    const CallbackPerformanceData & getPerformanceData() const {
-        return m_performanceData;
+    void resetPerformanceData() {
+        m_performance.reset();
     }
 };
 
+template <typename T>
+using BatchArray = nb::ndarray<nb::numpy, const T, nb::ndim<1>>;
+
+template <typename T>
+static BatchArray<T> batchArray(const vector<T>& values) {
+    return BatchArray<T>(values.data(), { values.size() });
+}
+
+static int audioRawDataBatchGetBuffer(PyObject* exporter, Py_buffer* view, int flags) {
+    AudioRawDataBatch* self = nb::inst_ptr<AudioRawDataBatch>(exporter);
+    return PyBuffer_FillInfo(view, exporter, self->buffer.data(), (Py_ssize_t) self->buffer.size(), 1, flags);
+}
+
+static PyType_Slot audioRawDataBatchSlots[] = {
+    { Py_bf_getbuffer, (void *) audioRawDataBatchGetBuffer },
+    { 0, nullptr }
+};
+
 void init_zoom_sdk_audio_raw_data_delegate_callbacks(nb::module_ &m) {
 
+    nb::class_<AudioRawDataBatch>(m, "AudioRawDataBatch", nb::type_slots(audioRawDataBatchSlots))
+        .def("GetBuffer", [](AudioRawDataBatch& self) -> nb::bytes {
+            return nb::bytes(self.buffer.data(), self.buffer.size());
+        })
+        .def("GetBufferLen", [](AudioRawDataBatch& self) { return self.buffer.size(); })
+        .def("__len__", [](AudioRawDataBatch& self) { return self.buffer.size(); })
+        .def("GetNodeIds", [](AudioRawDataBatch& self) { return batchArray(self.nodeIds); }, nb::rv_policy::reference_internal)
+        .def("GetTimeStamps", [](AudioRawDataBatch& self) { return batchArray(self.timeStamps); }, nb::rv_policy::reference_internal)
+        .def("GetArrivalTimes", [](AudioRawDataBatch& self) { return batchArray(self.arrivalTimes); }, nb::rv_policy::reference_internal)
+        .def("GetOffsets", [](AudioRawDataBatch& self) { return batchArray(self.offsets); }, nb::rv_policy::reference_internal)
+        .def("GetLengths", [](AudioRawDataBatch& self) { return batchArray(self.lengths); }, nb::rv_policy::reference_internal)
+        .def("GetNodeSegments", &AudioRawDataBatch::getNodeSegments)
+        .def("GetChunkCount", [](AudioRawDataBatch& self) { return self.nodeIds.size(); })
+        .def("GetSampleRate", [](AudioRawDataBatch& self) { return self.sampleRate; })
+        .def("GetChannelNum", [](AudioRawDataBatch& self) { return self.channelNum; });
+
     nb::class_<ZoomSDKAudioRawDataDelegateCallbacks, ZOOM_SDK_NAMESPACE::IZoomSDKAudioRawDataDelegate>(m, "ZoomSDKAudioRawDataDelegateCallbacks")
         .def(nb::init<
             const function<void(AudioRawData*)>&,
             const function<void(AudioRawData*, uint32_t)>&,
             const function<void(AudioRawData*)>&,
             const function<void(AudioRawData*, const zchar_t*)>&,
-            bool
+            bool,
+            const function<void(shared_ptr<AudioRawDataBatch>)>&,
+            unsigned int,
+            size_t,
+            const shared_ptr<AudioRawDataSharedMemorySink>&
         >(),
         nb::arg("onMixedAudioRawDataReceivedCallback") = nullptr,
         nb::arg("onOneWayAudioRawDataReceivedCallback") = nullptr,
         nb::arg("onShareAudioRawDataReceivedCallback") = nullptr,
         nb::arg("onOneWayInterpreterAudioRawDataReceivedCallback") = nullptr,
-        nb::arg("collectPerformanceData") = false
+        nb::arg("collectPerformanceData") = false,
+        nb::arg("onOneWayAudioRawDataBatchReceivedCallback") = nullptr,
+        nb::arg("audioBatchIntervalMilliseconds") = 100,
+        nb::arg("audioBatchMaxBytes") = 0,
+        nb::arg("sharedMemorySink") = nullptr
     )
-    .def("getPerformanceData", &ZoomSDKAudioRawDataDelegateCallbacks::getPerformanceData);
+    .def("flushAudioBatch", &ZoomSDKAudioRawDataDelegateCallbacks::flushAudioBatch, nb::call_guard<nb::gil_scoped_release>())
+    .def("flushExpiredAudioBatch", &ZoomSDKAudioRawDataDelegateCallbacks::flushExpiredAudioBatch, nb::call_guard<nb::gil_scoped_release>())
+    .def("getPerformanceData", &ZoomSDKAudioRawDataDelegateCallbacks::getPerformanceData)
+    .def("resetPerformanceData", &ZoomSDKAudioRawDataDelegateCallbacks::resetPerformanceData);
 }
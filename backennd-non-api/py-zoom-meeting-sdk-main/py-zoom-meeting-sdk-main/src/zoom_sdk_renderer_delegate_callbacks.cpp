@@ -47,8 +47,7 @@ private:
     function<void()> m_onRendererBeDestroyedCallback;
     function<void(YUVRawDataI420*)> m_onRawDataFrameReceivedCallback;
     function<void(RawDataStatus)> m_onRawDataStatusChangedCallback;
-    bool m_collectPerformanceData;
-    CallbackPerformanceData m_performanceData;
+    CallbackPerformanceCollector m_performance;
 
 public:
     ZoomSDKRendererDelegateCallbacks(
@@ -59,32 +58,29 @@ public:
     ) : m_onRendererBeDestroyedCallback(onRendererBeDestroyedCallback),
         m_onRawDataFrameReceivedCallback(onRawDataFrameReceivedCallback),
         m_onRawDataStatusChangedCallback(onRawDataStatusChangedCallback),
-        m_collectPerformanceData(collectPerformanceData) {}
+        m_performance("ZoomSDKRendererDelegateCallbacks", collectPerformanceData) {}
 
     void onRendererBeDestroyed() override {
         if (m_onRendererBeDestroyedCallback)
-            m_onRendererBeDestroyedCallback();
+            m_performance.invoke(m_onRendererBeDestroyedCallback);
     }
 
     void onRawDataFrameReceived(YUVRawDataI420* data) override {
-        if (m_collectPerformanceData) {
-            auto start = std::chrono::high_resolution_clock::now();
-            m_onRawDataFrameReceivedCallback(data);
-            auto end = std::chrono::high_resolution_clock::now();
-            uint64_t processingTimeMicroseconds = std::chrono::duration_cast<std::chrono::microseconds>(end - start).count();
-            m_performanceData.updatePerformanceData(processingTimeMicroseconds);
-        }
-        else
-            m_onRawDataFrameReceivedCallback(data);
+        if (m_onRawDataFrameReceivedCallback)
+            m_performance.invoke(m_onRawDataFrameReceivedCallback, data);
     }
 
     void onRawDataStatusChanged(RawDataStatus status) override {
         if (m_onRawDataStatusChangedCallback)
-            m_onRawDataStatusChangedCallback(status);
+            m_performance.invoke(m_onRawDataStatusChangedCallback, status);
     }
 
-    const CallbackPerformanceData & getPerformanceData() const {
-        return m_performanceData;
+    CallbackPerformanceData getPerformanceData() const {
+        return m_performance.getData();
+    }
+
+    void resetPerformanceData() {
+        m_performance.reset();
     }
 };
 
@@ -101,5 +97,6 @@ void init_zoom_sdk_renderer_delegate_callbacks(nb::module_ &m) {
         nb::arg("onRawDataStatusChangedCallback") = nullptr,
         nb::arg("collectPerformanceData") = false
     )
-    .def("getPerformanceData", &ZoomSDKRendererDelegateCallbacks::getPerformanceData);
+    .def("getPerformanceData", &ZoomSDKRendererDelegateCallbacks::getPerformanceData)
+    .def("resetPerformanceData", &ZoomSDKRendererDelegateCallbacks::resetPerformanceData);
 }
\ No newline at end of file
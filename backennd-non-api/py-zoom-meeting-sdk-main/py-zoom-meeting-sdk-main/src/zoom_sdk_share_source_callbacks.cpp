@@ -15,6 +15,8 @@
 #include <memory>
 #include <vector>
 
+#include "utilities.h"
+
 namespace nb = nanobind;
 using namespace ZOOMSDK;
 using namespace std;
@@ -23,22 +25,33 @@ class ShareSourceCallbacks : public ZOOM_SDK_NAMESPACE::IZoomSDKShareSource {
 private:
     function<void(IZoomSDKShareSender *pSender)> m_onStartSendCallback;
     function<void()> m_onStopSendCallback;
+    CallbackPerformanceCollector m_performance;
 
 public:
     ShareSourceCallbacks(
         const function<void(IZoomSDKShareSender *pSender)>& onStartSendCallback = nullptr,
-        const function<void()>& onStopSendCallback = nullptr
+        const function<void()>& onStopSendCallback = nullptr,
+        bool collectPerformanceData = false
     ) : m_onStartSendCallback(onStartSendCallback),
-        m_onStopSendCallback(onStopSendCallback) {}
+        m_onStopSendCallback(onStopSendCallback),
+        m_performance("ShareSourceCallbacks", collectPerformanceData) {}
 
     void onStartSend(IZoomSDKShareSender *pSender) override {
         if (m_onStartSendCallback)
-            m_onStartSendCallback(pSender);
+            m_performance.invoke(m_onStartSendCallback, pSender);
     }
 
     void onStopSend() override {
         if (m_onStopSendCallback)
-            m_onStopSendCallback();
+            m_performance.invoke(m_onStopSendCallback);
+    }
+
+    CallbackPerformanceData getPerformanceData() const {
+        return m_performance.getData();
+    }
+
+    void resetPerformanceData() {
+        m_performance.reset();
     }
 };
 
@@ -46,22 +59,33 @@ class ShareAudioCallbacks : public ZOOM_SDK_NAMESPACE::IZoomSDKShareAudioSource
 private:
     function<void(IZoomSDKShareAudioSender *pSender)> m_onStartSendAudioCallback;
     function<void()> m_onStopSendAudioCallback;
+    CallbackPerformanceCollector m_performance;
 
 public:
     ShareAudioCallbacks(
         const function<void(IZoomSDKShareAudioSender  *pSender)>& onStartSendAudioCallback = nullptr,
-        const function<void()>& onStopSendAudioCallback = nullptr
+        const function<void()>& onStopSendAudioCallback = nullptr,
+        bool collectPerformanceData = false
     ): m_onStartSendAudioCallback(onStartSendAudioCallback),
-        m_onStopSendAudioCallback(onStopSendAudioCallback) {}
+        m_onStopSendAudioCallback(onStopSendAudioCallback),
+        m_performance("ShareAudioCallbacks", collectPerformanceData) {}
 
     void onStartSendAudio(IZoomSDKShareAudioSender *pSender) override {
         if (m_onStartSendAudioCallback)
-            m_onStartSendAudioCallback(pSender);
+            m_performance.invoke(m_onStartSendAudioCallback, pSender);
     }
 
     void onStopSendAudio() override {
         if (m_onStopSendAudioCallback)
-            m_onStopSendAudioCallback();
+            m_performance.invoke(m_onStopSendAudioCallback);
+    }
+
+    CallbackPerformanceData getPerformanceData() const {
+        return m_performance.getData();
+    }
+
+    void resetPerformanceData() {
+        m_performance.reset();
     }
 };
 
@@ -70,18 +94,26 @@ void init_zoom_sdk_share_source_callbacks(nb::module_ &m) {
     nb::class_<ShareSourceCallbacks, IZoomSDKShareSource>(m, "ShareSourceCallbacks")
         .def(nb::init<
             function<void(IZoomSDKShareSender *pSender)>&,
-            function<void()>&
+            function<void()>&,
+            bool
         >(),
             nb::arg("onStartSendCallback") = nullptr,
-            nb::arg("onStopSendCallback") = nullptr
-        );
+            nb::arg("onStopSendCallback") = nullptr,
+            nb::arg("collectPerformanceData") = false
+        )
+        .def("getPerformanceData", &ShareSourceCallbacks::getPerformanceData)
+        .def("resetPerformanceData", &ShareSourceCallbacks::resetPerformanceData);
 
     nb::class_<ShareAudioCallbacks, IZoomSDKShareAudioSource>(m, "ShareAudioCallbacks")
         .def(nb::init<
             function<void(IZoomSDKShareAudioSender *pSender)>&,
-            function<void()>&
+            function<void()>&,
+            bool
         >(),
             nb::arg("onStartSendAudioCallback") = nullptr,
-            nb::arg("onStopSendAudioCallback") = nullptr
-        );
+            nb::arg("onStopSendAudioCallback") = nullptr,
+            nb::arg("collectPerformanceData") = false
+        )
+        .def("getPerformanceData", &ShareAudioCallbacks::getPerformanceData)
+        .def("resetPerformanceData", &ShareAudioCallbacks::resetPerformanceData);
 }
\ No newline at end of file
@@ -14,6 +14,8 @@
 #include <memory>
 #include <vector>
 
+#include "utilities.h"
+
 namespace nb = nanobind;
 using namespace ZOOMSDK;
 using namespace std;
@@ -25,6 +27,7 @@ private:
     function<void()> m_onStartSendCallback;
     function<void()> m_onStopSendCallback;
     function<void()> m_onUninitializedCallback;
+    CallbackPerformanceCollector m_performance;
 
 public:
     ZoomSDKVideoSourceCallbacks(
@@ -32,12 +35,14 @@ public:
         const function<void(vector<VideoSourceCapability>, VideoSourceCapability)>& onPropertyChangeCallback = nullptr,
         const function<void()>& onStartSendCallback = nullptr,
         const function<void()>& onStopSendCallback = nullptr,
-        const function<void()>& onUninitializedCallback = nullptr
+        const function<void()>& onUninitializedCallback = nullptr,
+        bool collectPerformanceData = false
     ) : m_onInitializeCallback(onInitializeCallback),
         m_onPropertyChangeCallback(onPropertyChangeCallback),
         m_onStartSendCallback(onStartSendCallback),
         m_onStopSendCallback(onStopSendCallback),
-        m_onUninitializedCallback(onUninitializedCallback) {}
+        m_onUninitializedCallback(onUninitializedCallback),
+        m_performance("ZoomSDKVideoSourceCallbacks", collectPerformanceData) {}
 
     void onInitialize(IZoomSDKVideoSender* sender, IList<VideoSourceCapability>* support_cap_list, VideoSourceCapability& suggest_cap) override {
         if (m_onInitializeCallback) {
@@ -49,7 +54,7 @@ public:
                     caps.push_back(support_cap_list->GetItem(i));
                 }
             }
-            m_onInitializeCallback(sender, caps, suggest_cap);
+            m_performance.invoke(m_onInitializeCallback, sender, caps, suggest_cap);
         }
     }
 
@@ -63,23 +68,31 @@ public:
                     caps.push_back(support_cap_list->GetItem(i));
                 }
             }
-            m_onPropertyChangeCallback(caps, suggest_cap);
+            m_performance.invoke(m_onPropertyChangeCallback, caps, suggest_cap);
         }
     }
 
     void onStartSend() override {
         if (m_onStartSendCallback)
-            m_onStartSendCallback();
+            m_performance.invoke(m_onStartSendCallback);
     }
 
     void onStopSend() override {
         if (m_onStopSendCallback)
-            m_onStopSendCallback();
+            m_performance.invoke(m_onStopSendCallback);
     }
 
     void onUninitialized() override {
         if (m_onUninitializedCallback)
-            m_onUninitializedCallback();
+            m_performance.invoke(m_onUninitializedCallback);
+    }
+
+    CallbackPerformanceData getPerformanceData() const {
+        return m_performance.getData();
+    }
+
+    void resetPerformanceData() {
+        m_performance.reset();
     }
 };
 
@@ -90,12 +103,16 @@ void init_zoom_sdk_video_source_callbacks(nb::module_ &m) {
             function<void(vector<VideoSourceCapability>, VideoSourceCapability)>&,
             function<void()>&,
             function<void()>&,
-            function<void()>&
+            function<void()>&,
+            bool
         >(),
             nb::arg("onInitializeCallback") = nullptr,
             nb::arg("onPropertyChangeCallback") = nullptr,
             nb::arg("onStartSendCallback") = nullptr,
             nb::arg("onStopSendCallback") = nullptr,
-            nb::arg("onUninitializedCallback") = nullptr
-        );
+            nb::arg("onUninitializedCallback") = nullptr,
+            nb::arg("collectPerformanceData") = false
+        )
+        .def("getPerformanceData", &ZoomSDKVideoSourceCallbacks::getPerformanceData)
+        .def("resetPerformanceData", &ZoomSDKVideoSourceCallbacks::resetPerformanceData);
 }
\ No newline at end of file
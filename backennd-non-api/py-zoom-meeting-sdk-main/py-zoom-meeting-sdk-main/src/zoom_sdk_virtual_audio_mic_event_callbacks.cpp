@@ -15,6 +15,8 @@
 #include <functional>
 #include <memory>
 
+#include "utilities.h"
+
 namespace nb = nanobind;
 using namespace ZOOMSDK;
 using namespace std;
@@ -25,36 +27,47 @@ private:
     function<void()> m_onMicStartSendCallback;
     function<void()> m_onMicStopSendCallback;
     function<void()> m_onMicUninitializedCallback;
+    CallbackPerformanceCollector m_performance;
 
 public:
     ZoomSDKVirtualAudioMicEventCallbacks(
         const function<void(ZOOM_SDK_NAMESPACE::IZoomSDKAudioRawDataSender*)>& onMicInitializeCallback = nullptr,
         const function<void()>& onMicStartSendCallback = nullptr,
         const function<void()>& onMicStopSendCallback = nullptr,
-        const function<void()>& onMicUninitializedCallback = nullptr
+        const function<void()>& onMicUninitializedCallback = nullptr,
+        bool collectPerformanceData = false
     ) : m_onMicInitializeCallback(onMicInitializeCallback),
         m_onMicStartSendCallback(onMicStartSendCallback),
         m_onMicStopSendCallback(onMicStopSendCallback),
-        m_onMicUninitializedCallback(onMicUninitializedCallback) {}
+        m_onMicUninitializedCallback(onMicUninitializedCallback),
+        m_performance("ZoomSDKVirtualAudioMicEventCallbacks", collectPerformanceData) {}
 
     void onMicInitialize(ZOOM_SDK_NAMESPACE::IZoomSDKAudioRawDataSender* pSender) override {
         if (m_onMicInitializeCallback)
-            m_onMicInitializeCallback(pSender);
+            m_performance.invoke(m_onMicInitializeCallback, pSender);
     }
 
     void onMicStartSend() override {
         if (m_onMicStartSendCallback)
-            m_onMicStartSendCallback();
+            m_performance.invoke(m_onMicStartSendCallback);
     }
 
     void onMicStopSend() override {
         if (m_onMicStopSendCallback)
-            m_onMicStopSendCallback();
+            m_performance.invoke(m_onMicStopSendCallback);
     }
 
     void onMicUninitialized() override {
         if (m_onMicUninitializedCallback)
-            m_onMicUninitializedCallback();
+            m_performance.invoke(m_onMicUninitializedCallback);
+    }
+
+    CallbackPerformanceData getPerformanceData() const {
+        return m_performance.getData();
+    }
+
+    void resetPerformanceData() {
+        m_performance.reset();
     }
 };
 
@@ -65,11 +78,15 @@ void init_zoom_sdk_virtual_audio_mic_event_callbacks(nb::module_ &m) {
                 function<void(ZOOM_SDK_NAMESPACE::IZoomSDKAudioRawDataSender*)>&,
                 function<void()>&,
                 function<void()>&,
-                function<void()>&
+                function<void()>&,
+                bool
             >(),
             nb::arg("onMicInitializeCallback") = nullptr,
             nb::arg("onMicStartSendCallback") = nullptr,
             nb::arg("onMicStopSendCallback") = nullptr,
-            nb::arg("onMicUninitializedCallback") = nullptr
-        );
+            nb::arg("onMicUninitializedCallback") = nullptr,
+            nb::arg("collectPerformanceData") = false
+        )
+        .def("getPerformanceData", &ZoomSDKVirtualAudioMicEventCallbacks::getPerformanceData)
+        .def("resetPerformanceData", &ZoomSDKVirtualAudioMicEventCallbacks::resetPerformanceData);
 }
\ No newline at end of file
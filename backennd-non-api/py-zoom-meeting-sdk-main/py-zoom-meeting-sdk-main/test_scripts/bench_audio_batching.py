@@ -0,0 +1,71 @@
+import argparse
+import time
+
+import zoom_meeting_sdk as zoom
+
+CHUNK_MILLISECONDS = 10
+SAMPLE_RATE = 32000
+
+def make_chunks(participants, seconds):
+    chunk = bytes(SAMPLE_RATE * 2 * CHUNK_MILLISECONDS // 1000)
+    chunks = []
+    for index in range(seconds * 1000 // CHUNK_MILLISECONDS):
+        for node_id in range(participants):
+            chunks.append((zoom.OwnedAudioRawData(chunk, SAMPLE_RATE, 1, index * CHUNK_MILLISECONDS), 16778240 + node_id))
+    return chunks
+
+def run(delegate, chunks):
+    # Chunks are fed from Python, so the driver loop itself is measured by the "no callback" row
+    cpu_start = time.process_time()
+    for data, node_id in chunks:
+        delegate.onOneWayAudioRawDataReceived(data, node_id)
+    delegate.flushAudioBatch()
+    return time.process_time() - cpu_start
+
+def main():
+    parser = argparse.ArgumentParser(description="Python calls and CPU time of per-chunk vs natively coalesced one-way audio delivery")
+    parser.add_argument("--participants", type=int, default=20)
+    parser.add_argument("--seconds", type=int, default=30)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    if not hasattr(zoom, "OwnedAudioRawData"):
+        raise SystemExit("OwnedAudioRawData is not built; reinstall with -Ccmake.define.ZOOM_SDK_BUILD_BENCHMARK_HELPERS=ON")
+
+    chunks = make_chunks(args.participants, args.seconds)
+    bytes_per_tick = args.participants * SAMPLE_RATE * 2 * CHUNK_MILLISECONDS // 1000
+    counts = {"calls": 0}
+
+    def on_chunk(data, node_id):
+        counts["calls"] += 1
+        len(data)
+
+    def on_batch(batch):
+        counts["calls"] += 1
+        for node_id, offset, length in batch.GetNodeSegments():
+            pass
+
+    modes = [("no callback", {}), ("per chunk", {"onOneWayAudioRawDataReceivedCallback": on_chunk})]
+    for interval in (20, 50, 100, 250):
+        # The driver runs faster than real time, so the batch size stands in for the interval
+        modes.append((f"batch {interval}ms", {
+            "onOneWayAudioRawDataBatchReceivedCallback": on_batch,
+            "audioBatchIntervalMilliseconds": 60000,
+            "audioBatchMaxBytes": bytes_per_tick * interval // CHUNK_MILLISECONDS,
+        }))
+
+    print(f"{args.participants} participants, {args.seconds}s of audio, {len(chunks)} chunks")
+    print(f"{'mode':<14} {'python calls/s':>15} {'cpu ms/s':>9} {'delivery ms/s':>14}")
+    baseline_seconds = None
+    for name, kwargs in modes:
+        counts["calls"] = 0
+        delegate = zoom.ZoomSDKAudioRawDataDelegateCallbacks(**kwargs)
+        cpu_seconds = min(run(delegate, chunks) for _ in range(args.repeats))
+        if baseline_seconds is None:
+            baseline_seconds = cpu_seconds
+        # Delivery cost over the driver loop. Per-chunk delivery holds the GIL for all of it;
+        # batched delivery holds it only for the batch callbacks.
+        delivery_seconds = cpu_seconds - baseline_seconds
+        print(f"{name:<14} {counts['calls'] / args.seconds / args.repeats:>15.0f} {cpu_seconds * 1000 / args.seconds:>9.2f} {delivery_seconds * 1000 / args.seconds:>14.2f}")
+
+if __name__ == "__main__":
+    main()
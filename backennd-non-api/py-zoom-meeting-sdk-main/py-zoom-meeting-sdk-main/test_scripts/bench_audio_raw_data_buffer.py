@@ -0,0 +1,53 @@
+import argparse
+import io
+import time
+
+import zoom_meeting_sdk as zoom
+
+# One 10ms chunk per callback, as delivered for a single participant
+CHUNK_SHAPES = {
+    "32kHz mono": (32000, 1),
+    "48kHz stereo": (48000, 2),
+}
+
+def consume_len(buffer):
+    return len(buffer)
+
+def consume_samples(buffer):
+    # Touch the samples the way the volume check does
+    return max(memoryview(buffer).cast('h'))
+
+def consume_write(buffer, sink=io.BytesIO()):
+    sink.seek(0)
+    return sink.write(buffer)
+
+def time_callbacks(get_buffer, consume, iterations):
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        consume(get_buffer())
+    return (time.perf_counter_ns() - start) / iterations
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-callback overhead of reading AudioRawData through GetBuffer (copy), GetBufferView and the buffer protocol (zero-copy)")
+    parser.add_argument("--iterations", type=int, default=200000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    if not hasattr(zoom, "OwnedAudioRawData"):
+        raise SystemExit("OwnedAudioRawData is not built; reinstall with -Ccmake.define.ZOOM_SDK_BUILD_BENCHMARK_HELPERS=ON")
+
+    consumers = {"len": consume_len, "write": consume_write, "samples": consume_samples}
+
+    print(f"{'chunk':<14} {'consumer':<9} {'GetBuffer ns':>13} {'GetBufferView ns':>17} {'protocol ns':>12}")
+    for name, (sample_rate, channels) in CHUNK_SHAPES.items():
+        chunk = bytes(range(256)) * (sample_rate * channels * 2 // 100 // 256 + 1)
+        chunk = chunk[:sample_rate * channels * 2 // 100]
+        data = zoom.OwnedAudioRawData(chunk, sample_rate, channels)
+
+        for consumer_name, consume in consumers.items():
+            copy_ns = min(time_callbacks(data.GetBuffer, consume, args.iterations) for _ in range(args.repeats))
+            view_ns = min(time_callbacks(data.GetBufferView, consume, args.iterations) for _ in range(args.repeats))
+            protocol_ns = min(time_callbacks(lambda: data, consume, args.iterations) for _ in range(args.repeats))
+            print(f"{name:<14} {consumer_name:<9} {copy_ns:>13.0f} {view_ns:>17.0f} {protocol_ns:>12.0f}")
+
+if __name__ == "__main__":
+    main()
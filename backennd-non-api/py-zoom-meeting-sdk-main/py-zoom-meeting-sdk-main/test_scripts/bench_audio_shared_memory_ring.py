@@ -0,0 +1,83 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+import zoom_meeting_sdk as zoom
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sample_program"))
+from audio_ring_reader import AudioRingReader
+
+SAMPLE_RATE = 32000
+CHUNK_BYTES = SAMPLE_RATE * 2 // 100
+
+def make_chunks(participants, count):
+    chunk = bytes(range(256)) * (CHUNK_BYTES // 256) + bytes(CHUNK_BYTES % 256)
+    return [(zoom.OwnedAudioRawData(chunk, SAMPLE_RATE, 1, index), 16778240 + index % participants) for index in range(count)]
+
+def consume(name, expected_chunks, result_queue):
+    reader = AudioRingReader(name)
+    received = 0
+    received_bytes = 0
+    start = None
+    while received + reader.stats()["dropped_chunks"] < expected_chunks:
+        chunks = reader.read()
+        if chunks and start is None:
+            start = time.perf_counter()
+        received += len(chunks)
+        received_bytes += sum(len(chunk.data) for chunk in chunks)
+        if not chunks:
+            time.sleep(0.0005)
+    result_queue.put((received, received_bytes, time.perf_counter() - (start or time.perf_counter())))
+    reader.close()
+
+def run_in_process(chunks):
+    kept = []
+    def on_chunk(data, node_id):
+        kept.append(data.GetBuffer())
+    delegate = zoom.ZoomSDKAudioRawDataDelegateCallbacks(onOneWayAudioRawDataReceivedCallback=on_chunk)
+    start = time.perf_counter()
+    for data, node_id in chunks:
+        delegate.onOneWayAudioRawDataReceived(data, node_id)
+    return time.perf_counter() - start, len(kept)
+
+def run_shared_memory(chunks, capacity_bytes):
+    name = f"bench_audio_ring_{os.getpid()}"
+    sink = zoom.AudioRawDataSharedMemorySink(name, capacity_bytes)
+    delegate = zoom.ZoomSDKAudioRawDataDelegateCallbacks(sharedMemorySink=sink)
+    result_queue = multiprocessing.Queue()
+    consumer = multiprocessing.Process(target=consume, args=(name, len(chunks), result_queue))
+    consumer.start()
+    time.sleep(0.5)
+
+    start = time.perf_counter()
+    for data, node_id in chunks:
+        delegate.onOneWayAudioRawDataReceived(data, node_id)
+    producer_seconds = time.perf_counter() - start
+
+    received, received_bytes, consumer_seconds = result_queue.get()
+    consumer.join()
+    return producer_seconds, received, sink.getDroppedChunks(), consumer_seconds
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of the shared memory audio ring against the in-process Python callback path")
+    parser.add_argument("--participants", type=int, default=20)
+    parser.add_argument("--chunks", type=int, default=200000)
+    parser.add_argument("--capacity-mb", type=int, default=16)
+    args = parser.parse_args()
+    if not hasattr(zoom, "OwnedAudioRawData"):
+        raise SystemExit("OwnedAudioRawData is not built; reinstall with -Ccmake.define.ZOOM_SDK_BUILD_BENCHMARK_HELPERS=ON")
+
+    chunks = make_chunks(args.participants, args.chunks)
+    megabytes = args.chunks * CHUNK_BYTES / 1e6
+
+    seconds, kept = run_in_process(chunks)
+    print(f"in-process callback: {args.chunks / seconds:>10.0f} chunks/s {megabytes / seconds:>8.1f} MB/s ({kept} chunks kept)")
+
+    producer_seconds, received, dropped, consumer_seconds = run_shared_memory(chunks, args.capacity_mb * 1024 * 1024)
+    print(f"shared memory sink:  {args.chunks / producer_seconds:>10.0f} chunks/s {megabytes / producer_seconds:>8.1f} MB/s (producer)")
+    print(f"shared memory reader:{received / max(consumer_seconds, 1e-9):>10.0f} chunks/s, {received} received, {dropped} dropped as overruns")
+
+if __name__ == "__main__":
+    main()
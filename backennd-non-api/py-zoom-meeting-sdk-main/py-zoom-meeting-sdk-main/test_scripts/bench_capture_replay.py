@@ -0,0 +1,91 @@
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sample_program"))
+import fake_zoom_meeting_sdk as zoom
+from bench_hot_paths import DEVNULL, make_offline_transcriber
+from media_capture import ACTIVE_SPEAKERS, AUDIO, USER_JOIN, CaptureReplayer, MediaCaptureReader, MediaCaptureWriter
+
+SAMPLE_RATE = 32000
+CHUNK_MILLISECONDS = 10
+
+def write_synthetic_capture(path, participants, seconds, speaker_change_seconds=5):
+    """A capture like a live bot would record: joins, then 10 ms chunks from everyone, one active speaker at a time"""
+    # Written faster than real time, so the queue is unbounded rather than dropping
+    writer = MediaCaptureWriter(path, sample_rate=SAMPLE_RATE, max_queue_bytes=float("inf"))
+    user_ids = [16778240 + 1024 * (index + 1) for index in range(participants)]
+    for index, user_id in enumerate(user_ids):
+        writer.enqueue(USER_JOIN, user_id, 0, f"Participant {index + 1}".encode(), arrival_us=0)
+    chunk_samples = SAMPLE_RATE * CHUNK_MILLISECONDS // 1000
+    t = np.arange(SAMPLE_RATE) / SAMPLE_RATE
+    speech = (6000 * np.sin(2 * np.pi * 180 * t)).astype(np.int16)
+    silence = np.random.default_rng(0).integers(-40, 40, SAMPLE_RATE).astype(np.int16)
+    speaker = None
+    for tick in range(seconds * 1000 // CHUNK_MILLISECONDS):
+        timestamp = tick * CHUNK_MILLISECONDS
+        arrival_us = timestamp * 1000
+        active = user_ids[(timestamp // (speaker_change_seconds * 1000)) % len(user_ids)]
+        if active != speaker:
+            speaker = active
+            writer.enqueue(ACTIVE_SPEAKERS, 0, 0, np.array([speaker], dtype="<u4").tobytes(), arrival_us=arrival_us)
+        offset = (tick * chunk_samples) % (SAMPLE_RATE - chunk_samples)
+        for index, user_id in enumerate(user_ids):
+            source = speech if user_id == speaker else silence
+            # Spread over the tick, as chunks from different participants do not arrive together
+            writer.enqueue(AUDIO, user_id, timestamp, source[offset:offset + chunk_samples].tobytes(), arrival_us=arrival_us + 50 * index)
+    with contextlib.redirect_stdout(DEVNULL):
+        writer.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Replays a media capture into MeetingBot's callbacks and reports how fast the bot keeps up")
+    parser.add_argument("capture", nargs="?", help="capture written with MEDIA_CAPTURE_PATH; a synthetic one is made if omitted")
+    parser.add_argument("--speed", type=float, default=0, help="1 for real time, N for N times as fast, 0 for as fast as possible")
+    parser.add_argument("--participants", type=int, default=8, help="for the synthetic capture")
+    parser.add_argument("--seconds", type=int, default=60, help="for the synthetic capture")
+    parser.add_argument("--transcriber", action="store_true", help="send audio to a transcriber with Deepgram's connection stubbed out")
+    args = parser.parse_args()
+
+    capture_path = args.capture
+    if capture_path is None:
+        capture_path = os.path.join(tempfile.mkdtemp(prefix="capture_replay_"), "synthetic.zmc")
+        write_synthetic_capture(capture_path, args.participants, args.seconds)
+    summary = MediaCaptureReader(capture_path).summary()
+    print(f"{capture_path}: {summary['seconds']:.1f} s, {summary['records']}")
+
+    # The bot looks up participant names through the SDK, so the simulated meeting has the captured participants
+    simulation = zoom.install()
+    simulation.participants = [simulation.me] + [zoom.Participant(user_id, name) for user_id, name in summary["users"].items() if user_id != simulation.me.user_id]
+    from meeting_bot import MeetingBot
+    bot = MeetingBot()
+    bot.participants_ctrl = zoom.MeetingParticipantsController()
+    bot.my_participant_id = simulation.me.user_id
+    if args.transcriber:
+        bot.deepgram_transcriber = make_offline_transcriber(bot.latency_tracer)
+    else:
+        os.environ.pop("DEEPGRAM_API_KEY", None)
+
+    audio_callback = bot.on_one_way_audio_raw_data_received_callback
+    timings = []
+    def on_audio(data, node_id):
+        start = time.perf_counter_ns()
+        audio_callback(data, node_id)
+        timings.append(time.perf_counter_ns() - start)
+
+    replayer = CaptureReplayer.for_bot(capture_path, bot, speed=args.speed)
+    replayer.on_audio = on_audio
+    with contextlib.redirect_stdout(DEVNULL):
+        replayer.run()
+    stats = replayer.stats()
+    timings = np.array(timings) / 1000
+    print(f"replayed {stats['captured_seconds']:.1f} s of capture in {stats['elapsed_seconds']:.2f} s ({stats['captured_seconds'] / max(stats['elapsed_seconds'], 1e-9):.1f}x real time), worst lateness {stats['max_lateness_ms']:.1f} ms")
+    print(f"audio callback: {len(timings)} calls, mean {timings.mean():.1f} us, p99 {np.percentile(timings, 99):.1f} us, max {timings.max():.1f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Times the bot's and the orchestrator's hot paths with realistic payloads, and saves or
+compares JSON baselines.
+
+    python test_scripts/bench_hot_paths.py --save test_scripts/baselines/hot_paths.json
+    python test_scripts/bench_hot_paths.py --compare test_scripts/baselines/hot_paths.json --threshold 0.2
+
+Baselines are only comparable on the machine they were saved on. --compare exits with
+status 1 when any case's median is more than threshold slower than its baseline.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+
+TEST_SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, TEST_SCRIPTS_DIR)
+sys.path.insert(0, os.path.join(TEST_SCRIPTS_DIR, "..", "sample_program"))
+sys.path.insert(0, os.path.join(TEST_SCRIPTS_DIR, "..", "..", ".."))
+
+SAMPLE_RATE = 32000
+# One 10 ms one-way audio chunk, and one participant's share of a 100 ms batch
+CHUNK_BYTES = SAMPLE_RATE * 2 // 100
+BATCH_SEGMENT_BYTES = CHUNK_BYTES * 10
+VIDEO_SIZES = ((640, 360), (1280, 720))
+TRANSCRIBER_PARTICIPANTS = 8
+# The bot and the orchestrator print as they go; their output is discarded but still formatted
+DEVNULL = open(os.devnull, "w")
+
+def measure(function, repeats):
+    """Median, min and max seconds per call over repeats rounds of at least 0.2 s each"""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    rounds = sorted(seconds / number for seconds in timer.repeat(repeats, number))
+    return {"median_us": rounds[len(rounds) // 2] * 1e6, "min_us": rounds[0] * 1e6, "max_us": rounds[-1] * 1e6, "calls_per_round": number}
+
+def speech_pcm(byte_count):
+    import numpy as np
+    t = np.arange(byte_count // 2) / SAMPLE_RATE
+    return (6000 * np.sin(2 * np.pi * 180 * t)).astype(np.int16).tobytes()
+
+def audio_cases(work_dir):
+    import fake_zoom_meeting_sdk as zoom
+    zoom.install()
+    from meeting_bot import normalized_rms_audio
+
+    chunk = zoom.AudioRawData(speech_pcm(CHUNK_BYTES), SAMPLE_RATE)
+    segment = memoryview(speech_pcm(BATCH_SEGMENT_BYTES))
+    yield "normalized_rms_audio 10ms chunk", lambda: normalized_rms_audio(chunk)
+    yield "normalized_rms_audio 100ms segment", lambda: normalized_rms_audio(segment)
+
+    from meeting_bot import MeetingBot
+    bot = MeetingBot()
+    path = os.path.join(work_dir, "audio.pcm")
+    # Bounded, so a long run does not fill the disk; the truncate is a small part of the cost
+    def write_chunk():
+        bot.write_to_file(path, chunk)
+        if os.path.getsize(path) > 64 * 1024 * 1024:
+            os.truncate(path, 0)
+    yield "write_to_file 10ms chunk", write_chunk
+
+def video_cases(work_dir):
+    from meeting_bot import create_red_yuv420_frame, save_yuv420_frame_as_png
+    for width, height in VIDEO_SIZES:
+        frame = create_red_yuv420_frame(width, height)
+        path = os.path.join(work_dir, f"frame_{width}x{height}.png")
+        yield f"create_red_yuv420_frame {width}x{height}", lambda width=width, height=height: create_red_yuv420_frame(width, height)
+        yield f"save_yuv420_frame_as_png {width}x{height}", lambda frame=frame, width=width, height=height, path=path: save_yuv420_frame_as_png(frame, width, height, path)
+
+class NullConnection:
+    """Stands in for Deepgram's websocket, so only the bot's side of the path is timed"""
+    def send(self, data):
+        return True
+
+    def keep_alive(self):
+        pass
+
+    def finish(self):
+        pass
+
+def make_offline_transcriber(latency_tracer=None):
+    """A DeepgramTranscriber whose connection is a NullConnection; sets DEEPGRAM_API_KEY if unset"""
+    os.environ.setdefault("DEEPGRAM_API_KEY", "benchmark")
+    from deepgram_transcriber import DeepgramTranscriber
+
+    class OfflineTranscriber(DeepgramTranscriber):
+        def connect(self):
+            self.dg_connection = NullConnection()
+            self.connected = True
+            return True
+
+    return OfflineTranscriber(latency_tracer=latency_tracer)
+
+def transcriber_cases(work_dir):
+    import fake_zoom_meeting_sdk as zoom
+    from meeting_bot import MeetingBot
+
+    participants = TRANSCRIBER_PARTICIPANTS
+    bot = MeetingBot()
+    bot.my_participant_id = 1
+    bot.deepgram_transcriber = make_offline_transcriber(bot.latency_tracer)
+    chunk = zoom.AudioRawData(speech_pcm(CHUNK_BYTES), SAMPLE_RATE)
+    batch = zoom.AudioRawDataBatch({16778240 + 1024 * index: [chunk] * 10 for index in range(participants)}, SAMPLE_RATE, 1)
+    # Emits the start-up timeline once, outside the timed calls
+    with contextlib.redirect_stdout(DEVNULL):
+        bot.on_one_way_audio_raw_data_received_callback(chunk, 16778240)
+    yield "audio callback to transcriber 10ms chunk", lambda: bot.on_one_way_audio_raw_data_received_callback(chunk, 16778240)
+    yield f"audio batch callback to transcriber {participants}x100ms", lambda: bot.on_one_way_audio_raw_data_batch_received_callback(batch)
+
+class RunningProcess:
+    pid = 0
+
+    def poll(self):
+        return None
+
+def make_meetings(count):
+    """count meetings for count / 4 users, newest first per user, one in 20 due now"""
+    now = datetime.now()
+    meetings = []
+    for index in range(count):
+        start = now - timedelta(minutes=1) if index % 20 == 0 else now + timedelta(minutes=10 + index % 600)
+        meetings.append({
+            "id": f"meeting-{index}",
+            "userId": f"user-{index % max(count // 4, 1)}",
+            "link": f"https://zoom.us/j/{8000000000 + index}?pwd=benchmark{index}",
+            "startTime": start.strftime("%H:%M:%S"),
+            "duration": 60,
+        })
+    return meetings
+
+def orchestrator_cases(work_dir, sizes):
+    os.environ.setdefault("USER_MEETINGS_API_KEY", "benchmark")
+    from simple_orchestrator import SimpleOrchestrator
+
+    for size in sizes:
+        with contextlib.redirect_stdout(DEVNULL):
+            orchestrator = SimpleOrchestrator()
+        meetings = make_meetings(size)
+        orchestrator.fetch_all_meetings = lambda meetings=meetings: meetings
+
+        # Records the bot instead of running docker-compose and sleeping for it to start
+        def start_meeting_bot(meeting, user_id, orchestrator=orchestrator):
+            orchestrator.active_bots[meeting["id"]] = {"process": RunningProcess(), "user_id": user_id, "start_time": datetime.now(), "duration_minutes": int(meeting.get("duration", 30)), "meeting_id": meeting["id"]}
+        orchestrator.start_meeting_bot = start_meeting_bot
+
+        # The first tick starts the due bots; the timed ticks are the steady state that repeats every 30 s
+        with contextlib.redirect_stdout(DEVNULL):
+            orchestrator.tick()
+
+        def tick(orchestrator=orchestrator):
+            with contextlib.redirect_stdout(DEVNULL):
+                orchestrator.tick()
+        yield f"orchestrator tick {size} meetings", tick
+
+def case_groups(work_dir, sizes):
+    """Each case generator with the names it yields, so a group none of whose cases match the filter is never set up"""
+    return [
+        (lambda: audio_cases(work_dir), ["normalized_rms_audio 10ms chunk", "normalized_rms_audio 100ms segment", "write_to_file 10ms chunk"]),
+        (lambda: video_cases(work_dir), [f"{name} {width}x{height}" for width, height in VIDEO_SIZES for name in ("create_red_yuv420_frame", "save_yuv420_frame_as_png")]),
+        (lambda: transcriber_cases(work_dir), ["audio callback to transcriber 10ms chunk", f"audio batch callback to transcriber {TRANSCRIBER_PARTICIPANTS}x100ms"]),
+        (lambda: orchestrator_cases(work_dir, sizes), [f"orchestrator tick {size} meetings" for size in sizes]),
+    ]
+
+def compare(results, baseline, threshold):
+    regressions = []
+    print(f"{'case':<48} {'baseline us':>12} {'now us':>12} {'change':>8}")
+    for name, result in results.items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<48} {'-':>12} {result['median_us']:>12.1f} {'new':>8}")
+            continue
+        change = result["median_us"] / before["median_us"] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<48} {before['median_us']:>12.1f} {result['median_us']:>12.1f} {change * 100:>+7.1f}%{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Times the bot and orchestrator hot paths, and saves or compares JSON baselines")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare the results with a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="slowdown that counts as a regression, as a fraction of the baseline")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--orchestrator-sizes", default="1000,10000,100000", help="comma separated meeting counts")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bench_hot_paths_")
+    # Filtered up front, since each size's set-up tick is slow at 100k meetings
+    sizes = [int(size) for size in args.orchestrator_sizes.split(",") if size and args.filter in f"orchestrator tick {size} meetings"]
+    results = {}
+    try:
+        for make_cases, names in case_groups(work_dir, sizes):
+            # Set-up imports the fake SDK, gi and the bot, which --filter orchestrator must not need
+            if not any(args.filter in name for name in names):
+                continue
+            for name, function in make_cases():
+                if args.filter not in name:
+                    continue
+                results[name] = measure(function, args.repeats)
+                print(f"{name:<48} {results[name]['median_us']:>12.1f} us")
+    finally:
+        shutil.rmtree(work_dir)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as file:
+            json.dump({"created": datetime.now().isoformat(), "python": platform.python_version(), "machine": platform.machine(), "results": results}, file, indent=2)
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} cases more than {args.threshold * 100:.0f}% slower than the baseline")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
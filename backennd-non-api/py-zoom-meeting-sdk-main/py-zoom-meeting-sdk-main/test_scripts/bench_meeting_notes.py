@@ -0,0 +1,65 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sample_program"))
+from meeting_notes import MeetingNotesEngine
+
+TOPICS = [
+    "release deployment staging rollback migration database schema downtime",
+    "budget hiring contractors headcount forecast quarter spending approval",
+    "customer onboarding churn feedback survey support tickets renewal",
+    "latency dashboard alerts pager incident outage postmortem monitoring",
+    "design mockups accessibility review prototype usability research",
+]
+FILLER = "so I think that the we it is was going to basically kind of actually".split()
+ACTIONS = ["I'll send the {} notes by Friday.", "Can you follow up on the {} tomorrow?", "We need to update the {} before next week."]
+
+def make_segment(rng):
+    """A final transcript segment of one to three sentences about one topic"""
+    topic = rng.choice(TOPICS).split()
+    sentences = []
+    for _ in range(rng.randint(1, 3)):
+        if rng.random() < 0.08:
+            sentences.append(rng.choice(ACTIONS).format(rng.choice(topic)))
+            continue
+        words = rng.sample(topic, rng.randint(2, 5)) + rng.sample(FILLER, rng.randint(3, 8))
+        rng.shuffle(words)
+        sentences.append(" ".join(words).capitalize() + ".")
+    return " ".join(sentences)
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-segment update cost of MeetingNotesEngine as a meeting grows")
+    parser.add_argument("--segments", type=int, default=5000, help="About 2,000 final segments is an hour of conversation")
+    parser.add_argument("--report-at", type=int, nargs="+", default=[100, 1000, 2000, 5000])
+    parser.add_argument("--top-k", type=int, default=8)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    segments = [make_segment(rng) for _ in range(args.segments)]
+    engine = MeetingNotesEngine(top_k=args.top_k)
+
+    print(f"{'segments':>9} {'sentences':>10} {'terms':>8} {'add_segment us':>15} {'summary ms':>11}")
+    window_start = 0
+    window_seconds = 0
+    for index, segment in enumerate(segments, 1):
+        start = time.perf_counter()
+        engine.add_segment(segment, start=index * 2.0, end=index * 2.0 + 1.5)
+        window_seconds += time.perf_counter() - start
+        if index in args.report_at:
+            start = time.perf_counter()
+            engine.summary()
+            summary_ms = (time.perf_counter() - start) * 1000
+            print(f"{index:>9} {len(engine.sentences):>10} {engine.nnz:>8} {window_seconds / (index - window_start) * 1e6:>15.0f} {summary_ms:>11.2f}")
+            window_start = index
+            window_seconds = 0
+
+    start = time.perf_counter()
+    markdown = engine.to_markdown()
+    print(f"Final notes in {(time.perf_counter() - start) * 1000:.1f} ms, {len(engine.action_items)} action items")
+    print(markdown)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sample_program"))
+from scene_change import SceneChangeDetector
+from video_capture import FrameSampler
+
+WIDTH = 1280
+HEIGHT = 720
+
+def make_slides(count):
+    rng = np.random.default_rng(0)
+    slides = []
+    for index in range(count):
+        slide = np.full((HEIGHT, WIDTH), 235, dtype=np.uint8)
+        cv2.putText(slide, f"Slide {index}", (80, 140), cv2.FONT_HERSHEY_SIMPLEX, 3, 20, 6)
+        for line in range(int(rng.integers(3, 8))):
+            cv2.putText(slide, "- " + "x" * int(rng.integers(10, 40)), (120, 260 + line * 70), cv2.FONT_HERSHEY_SIMPLEX, 1.5, 40, 3)
+        slides.append(slide)
+    return slides
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyframes kept by SceneChangeDetector on a simulated slide deck share")
+    parser.add_argument("--slides", type=int, default=20)
+    parser.add_argument("--seconds-per-slide", type=int, default=30)
+    parser.add_argument("--fps", type=int, default=10, help="Rate share frames arrive at")
+    parser.add_argument("--check-interval", type=float, default=0.5, help="Seconds between checked frames, as the bot samples shares")
+    parser.add_argument("--threshold", type=float, default=None, help="Defaults to the method's own threshold")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    slides = make_slides(args.slides)
+    # Compression noise, so consecutive frames of the same slide are never byte identical
+    noise = [rng.integers(-3, 4, (HEIGHT, WIDTH)).astype(np.int16) for _ in range(8)]
+    frames_per_slide = args.seconds_per_slide * args.fps
+    total = args.slides * frames_per_slide
+
+    # What storing a frame costs on the old path: BGR conversion plus a PNG encode
+    i420 = np.zeros((HEIGHT * 3 // 2, WIDTH), dtype=np.uint8)
+    i420[:HEIGHT] = slides[0]
+    start = time.perf_counter()
+    for _ in range(10):
+        cv2.imencode(".png", cv2.cvtColor(i420, cv2.COLOR_YUV2BGR_I420))
+    encode_ms = (time.perf_counter() - start) / 10 * 1000
+
+    print(f"{args.slides} slides, {args.seconds_per_slide}s each at {args.fps} fps: {total} frames, {encode_ms:.1f} ms to store one")
+    print(f"{'method':<8} {'kept':>6} {'check ms':>9} {'stored every 10th':>18} {'cpu saved':>10}")
+    for method in ("diff", "dhash"):
+        detector = SceneChangeDetector(threshold=args.threshold, method=method)
+        sampler = FrameSampler(interval_seconds=args.check_interval)
+        kept = 0
+        checked = 0
+        check_seconds = 0
+        for index in range(total):
+            if not sampler.should_sample(index / args.fps):
+                continue
+            checked += 1
+            frame = np.clip(slides[index // frames_per_slide] + noise[index % len(noise)], 0, 255).astype(np.uint8)
+            start = time.perf_counter()
+            kept += detector.is_keyframe(frame, now=index / args.fps)
+            check_seconds += time.perf_counter() - start
+        check_ms = check_seconds / checked * 1000
+        every_tenth = total // 10
+        saved = every_tenth * encode_ms / (kept * encode_ms + checked * check_ms)
+        print(f"{method:<8} {kept:>6} {check_ms:>9.3f} {every_tenth:>18} {saved:>9.0f}x")
+
+if __name__ == "__main__":
+    main()
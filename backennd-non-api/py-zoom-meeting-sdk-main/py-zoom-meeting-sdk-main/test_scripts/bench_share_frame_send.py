@@ -0,0 +1,75 @@
+import argparse
+import threading
+import time
+
+import numpy as np
+import zoom_meeting_sdk as zoom
+
+WIDTH = 1280
+HEIGHT = 720
+
+def make_frames(count):
+    # I420 frames as NumPy arrays, the shape cv2.cvtColor(..., cv2.COLOR_BGR2YUV_I420) produces
+    return [np.full((HEIGHT * 3 // 2, WIDTH), index * 9 % 256, dtype=np.uint8) for index in range(count)]
+
+def send_frames(sender, frames, fps, seconds, as_bytes, send_times):
+    interval = 1 / fps
+    next_send = time.perf_counter()
+    for index in range(int(fps * seconds)):
+        frame = frames[index % len(frames)]
+        start = time.perf_counter()
+        buffer = frame.tobytes() if as_bytes else frame
+        sender.sendShareFrame(buffer, WIDTH, HEIGHT, zoom.FrameDataFormat_I420_FULL)
+        send_times.append(time.perf_counter() - start)
+        next_send += interval
+        delay = next_send - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+def probe(stop, counter):
+    # Pure Python work; it only makes progress while the sender thread is not holding the GIL
+    while not stop.is_set():
+        counter[0] += 1
+
+def run(frames, fps, seconds, as_bytes):
+    sender = zoom.MemoryShareSender()
+    send_times = []
+    stop = threading.Event()
+    counter = [0]
+    probe_thread = threading.Thread(target=probe, args=(stop, counter))
+    probe_thread.start()
+    try:
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        send_frames(sender, frames, fps, seconds, as_bytes, send_times)
+        elapsed = time.perf_counter() - start
+        cpu_seconds = time.process_time() - cpu_start
+    finally:
+        stop.set()
+        probe_thread.join()
+    send_times.sort()
+    return {
+        "frames": sender.getFrameCount(),
+        "mean_ms": sum(send_times) / len(send_times) * 1000,
+        "p99_ms": send_times[int(len(send_times) * 0.99)] * 1000,
+        "cpu_ms_per_s": cpu_seconds * 1000 / elapsed,
+        "probe_per_s": counter[0] / elapsed,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="720p I420 share frames at 30 fps, passed as bytes copies vs NumPy arrays")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--seconds", type=int, default=10)
+    args = parser.parse_args()
+    if not hasattr(zoom, "MemoryShareSender"):
+        raise SystemExit("MemoryShareSender is not built; reinstall with -Ccmake.define.ZOOM_SDK_BUILD_BENCHMARK_HELPERS=ON")
+
+    frames = make_frames(26)
+    print(f"{WIDTH}x{HEIGHT} I420 at {args.fps} fps for {args.seconds}s, with a pure Python probe thread running")
+    print(f"{'path':<12} {'frames':>7} {'send ms':>8} {'p99 ms':>7} {'cpu ms/s':>9} {'probe iters/s':>14}")
+    for name, as_bytes in (("tobytes()", True), ("ndarray", False)):
+        result = run(frames, args.fps, args.seconds, as_bytes)
+        print(f"{name:<12} {result['frames']:>7} {result['mean_ms']:>8.3f} {result['p99_ms']:>7.3f} {result['cpu_ms_per_s']:>9.1f} {result['probe_per_s']:>14.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import asyncio
+import contextlib
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sample_program"))
+import fake_zoom_meeting_sdk
+
+def main():
+    parser = argparse.ArgumentParser(description="Runs MeetingBot against the simulated SDK and reports media throughput, drops and callback times")
+    parser.add_argument("--participants", type=int, default=8, help="including the bot")
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--video-fps", type=float, default=15)
+    parser.add_argument("--share", action="store_true", help="have a participant share their screen")
+    parser.add_argument("--chat-interval", type=float, default=0, help="seconds between chat messages, 0 for none")
+    parser.add_argument("--audio-batch-interval", type=int, default=0, help="sets AUDIO_BATCH_INTERVAL_MS")
+    parser.add_argument("--capture", action="store_true", help="keep video capture on, which writes stills to sample_program/out")
+    parser.add_argument("--max-drop-rate", type=float, default=None, help="exit with status 1 when more than this fraction of audio or video is dropped")
+    parser.add_argument("--verbose", action="store_true", help="show the bot's output")
+    args = parser.parse_args()
+
+    # The bot writes to paths relative to the repository root
+    os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    for name, value in (("MEETING_ID", "1234567890"), ("MEETING_PWD", "simulated"), ("ZOOM_APP_CLIENT_ID", "simulated"), ("ZOOM_APP_CLIENT_SECRET", "simulated")):
+        os.environ.setdefault(name, value)
+    os.environ["AUDIO_BATCH_INTERVAL_MS"] = str(args.audio_batch_interval)
+    if not args.capture:
+        os.environ["VIDEO_CAPTURE_FORMAT"] = "none"
+
+    simulation = fake_zoom_meeting_sdk.install(participants=args.participants, video_fps=args.video_fps, share=args.share, chat_interval_seconds=args.chat_interval)
+    from meeting_bot import MeetingBot
+    from glib_asyncio import GLibEventLoop
+    from gi.repository import GLib
+
+    event_loop = GLibEventLoop()
+    asyncio.set_event_loop(event_loop)
+    bot = MeetingBot()
+    bot.event_loop = event_loop
+    results = {}
+
+    def finish():
+        results["stats"] = simulation.stats()
+        results["performance"] = fake_zoom_meeting_sdk.GetCallbackPerformanceDataSnapshot()
+        bot.leave()
+        bot.cleanup()
+        event_loop.stop()
+        return False
+
+    output = sys.stdout if args.verbose else open(os.devnull, "w")
+    with contextlib.redirect_stdout(output):
+        bot.init()
+        GLib.timeout_add(int(args.seconds * 1000), finish)
+        event_loop.run_forever()
+    event_loop.close()
+
+    stats = results["stats"]
+    seconds = stats["seconds_in_meeting"]
+    print(f"{args.participants} participants, {seconds:.1f} s in meeting, audio batch interval {args.audio_batch_interval} ms")
+    print(f"{'stream':<8} {'sent':>10} {'dropped':>9} {'per s':>9} {'drop %':>8}")
+    drop_rates = {}
+    for stream, sent, dropped in (("audio", stats["audio_chunks_sent"], stats["audio_chunks_dropped"]), ("video", stats["video_frames_sent"], stats["video_frames_dropped"]), ("share", stats["share_frames_sent"], 0)):
+        drop_rates[stream] = dropped / (sent + dropped) if sent + dropped else 0
+        print(f"{stream:<8} {sent:>10} {dropped:>9} {sent / seconds if seconds else 0:>9.1f} {drop_rates[stream] * 100:>8.2f}")
+    print(f"mic: {stats['mic_bytes_received']} bytes received, worst audio lateness {stats['max_lateness_ms']:.1f} ms, video {stats['video_max_lateness_ms']:.1f} ms")
+
+    print(f"{'callback':<44} {'calls':>8} {'mean us':>9} {'p99 us':>9} {'max us':>9}")
+    for name, data in sorted(results["performance"].items()):
+        if data.numCalls:
+            print(f"{name:<44} {data.numCalls:>8} {data.totalProcessingTimeMicroseconds / data.numCalls:>9.1f} {data.p99:>9} {data.maxProcessingTimeMicroseconds:>9}")
+
+    if args.max_drop_rate is not None and max(drop_rates.values()) > args.max_drop_rate:
+        print(f"Drop rate over {args.max_drop_rate * 100:.2f}%")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
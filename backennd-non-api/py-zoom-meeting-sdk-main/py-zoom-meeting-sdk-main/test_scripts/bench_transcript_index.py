@@ -0,0 +1,93 @@
+import argparse
+import itertools
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sample_program"))
+from meeting_notes import tokenize
+from transcript_index import TranscriptIndex
+
+SPEAKERS = ["Alice", "Bob", "Carol", "Dan", "Erin", "Frank"]
+
+def make_vocabulary(rng, size):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(size)]
+
+def make_corpus(rng, vocabulary, meetings, segments_per_meeting):
+    """Yields (meeting_id, speaker, start, end, text) with Zipf distributed words, like speech"""
+    cumulative_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+    for meeting in range(meetings):
+        time_offset = 0.0
+        for _ in range(segments_per_meeting):
+            words = rng.choices(vocabulary, cum_weights=cumulative_weights, k=rng.randint(6, 24))
+            duration = len(words) * 0.4
+            yield f"meeting-{meeting}", rng.choice(SPEAKERS), time_offset, time_offset + duration, " ".join(words)
+            time_offset += duration + 0.5
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+def main():
+    parser = argparse.ArgumentParser(description="TranscriptIndex indexing throughput and query latency on a synthetic corpus")
+    parser.add_argument("--meetings", type=int, default=2000)
+    parser.add_argument("--segments-per-meeting", type=int, default=200)
+    parser.add_argument("--vocabulary", type=int, default=30000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--flush-docs", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = make_vocabulary(rng, args.vocabulary)
+    corpus = list(make_corpus(rng, vocabulary, args.meetings, args.segments_per_meeting))
+    text_bytes = sum(len(doc[4]) for doc in corpus)
+    directory = tempfile.mkdtemp(prefix="transcript_index_")
+    try:
+        index = TranscriptIndex(directory, flush_docs=args.flush_docs)
+        start = time.perf_counter()
+        for meeting_id, speaker, segment_start, segment_end, text in corpus:
+            index.add(meeting_id, text, start=segment_start, end=segment_end, speaker=speaker)
+        add_seconds = time.perf_counter() - start
+        index.close()
+        total_seconds = time.perf_counter() - start
+        stats = index.stats()
+        print(f"{len(corpus)} segments from {args.meetings} meetings, {text_bytes / 1e6:.1f} MB of text")
+        print(f"add: {len(corpus) / add_seconds:,.0f} segments/s, including segment writes and merges: {len(corpus) / total_seconds:,.0f} segments/s")
+        print(f"index: {stats['segments']} segments, {stats['bytes'] / 1e6:.1f} MB including stored text")
+
+        index = TranscriptIndex(directory, flush_docs=args.flush_docs)
+        queries = {
+            "common word": lambda: vocabulary[rng.randint(0, 20)],
+            "mid frequency word": lambda: vocabulary[rng.randint(100, 2000)],
+            "rare word": lambda: vocabulary[rng.randint(10000, args.vocabulary - 1)],
+            "two words": lambda: f"{vocabulary[rng.randint(0, 200)]} {vocabulary[rng.randint(200, 2000)]}",
+        }
+        print(f"{'query':<20} {'p50 ms':>8} {'p99 ms':>8} {'scan ms':>9}")
+        for name, make_query in queries.items():
+            latencies = []
+            for _ in range(args.queries):
+                query = make_query()
+                start = time.perf_counter()
+                index.search(query, limit=20)
+                latencies.append((time.perf_counter() - start) * 1000)
+            # What searching costs without an index: tokenizing every transcript until 20 hits
+            terms = set(tokenize(query))
+            start = time.perf_counter()
+            hits = 0
+            for doc in reversed(corpus):
+                if terms <= set(tokenize(doc[4])):
+                    hits += 1
+                    if hits == 20:
+                        break
+            scan_ms = (time.perf_counter() - start) * 1000
+            print(f"{name:<20} {percentile(latencies, 0.5):>8.2f} {percentile(latencies, 0.99):>8.2f} {scan_ms:>9.1f}")
+        index.close()
+    finally:
+        shutil.rmtree(directory)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import glob
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "sample_program"))
+from video_recorder import SegmentedVideoRecorder
+
+WIDTH = 1280
+HEIGHT = 720
+
+class SyntheticFrame:
+    """Stands in for YUVRawDataI420"""
+    def __init__(self, buffer, timestamp):
+        self.buffer = buffer
+        self.timestamp = timestamp
+
+    def GetBufferView(self):
+        return self.buffer
+
+    def GetTimeStamp(self):
+        return self.timestamp
+
+    def GetStreamWidth(self):
+        return WIDTH
+
+    def GetStreamHeight(self):
+        return HEIGHT
+
+def make_frames(count, content):
+    rng = np.random.default_rng(0)
+    background = np.tile(np.linspace(40, 200, WIDTH, dtype=np.uint8), (HEIGHT, 1))
+    frames = []
+    for index in range(count):
+        bgr = cv2.cvtColor(background, cv2.COLOR_GRAY2BGR)
+        if content == "camera":
+            # A moving subject over sensor noise, roughly what a webcam sends
+            x = 200 + index * 20 % 800
+            cv2.circle(bgr, (x, HEIGHT // 2), 150, (60, 120, 200), -1)
+            bgr = cv2.add(bgr, rng.integers(0, 12, bgr.shape, dtype=np.uint8))
+        else:
+            # A slide that changes every 30 frames
+            cv2.putText(bgr, f"Slide {index // 30}", (100, 200), cv2.FONT_HERSHEY_SIMPLEX, 4, (0, 0, 0), 8)
+        frames.append(cv2.cvtColor(bgr, cv2.COLOR_BGR2YUV_I420))
+    return frames
+
+def cpu_seconds():
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+def run_png(frames, count, fps, every_n_frames, output_dir):
+    # The old path: every Nth frame converted to BGR and written as its own PNG
+    start = time.perf_counter()
+    cpu_start = cpu_seconds()
+    written = 0
+    for index in range(0, count, every_n_frames):
+        bgr = cv2.cvtColor(frames[index % len(frames)], cv2.COLOR_YUV2BGR_I420)
+        cv2.imwrite(os.path.join(output_dir, f"output_{written:06d}.png"), bgr)
+        written += 1
+    elapsed = time.perf_counter() - start
+    cpu = cpu_seconds() - cpu_start
+    total_bytes = sum(os.path.getsize(path) for path in glob.glob(os.path.join(output_dir, "*.png")))
+    meeting_minutes = count / fps / 60
+    return {"frames": written, "frames_per_s": written / elapsed, "cpu_s_per_min": cpu / meeting_minutes, "mb_per_min": total_bytes / meeting_minutes / 1e6, "files": written}
+
+def run_recorder(frames, count, fps, recording_fps, backend, output_dir):
+    recorder = SegmentedVideoRecorder(output_dir=output_dir, fps=recording_fps, segment_seconds=60, backend=backend, queue_size=count + 1)
+    start = time.perf_counter()
+    cpu_start = cpu_seconds()
+    for index in range(count):
+        recorder.submit(SyntheticFrame(frames[index % len(frames)], index), timestamp=index / fps)
+    recorder.stop(timeout=None)
+    elapsed = time.perf_counter() - start
+    cpu = cpu_seconds() - cpu_start
+    stats = recorder.stats()
+    segments = glob.glob(os.path.join(output_dir, "*.mp4"))
+    total_bytes = sum(os.path.getsize(path) for path in segments)
+    meeting_minutes = count / fps / 60
+    return {"frames": stats["written"], "frames_per_s": stats["written"] / elapsed, "cpu_s_per_min": cpu / meeting_minutes, "mb_per_min": total_bytes / meeting_minutes / 1e6, "files": len(segments) + 1}
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-frame PNG files vs segmented video recording of 720p I420 frames")
+    parser.add_argument("--seconds", type=int, default=60, help="Length of the simulated meeting")
+    parser.add_argument("--fps", type=int, default=30, help="Rate the SDK delivers frames at")
+    parser.add_argument("--recording-fps", type=int, default=15)
+    parser.add_argument("--content", choices=["camera", "slides"], default="camera")
+    parser.add_argument("--backend", choices=["ffmpeg", "opencv"], default=None)
+    args = parser.parse_args()
+
+    count = args.seconds * args.fps
+    frames = make_frames(60, args.content)
+    print(f"{WIDTH}x{HEIGHT} {args.content} frames, {args.seconds}s at {args.fps} fps")
+    print(f"{'path':<26} {'frames':>7} {'frames/s':>9} {'cpu s/min':>10} {'MB/min':>8} {'files':>6}")
+    with tempfile.TemporaryDirectory() as output_dir:
+        result = run_png(frames, count, args.fps, 10, output_dir)
+        print(f"{'png every 10th frame':<26} {result['frames']:>7} {result['frames_per_s']:>9.1f} {result['cpu_s_per_min']:>10.2f} {result['mb_per_min']:>8.2f} {result['files']:>6}")
+    with tempfile.TemporaryDirectory() as output_dir:
+        result = run_recorder(frames, count, args.fps, args.recording_fps, args.backend, output_dir)
+        name = f"segments at {args.recording_fps} fps"
+        print(f"{name:<26} {result['frames']:>7} {result['frames_per_s']:>9.1f} {result['cpu_s_per_min']:>10.2f} {result['mb_per_min']:>8.2f} {result['files']:>6}")
+
+if __name__ == "__main__":
+    main()
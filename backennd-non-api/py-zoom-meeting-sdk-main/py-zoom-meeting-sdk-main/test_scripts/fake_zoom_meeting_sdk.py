@@ -0,0 +1,1095 @@
+"""
+Pure Python stand-in for the zoom_meeting_sdk module, for driving MeetingBot without the
+native SDK, credentials or a live meeting.
+
+    import fake_zoom_meeting_sdk
+    fake_zoom_meeting_sdk.install(participants=8, video_fps=15)
+    from meeting_bot import MeetingBot
+
+install() registers the module as zoom_meeting_sdk. Auth, join and leave run as a state
+machine on the GLib main loop, like the real SDK's control callbacks. Once joined, an audio
+thread sends every other participant's audio as 10 ms one-way chunks, and a video thread
+sends I420 frames at the subscribed resolution to each subscribed renderer, both paced
+against absolute deadlines. As with the SDK's separate audio and renderer threads, slow
+video callbacks do not hold up audio, except through the GIL and locks they share. When
+the bot's callbacks make a thread fall behind, the chunks and frames it could not send in
+time are dropped and counted, as a real-time source would. stats() returns the counts.
+"""
+import itertools
+import sys
+import threading
+import time
+
+import numpy as np
+
+import gi
+gi.require_version('GLib', '2.0')
+from gi.repository import GLib
+
+# Result codes and enums, with the native module's names
+
+SDKERR_SUCCESS = 0
+SDKERR_WRONG_USAGE = 2
+SDKERR_INVALID_PARAMETER = 4
+SDKERR_UNINITIALIZE = 7
+SDKERR_NO_PERMISSION = 12
+
+class SDKError:
+    SDKERR_SUCCESS = SDKERR_SUCCESS
+    SDKERR_WRONG_USAGE = SDKERR_WRONG_USAGE
+    SDKERR_INVALID_PARAMETER = SDKERR_INVALID_PARAMETER
+    SDKERR_UNINITIALIZE = SDKERR_UNINITIALIZE
+    SDKERR_NO_PERMISSION = SDKERR_NO_PERMISSION
+
+AUTHRET_SUCCESS = 0
+AUTHRET_JWTTOKENWRONG = 9
+
+MEETING_STATUS_IDLE = 0
+MEETING_STATUS_CONNECTING = 1
+MEETING_STATUS_WAITINGFORHOST = 2
+MEETING_STATUS_INMEETING = 3
+MEETING_STATUS_DISCONNECTING = 4
+MEETING_STATUS_RECONNECTING = 5
+MEETING_STATUS_FAILED = 6
+MEETING_STATUS_ENDED = 7
+
+LEAVE_MEETING = 0
+END_MEETING = 1
+
+Sharing_Self_Send_Begin = 0
+Sharing_Self_Send_End = 1
+Sharing_Other_Share_Begin = 4
+Sharing_Other_Share_End = 5
+
+ZoomSDKResolution_90P = 0
+ZoomSDKResolution_180P = 1
+ZoomSDKResolution_360P = 2
+ZoomSDKResolution_720P = 3
+ZoomSDKResolution_1080P = 4
+RESOLUTION_SIZES = {
+    ZoomSDKResolution_90P: (160, 90),
+    ZoomSDKResolution_180P: (320, 180),
+    ZoomSDKResolution_360P: (640, 360),
+    ZoomSDKResolution_720P: (1280, 720),
+    ZoomSDKResolution_1080P: (1920, 1080),
+}
+
+ZoomSDKAudioChannel_Mono = 0
+ZoomSDKAudioChannel_Stereo = 1
+FrameDataFormat_I420_LIMITED = 0
+FrameDataFormat_I420_FULL = 1
+
+class ZoomSDKRawDataType:
+    RAW_DATA_TYPE_VIDEO = 0
+    RAW_DATA_TYPE_SHARE = 1
+
+class SDKUserType:
+    SDK_UT_NORMALUSER = 0
+    SDK_UT_WITHOUT_LOGIN = 1
+
+class SDK_LANGUAGE_ID:
+    LANGUAGE_Unknow = 0
+    LANGUAGE_English = 1
+
+class AudioRawdataSamplingRate:
+    AudioRawdataSamplingRate_32K = 0
+    AudioRawdataSamplingRate_48K = 1
+
+SAMPLING_RATES = {AudioRawdataSamplingRate.AudioRawdataSamplingRate_32K: 32000, AudioRawdataSamplingRate.AudioRawdataSamplingRate_48K: 48000}
+
+class SDKChatMessageType:
+    To_None = 0
+    To_All = 1
+    To_Individual = 3
+
+# Callback performance data, with the native histogram layout
+
+PROCESSING_TIME_SUB_BIN_BITS = 3
+PROCESSING_TIME_SUB_BIN_COUNT = 1 << PROCESSING_TIME_SUB_BIN_BITS
+PROCESSING_TIME_MAX_EXPONENT = 32
+PROCESSING_TIME_BIN_COUNT = (PROCESSING_TIME_MAX_EXPONENT - PROCESSING_TIME_SUB_BIN_BITS + 1) * PROCESSING_TIME_SUB_BIN_COUNT
+UINT64_MAX = 2 ** 64 - 1
+
+class CallbackPerformanceData:
+    def __init__(self):
+        self.totalProcessingTimeMicroseconds = 0
+        self.numCalls = 0
+        self.maxProcessingTimeMicroseconds = 0
+        self.minProcessingTimeMicroseconds = UINT64_MAX
+        self.processingTimeBinCounts = [0] * PROCESSING_TIME_BIN_COUNT
+
+    def record(self, microseconds):
+        self.totalProcessingTimeMicroseconds += microseconds
+        self.numCalls += 1
+        self.processingTimeBinCounts[self.getBinIndex(microseconds)] += 1
+        self.maxProcessingTimeMicroseconds = max(self.maxProcessingTimeMicroseconds, microseconds)
+        self.minProcessingTimeMicroseconds = min(self.minProcessingTimeMicroseconds, microseconds)
+
+    def copy(self):
+        data = CallbackPerformanceData()
+        data.__dict__.update(self.__dict__)
+        data.processingTimeBinCounts = list(self.processingTimeBinCounts)
+        return data
+
+    def getPercentile(self, fraction):
+        if self.numCalls == 0:
+            return 0
+        target = max(1, int(np.ceil(min(max(fraction, 0), 1) * self.numCalls)))
+        seen = 0
+        for index, count in enumerate(self.processingTimeBinCounts):
+            seen += count
+            if seen >= target:
+                return min(max(self.getBinUpperBound(index), self.minProcessingTimeMicroseconds), self.maxProcessingTimeMicroseconds)
+        return self.maxProcessingTimeMicroseconds
+
+    p50 = property(lambda self: self.getPercentile(0.5))
+    p90 = property(lambda self: self.getPercentile(0.9))
+    p99 = property(lambda self: self.getPercentile(0.99))
+    p999 = property(lambda self: self.getPercentile(0.999))
+
+    @staticmethod
+    def getBinIndex(microseconds):
+        if microseconds < PROCESSING_TIME_SUB_BIN_COUNT:
+            return microseconds
+        exponent = microseconds.bit_length() - 1
+        if exponent >= PROCESSING_TIME_MAX_EXPONENT:
+            return PROCESSING_TIME_BIN_COUNT - 1
+        shift = exponent - PROCESSING_TIME_SUB_BIN_BITS
+        return (shift + 1) * PROCESSING_TIME_SUB_BIN_COUNT + ((microseconds >> shift) - PROCESSING_TIME_SUB_BIN_COUNT)
+
+    @staticmethod
+    def getBinLowerBound(index):
+        if index < PROCESSING_TIME_SUB_BIN_COUNT:
+            return index
+        shift = index // PROCESSING_TIME_SUB_BIN_COUNT - 1
+        return (PROCESSING_TIME_SUB_BIN_COUNT + index % PROCESSING_TIME_SUB_BIN_COUNT) << shift
+
+    @staticmethod
+    def getBinUpperBound(index):
+        if index >= PROCESSING_TIME_BIN_COUNT - 1:
+            return UINT64_MAX
+        return CallbackPerformanceData.getBinLowerBound(index + 1) - 1
+
+_collectors = {}
+_collectors_lock = threading.Lock()
+_collector_counter = itertools.count(1)
+
+def GetCallbackPerformanceDataSnapshot():
+    with _collectors_lock:
+        return {name: callbacks.getPerformanceData() for name, callbacks in _collectors.items()}
+
+def ResetCallbackPerformanceData():
+    with _collectors_lock:
+        for callbacks in _collectors.values():
+            callbacks.resetPerformanceData()
+
+class _Callbacks:
+    """Base of the *Callbacks classes: keyword callbacks, timed like the native CallbackPerformanceCollector"""
+    def __init__(self, collectPerformanceData=False, **callbacks):
+        self.callbacks = callbacks
+        self.performance = CallbackPerformanceData()
+        self.performance_lock = threading.Lock()
+        self.collect_performance_data = collectPerformanceData
+        if collectPerformanceData:
+            with _collectors_lock:
+                _collectors[f"{type(self).__name__}#{next(_collector_counter)}"] = self
+
+    def invoke(self, name, *args):
+        callback = self.callbacks.get(name)
+        if callback is None:
+            return None
+        if not self.collect_performance_data:
+            return callback(*args)
+        start = time.perf_counter_ns()
+        try:
+            return callback(*args)
+        finally:
+            elapsed = (time.perf_counter_ns() - start) // 1000
+            with self.performance_lock:
+                self.performance.record(elapsed)
+
+    def getPerformanceData(self):
+        with self.performance_lock:
+            return self.performance.copy()
+
+    def resetPerformanceData(self):
+        with self.performance_lock:
+            self.performance = CallbackPerformanceData()
+
+class MeetingServiceEventCallbacks(_Callbacks): pass
+class AuthServiceEventCallbacks(_Callbacks): pass
+class MeetingReminderEventCallbacks(_Callbacks): pass
+class MeetingRecordingCtrlEventCallbacks(_Callbacks): pass
+class MeetingParticipantsCtrlEventCallbacks(_Callbacks): pass
+class MeetingShareCtrlEventCallbacks(_Callbacks): pass
+class MeetingAudioCtrlEventCallbacks(_Callbacks): pass
+class MeetingChatEventCallbacks(_Callbacks): pass
+class MeetingBOEventCallbacks(_Callbacks): pass
+class ZoomSDKRendererDelegateCallbacks(_Callbacks): pass
+class ZoomSDKVirtualAudioMicEventCallbacks(_Callbacks): pass
+class ZoomSDKVideoSourceCallbacks(_Callbacks): pass
+class ShareSourceCallbacks(_Callbacks): pass
+class ShareAudioCallbacks(_Callbacks): pass
+
+# Raw data
+
+class AudioRawData(bytes):
+    """
+    One chunk of PCM; a bytes subclass, so like the native type it supports the buffer protocol.
+    Takes the same arguments, in the same order, as the native OwnedAudioRawData.
+    """
+    def __new__(cls, buffer, sampleRate, channelNum=1, timeStamp=0):
+        data = super().__new__(cls, buffer)
+        data.timestamp = timeStamp
+        data.sample_rate = sampleRate
+        data.channels = channelNum
+        return data
+
+    def GetBuffer(self):
+        return bytes(self)
+
+    def GetBufferView(self):
+        return memoryview(self)
+
+    def GetBufferLen(self):
+        return len(self)
+
+    def GetSampleRate(self):
+        return self.sample_rate
+
+    def GetChannelNum(self):
+        return self.channels
+
+    def GetTimeStamp(self):
+        return self.timestamp
+
+class AudioRawDataBatch(bytes):
+    """One-way audio coalesced per participant, laid out like the native batch. arrival_times maps node ids to time.monotonic_ns() per chunk, now if omitted."""
+    def __new__(cls, node_chunks, sample_rate, channels, arrival_times=None):
+        node_ids, timestamps, arrivals, offsets, lengths, buffers = [], [], [], [], [], []
+        offset = 0
+        now = time.monotonic_ns()
+        for node_id, chunks in node_chunks.items():
+            chunk_arrivals = (arrival_times or {}).get(node_id) or [now] * len(chunks)
+            for chunk, arrival_ns in zip(chunks, chunk_arrivals):
+                node_ids.append(node_id)
+                timestamps.append(chunk.timestamp)
+                arrivals.append(arrival_ns)
+                offsets.append(offset)
+                lengths.append(len(chunk))
+                buffers.append(chunk)
+                offset += len(chunk)
+        batch = super().__new__(cls, b"".join(buffers))
+        batch.node_ids = np.array(node_ids, dtype=np.uint32)
+        batch.timestamps = np.array(timestamps, dtype=np.uint64)
+        batch.arrival_times = np.array(arrivals, dtype=np.uint64)
+        batch.offsets = np.array(offsets, dtype=np.uint32)
+        batch.lengths = np.array(lengths, dtype=np.uint32)
+        batch.sample_rate = sample_rate
+        batch.channels = channels
+        return batch
+
+    def GetBuffer(self):
+        return bytes(self)
+
+    def GetBufferLen(self):
+        return len(self)
+
+    def GetNodeIds(self):
+        return self.node_ids
+
+    def GetTimeStamps(self):
+        return self.timestamps
+
+    def GetArrivalTimes(self):
+        return self.arrival_times
+
+    def GetOffsets(self):
+        return self.offsets
+
+    def GetLengths(self):
+        return self.lengths
+
+    def GetNodeSegments(self):
+        segments = []
+        for node_id, offset, length in zip(self.node_ids.tolist(), self.offsets.tolist(), self.lengths.tolist()):
+            if segments and segments[-1][0] == node_id:
+                segments[-1] = (node_id, segments[-1][1], segments[-1][2] + length)
+            else:
+                segments.append((node_id, offset, length))
+        return segments
+
+    def GetChunkCount(self):
+        return len(self.node_ids)
+
+    def GetSampleRate(self):
+        return self.sample_rate
+
+    def GetChannelNum(self):
+        return self.channels
+
+class YUVRawDataI420:
+    """A frame over a shared read-only I420 array, like the native views over the SDK's buffer"""
+    def __init__(self, frame, width, height, timestamp, source_id):
+        self.frame = frame
+        self.width = width
+        self.height = height
+        self.timestamp = timestamp
+        self.source_id = source_id
+
+    def GetBufferView(self):
+        return self.frame
+
+    def GetYPlaneView(self):
+        return self.frame[:self.height]
+
+    def GetUPlaneView(self):
+        return self.frame[self.height:self.height * 5 // 4].reshape(self.height // 2, self.width // 2)
+
+    def GetVPlaneView(self):
+        return self.frame[self.height * 5 // 4:].reshape(self.height // 2, self.width // 2)
+
+    def GetBuffer(self):
+        return self.frame.tobytes()
+
+    def GetYBuffer(self):
+        return self.GetYPlaneView().tobytes()
+
+    def GetBufferLen(self):
+        return self.frame.size
+
+    def GetStreamWidth(self):
+        return self.width
+
+    def GetStreamHeight(self):
+        return self.height
+
+    def IsLimitedI420(self):
+        return False
+
+    def GetRotation(self):
+        return 0
+
+    def GetSourceID(self):
+        return self.source_id
+
+    def GetTimeStamp(self):
+        return self.timestamp
+
+class ZoomSDKAudioRawDataDelegateCallbacks(_Callbacks):
+    def __init__(self, onMixedAudioRawDataReceivedCallback=None, onOneWayAudioRawDataReceivedCallback=None, onShareAudioRawDataReceivedCallback=None, onOneWayInterpreterAudioRawDataReceivedCallback=None, collectPerformanceData=False, onOneWayAudioRawDataBatchReceivedCallback=None, audioBatchIntervalMilliseconds=100, audioBatchMaxBytes=0, sharedMemorySink=None):
+        super().__init__(
+            collectPerformanceData=collectPerformanceData,
+            onMixedAudioRawDataReceivedCallback=onMixedAudioRawDataReceivedCallback,
+            onOneWayAudioRawDataReceivedCallback=onOneWayAudioRawDataReceivedCallback,
+            onOneWayAudioRawDataBatchReceivedCallback=onOneWayAudioRawDataBatchReceivedCallback,
+        )
+        self.batch_interval = audioBatchIntervalMilliseconds / 1000
+        self.batch_max_bytes = audioBatchMaxBytes
+        self.shared_memory_sink = sharedMemorySink
+        self.pending = {}
+        self.pending_arrivals = {}
+        self.pending_bytes = 0
+        self.pending_since = None
+        self.pending_format = None
+        # As natively, pending chunks are guarded and batches delivered in order when a timer flush races the audio thread
+        self.pending_lock = threading.Lock()
+        self.delivery_lock = threading.Lock()
+
+    def take_batch(self):
+        if not self.pending:
+            return None
+        batch = AudioRawDataBatch(self.pending, *self.pending_format, arrival_times=self.pending_arrivals)
+        self.pending = {}
+        self.pending_arrivals = {}
+        self.pending_bytes = 0
+        return batch
+
+    def deliver(self, *batches):
+        for batch in batches:
+            if batch is not None:
+                self.invoke("onOneWayAudioRawDataBatchReceivedCallback", batch)
+
+    def on_one_way_audio(self, data, node_id):
+        """Called by the simulation for each participant's chunk"""
+        if self.shared_memory_sink:
+            self.shared_memory_sink.write(data)
+        if self.callbacks.get("onOneWayAudioRawDataBatchReceivedCallback"):
+            with self.delivery_lock:
+                format_changed_batch = full_batch = None
+                with self.pending_lock:
+                    now = time.monotonic()
+                    audio_format = (data.sample_rate, data.channels)
+                    if self.pending and audio_format != self.pending_format:
+                        format_changed_batch = self.take_batch()
+                    if not self.pending:
+                        self.pending_since = now
+                        self.pending_format = audio_format
+                    self.pending.setdefault(node_id, []).append(data)
+                    self.pending_arrivals.setdefault(node_id, []).append(int(now * 1e9))
+                    self.pending_bytes += len(data)
+                    if (self.batch_max_bytes and self.pending_bytes >= self.batch_max_bytes) or now - self.pending_since >= self.batch_interval:
+                        full_batch = self.take_batch()
+                self.deliver(format_changed_batch, full_batch)
+        self.invoke("onOneWayAudioRawDataReceivedCallback", data, node_id)
+
+    def flushAudioBatch(self):
+        with self.delivery_lock:
+            with self.pending_lock:
+                batch = self.take_batch()
+            self.deliver(batch)
+
+    def flushExpiredAudioBatch(self):
+        with self.delivery_lock:
+            with self.pending_lock:
+                batch = self.take_batch() if self.pending and time.monotonic() - self.pending_since >= self.batch_interval else None
+            self.deliver(batch)
+        return batch is not None
+
+class AudioRawDataSharedMemorySink:
+    """Counts what would be written to the shared memory ring"""
+    def __init__(self, name, capacityBytes=16 * 1024 * 1024):
+        self.name = name
+        self.capacity = capacityBytes
+        self.written_chunks = 0
+
+    def write(self, data):
+        self.written_chunks += 1
+
+    def getName(self):
+        return self.name
+
+    def unlink(self):
+        pass
+
+    def getCapacity(self):
+        return self.capacity
+
+    def getWrittenChunks(self):
+        return self.written_chunks
+
+    def getDroppedChunks(self):
+        return 0
+
+    def getDroppedBytes(self):
+        return 0
+
+    def getPendingBytes(self):
+        return 0
+
+# Synthetic media
+
+def make_participant_audio(index, sample_rate, seconds=1.0):
+    """A second of a tone with a syllable-like envelope for speech, and a second of low noise for silence"""
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)
+    speech = (8000 * envelope * np.sin(2 * np.pi * (140 + 30 * index) * t)).astype(np.int16)
+    noise = np.random.default_rng(index).integers(-40, 40, len(t)).astype(np.int16)
+    return speech.tobytes(), noise.tobytes()
+
+def make_participant_frames(index, width, height, count=8):
+    """Frames with a block that moves, so consecutive frames differ like a camera image"""
+    frames = []
+    for number in range(count):
+        frame = np.full((height * 3 // 2, width), 128, dtype=np.uint8)
+        frame[:height] = np.linspace(30 + index * 10 % 60, 200, width, dtype=np.uint8)
+        size = max(height // 4, 2)
+        x = (number * width // count) % max(width - size, 1)
+        frame[height // 3:height // 3 + size, x:x + size] = 235
+        frame.flags.writeable = False
+        frames.append(frame)
+    return frames
+
+class Participant:
+    def __init__(self, user_id, name, is_me=False):
+        self.user_id = user_id
+        self.name = name
+        self.is_me = is_me
+
+    def GetUserID(self):
+        return self.user_id
+
+    def GetUserName(self):
+        return self.name
+
+    def IsHost(self):
+        return self.user_id == 16778240
+
+class ShareInfo:
+    def __init__(self, status, userid, share_source_id):
+        self.status = status
+        self.userid = userid
+        self.shareSourceID = share_source_id
+        self.contentType = 0
+        self.isShowingInFirstView = True
+        self.isShowingInSecondView = False
+
+class ChatMsgInfo:
+    def __init__(self, message_id, sender, receiver_id, content):
+        self.message_id = message_id
+        self.sender = sender
+        self.receiver_id = receiver_id
+        self.content = content
+        self.timestamp = int(time.time())
+
+    def GetMessageID(self): return self.message_id
+    def GetSenderUserId(self): return self.sender.user_id
+    def GetSenderDisplayName(self): return self.sender.name
+    def GetReceiverUserId(self): return self.receiver_id
+    def GetReceiverDisplayName(self): return "Everyone"
+    def GetContent(self): return self.content
+    def GetTimeStamp(self): return self.timestamp
+    def GetChatMessageType(self): return SDKChatMessageType.To_All
+    def IsChatToAll(self): return True
+    def IsChatToAllPanelist(self): return False
+    def IsChatToWaitingroom(self): return False
+    def IsComment(self): return False
+    def IsThread(self): return False
+    def GetThreadID(self): return ""
+
+class Simulation:
+    """
+    The meeting. Control events run on the GLib main loop; audio and video run on a thread
+    each once the bot subscribes to audio or a renderer.
+    """
+    def __init__(self, participants=4, sample_rate=None, audio_interval_ms=10, video_fps=15, share_fps=5, speaker_change_seconds=5, chat_interval_seconds=0, share=False, auth_delay_ms=50, join_delay_ms=200, auth_result=AUTHRET_SUCCESS, max_behind_ms=100):
+        self.participant_count = participants
+        self.sample_rate = sample_rate
+        self.audio_interval = audio_interval_ms / 1000
+        self.video_interval = 1 / video_fps
+        self.share_interval = 1 / share_fps
+        self.speaker_change_seconds = speaker_change_seconds
+        self.chat_interval_seconds = chat_interval_seconds
+        self.share = share
+        self.auth_delay_ms = auth_delay_ms
+        self.join_delay_ms = join_delay_ms
+        self.auth_result = auth_result
+        self.max_behind = max_behind_ms / 1000
+        self.reset()
+
+    def reset(self):
+        self.initialized = False
+        self.status = MEETING_STATUS_IDLE
+        self.meeting_service = None
+        self.auth_service = None
+        # The bot is the first participant, like the bot joining an existing meeting last gets listed first
+        self.me = Participant(16778240, "My meeting bot", is_me=True)
+        self.participants = [self.me] + [Participant(16778240 + 1024 * (index + 1), f"Participant {index + 1}") for index in range(self.participant_count - 1)]
+        self.audio_delegate = None
+        self.renderers = set()
+        self.lock = threading.Lock()
+        self.media_threads = []
+        self.media_stop = threading.Event()
+        self.joined_at = None
+        self.active_speaker = None
+        self.audio_buffers = {}
+        self.frame_cache = {}
+        self.counters = {
+            "audio_chunks_sent": 0,
+            "audio_chunks_dropped": 0,
+            "video_frames_sent": 0,
+            "video_frames_dropped": 0,
+            "share_frames_sent": 0,
+            "mic_bytes_received": 0,
+            "video_frames_received": 0,
+            "share_frames_received": 0,
+            "chat_messages_sent": 0,
+        }
+        self.max_lateness = 0
+        self.video_max_lateness = 0
+
+    def others(self):
+        return [participant for participant in self.participants if not participant.is_me]
+
+    def participant(self, user_id):
+        return next((participant for participant in self.participants if participant.user_id == user_id), None)
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] += amount
+
+    # Control state machine, on the GLib main loop
+
+    def authenticate(self, auth_service):
+        def authenticated():
+            auth_service.event.invoke("onAuthenticationReturnCallback", self.auth_result)
+            return False
+        GLib.timeout_add(self.auth_delay_ms, authenticated)
+
+    def set_status(self, status):
+        self.status = status
+        if self.meeting_service and self.meeting_service.event:
+            self.meeting_service.event.invoke("onMeetingStatusChangedCallback", status, 0)
+
+    def join(self, join_param):
+        self.sample_rate = self.sample_rate or SAMPLING_RATES.get(join_param.param.eAudioRawdataSamplingRate, 32000)
+        self.set_status(MEETING_STATUS_CONNECTING)
+
+        def joined():
+            self.joined_at = time.monotonic()
+            self.set_status(MEETING_STATUS_INMEETING)
+            GLib.timeout_add(100, self.after_join)
+            return False
+        GLib.timeout_add(self.join_delay_ms, joined)
+
+    def after_join(self):
+        """Events that follow joining: the recording privilege, speakers, a share and chat"""
+        if self.status != MEETING_STATUS_INMEETING:
+            return False
+        service = self.meeting_service
+        if service.participants_controller.event:
+            for participant in self.others():
+                service.participants_controller.event.invoke("onUserJoinCallback", [participant.user_id], participant.name)
+        if self.others():
+            GLib.timeout_add(int(self.speaker_change_seconds * 1000), self.change_active_speaker)
+            self.change_active_speaker()
+        if self.share and self.others():
+            sharer = self.others()[0]
+            share_info = ShareInfo(Sharing_Other_Share_Begin, sharer.user_id, sharer.user_id + 1)
+            if service.share_controller.event:
+                service.share_controller.event.invoke("onSharingStatusCallback", share_info)
+        if self.chat_interval_seconds and self.others():
+            GLib.timeout_add(int(self.chat_interval_seconds * 1000), self.send_chat)
+        return False
+
+    def change_active_speaker(self):
+        if self.status != MEETING_STATUS_INMEETING:
+            return False
+        others = self.others()
+        index = others.index(self.active_speaker) + 1 if self.active_speaker in others else 0
+        self.active_speaker = others[index % len(others)]
+        controller = self.meeting_service.audio_controller
+        if controller.event:
+            controller.event.invoke("onUserActiveAudioChangeCallback", [self.active_speaker.user_id])
+        return True
+
+    def send_chat(self):
+        if self.status != MEETING_STATUS_INMEETING:
+            return False
+        number = self.counters["chat_messages_sent"]
+        sender = self.others()[number % len(self.others())]
+        controller = self.meeting_service.chat_controller
+        if controller.event:
+            controller.event.invoke("onChatMsgNotificationCallback", ChatMsgInfo(f"msg-{number}", sender, 0, f"Chat message {number} from {sender.name}"), None)
+        self.count("chat_messages_sent")
+        return True
+
+    def leave(self):
+        if self.status == MEETING_STATUS_IDLE:
+            return
+        self.stop_media()
+        self.set_status(MEETING_STATUS_DISCONNECTING)
+        self.set_status(MEETING_STATUS_ENDED)
+        self.status = MEETING_STATUS_IDLE
+
+    # Media, on the audio and video threads
+
+    def start_media(self):
+        with self.lock:
+            if self.media_threads:
+                return
+            self.media_stop.clear()
+            self.media_start = time.monotonic()
+            self.media_threads = [
+                threading.Thread(target=self.run_audio, name="fake-zoom-audio", daemon=True),
+                threading.Thread(target=self.run_video, name="fake-zoom-video", daemon=True),
+            ]
+        for thread in self.media_threads:
+            thread.start()
+
+    def stop_media(self):
+        self.media_stop.set()
+        for thread in self.media_threads:
+            if thread is not threading.current_thread():
+                thread.join(2)
+        self.media_threads = []
+
+    def audio_chunk(self, participant, tick):
+        if participant.user_id not in self.audio_buffers:
+            self.audio_buffers[participant.user_id] = make_participant_audio(len(self.audio_buffers), self.sample_rate)
+        speech, noise = self.audio_buffers[participant.user_id]
+        source = speech if participant is self.active_speaker else noise
+        chunk_bytes = int(self.sample_rate * self.audio_interval) * 2
+        offset = (tick * chunk_bytes) % (len(source) - chunk_bytes + 1)
+        timestamp = int((tick * self.audio_interval) * 1000)
+        return AudioRawData(source[offset:offset + chunk_bytes], self.sample_rate, timeStamp=timestamp)
+
+    def frames_for(self, user_id, width, height):
+        key = (user_id, width, height)
+        if key not in self.frame_cache:
+            self.frame_cache[key] = make_participant_frames(len(self.frame_cache), width, height)
+        return self.frame_cache[key]
+
+    def send_video(self, renderer, frame_number, timestamp):
+        width, height = RESOLUTION_SIZES[renderer.resolution]
+        if renderer.raw_data_type == ZoomSDKRawDataType.RAW_DATA_TYPE_SHARE:
+            # Slides: the same frame for several seconds
+            frames = self.frames_for(("share", renderer.user_id), 1280, 720)
+            frame = frames[(frame_number // int(5 / self.share_interval + 1)) % len(frames)]
+            data = YUVRawDataI420(frame, 1280, 720, timestamp, renderer.user_id)
+            self.count("share_frames_sent")
+        else:
+            frames = self.frames_for(renderer.user_id, width, height)
+            data = YUVRawDataI420(frames[frame_number % len(frames)], width, height, timestamp, renderer.user_id)
+            self.count("video_frames_sent")
+        renderer.delegate.invoke("onRawDataFrameReceivedCallback", data)
+
+    def run_audio(self):
+        """
+        Sends audio every audio_interval. Deadlines are absolute, so slow callbacks delay
+        sends rather than stretching the timeline; chunks more than max_behind late are
+        dropped instead of sent in a burst.
+        """
+        tick = 0
+        while not self.media_stop.is_set():
+            deadline = self.media_start + tick * self.audio_interval
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                if self.media_stop.wait(delay):
+                    break
+            lateness = time.monotonic() - deadline
+            self.max_lateness = max(self.max_lateness, lateness)
+            if lateness > self.max_behind:
+                skipped = int(lateness / self.audio_interval)
+                self.count("audio_chunks_dropped", skipped * len(self.others()))
+                tick += skipped
+                continue
+
+            delegate = self.audio_delegate
+            if delegate is not None:
+                for participant in self.others():
+                    delegate.on_one_way_audio(self.audio_chunk(participant, tick), participant.user_id)
+                    self.count("audio_chunks_sent")
+            tick += 1
+
+    def run_video(self):
+        """Sends each renderer's frame when it is due; frames missed while a callback ran long are dropped"""
+        next_frames = {}
+        while not self.media_stop.is_set():
+            now = time.monotonic()
+            for renderer in list(self.renderers):
+                interval = self.share_interval if renderer.raw_data_type == ZoomSDKRawDataType.RAW_DATA_TYPE_SHARE else self.video_interval
+                frame_number, due = next_frames.get(renderer, (0, now))
+                if now < due:
+                    continue
+                self.video_max_lateness = max(self.video_max_lateness, now - due)
+                missed = int((now - due) / interval)
+                if missed:
+                    self.count("video_frames_dropped", missed)
+                self.send_video(renderer, frame_number + missed, int((now - self.media_start) * 1000))
+                next_frames[renderer] = (frame_number + missed + 1, due + (missed + 1) * interval)
+                now = time.monotonic()
+            # Renderers come and go, so the next due frame is rechecked at least every audio interval
+            renderers = self.renderers
+            next_due = min((due for renderer, (frame_number, due) in next_frames.items() if renderer in renderers), default=now + self.audio_interval)
+            self.media_stop.wait(max(0, min(next_due, now + self.audio_interval) - time.monotonic()))
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.counters)
+        stats["max_lateness_ms"] = self.max_lateness * 1000
+        stats["video_max_lateness_ms"] = self.video_max_lateness * 1000
+        stats["seconds_in_meeting"] = time.monotonic() - self.joined_at if self.joined_at else 0
+        return stats
+
+_simulation = Simulation()
+
+def install(**settings):
+    """Registers this module as zoom_meeting_sdk, with a fresh simulation using these settings"""
+    global _simulation
+    _simulation = Simulation(**settings)
+    sys.modules["zoom_meeting_sdk"] = sys.modules[__name__]
+    return _simulation
+
+def simulation():
+    return _simulation
+
+def stats():
+    return _simulation.stats()
+
+# SDK setup
+
+class InitParam:
+    def __init__(self):
+        self.strWebDomain = ""
+        self.strSupportUrl = ""
+        self.enableGenerateDump = False
+        self.emLanguageID = SDK_LANGUAGE_ID.LANGUAGE_English
+        self.enableLogByDefault = False
+
+class AuthContext:
+    def __init__(self):
+        self.jwt_token = ""
+
+class JoinParam4WithoutLogin:
+    def __init__(self):
+        self.meetingNumber = 0
+        self.userName = ""
+        self.psw = ""
+        self.isVideoOff = True
+        self.isAudioOff = True
+        self.isAudioRawDataStereo = False
+        self.isMyVoiceInMix = False
+        self.eAudioRawdataSamplingRate = AudioRawdataSamplingRate.AudioRawdataSamplingRate_32K
+
+class JoinParam:
+    def __init__(self):
+        self.userType = SDKUserType.SDK_UT_WITHOUT_LOGIN
+        self.param = JoinParam4WithoutLogin()
+
+def InitSDK(init_param):
+    _simulation.initialized = True
+    return SDKERR_SUCCESS
+
+def CleanUPSDK():
+    _simulation.stop_media()
+    _simulation.initialized = False
+    return SDKERR_SUCCESS
+
+# Services and controllers
+
+class _EventTarget:
+    def __init__(self):
+        self.event = None
+
+    def SetEvent(self, event):
+        self.event = event
+        return SDKERR_SUCCESS
+
+class AuthService(_EventTarget):
+    def SDKAuth(self, auth_context):
+        if not _simulation.initialized:
+            return SDKERR_UNINITIALIZE
+        _simulation.authenticate(self)
+        return SDKERR_SUCCESS
+
+class MeetingReminderController(_EventTarget): pass
+class MeetingBOController(_EventTarget): pass
+
+class MeetingRecordingController(_EventTarget):
+    def CanStartRawRecording(self):
+        return SDKERR_SUCCESS
+
+    def StartRawRecording(self):
+        return SDKERR_SUCCESS
+
+    def StopRawRecording(self):
+        return SDKERR_SUCCESS
+
+    def RequestLocalRecordingPrivilege(self):
+        return SDKERR_SUCCESS
+
+class MeetingParticipantsController(_EventTarget):
+    def GetMySelfUser(self):
+        return _simulation.me
+
+    def GetParticipantsList(self):
+        return [participant.user_id for participant in _simulation.participants]
+
+    def GetUserByUserID(self, user_id):
+        return _simulation.participant(user_id)
+
+class MeetingShareController(_EventTarget):
+    def GetViewableSharingUserList(self):
+        return []
+
+    def GetSharingSourceInfoList(self, user_id):
+        return []
+
+    def ResumeCurrentSharing(self):
+        return SDKERR_WRONG_USAGE
+
+class MeetingAudioController(_EventTarget):
+    def JoinVoip(self):
+        return SDKERR_SUCCESS
+
+class ChatMessageBuilder:
+    def __init__(self):
+        self.Clear()
+
+    def SetContent(self, content):
+        self.content = content
+        return self
+
+    def SetReceiver(self, receiver):
+        self.receiver = receiver
+        return self
+
+    def SetMessageType(self, message_type):
+        self.message_type = message_type
+        return self
+
+    def Build(self):
+        return ChatMsgInfo("sent", _simulation.me, self.receiver, self.content)
+
+    def Clear(self):
+        self.content = ""
+        self.receiver = 0
+        self.message_type = SDKChatMessageType.To_All
+
+class MeetingChatController(_EventTarget):
+    def GetChatMessageBuilder(self):
+        return ChatMessageBuilder()
+
+    def SendChatMsgTo(self, message):
+        return SDKERR_SUCCESS
+
+class MeetingVideoController(_EventTarget):
+    def UnmuteVideo(self):
+        return SDKERR_SUCCESS
+
+    def MuteVideo(self):
+        return SDKERR_SUCCESS
+
+class MeetingService(_EventTarget):
+    def __init__(self):
+        super().__init__()
+        self.reminder_controller = MeetingReminderController()
+        self.recording_controller = MeetingRecordingController()
+        self.participants_controller = MeetingParticipantsController()
+        self.share_controller = MeetingShareController()
+        self.audio_controller = MeetingAudioController()
+        self.chat_controller = MeetingChatController()
+        self.bo_controller = MeetingBOController()
+        self.video_controller = MeetingVideoController()
+
+    def Join(self, join_param):
+        _simulation.join(join_param)
+        return SDKERR_SUCCESS
+
+    def Leave(self, leave_type):
+        _simulation.leave()
+        return SDKERR_SUCCESS
+
+    def GetMeetingStatus(self):
+        return _simulation.status
+
+    def GetMeetingReminderController(self): return self.reminder_controller
+    def GetMeetingRecordingController(self): return self.recording_controller
+    def GetMeetingParticipantsController(self): return self.participants_controller
+    def GetMeetingShareController(self): return self.share_controller
+    def GetMeetingAudioController(self): return self.audio_controller
+    def GetMeetingChatController(self): return self.chat_controller
+    def GetMeetingBOController(self): return self.bo_controller
+    def GetMeetingVideoController(self): return self.video_controller
+
+class AudioSettings:
+    def EnableAutoJoinAudio(self, enable):
+        return SDKERR_SUCCESS
+
+class SettingService:
+    def GetAudioSettings(self):
+        return AudioSettings()
+
+def CreateMeetingService():
+    _simulation.meeting_service = MeetingService()
+    return _simulation.meeting_service
+
+def CreateAuthService():
+    _simulation.auth_service = AuthService()
+    return _simulation.auth_service
+
+def CreateSettingService():
+    return SettingService()
+
+def DestroyMeetingService(service):
+    return SDKERR_SUCCESS
+
+def DestroyAuthService(service):
+    return SDKERR_SUCCESS
+
+def DestroySettingService(service):
+    return SDKERR_SUCCESS
+
+# Raw data helpers and senders
+
+class AudioRawDataSender:
+    """The virtual mic; counts what the bot sends"""
+    def send(self, data, sample_rate, channel):
+        _simulation.count("mic_bytes_received", len(memoryview(data).cast("B")))
+        return SDKERR_SUCCESS
+
+class AudioRawdataHelper:
+    def subscribe(self, delegate, withInterpreters=False):
+        _simulation.audio_delegate = delegate
+        _simulation.start_media()
+        return SDKERR_SUCCESS
+
+    def unSubscribe(self):
+        _simulation.audio_delegate = None
+        return SDKERR_SUCCESS
+
+    def setExternalAudioSource(self, source):
+        def start():
+            source.invoke("onMicInitializeCallback", AudioRawDataSender())
+            source.invoke("onMicStartSendCallback")
+            return False
+        GLib.idle_add(start)
+        return SDKERR_SUCCESS
+
+class VideoSender:
+    def sendVideoFrame(self, frame, width, height, rotation, format):
+        _simulation.count("video_frames_received")
+        return SDKERR_SUCCESS
+
+class ShareSender:
+    def sendShareFrame(self, frame, width, height, format):
+        _simulation.count("share_frames_received")
+        return SDKERR_SUCCESS
+
+class RawdataShareSourceHelper:
+    def setExternalShareSource(self, share_source, share_audio_source=None):
+        self.share_source = share_source
+        return SDKERR_SUCCESS
+
+class RawdataVideoSourceHelper:
+    def setExternalVideoSource(self, video_source):
+        def start():
+            video_source.invoke("onInitializeCallback", VideoSender(), [], None)
+            video_source.invoke("onStartSendCallback")
+            return False
+        GLib.idle_add(start)
+        return SDKERR_SUCCESS
+
+_audio_helper = AudioRawdataHelper()
+
+def GetAudioRawdataHelper():
+    return _audio_helper
+
+def GetRawdataShareSourceHelper():
+    return RawdataShareSourceHelper()
+
+def GetRawdataVideoSourceHelper():
+    return RawdataVideoSourceHelper()
+
+class Renderer:
+    def __init__(self, delegate):
+        self.delegate = delegate
+        self.resolution = ZoomSDKResolution_720P
+        self.user_id = None
+        self.raw_data_type = None
+
+    def setRawDataResolution(self, resolution):
+        self.resolution = resolution
+        return SDKERR_SUCCESS
+
+    def subscribe(self, user_id, raw_data_type):
+        if raw_data_type == ZoomSDKRawDataType.RAW_DATA_TYPE_VIDEO and _simulation.participant(user_id) is None:
+            return SDKERR_INVALID_PARAMETER
+        self.user_id = user_id
+        self.raw_data_type = raw_data_type
+        _simulation.renderers.add(self)
+        _simulation.start_media()
+        return SDKERR_SUCCESS
+
+    def unSubscribe(self):
+        _simulation.renderers.discard(self)
+        self.user_id = None
+        return SDKERR_SUCCESS
+
+def createRenderer(delegate):
+    return Renderer(delegate)
+
+def destroyRenderer(renderer):
+    renderer.unSubscribe()
+    return SDKERR_SUCCESS
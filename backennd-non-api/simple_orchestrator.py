@@ -395,33 +395,37 @@ class SimpleOrchestrator:
         for meeting_id in bots_to_cleanup:
             self.cleanup_bot(meeting_id)
 
+    def tick(self):
+        """One pass of the orchestrator loop: reap bots, fetch meetings and start the bots that are due"""
+        # Check for stopped bots
+        self.check_bot_status()
+        
+        # Fetch all users and their meetings
+        users_with_meetings = self.fetch_users_with_meetings()
+        
+        # Check each user's meetings - only start bot for the most recent meeting
+        for user_id, user_meetings in users_with_meetings.items():
+            if user_meetings:  # If user has meetings
+                # Get the most recent meeting (first in the list since it's sorted by createdAt desc)
+                most_recent_meeting = user_meetings[0]
+                if self.should_start_bot_for_meeting(most_recent_meeting):
+                    self.start_meeting_bot(most_recent_meeting, user_id)
+        
+        # Log current status
+        print(f"📊 Active bots: {len(self.active_bots)}")
+        for meeting_id, bot_info in self.active_bots.items():
+            elapsed_minutes = (datetime.now() - bot_info['start_time']).total_seconds() / 60
+            remaining = bot_info['duration_minutes'] - elapsed_minutes
+            print(f"   🤖 Meeting {meeting_id}: {elapsed_minutes:.1f}/{bot_info['duration_minutes']} minutes ({remaining:.1f} remaining)")
+        print(f"👥 Monitoring {len(users_with_meetings)} users")
+
     def run(self):
         """Main orchestrator loop"""
         print("🚀 Starting Simple Meeting Orchestrator...")
         
         while self.running:
             try:
-                # Check for stopped bots
-                self.check_bot_status()
-                
-                # Fetch all users and their meetings
-                users_with_meetings = self.fetch_users_with_meetings()
-                
-                # Check each user's meetings - only start bot for the most recent meeting
-                for user_id, user_meetings in users_with_meetings.items():
-                    if user_meetings:  # If user has meetings
-                        # Get the most recent meeting (first in the list since it's sorted by createdAt desc)
-                        most_recent_meeting = user_meetings[0]
-                        if self.should_start_bot_for_meeting(most_recent_meeting):
-                            self.start_meeting_bot(most_recent_meeting, user_id)
-                
-                # Log current status
-                print(f"📊 Active bots: {len(self.active_bots)}")
-                for meeting_id, bot_info in self.active_bots.items():
-                    elapsed_minutes = (datetime.now() - bot_info['start_time']).total_seconds() / 60
-                    remaining = bot_info['duration_minutes'] - elapsed_minutes
-                    print(f"   🤖 Meeting {meeting_id}: {elapsed_minutes:.1f}/{bot_info['duration_minutes']} minutes ({remaining:.1f} remaining)")
-                print(f"👥 Monitoring {len(users_with_meetings)} users")
+                self.tick()
                 
                 # Sleep for 30 seconds before next check
                 time.sleep(30)